@@ -105,6 +105,22 @@ def get_command_line_args(arglist=None, description=None):
     return argdict
 
 
+def get_default_command_line_args(arglist=None):
+    ''' Return the default value of every requested command line argument, as get_command_line_args would with
+        no command line arguments specified
+
+    Args:
+        arglist (:obj:`list`, optional) : DEFAULT None.
+                                            list of requested arguments to include, if None include all arguments
+    Returns:
+        (dict) : Dictionary of default command line arguments
+    '''
+    import argparse
+    parser = argparse.ArgumentParser()
+    add_args(parser, arglist)
+    return parser.parse_args([]).__dict__
+
+
 def add_args(parser, arglist=None):
     ''' List of available standard arguments for calling data file processing command line.
 
@@ -219,6 +235,22 @@ def add_args(parser, arglist=None):
         procflow_group.add_argument('--output_config', nargs='?', default=None,
                                   help='''Specify YAML config file holding output modile names and 
                                           their respective filename modules''')
+    if arglist is None or 'profile_report' in arglist:
+        procflow_group.add_argument('--profile_report', nargs='?', default=None,
+                                  help='''Specify full path to a profile report file, to write the wall time, CPU
+                                          time, peak RSS and bytes read/written for each procflow stage.
+                                          Written as CSV if the filename ends in .csv, otherwise JSON''')
+    if arglist is None or 'memory_budget_mb' in arglist:
+        procflow_group.add_argument('--memory_budget_mb', nargs='?', default=None, type=float,
+                                  help='''Specify the maximum RSS in MB for the procflow.  When set, cached
+                                          intermediates are released before the budget is reached, and full reads
+                                          fall back to windowed reads per sector if they are not expected to fit.
+                                          Defaults to the GEOIPS_MEMORY_BUDGET_MB environment variable, if set''')
+    if arglist is None or 'result_cache' in arglist:
+        procflow_group.add_argument('--result_cache', action='store_true',
+                                  help='''Skip reprocessing products whose recorded outputs already exist for identical
+                                          input file contents, product, sector, plugins and options, and record new
+                                          outputs in the result cache manifest''')
 
     rdr_group = parser.add_argument_group(title='Data reader specifications')
 
@@ -0,0 +1,206 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Import time budget for the procflow cold start path.
+
+    Heavy dependencies (matplotlib, cartopy, scipy, pyresample, h5py, netCDF4, rasterio, ...) must only be imported
+    by the plugins that actually use them, at call time.  Plugin lookups go through the plugin registry, so selecting
+    a procflow, reader or output format imports only that plugin's module.
+
+    Each case in IMPORT_BUDGET_CASES is run in a fresh python process, recording the wall time and every module
+    imported.  A case fails if it takes longer than its budget, or imports any of its forbidden modules:
+
+        check_import_budget --report new.json --baseline old.json
+
+    Results are written in the geoips2.profiler report format (one span per case, ie 'import_budget/get_reader'),
+    so runs can be compared with --baseline.  The slowest imports for each case (from python -X importtime) are
+    logged, to identify the source of any regression.
+'''
+import os
+import sys
+import json
+import logging
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+HEAVY_MODULES = ['numpy', 'xarray', 'pandas', 'scipy', 'matplotlib', 'cartopy', 'pyresample', 'pyproj', 'shapely',
+                 'h5py', 'netCDF4', 'pyhdf', 'rasterio', 'numexpr', 'dask']
+
+# Each case: code run in a fresh process, maximum wall time in seconds, and top level modules it must not import
+IMPORT_BUDGET_CASES = {
+    'run_procflow_startup': {'code': 'from geoips2.commandline.args import get_command_line_args\n'
+                                     'import geoips2.commandline.run_procflow',
+                             'max_seconds': 0.5,
+                             'forbidden': HEAVY_MODULES},
+    'list_plugins': {'code': 'from geoips2.plugin_registry import list_plugins, TYPE_ATTRIBUTES\n'
+                             'for namespace in TYPE_ATTRIBUTES:\n'
+                             '    list_plugins(namespace)',
+                     'max_seconds': 0.5,
+                     'forbidden': HEAVY_MODULES},
+    'get_procflow': {'code': 'from geoips2.dev.procflow import get_procflow, get_procflow_type\n'
+                             'get_procflow_type("single_source")\n'
+                             'get_procflow("single_source")',
+                     'max_seconds': 1.0,
+                     'forbidden': [mod for mod in HEAVY_MODULES if mod not in ['numpy', 'xarray', 'pandas']]},
+    'get_reader': {'code': 'from geoips2.stable.reader import get_reader, get_reader_type\n'
+                           'get_reader_type("geoips2_netcdf")\n'
+                           'get_reader("geoips2_netcdf")',
+                   'max_seconds': 1.0,
+                   'forbidden': ['matplotlib', 'cartopy', 'scipy', 'pyresample', 'h5py', 'pyhdf', 'rasterio']},
+    'get_outputter': {'code': 'from geoips2.dev.output import get_outputter, get_outputter_type\n'
+                              'for output_format in ["imagery_clean", "imagery_annotated", "netcdf_geoips"]:\n'
+                              '    get_outputter_type(output_format)\n'
+                              '    get_outputter(output_format)',
+                      'max_seconds': 1.0,
+                      'forbidden': ['cartopy', 'scipy', 'pyresample', 'h5py', 'pyhdf', 'rasterio']},
+}
+
+# Appended to each case, to report the wall time and imported modules to the parent process
+CASE_TEMPLATE = '''import sys, time, json
+start = time.perf_counter()
+{code}
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules.keys())}}))
+'''
+
+# Number of slowest imports logged for each case
+NUM_SLOWEST_IMPORTS = 10
+
+
+def parse_importtime(stderr):
+    ''' Return (cumulative microseconds, module) for every import in python -X importtime output, slowest first '''
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        try:
+            _, cumulative, module = line[len('import time:'):].split('|')
+            imports += [(int(cumulative), module.strip())]
+        except ValueError:
+            continue
+    return sorted(imports, reverse=True)
+
+
+def run_import_case(case_name, case):
+    ''' Run a single import budget case in a fresh python process
+
+    Returns:
+        (dict) : profiler report span dictionary for the case, with status 'done' or 'failed'
+    '''
+    import subprocess
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', CASE_TEMPLATE.format(code=case['code'])],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    span_dict = {'path': 'import_budget/{0}'.format(case_name),
+                 'name': case_name,
+                 'depth': 1,
+                 'status': 'done',
+                 'attrs': {'max_seconds': str(case['max_seconds'])},
+                 'cpu_seconds': None,
+                 'peak_rss_mb': None,
+                 'bytes_read': None,
+                 'bytes_written': None}
+    if proc.returncode != 0:
+        LOG.error('IMPORTBUDGETFAILED %s raised an exception:\n%s', case_name, proc.stderr[-2000:])
+        span_dict.update({'status': 'failed', 'wall_seconds': 0.0, 'error': 'exception'})
+        return span_dict
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    span_dict['wall_seconds'] = result['seconds']
+    imported = set(module.split('.')[0] for module in result['modules'])
+    forbidden_imported = sorted(imported & set(case['forbidden']))
+    span_dict['attrs']['num_modules'] = str(len(result['modules']))
+    span_dict['attrs']['forbidden_imported'] = ','.join(forbidden_imported)
+
+    for cumulative, module in parse_importtime(proc.stderr)[:NUM_SLOWEST_IMPORTS]:
+        LOG.info('IMPORTTIME %-25s %9.3fs %s', case_name, cumulative / 1e6, module)
+    if forbidden_imported:
+        LOG.error('IMPORTBUDGETFAILED %s imported forbidden modules %s', case_name, forbidden_imported)
+        span_dict['status'] = 'failed'
+    if result['seconds'] > case['max_seconds']:
+        LOG.error('IMPORTBUDGETFAILED %s took %.3fs, budget %.3fs', case_name, result['seconds'], case['max_seconds'])
+        span_dict['status'] = 'failed'
+    LOG.info('IMPORTBUDGET %-25s %-6s %.3fs (budget %.3fs), %s modules', case_name, span_dict['status'],
+             result['seconds'], case['max_seconds'], len(result['modules']))
+    return span_dict
+
+
+def check_import_budget(case_names=None, budget_scale=1.0):
+    ''' Run the requested import budget cases
+
+    Args:
+        case_names (list) : DEFAULT None, list of IMPORT_BUDGET_CASES keys, all cases if None
+        budget_scale (float) : DEFAULT 1.0, multiply all time budgets by budget_scale (ie, for slow file systems)
+
+    Returns:
+        (dict) : report in geoips2.profiler report format, {'run': run information, 'spans': case results}
+    '''
+    import socket
+    from datetime import datetime
+    from geoips2.plugin_registry import get_registry
+    # Build the plugin registry snapshot if needed, so its one time cost is not attributed to the first case
+    get_registry()
+    if case_names is None:
+        case_names = list(IMPORT_BUDGET_CASES.keys())
+    report = {'run': {'name': 'import_budget',
+                      'start_datetime': datetime.utcnow().isoformat(),
+                      'host': socket.gethostname(),
+                      'pid': os.getpid(),
+                      'attrs': {'python': sys.version.split()[0], 'budget_scale': str(budget_scale)}},
+              'spans': []}
+    for case_name in case_names:
+        case = dict(IMPORT_BUDGET_CASES[case_name])
+        case['max_seconds'] = case['max_seconds'] * budget_scale
+        report['spans'] += [run_import_case(case_name, case)]
+    return report
+
+
+def main():
+    ''' Run the import budget cases, write the report, and compare to a baseline report if requested '''
+    import argparse
+    from datetime import datetime
+    from geoips2.commandline.log_setup import setup_logging
+    from geoips2.commandline.run_benchmarks import write_benchmark_report
+    setup_logging()
+    parser = argparse.ArgumentParser(description='Import time budget for the geoips2 procflow cold start path')
+    parser.add_argument('--cases', nargs='+', default=None, choices=sorted(IMPORT_BUDGET_CASES.keys()),
+                        help='''Import budget cases to run, default all''')
+    parser.add_argument('--budget_scale', default=1.0, type=float,
+                        help='''Multiply all import time budgets by this factor''')
+    parser.add_argument('--report', default=None,
+                        help='''JSON report filename, default BENCHMARK_PATH/import_budget_<YYYYmmddHHMMSS>.json''')
+    parser.add_argument('--baseline', default=None,
+                        help='''Baseline JSON report to compare against''')
+    parser.add_argument('--threshold', default=1.2, type=float,
+                        help='''Report regressions where new / baseline import time exceeds threshold''')
+    args = parser.parse_args()
+
+    report_fname = args.report
+    if report_fname is None:
+        report_fname = os.path.join(gpaths['BENCHMARK_PATH'],
+                                    'import_budget_{0}.json'.format(datetime.utcnow().strftime('%Y%m%d%H%M%S')))
+    report = check_import_budget(case_names=args.cases, budget_scale=args.budget_scale)
+    write_benchmark_report(report, report_fname)
+
+    retval = 0
+    if [span_dict for span_dict in report['spans'] if span_dict['status'] != 'done']:
+        retval = 1
+    if args.baseline:
+        from geoips2.profiler import diff_profile_reports
+        if diff_profile_reports(args.baseline, report_fname, threshold=args.threshold):
+            retval = 2
+    sys.exit(retval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,372 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Resident procflow worker, processing jobs from a spool directory with warm module, plugin and cache state.
+
+    Each job is a JSON file containing the same argument dictionary run_procflow builds from the command line
+    (at minimum "filenames" and "procflow" - any arguments not specified take their command line defaults):
+
+        {"procflow": "single_source", "filenames": ["/data/file1.nc"], "reader_name": "amsr2_netcdf", ...}
+
+    Jobs are submitted by writing <spool_dir>/incoming/<job_id>.json (see submit_job).  A worker claims a job by
+    atomically renaming it into <spool_dir>/running, so any number of workers can share one spool directory, and
+    records its host and pid in <spool_dir>/running/<job_id>.json.claim.  At startup, jobs claimed by workers on
+    the same host that are no longer running are requeued.
+    When the job completes, the job file is moved to <spool_dir>/done or <spool_dir>/failed, along with
+    a <job_id>.result.json containing the status, return value, outputs, and timing.  Each job logs the same
+    GEOIPS2PROCFLOWSUCCESS / GEOIPS2TOTALSUCCESS lines as run_procflow.
+
+    Heavy modules, procflow functions, and module level caches (warp indices, overlay templates, boundary geometry,
+    sector metadata) persist between jobs.  A failing job is logged and recorded, and the worker continues with the
+    next job.  Use --max_jobs to recycle worker processes periodically.
+
+        procflow_worker --spool_dir /path/to/spool --max_jobs 500
+'''
+import os
+import sys
+import json
+import logging
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+SPOOL_SUBDIRS = ['incoming', 'running', 'done', 'failed']
+
+# Suffix of the claim file recording the worker host and pid for each job in spool_dir/running
+CLAIM_SUFFIX = '.claim'
+
+# Jobs in spool_dir/running with no claim file (worker died between claiming and recording the claim) are requeued
+# once they have been in running this many seconds
+UNRECORDED_CLAIM_SECONDS = 300
+
+# Modules imported once at worker startup, so individual jobs do not pay the import time
+PRELOAD_MODULES = ['numpy', 'xarray', 'matplotlib.pyplot', 'pyresample', 'cartopy.crs', 'cartopy.feature']
+
+# Procflow functions resolved once per worker, keyed by procflow name
+PROCFLOW_CACHE = {}
+
+
+def setup_spool_dir(spool_dir):
+    ''' Create the incoming, running, done and failed subdirectories of spool_dir '''
+    from geoips2.filenames.base_paths import make_dirs
+    for subdir in SPOOL_SUBDIRS:
+        make_dirs(os.path.join(spool_dir, subdir))
+
+
+def write_json_atomic(json_dict, out_fname):
+    ''' Write json_dict to out_fname through a temporary file in the same directory, so readers never see a
+        partial file
+    '''
+    from geoips2.filenames.base_paths import atomic_output_fname
+    with atomic_output_fname(out_fname) as tmp_fname:
+        with open(tmp_fname, 'w') as fobj:
+            json.dump(json_dict, fobj, indent=2, default=str)
+    return out_fname
+
+
+def submit_job(filenames, command_line_args, spool_dir=None, job_id=None):
+    ''' Submit a procflow job to the resident workers
+
+    Args:
+        filenames (list) : list of data files to process
+        command_line_args (dict) : procflow arguments, as produced by get_command_line_args (must include procflow)
+        spool_dir (str) : DEFAULT None, spool directory, PATHS['PROCFLOW_SPOOL_PATH'] if None
+        job_id (str) : DEFAULT None, unique job name, generated from the current time if None
+
+    Returns:
+        (str) : full path to the submitted job file
+    '''
+    from datetime import datetime
+    if spool_dir is None:
+        spool_dir = gpaths['PROCFLOW_SPOOL_PATH']
+    if job_id is None:
+        job_id = '{0}_{1}'.format(datetime.utcnow().strftime('%Y%m%d%H%M%S%f'), os.getpid())
+    setup_spool_dir(spool_dir)
+    job = dict(command_line_args)
+    job['filenames'] = list(filenames)
+    job_fname = write_json_atomic(job, os.path.join(spool_dir, 'incoming', '{0}.json'.format(job_id)))
+    LOG.info('Submitted procflow job %s', job_fname)
+    return job_fname
+
+
+def claim_next_job(spool_dir):
+    ''' Claim the oldest job in spool_dir/incoming by renaming it into spool_dir/running, and record this worker's
+        host and pid in the job's claim file
+
+    Returns:
+        (str) : full path to the claimed job file in spool_dir/running, or None if no jobs are waiting
+    '''
+    import socket
+    from datetime import datetime
+    incoming_dir = os.path.join(spool_dir, 'incoming')
+    job_fnames = [fname for fname in os.listdir(incoming_dir) if fname.endswith('.json')]
+    for job_fname in sorted(job_fnames):
+        running_fname = os.path.join(spool_dir, 'running', job_fname)
+        try:
+            os.rename(os.path.join(incoming_dir, job_fname), running_fname)
+        except FileNotFoundError:
+            # Claimed by another worker
+            continue
+        write_json_atomic({'host': socket.gethostname(), 'pid': os.getpid(), 'claimed': datetime.utcnow()},
+                          running_fname + CLAIM_SUFFIX)
+        return running_fname
+    return None
+
+
+def is_pid_running(pid):
+    ''' Return True if process pid exists on this host '''
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    return True
+
+
+def requeue_stale_jobs(spool_dir):
+    ''' Move jobs claimed by workers that are no longer running back to spool_dir/incoming
+
+    A claim is stale if it was made on this host by a pid that no longer exists, or if the job has had no claim
+    file for UNRECORDED_CLAIM_SECONDS.  Claims made on other hosts can not be checked, and are left in place.
+
+    Returns:
+        (list) : full paths to the requeued job files in spool_dir/incoming
+    '''
+    import time
+    import socket
+    running_dir = os.path.join(spool_dir, 'running')
+    hostname = socket.gethostname()
+    requeued = []
+    for job_fname in sorted(os.listdir(running_dir)):
+        if not job_fname.endswith('.json'):
+            continue
+        running_fname = os.path.join(running_dir, job_fname)
+        claim_fname = running_fname + CLAIM_SUFFIX
+        try:
+            with open(claim_fname) as fobj:
+                claim = json.load(fobj)
+            if claim['host'] != hostname or is_pid_running(claim['pid']):
+                continue
+            LOG.warning('REQUEUE %s, claimed by pid %s which is no longer running', job_fname, claim['pid'])
+        except FileNotFoundError:
+            try:
+                # rename updates the inode change time, so ctime is the time the job was claimed
+                if time.time() - os.stat(running_fname).st_ctime < UNRECORDED_CLAIM_SECONDS:
+                    continue
+            except FileNotFoundError:
+                # Finished in the meantime
+                continue
+            LOG.warning('REQUEUE %s, no claim recorded for %s seconds', job_fname, UNRECORDED_CLAIM_SECONDS)
+        except (ValueError, KeyError) as resp:
+            LOG.warning('Unreadable claim file %s, not requeueing: %s', claim_fname, resp)
+            continue
+        incoming_fname = os.path.join(spool_dir, 'incoming', job_fname)
+        try:
+            os.rename(running_fname, incoming_fname)
+        except FileNotFoundError:
+            # Requeued by another worker
+            continue
+        if os.path.exists(claim_fname):
+            os.remove(claim_fname)
+        requeued += [incoming_fname]
+    return requeued
+
+
+def get_job_command_line_args(job):
+    ''' Return the complete procflow argument dictionary for job, filling unspecified arguments with defaults
+
+    Args:
+        job (dict) : job dictionary, as written by submit_job
+
+    Returns:
+        (dict) : command line arguments dictionary, as produced by get_command_line_args
+
+    Raises:
+        (ValueError) : job contains unknown arguments, or does not specify the procflow
+    '''
+    from geoips2.commandline.args import get_default_command_line_args, check_command_line_args
+    command_line_args = get_default_command_line_args()
+    unknown_args = set(job.keys()) - set(command_line_args.keys())
+    if unknown_args:
+        raise ValueError('Unknown procflow job arguments {0}'.format(sorted(unknown_args)))
+    command_line_args.update(job)
+    if not command_line_args['procflow']:
+        raise ValueError('Procflow job must specify "procflow"')
+    command_line_args['filenames'] = [os.path.abspath(fname) for fname in command_line_args['filenames'] or []]
+    check_command_line_args(['filenames', 'procflow'], command_line_args)
+    return command_line_args
+
+
+def get_cached_procflow(procflow_name):
+    ''' Return the procflow function procflow_name, resolving the entry point only once per worker '''
+    if procflow_name not in PROCFLOW_CACHE:
+        from geoips2.dev.procflow import get_procflow
+        PROCFLOW_CACHE[procflow_name] = get_procflow(procflow_name)
+    return PROCFLOW_CACHE[procflow_name]
+
+
+def get_exit_status(resp):
+    ''' Return the process exit status equivalent to exception resp raised from a job
+
+    sys.exit() and sys.exit(0) are clean exits (0), sys.exit(<int>) exits with that status, and any other
+    exception (including sys.exit(<message>)) is a failure (1).
+    '''
+    if isinstance(resp, SystemExit):
+        if resp.code is None:
+            return 0
+        if isinstance(resp.code, int):
+            return resp.code
+    return 1
+
+
+def run_job(job_fname):
+    ''' Run the procflow job in job_fname, isolating any failure to this job
+
+    Args:
+        job_fname (str) : full path to the claimed job file
+
+    Returns:
+        (dict) : job result, with status ('done' or 'failed'), exit_status, outputs, error, and timing
+    '''
+    import traceback
+    from datetime import datetime
+    from geoips2.commandline.run_procflow import log_procflow_results
+    start_datetime = datetime.utcnow()
+    result = {'job': os.path.basename(job_fname), 'start': start_datetime, 'outputs': [], 'error': None}
+    try:
+        with open(job_fname) as fobj:
+            command_line_args = get_job_command_line_args(json.load(fobj))
+        LOG.info('PROCFLOWJOB %s %s', result['job'], command_line_args)
+        procflow = get_cached_procflow(command_line_args['procflow'])
+        if not procflow:
+            raise IOError('FAILED no geoips2*/{0}.py with def {0}'.format(command_line_args['procflow']))
+        retval = procflow(command_line_args['filenames'], command_line_args)
+        result['exit_status'] = log_procflow_results(retval, command_line_args, start_datetime)
+        if isinstance(retval, list):
+            result['outputs'] = retval
+        result['status'] = 'done' if result['exit_status'] == 0 else 'failed'
+    # SystemExit included, since some procflows and readers exit on unrecoverable errors
+    except (Exception, SystemExit) as resp:
+        exit_status = get_exit_status(resp)
+        # Close out the job's stage profile, so the next job starts a fresh one
+        from geoips2.profiler import stop_profiler
+        if exit_status == 0:
+            LOG.info('PROCFLOWJOB %s exited cleanly', result['job'])
+            stop_profiler()
+            result['status'] = 'done'
+        else:
+            LOG.exception('PROCFLOWJOBFAILED %s', result['job'])
+            stop_profiler(status='failed')
+            result['status'] = 'failed'
+            result['error'] = ''.join(traceback.format_exception_only(type(resp), resp)).strip()
+        result['exit_status'] = exit_status
+    finally:
+        if 'matplotlib.pyplot' in sys.modules:
+            # Never carry open figures from one job to the next
+            sys.modules['matplotlib.pyplot'].close('all')
+    result['end'] = datetime.utcnow()
+    result['total_time'] = (result['end'] - start_datetime).total_seconds()
+    return result
+
+
+def finish_job(spool_dir, job_fname, result):
+    ''' Move job_fname to spool_dir/<status>, and write the job result alongside it '''
+    job_id = os.path.splitext(os.path.basename(job_fname))[0]
+    status_dir = os.path.join(spool_dir, result['status'])
+    write_json_atomic(result, os.path.join(status_dir, '{0}.result.json'.format(job_id)))
+    os.replace(job_fname, os.path.join(status_dir, os.path.basename(job_fname)))
+    if os.path.exists(job_fname + CLAIM_SUFFIX):
+        os.remove(job_fname + CLAIM_SUFFIX)
+    LOG.info('PROCFLOWJOB%s %s %s products, total time %s seconds',
+             result['status'].upper(), job_id, len(result['outputs']), result['total_time'])
+
+
+def preload_modules(module_names=None):
+    ''' Import module_names once at startup, skipping any that are not installed '''
+    from importlib import import_module
+    if module_names is None:
+        module_names = PRELOAD_MODULES
+    import matplotlib
+    matplotlib.use('agg')
+    for module_name in module_names:
+        try:
+            import_module(module_name)
+        except ImportError as resp:
+            LOG.info('Not preloading %s: %s', module_name, resp)
+
+
+def run_worker(spool_dir, poll_interval=1.0, max_jobs=None, idle_timeout=None):
+    ''' Process jobs from spool_dir until max_jobs have run, or no job has arrived for idle_timeout seconds
+
+    Args:
+        spool_dir (str) : spool directory containing incoming, running, done and failed subdirectories
+        poll_interval (float) : DEFAULT 1.0, seconds to wait between checks for new jobs
+        max_jobs (int) : DEFAULT None, exit after this many jobs, if None run indefinitely
+        idle_timeout (float) : DEFAULT None, exit after this many seconds with no jobs, if None wait indefinitely
+
+    Returns:
+        (int) : number of failed jobs
+    '''
+    import time
+    setup_spool_dir(spool_dir)
+    for requeued_fname in requeue_stale_jobs(spool_dir):
+        LOG.info('Requeued stale procflow job %s', requeued_fname)
+    num_jobs = 0
+    num_failed = 0
+    idle_start = time.time()
+    while max_jobs is None or num_jobs < max_jobs:
+        job_fname = claim_next_job(spool_dir)
+        if job_fname is None:
+            if idle_timeout is not None and time.time() - idle_start > idle_timeout:
+                LOG.info('No procflow jobs for %s seconds, exiting', idle_timeout)
+                break
+            time.sleep(poll_interval)
+            continue
+        result = run_job(job_fname)
+        finish_job(spool_dir, job_fname, result)
+        num_jobs += 1
+        if result['status'] != 'done':
+            num_failed += 1
+        idle_start = time.time()
+    LOG.info('Procflow worker processed %s jobs, %s failed', num_jobs, num_failed)
+    return num_failed
+
+
+def main():
+    ''' Start a resident procflow worker on the requested spool directory '''
+    import argparse
+    from geoips2.commandline.log_setup import setup_logging
+    setup_logging()
+    parser = argparse.ArgumentParser(description='Resident procflow worker, processing jobs from a spool directory')
+    parser.add_argument('--spool_dir', default=gpaths['PROCFLOW_SPOOL_PATH'],
+                        help='''Spool directory, containing incoming/running/done/failed job subdirectories''')
+    parser.add_argument('--poll_interval', default=1.0, type=float,
+                        help='''Seconds to wait between checks for new jobs''')
+    parser.add_argument('--max_jobs', default=None, type=int,
+                        help='''Exit after processing this many jobs (allows periodic worker recycling)''')
+    parser.add_argument('--idle_timeout', default=None, type=float,
+                        help='''Exit after this many seconds with no new jobs''')
+    args = parser.parse_args()
+    LOG.info('Starting procflow worker on %s', args.spool_dir)
+    preload_modules()
+    run_worker(args.spool_dir, poll_interval=args.poll_interval, max_jobs=args.max_jobs,
+               idle_timeout=args.idle_timeout)
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,752 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Self contained synthetic data benchmarks for reading, sectoring, interpolation, algorithms, outputs and procflows.
+
+    No real data files are required - a synthetic AMSR2-like swath (89 GHz brightness temperatures with standard
+    geoips2 latitude, longitude and timestamp variables and attributes) and a matching static sector are generated
+    at each requested size, with the same geographic footprint and proportionally more pixels as the size increases.
+    The swath is written as a geoips2 netcdf, so the reader and full procflow benchmarks run the geoips2_netcdf reader
+    and the single_source procflow exactly as for real preprocessed data.  A synthetic ABI Level 1b mesoscale
+    10.3um radiance file (NOAA netcdf layout, fixed grid scan angles, Planck coefficients and projection attributes)
+    over the same region is read with the abi_netcdf reader.  The other instrument readers are not benchmarked.
+    The boundaries benchmarks compare drawing
+    cartopy's Natural Earth features against the cached geometry in geoips2.image_utils.boundary_geometry, and need
+    the Natural Earth shapefiles in the cartopy data directory.
+
+    Each benchmark is timed --repeat times at each size, and the fastest wall time recorded.  Results are written
+    as a JSON report in the same format as geoips2.profiler reports, with one span per benchmark and size
+    (ie, 'benchmarks/interp_kd_tree_gauss[large]'), so a run can be compared against a stored baseline:
+
+        run_benchmarks --sizes small medium --repeat 3 --report new.json --baseline old.json
+
+    Returns non-zero if any benchmark failed, or if any benchmark regressed by more than --threshold relative to
+    --baseline.
+'''
+import os
+import sys
+import logging
+from functools import partial
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+# Synthetic data mimic AMSR2 89 GHz, so the product, colormap, and interpolation configuration is used as is
+SOURCE_NAME = 'amsr2'
+PLATFORM_NAME = 'gcom-w1'
+PRODUCT_NAME = '89H'
+VARIABLE = 'tb89hA'
+
+# Swath lines and samples, and area_def pixels along each side, at size scale 1
+BASE_SWATH_SHAPE = (400, 243)
+BASE_AREA_PIXELS = 400
+# Swath footprint, km along track and across track, and sector footprint, km along each side
+SWATH_EXTENT_KM = (2000.0, 1450.0)
+AREA_EXTENT_KM = 1200.0
+CENTER_LAT = 15.0
+CENTER_LON = 140.0
+
+# Synthetic ABI mesoscale 10.3um file - nadir resolution in km and footprint in km along each side at size scale 1,
+# with the sub-satellite point at CENTER_LON
+ABI_BAND = 13
+ABI_RES_KM = 4.0
+ABI_EXTENT_KM = 1500.0
+ABI_PLATFORM_ID = 'G17'
+ABI_PLANCK = {'planck_fk1': 10803.3, 'planck_fk2': 1392.74, 'planck_bc1': 0.0755, 'planck_bc2': 0.99975}
+ABI_PROJECTION = {'semi_major_axis': 6378137.0, 'semi_minor_axis': 6356752.31414,
+                  'inverse_flattening': 298.2572221, 'perspective_point_height': 35786023.0,
+                  'latitude_of_projection_origin': 0.0, 'longitude_of_projection_origin': CENTER_LON}
+
+# Number of pixels scales with the square of the size scale
+BENCHMARK_SIZES = {'small': 1, 'medium': 2, 'large': 4}
+
+# Environment variables overriding output locations (see geoips2.filenames.base_paths), removed for the procflow
+# benchmark so every output is written under the benchmark work_dir
+OUTPUT_PATH_VARIABLES = ['ANNOTATED_IMAGERY_PATH', 'CLEAN_IMAGERY_PATH', 'FINAL_DATA_PATH', 'PRESECTORED_DATA_PATH',
+                         'PREREAD_DATA_PATH', 'PREREGISTERED_DATA_PATH', 'PRECALCULATED_DATA_PATH', 'TCWWW',
+                         'PUBLICWWW', 'PRIVATEWWW', 'PRODUCT_INDEX_DB', 'RESULT_CACHE_DB']
+
+OUTPUT_FORMATS = ['imagery_clean', 'imagery_annotated', 'geotiff_standard', 'netcdf_geoips', 'netcdf_xarray']
+
+
+def make_synthetic_swath(scale, start_datetime):
+    ''' Return a synthetic AMSR2-like swath xarray Dataset following the geoips2 xarray standards
+
+    Args:
+        scale (int) : size scale, the swath has scale**2 times the pixels of BASE_SWATH_SHAPE over the same footprint
+        start_datetime (datetime) : time of the first scan line
+
+    Returns:
+        (xarray.Dataset) : Dataset containing latitude, longitude, timestamp, and VARIABLE
+    '''
+    import numpy
+    import xarray
+    from datetime import timedelta
+    num_lines, num_samples = BASE_SWATH_SHAPE[0] * scale, BASE_SWATH_SHAPE[1] * scale
+    along_km = numpy.linspace(-SWATH_EXTENT_KM[0] / 2.0, SWATH_EXTENT_KM[0] / 2.0, num_lines)[:, None]
+    across_km = numpy.linspace(-SWATH_EXTENT_KM[1] / 2.0, SWATH_EXTENT_KM[1] / 2.0, num_samples)[None, :]
+    # Slightly inclined ascending pass
+    lats = CENTER_LAT + (along_km + 0.1 * across_km) / 111.0
+    lons = CENTER_LON + (across_km - 0.2 * along_km) / (111.0 * numpy.cos(numpy.radians(lats)))
+
+    # Smooth large scale structure plus repeatable noise, with a scattering "storm" near the center
+    rng = numpy.random.RandomState(42)
+    dist = numpy.hypot(along_km, across_km)
+    tbs = 270.0 + 15.0 * numpy.sin(lats / 3.0) * numpy.cos(lons / 4.0) - 120.0 * numpy.exp(-(dist / 300.0)**2)
+    tbs += rng.normal(0.0, 2.0, tbs.shape)
+
+    scan_seconds = numpy.linspace(0, 300, num_lines)
+    timestamps = numpy.array([start_datetime + timedelta(seconds=float(sec)) for sec in scan_seconds],
+                             dtype='datetime64[ns]')
+
+    xobj = xarray.Dataset()
+    xobj['latitude'] = xarray.DataArray(lats.astype(numpy.float32), dims=['dim_0', 'dim_1'])
+    xobj['longitude'] = xarray.DataArray(lons.astype(numpy.float32), dims=['dim_0', 'dim_1'])
+    xobj['timestamp'] = xarray.DataArray(numpy.repeat(timestamps[:, None], num_samples, axis=1),
+                                         dims=['dim_0', 'dim_1'])
+    xobj[VARIABLE] = xarray.DataArray(tbs.astype(numpy.float32), dims=['dim_0', 'dim_1'])
+    xobj.attrs['source_name'] = SOURCE_NAME
+    xobj.attrs['platform_name'] = PLATFORM_NAME
+    xobj.attrs['data_provider'] = 'synthetic'
+    xobj.attrs['start_datetime'] = start_datetime
+    xobj.attrs['end_datetime'] = start_datetime + timedelta(seconds=300)
+    xobj.attrs['interpolation_radius_of_influence'] = 15000.0 / scale
+    xobj.attrs['minimum_coverage'] = 0
+    return xobj
+
+
+def write_synthetic_abi_netcdf(scale, start_datetime, out_dir):
+    ''' Write a synthetic ABI Level 1b mesoscale radiance file, readable by the abi_netcdf reader
+
+    The file has ABI_EXTENT_KM footprint centered on CENTER_LAT, CENTER_LON, at ABI_RES_KM / scale nadir
+    resolution, with brightness temperatures converted to radiances using ABI_PLANCK.
+
+    Args:
+        scale (int) : size scale, the file has scale**2 times the pixels over the same footprint
+        start_datetime (datetime) : scan start time
+        out_dir (str) : directory for the file, named following the NOAA ABI filename convention
+
+    Returns:
+        (str) : full path to the synthetic ABI file
+    '''
+    import numpy
+    import netCDF4
+    from datetime import datetime, timedelta
+    from pyproj import Proj
+    res_km = ABI_RES_KM / scale
+    height = ABI_PROJECTION['perspective_point_height']
+    geos = Proj(proj='geos', h=height, lon_0=ABI_PROJECTION['longitude_of_projection_origin'], sweep='x',
+                a=ABI_PROJECTION['semi_major_axis'], b=ABI_PROJECTION['semi_minor_axis'])
+    center_x, center_y = geos(CENTER_LON, CENTER_LAT)
+    # Fixed grid scan angles in radians - x increases to the east, y decreases to the south
+    num_pixels = int(ABI_EXTENT_KM / res_km)
+    offsets = (numpy.arange(num_pixels) - (num_pixels - 1) / 2.0) * res_km * 1000.0
+    x_rad = (center_x + offsets) / height
+    y_rad = (center_y - offsets) / height
+
+    # Smooth large scale structure plus repeatable noise, with a cold "storm" near the center
+    rng = numpy.random.RandomState(42)
+    dist = numpy.hypot(offsets[:, None], offsets[None, :]) / 1000.0
+    bts = 285.0 + 10.0 * numpy.sin(offsets[:, None] / 2.0e5) * numpy.cos(offsets[None, :] / 3.0e5)
+    bts -= 90.0 * numpy.exp(-(dist / 250.0)**2)
+    bts += rng.normal(0.0, 1.0, bts.shape)
+    rads = ABI_PLANCK['planck_fk1'] / (numpy.exp(ABI_PLANCK['planck_fk2'] /
+                                                 (ABI_PLANCK['planck_bc1'] + ABI_PLANCK['planck_bc2'] * bts)) - 1.0)
+
+    end_datetime = start_datetime + timedelta(seconds=60)
+    time_fmt = '%Y%j%H%M%S'
+    fname = 'OR_ABI-L1b-RadM1-M6C{0:02d}_{1}_s{2}0_e{3}0_c{3}0.nc'.format(ABI_BAND, ABI_PLATFORM_ID,
+                                                                           start_datetime.strftime(time_fmt),
+                                                                           end_datetime.strftime(time_fmt))
+    out_fname = os.path.join(out_dir, fname)
+    if os.path.exists(out_fname):
+        os.remove(out_fname)
+    epoch = datetime(2000, 1, 1, 12, 0, 0)
+    with netCDF4.Dataset(out_fname, 'w') as ncobj:
+        # The reader requires every global attribute present in real files
+        ncobj.setncatts({'dataset_name': fname,
+                         'naming_authority': 'gov.nesdis.noaa',
+                         'instrument_ID': 'FM2',
+                         'institution': 'synthetic',
+                         'project': 'GOES',
+                         'iso_series_metadata_id': 'synthetic',
+                         'Conventions': 'CF-1.7',
+                         'Metadata_Conventions': 'Unidata Dataset Discovery v1.0',
+                         'keywords_vocabulary': 'NASA Global Change Master Directory (GCMD) Earth Science Keywords',
+                         'standard_name_vocabulary': 'CF Standard Name Table (v35, 20 February 2017)',
+                         'title': 'Synthetic ABI L1b Radiances',
+                         'summary': 'Synthetic ABI L1b Radiances for geoips2 benchmarks',
+                         'license': 'Unclassified data.  Access is restricted to approved users only.',
+                         'keywords': 'SPECTRAL/ENGINEERING > INFRARED WAVELENGTHS > INFRARED RADIANCE',
+                         'cdm_data_type': 'Image',
+                         'orbital_slot': 'synthetic',
+                         'processing_level': 'L1b',
+                         'date_created': end_datetime.strftime('%Y-%m-%dT%H:%M:%S.0Z'),
+                         'production_site': 'synthetic',
+                         'production_environment': 'OE',
+                         'production_data_source': 'Realtime',
+                         'platform_ID': ABI_PLATFORM_ID,
+                         'instrument_type': 'GOES R Series Advanced Baseline Imager',
+                         'timeline_id': 'ABI Mode 6',
+                         'scene_id': 'Mesoscale',
+                         'spatial_resolution': '{0:g}km at nadir'.format(res_km),
+                         'time_coverage_start': start_datetime.strftime('%Y-%m-%dT%H:%M:%S.0Z'),
+                         'time_coverage_end': end_datetime.strftime('%Y-%m-%dT%H:%M:%S.0Z')})
+        ncobj.createDimension('y', num_pixels)
+        ncobj.createDimension('x', num_pixels)
+        ncobj.createDimension('band', 1)
+        ncobj.createDimension('number_of_time_bounds', 2)
+        ncobj.createVariable('Rad', 'f4', ('y', 'x'), zlib=True)[:] = rads
+        ncobj.createVariable('DQF', 'u1', ('y', 'x'), zlib=True)[:] = 0
+        ncobj.createVariable('x', 'f8', ('x',))[:] = x_rad
+        ncobj.createVariable('y', 'f8', ('y',))[:] = y_rad
+        ncobj.createVariable('band_id', 'i1', ('band',))[:] = ABI_BAND
+        ncobj.createVariable('time_bounds', 'f8', ('number_of_time_bounds',))[:] = \
+            [(start_datetime - epoch).total_seconds(), (end_datetime - epoch).total_seconds()]
+        ncobj.createVariable('kappa0', 'f4')[...] = -1.0
+        for varname, value in ABI_PLANCK.items():
+            ncobj.createVariable(varname, 'f4')[...] = value
+        proj_var = ncobj.createVariable('goes_imager_projection', 'i4')
+        proj_var.setncatts(ABI_PROJECTION)
+        proj_var.grid_mapping_name = 'geostationary'
+        proj_var.sweep_angle_axis = 'x'
+        extent_var = ncobj.createVariable('geospatial_lat_lon_extent', 'f4')
+        extent_var.setncatts({'geospatial_lat_center': CENTER_LAT, 'geospatial_lon_center': CENTER_LON,
+                              'geospatial_lat_nadir': 0.0,
+                              'geospatial_lon_nadir': ABI_PROJECTION['longitude_of_projection_origin']})
+    return out_fname
+
+
+def write_synthetic_sectorfile(scale, out_fname):
+    ''' Write a static sector YAML file covering the center of the synthetic swath
+
+    Returns:
+        (str) : sector name within out_fname
+    '''
+    import yaml
+    sector_name = 'benchmark{0}x'.format(scale)
+    half_width_m = AREA_EXTENT_KM * 1000.0 / 2.0
+    num_pixels = BASE_AREA_PIXELS * scale
+    resolution = AREA_EXTENT_KM * 1000.0 / num_pixels
+    sector_dict = {sector_name: {'description': 'Synthetic benchmark sector, scale {0}'.format(scale),
+                                 'projection': {'a': 6371228.0, 'lat_0': CENTER_LAT, 'lon_0': CENTER_LON,
+                                                'proj': 'eqc', 'units': 'm'},
+                                 'resolution': [resolution, resolution],
+                                 'sector_info': {'continent': 'x', 'country': 'x', 'area': 'benchmark',
+                                                 'subarea': 'x', 'state': 'x', 'city': 'x'},
+                                 'sector_type': 'static',
+                                 'shape': {'height': num_pixels, 'width': num_pixels},
+                                 'area_extent': {'lower_left_xy': [-half_width_m, -half_width_m],
+                                                 'upper_right_xy': [half_width_m, half_width_m]}}}
+    with open(out_fname, 'w') as fobj:
+        yaml.safe_dump(sector_dict, fobj, default_flow_style=False)
+    return sector_name
+
+
+def setup_benchmark_inputs(scale, work_dir):
+    ''' Generate and write the synthetic inputs for size scale
+
+    Args:
+        scale (int) : size scale
+        work_dir (str) : directory for synthetic data files and benchmark outputs
+
+    Returns:
+        (dict) : benchmark inputs - swath, data_fname, sectorfile, sector_name, area_def, work_dir, scale
+    '''
+    from datetime import datetime
+    from geoips2.filenames.base_paths import make_dirs
+    from geoips2.sector_utils.utils import get_sectors_from_yamls
+    from geoips2.interface_modules.output_formats.netcdf_xarray import write_xarray_netcdf
+    make_dirs(work_dir)
+    swath = make_synthetic_swath(scale, datetime(2020, 1, 1, 12, 0, 0))
+    data_fname = os.path.join(work_dir, 'synthetic_{0}_scale{1}.nc'.format(SOURCE_NAME, scale))
+    write_xarray_netcdf(swath, data_fname, clobber=True)
+    sectorfile = os.path.join(work_dir, 'synthetic_sectors_scale{0}.yaml'.format(scale))
+    sector_name = write_synthetic_sectorfile(scale, sectorfile)
+    area_def = get_sectors_from_yamls([sectorfile], [sector_name])[0]
+    LOG.info('Synthetic inputs scale %s: swath %s, area_def %s', scale, swath[VARIABLE].shape, area_def.shape)
+    return {'swath': swath, 'data_fname': data_fname, 'sectorfile': sectorfile, 'sector_name': sector_name,
+            'area_def': area_def, 'work_dir': work_dir, 'scale': scale}
+
+
+def get_sectored_swath(inputs):
+    ''' Return the synthetic swath sectored to the benchmark area_def, computing it only once per size '''
+    if 'sect_xarray' not in inputs:
+        from geoips2.xarray_utils.data import sector_xarrays
+        sect_xarrays = sector_xarrays({'swath': inputs['swath']}, inputs['area_def'], varlist=[VARIABLE], drop=True)
+        inputs['sect_xarray'] = sect_xarrays['swath']
+    return inputs['sect_xarray']
+
+
+def get_alg_xarray_for_outputs(inputs):
+    ''' Return the registered 89H product, computing it only once per size '''
+    if 'alg_xarray' not in inputs:
+        from geoips2.interface_modules.procflows.single_source import get_alg_xarray
+        inputs['alg_xarray'] = get_alg_xarray({'swath': get_sectored_swath(inputs)}, inputs['area_def'],
+                                              PRODUCT_NAME)
+    return inputs['alg_xarray']
+
+
+def bench_read_geoips2_netcdf(inputs):
+    ''' Read the synthetic swath file, windowed to the benchmark area_def, and load the data '''
+    from geoips2.stable.reader import get_reader
+    reader = get_reader('geoips2_netcdf')
+    xobjs = reader([inputs['data_fname']], chans=[VARIABLE], area_def=inputs['area_def'])
+    for xobj in xobjs.values():
+        xobj.load()
+
+
+def get_abi_fname(inputs):
+    ''' Return the synthetic ABI file for the benchmark size, writing it only once per size '''
+    if 'abi_fname' not in inputs:
+        from datetime import datetime
+        inputs['abi_fname'] = write_synthetic_abi_netcdf(inputs['scale'], datetime(2020, 1, 1, 12, 0, 0),
+                                                         inputs['work_dir'])
+    return inputs['abi_fname']
+
+
+def bench_read_abi_netcdf(inputs):
+    ''' Read the synthetic ABI 10.3um brightness temperatures for the benchmark area_def
+
+    Run in a child process (see run_in_child_process), so the cached ABI geolocation files are written under the
+    benchmark work_dir.  The geolocation files are created on the first run, so the fastest run measures the
+    steady state read with cached geolocation.
+    '''
+    reader_args = {'reader_name': 'abi_netcdf',
+                   'fnames': [get_abi_fname(inputs)],
+                   'chans': ['B{0:02d}BT'.format(ABI_BAND)],
+                   'sectorfile': inputs['sectorfile'],
+                   'sector_name': inputs['sector_name']}
+    return run_in_child_process('measure_reader', reader_args, inputs['work_dir'])
+
+
+def bench_sector_xarrays(inputs):
+    ''' Sector the full synthetic swath to the benchmark area_def '''
+    from geoips2.xarray_utils.data import sector_xarrays
+    sector_xarrays({'swath': inputs['swath']}, inputs['area_def'], varlist=[VARIABLE], drop=True)
+
+
+def run_interp_kd_tree(inputs, interp_type, sigmas=None):
+    ''' Interpolate the sectored synthetic swath to the benchmark area_def with interp_kd_tree '''
+    from geoips2.interface_modules.interpolation.utils.interp_pyresample import interp_kd_tree
+    from geoips2.interface_modules.interpolation.utils.interp_pyresample import get_data_box_definition
+    sect_xarray = get_sectored_swath(inputs)
+    data_box_definition = get_data_box_definition(SOURCE_NAME, sect_xarray['longitude'].to_masked_array(),
+                                                  sect_xarray['latitude'].to_masked_array())
+    return interp_kd_tree([sect_xarray[VARIABLE].to_masked_array()], inputs['area_def'], data_box_definition,
+                          float(sect_xarray.interpolation_radius_of_influence), interp_type=interp_type,
+                          sigmas=sigmas)
+
+
+def bench_interp_kd_tree_nearest(inputs):
+    ''' Nearest neighbor kd_tree interpolation '''
+    run_interp_kd_tree(inputs, 'nearest')
+
+
+def bench_interp_kd_tree_gauss(inputs):
+    ''' Gaussian weighted kd_tree interpolation, as used by the 89H product '''
+    run_interp_kd_tree(inputs, 'gauss', sigmas=10000)
+
+
+def bench_interp_griddata(inputs):
+    ''' scipy.interpolate.griddata linear interpolation to a regular lat/lon grid covering the area_def '''
+    from geoips2.interface_modules.interpolation.utils.interp_scipy import interp_griddata
+    sect_xarray = get_sectored_swath(inputs)
+    area_def = inputs['area_def']
+    minlon, minlat, maxlon, maxlat = area_def.area_extent_ll
+    interp_griddata(sect_xarray[VARIABLE].to_masked_array(),
+                    sect_xarray['longitude'].to_masked_array(),
+                    sect_xarray['latitude'].to_masked_array(),
+                    minlon, maxlon, minlat, maxlat,
+                    area_def.shape[1], area_def.shape[0],
+                    'linear')
+
+
+def bench_apply_data_range(inputs):
+    ''' Crop and normalize the interpolated data, as the single_channel algorithm does '''
+    from geoips2.data_manipulations.corrections import apply_data_range
+    if 'interp_data' not in inputs:
+        inputs['interp_data'] = run_interp_kd_tree(inputs, 'nearest')[0]
+    apply_data_range(inputs['interp_data'].copy(), min_val=105, max_val=305, min_outbounds='crop',
+                     max_outbounds='crop', norm=True, inverse=False)
+
+
+def bench_get_alg_xarray(inputs):
+    ''' Interpolation and algorithm for the 89H product, as run within the procflows '''
+    from geoips2.interface_modules.procflows.single_source import get_alg_xarray
+    get_alg_xarray({'swath': get_sectored_swath(inputs)}, inputs['area_def'], PRODUCT_NAME)
+
+
+def run_output_format(inputs, output_format):
+    ''' Produce output_format for the registered 89H product, written within the benchmark work directory '''
+    from geoips2.interface_modules.procflows.overlay import plot_data
+    from geoips2.dev.output import get_outputter_type
+    alg_xarray = get_alg_xarray_for_outputs(inputs)
+    extension = '.nc' if get_outputter_type(output_format) == 'xarray_data' else '.png'
+    if output_format == 'geotiff_standard':
+        extension = '.tif'
+    out_fname = os.path.join(inputs['work_dir'], 'outputs', '{0}_{1}{2}'.format(inputs['sector_name'],
+                                                                               output_format,
+                                                                               extension))
+    from geoips2.filenames.base_paths import make_dirs
+    make_dirs(os.path.dirname(out_fname))
+    if os.path.exists(out_fname):
+        os.remove(out_fname)
+    plot_data(alg_xarray, inputs['area_def'], output_format, PRODUCT_NAME, [out_fname])
+
+
+def run_draw_boundaries(inputs, cached):
+    ''' Draw coastlines, countries, states and rivers over the benchmark area_def, and render the figure
+
+    Cartopy only projects its Natural Earth features when the figure is rendered, so the canvas draw is included.
+
+    Args:
+        inputs (dict) : benchmark inputs, from setup_benchmark_inputs
+        cached (bool) : if True, draw from geoips2.image_utils.boundary_geometry, otherwise cartopy features
+    '''
+    import matplotlib.pyplot as plt
+    from geoips2.image_utils.maps import set_boundaries_info_dict, draw_boundaries
+    from geoips2.image_utils.mpl_utils import create_figure_and_main_ax_and_mapobj
+    area_def = inputs['area_def']
+    fig, main_ax, mapobj = create_figure_and_main_ax_and_mapobj(area_def.x_size, area_def.y_size, area_def,
+                                                                noborder=True)
+    draw_boundaries(mapobj, main_ax, set_boundaries_info_dict(None), area_def=area_def if cached else None)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def bench_boundaries_cartopy(inputs):
+    ''' Boundaries drawn with cartopy features, projected from the global geometries on every draw
+
+    Cartopy also caches the Natural Earth and projected geometries within the process - cleared first, so each run
+    measures what every new procflow process pays.
+    '''
+    import cartopy.feature
+    from cartopy.mpl.feature_artist import FeatureArtist
+    for cache_obj, cache_name in [(cartopy.feature, '_NATURAL_EARTH_GEOM_CACHE'),
+                                  (FeatureArtist, '_geom_key_to_geometry_cache'),
+                                  (FeatureArtist, '_geom_key_to_path_cache')]:
+        if hasattr(cache_obj, cache_name):
+            getattr(cache_obj, cache_name).clear()
+    run_draw_boundaries(inputs, cached=False)
+
+
+def bench_boundaries_compute(inputs):
+    ''' First time computation of the pre-projected, pre-clipped boundary geometry for the benchmark area_def '''
+    from geoips2.image_utils import boundary_geometry
+    area_def = inputs['area_def']
+    mapobj = area_def.to_cartopy_crs()
+    proj4_params = dict(mapobj.proj4_params) or dict(area_def.proj_dict)
+    extent = tuple(float(val) for val in mapobj.bounds)
+    resolution = boundary_geometry.get_boundary_resolution(area_def)
+    lonlat_bounds = boundary_geometry.get_padded_lonlat_bounds(area_def)
+    for feature_name in boundary_geometry.BOUNDARY_FEATURES:
+        boundary_geometry.compute_boundary_geometry(proj4_params, extent, resolution, feature_name,
+                                                    lonlat_bounds=lonlat_bounds)
+
+
+def bench_boundaries_cached(inputs):
+    ''' Boundaries drawn from the boundary geometry cache files, as in every procflow process after the first
+
+    The in memory cache is cleared first, so the geometry is read from disk as a new process would.
+    '''
+    from geoips2.image_utils import boundary_geometry
+    boundary_geometry.BOUNDARY_GEOMETRY_CACHE.clear()
+    run_draw_boundaries(inputs, cached=True)
+
+
+def measure_single_source(procflow_args):
+    ''' Run the single_source procflow in this process, returning the resource usage of the procflow call
+
+    Run in a child process by bench_single_source, so outputs are written under the benchmark work_dir.
+
+    Args:
+        procflow_args (dict) : procflow arguments, all other arguments take their command line defaults
+
+    Returns:
+        (dict) : wall_seconds, cpu_seconds, peak_rss_mb, bytes_read, bytes_written
+    '''
+    from geoips2.commandline.args import get_default_command_line_args
+    from geoips2.dev.procflow import get_procflow
+    from geoips2.profiler import get_resource_usage
+    command_line_args = get_default_command_line_args()
+    command_line_args.update(procflow_args)
+    procflow = get_procflow('single_source')
+    start = get_resource_usage()
+    retval = procflow(command_line_args['filenames'], command_line_args)
+    end = get_resource_usage()
+    if retval != 0:
+        raise ValueError('single_source procflow returned {0}'.format(retval))
+    return get_usage_difference(start, end)
+
+
+def measure_reader(reader_args):
+    ''' Read and load the requested files for the requested sector in this process, returning the resource usage
+
+    Run in a child process by bench_read_abi_netcdf.
+
+    Args:
+        reader_args (dict) : reader_name, fnames, chans, sectorfile and sector_name
+
+    Returns:
+        (dict) : wall_seconds, cpu_seconds, peak_rss_mb, bytes_read, bytes_written
+    '''
+    from geoips2.stable.reader import get_reader
+    from geoips2.profiler import get_resource_usage
+    from geoips2.sector_utils.utils import get_sectors_from_yamls
+    area_def = get_sectors_from_yamls([reader_args['sectorfile']], [reader_args['sector_name']])[0]
+    reader = get_reader(reader_args['reader_name'])
+    start = get_resource_usage()
+    xobjs = reader(reader_args['fnames'], chans=reader_args['chans'], area_def=area_def)
+    for xobj in xobjs.values():
+        xobj.load()
+    end = get_resource_usage()
+    if not [xobj for dsname, xobj in xobjs.items() if dsname != 'METADATA' and xobj.data_vars]:
+        raise ValueError('{0} returned no data for {1}'.format(reader_args['reader_name'], area_def.area_id))
+    return get_usage_difference(start, end)
+
+
+def get_usage_difference(start, end):
+    ''' Return the resource usage between two geoips2.profiler.get_resource_usage measurements
+
+    Returns:
+        (dict) : wall_seconds, cpu_seconds, peak_rss_mb, bytes_read, bytes_written
+    '''
+    usage = {'wall_seconds': end['wall'] - start['wall'],
+             'cpu_seconds': end['cpu'] - start['cpu'],
+             'peak_rss_mb': end['peak_rss_mb'],
+             'bytes_read': None,
+             'bytes_written': None}
+    for field in ['bytes_read', 'bytes_written']:
+        if start[field] is not None and end[field] is not None:
+            usage[field] = end[field] - start[field]
+    return usage
+
+
+def run_in_child_process(measure_func_name, measure_args, work_dir):
+    ''' Run measure_func_name(measure_args) from this module in a child python process, returning its measurements
+
+    Filename formats and cached geolocation take their output directories from PATHS at import time, so the child
+    process runs with GEOIPS_OUTDIRS set to work_dir/geoips_outdirs (and OUTPUT_PATH_VARIABLES overrides removed),
+    keeping synthetic products out of the real output trees.
+
+    Args:
+        measure_func_name (str) : name of the measurement function in this module, ie 'measure_single_source'
+        measure_args (dict) : JSON serializable arguments passed to the measurement function
+        work_dir (str) : benchmark work directory
+
+    Returns:
+        (dict) : measurements returned by the measurement function
+    '''
+    import json
+    import subprocess
+    env = dict(os.environ)
+    for varname in OUTPUT_PATH_VARIABLES:
+        env.pop(varname, None)
+    env['GEOIPS_OUTDIRS'] = os.path.join(work_dir, 'geoips_outdirs')
+    code = ('import sys, json\n'
+            'from geoips2.commandline.run_benchmarks import {0}\n'
+            'print(json.dumps({0}(json.loads(sys.argv[1]))))'.format(measure_func_name))
+    proc = subprocess.run([sys.executable, '-c', code, json.dumps(measure_args)], env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if proc.returncode != 0:
+        raise ValueError('{0} failed:\n{1}'.format(measure_func_name, proc.stderr[-2000:]))
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def bench_single_source(inputs):
+    ''' Full single_source procflow run (read, sector, interpolate, algorithm, imagery_clean output)
+
+    Run in a child process (see run_in_child_process), so the synthetic products are kept out of the real output
+    trees.  Only the procflow call itself is measured.
+    '''
+    procflow_args = {'filenames': [inputs['data_fname']],
+                     'procflow': 'single_source',
+                     'reader_name': 'geoips2_netcdf',
+                     'product_name': PRODUCT_NAME,
+                     'output_format': 'imagery_clean',
+                     'filename_format': 'geoips_fname',
+                     'sectorfiles': [inputs['sectorfile']],
+                     'sector_list': [inputs['sector_name']]}
+    return run_in_child_process('measure_single_source', procflow_args, inputs['work_dir'])
+
+
+BENCHMARKS = {'read_geoips2_netcdf': bench_read_geoips2_netcdf,
+              'read_abi_netcdf': bench_read_abi_netcdf,
+              'sector_xarrays': bench_sector_xarrays,
+              'interp_kd_tree_nearest': bench_interp_kd_tree_nearest,
+              'interp_kd_tree_gauss': bench_interp_kd_tree_gauss,
+              'interp_griddata': bench_interp_griddata,
+              'apply_data_range': bench_apply_data_range,
+              'get_alg_xarray': bench_get_alg_xarray,
+              'boundaries_cartopy': bench_boundaries_cartopy,
+              'boundaries_compute': bench_boundaries_compute,
+              'boundaries_cached': bench_boundaries_cached,
+              'procflow_single_source': bench_single_source}
+for _output_format in OUTPUT_FORMATS:
+    BENCHMARKS['output_{0}'.format(_output_format)] = partial(run_output_format, output_format=_output_format)
+
+
+def time_benchmark(bench_func, inputs, repeat):
+    ''' Run bench_func(inputs) repeat times, returning the measurements of the fastest run
+
+    If bench_func returns a dictionary of measurements (ie, from a child process), those are used in place of the
+    measurements around the call.
+
+    Returns:
+        (dict) : wall_seconds, cpu_seconds, bytes_read, bytes_written of the fastest run, peak_rss_mb after all runs,
+                 and the wall_seconds of every run
+    '''
+    from geoips2.profiler import get_resource_usage
+    best = None
+    all_wall_seconds = []
+    for _ in range(repeat):
+        start = get_resource_usage()
+        measured = bench_func(inputs)
+        end = get_resource_usage()
+        curr = {'wall_seconds': end['wall'] - start['wall'],
+                'cpu_seconds': end['cpu'] - start['cpu'],
+                'peak_rss_mb': end['peak_rss_mb'],
+                'bytes_read': None,
+                'bytes_written': None}
+        for field in ['bytes_read', 'bytes_written']:
+            if start[field] is not None and end[field] is not None:
+                curr[field] = end[field] - start[field]
+        if isinstance(measured, dict):
+            curr.update(measured)
+        all_wall_seconds += [curr['wall_seconds']]
+        if best is None or curr['wall_seconds'] < best['wall_seconds']:
+            best = curr
+    best['peak_rss_mb'] = curr['peak_rss_mb']
+    best['all_wall_seconds'] = all_wall_seconds
+    return best
+
+
+def run_benchmarks(sizes=None, benchmark_names=None, repeat=3, work_dir=None):
+    ''' Run the requested benchmarks at the requested sizes
+
+    A failing benchmark is logged and recorded with status 'failed', and the remaining benchmarks still run.
+
+    Args:
+        sizes (list) : DEFAULT None, list of BENCHMARK_SIZES keys, all sizes if None
+        benchmark_names (list) : DEFAULT None, list of BENCHMARKS keys, all benchmarks if None
+        repeat (int) : DEFAULT 3, number of timed runs of each benchmark
+        work_dir (str) : DEFAULT None, directory for synthetic inputs and outputs, under PATHS['BENCHMARK_PATH']
+                         if None
+
+    Returns:
+        (dict) : report in geoips2.profiler report format, {'run': run information, 'spans': benchmark results}
+    '''
+    import socket
+    import platform
+    from datetime import datetime
+    if sizes is None:
+        sizes = sorted(BENCHMARK_SIZES, key=BENCHMARK_SIZES.get)
+    if benchmark_names is None:
+        benchmark_names = list(BENCHMARKS.keys())
+    if work_dir is None:
+        work_dir = os.path.join(gpaths['BENCHMARK_PATH'], 'work')
+    report = {'run': {'name': 'benchmarks',
+                      'start_datetime': datetime.utcnow().isoformat(),
+                      'host': socket.gethostname(),
+                      'pid': os.getpid(),
+                      'attrs': {'python': platform.python_version(),
+                                'repeat': str(repeat),
+                                'sizes': ','.join(sizes)}},
+              'spans': []}
+    for size in sizes:
+        inputs = setup_benchmark_inputs(BENCHMARK_SIZES[size], os.path.join(work_dir, size))
+        for benchmark_name in benchmark_names:
+            span_dict = {'path': 'benchmarks/{0}[{1}]'.format(benchmark_name, size),
+                         'name': benchmark_name,
+                         'depth': 1,
+                         'status': 'done',
+                         'attrs': {'size': size,
+                                   'swath_shape': str(inputs['swath'][VARIABLE].shape),
+                                   'area_def_shape': str(inputs['area_def'].shape)}}
+            LOG.info('BENCHMARK running %s', span_dict['path'])
+            try:
+                span_dict.update(time_benchmark(BENCHMARKS[benchmark_name], inputs, repeat))
+                LOG.info('BENCHMARK %-50s wall %9.3fs cpu %9.3fs peak_rss %9.1fMB', span_dict['path'],
+                         span_dict['wall_seconds'], span_dict['cpu_seconds'], span_dict['peak_rss_mb'])
+            except Exception as resp:  # Record any benchmark failure (ie, missing optional dependency) and continue
+                LOG.exception('BENCHMARKFAILED %s', span_dict['path'])
+                span_dict.update({'status': 'failed', 'error': str(resp), 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                  'peak_rss_mb': 0.0, 'bytes_read': None, 'bytes_written': None})
+            report['spans'] += [span_dict]
+    return report
+
+
+def write_benchmark_report(report, out_fname):
+    ''' Write benchmark report as JSON to out_fname, readable by geoips2.profiler.read_profile_report '''
+    import json
+    from geoips2.filenames.base_paths import make_dirs
+    if os.path.dirname(out_fname):
+        make_dirs(os.path.dirname(out_fname))
+    with open(out_fname, 'w') as fobj:
+        json.dump(report, fobj, indent=2)
+    LOG.info('BENCHMARKSUCCESS wrote %s', out_fname)
+    return [out_fname]
+
+
+def main():
+    ''' Run the synthetic benchmarks, write the report, and compare to a baseline report if requested '''
+    import argparse
+    from datetime import datetime
+    from geoips2.commandline.log_setup import setup_logging
+    setup_logging()
+    parser = argparse.ArgumentParser(description='Synthetic data benchmarks for geoips2 processing stages')
+    parser.add_argument('--sizes', nargs='+', default=None, choices=sorted(BENCHMARK_SIZES.keys()),
+                        help='''Synthetic data sizes to run, default all''')
+    parser.add_argument('--benchmarks', nargs='+', default=None, choices=sorted(BENCHMARKS.keys()),
+                        help='''Benchmarks to run, default all''')
+    parser.add_argument('--repeat', default=3, type=int,
+                        help='''Number of timed runs of each benchmark, the fastest is reported''')
+    parser.add_argument('--work_dir', default=None,
+                        help='''Directory for synthetic inputs and outputs, default BENCHMARK_PATH/work''')
+    parser.add_argument('--report', default=None,
+                        help='''JSON report filename, default BENCHMARK_PATH/benchmarks_<YYYYmmddHHMMSS>.json''')
+    parser.add_argument('--baseline', default=None,
+                        help='''Baseline JSON report to compare against''')
+    parser.add_argument('--threshold', default=1.2, type=float,
+                        help='''Report regressions where new / baseline wall time exceeds threshold''')
+    args = parser.parse_args()
+
+    report_fname = args.report
+    if report_fname is None:
+        report_fname = os.path.join(gpaths['BENCHMARK_PATH'],
+                                    'benchmarks_{0}.json'.format(datetime.utcnow().strftime('%Y%m%d%H%M%S')))
+    report = run_benchmarks(sizes=args.sizes, benchmark_names=args.benchmarks, repeat=args.repeat,
+                            work_dir=args.work_dir)
+    write_benchmark_report(report, report_fname)
+
+    retval = 0
+    failed = [span_dict['path'] for span_dict in report['spans'] if span_dict['status'] != 'done']
+    for path in failed:
+        LOG.info('BENCHMARKFAILED %s', path)
+    if failed:
+        retval = 1
+    if args.baseline:
+        from geoips2.profiler import diff_profile_reports
+        regressions = diff_profile_reports(args.baseline, report_fname, threshold=args.threshold)
+        if regressions:
+            retval = 2
+        else:
+            LOG.info('BENCHMARKSUCCESS no regressions relative to %s', args.baseline)
+    sys.exit(retval)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,39 @@
 ''' Command line script for kicking off geoips2 based procflows. MUST call with --procflow'''
 
 
+def log_procflow_results(retval, command_line_args, start_datetime):
+    ''' Log the GEOIPS2PROCFLOWSUCCESS / GEOIPS2TOTALSUCCESS summary for a completed procflow
+
+    Args:
+        retval (list or int) : procflow return value, either a list of successful outputs or an integer status
+        command_line_args (dict) : command line arguments passed to the procflow
+        start_datetime (datetime) : processing start time
+
+    Returns:
+        (int) : exit status, 0 if the procflow returned a list of outputs, otherwise retval
+    '''
+    import logging
+    from datetime import datetime
+    LOG = logging.getLogger(__name__)
+    LOG.info('Completed geoips2 PROCFLOW processing, done!')
+    LOG.info('Starting time: %s', start_datetime)
+    LOG.info('Ending time: %s', datetime.utcnow())
+    LOG.info('Total time: %s', datetime.utcnow() - start_datetime)
+    if isinstance(retval, list):
+        for ret in retval:
+            LOG.info('GEOIPS2PROCFLOWSUCCESS %s', ret)
+        if len(retval) > 2:
+            LOG.info('GEOIPS2TOTALSUCCESS %s %s products generated, total time %s',
+                     str(command_line_args['sectorfiles']), len(retval), datetime.utcnow() - start_datetime)
+        else:
+            LOG.info('GEOIPS2NOSUCCESS %s %s products generated, total time %s',
+                     str(command_line_args['sectorfiles']), len(retval), datetime.utcnow() - start_datetime)
+        return 0
+    # LOG.info('Return value: %s', bin(retval))
+    LOG.info('Return value: %d', retval)
+    return retval
+
+
 def main():
     ''' Script to kick off processing based on command line args '''
     from datetime import datetime
@@ -41,23 +74,7 @@ def main():
     LOG.info('CALLING PROCFLOW MODULE')
     if PROCFLOW:
         RETVAL = PROCFLOW(COMMAND_LINE_ARGS['filenames'], COMMAND_LINE_ARGS)
-        LOG.info('Completed geoips2 PROCFLOW processing, done!')
-        LOG.info('Starting time: %s', DATETIMES['start'])
-        LOG.info('Ending time: %s', datetime.utcnow())
-        LOG.info('Total time: %s', datetime.utcnow() - DATETIMES['start'])
-        if isinstance(RETVAL, list):
-            for ret in RETVAL:
-                LOG.info('GEOIPS2PROCFLOWSUCCESS %s', ret)
-            if len(RETVAL) > 2:
-                LOG.info('GEOIPS2TOTALSUCCESS %s %s products generated, total time %s',
-                         str(COMMAND_LINE_ARGS['sectorfiles']), len(RETVAL), datetime.utcnow() - DATETIMES['start'])
-            else:
-                LOG.info('GEOIPS2NOSUCCESS %s %s products generated, total time %s',
-                         str(COMMAND_LINE_ARGS['sectorfiles']), len(RETVAL), datetime.utcnow() - DATETIMES['start'])
-            sys.exit(0)
-        # LOG.info('Return value: %s', bin(RETVAL))
-        LOG.info('Return value: %d', RETVAL)
-        sys.exit(RETVAL)
+        sys.exit(log_procflow_results(RETVAL, COMMAND_LINE_ARGS, DATETIMES['start']))
 
     else:
         raise IOError('FAILED no geoips2*/{0}.py with def {0}'.format(COMMAND_LINE_ARGS['procflow']))
@@ -22,10 +22,10 @@
 
 import logging
 import collections
-from importlib import import_module
 LOG = logging.getLogger(__name__)
 
 from geoips2.geoips2_utils import find_entry_point, list_entry_points
+from geoips2.plugin_registry import get_plugin_type
 
 
 ### Algorithm functions ###
@@ -169,8 +169,7 @@ def get_alg_type(alg_func_name):
     Returns:
         (str) : Algorithm function type
     '''
-    func = find_entry_point('algorithms', alg_func_name)
-    return getattr(import_module(func.__module__), 'alg_func_type')
+    return get_plugin_type('algorithms', alg_func_name)
 
 
 def list_algs_by_type():
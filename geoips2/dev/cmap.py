@@ -22,10 +22,10 @@
 
 import logging
 import collections
-from importlib import import_module
 LOG = logging.getLogger(__name__)
 
 from geoips2.geoips2_utils import find_entry_point, list_entry_points
+from geoips2.plugin_registry import get_plugin_type
 
 
 ### Colormap functions ###
@@ -169,8 +169,7 @@ def get_cmap_type(cmap_func_name):
     Returns:
         (str) : Colormap function type
     '''
-    cmap_func = find_entry_point('user_colormaps', cmap_func_name)
-    return getattr(import_module(cmap_func.__module__), 'cmap_type')
+    return get_plugin_type('user_colormaps', cmap_func_name)
 
 
 def list_cmaps_by_type():
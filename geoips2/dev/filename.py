@@ -26,6 +26,7 @@ import logging
 LOG = logging.getLogger(__name__)
 
 from geoips2.geoips2_utils import find_entry_point, list_entry_points
+from geoips2.plugin_registry import get_plugin_type
 
 
 ### Filename Functions ###
@@ -177,8 +178,7 @@ def get_filenamer_type(func_name):
     Returns:
         (str) : Type of requested filename function
     '''
-    curr_func = find_entry_point('filename_formats', func_name)
-    return getattr(import_module(curr_func.__module__), 'filename_type')
+    return get_plugin_type('filename_formats', func_name)
 
 
 def list_filenamers_by_type():
@@ -21,11 +21,11 @@
 '''
 
 import collections
-from importlib import import_module
 import logging
 LOG = logging.getLogger(__name__)
 
 from geoips2.geoips2_utils import find_entry_point, list_entry_points
+from geoips2.plugin_registry import get_plugin_type
 
 
 ### Interpolation Functions ###
@@ -140,8 +140,7 @@ def get_interp_type(interp_func_name):
     Returns:
         (str) : Interpolation function type
     '''
-    func = find_entry_point('interpolation', interp_func_name)
-    return getattr(import_module(func.__module__), 'interp_type')
+    return get_plugin_type('interpolation', interp_func_name)
 
 
 def list_interps_by_type():
@@ -20,11 +20,11 @@
     this module will be moved to the geoips2/stable sub-package.
 '''
 import collections
-from importlib import import_module
 import logging
 LOG = logging.getLogger(__name__)
 
 from geoips2.geoips2_utils import find_entry_point, list_entry_points
+from geoips2.plugin_registry import get_plugin_type
 
 
 ### Output Format Functions ###
@@ -71,7 +71,8 @@ def is_valid_outputter(output_func_name):
                          return value:   <list of str containing all successfully produced ouput filenames>
                'xarray_data' : call signature: <func_name>(xarray_obj,
                                                                product_names,  # All product names to include in output data file
-                                                               output_fnames)  # Multiple filenames to produce of the same datafile
+                                                               output_fnames,  # Multiple filenames to produce of the same datafile
+                                                               encoding_policy=None)  # Optional, only passed if netcdf_encoding specified
                         return value:   <list of str containing all successfully produced ouput filenames>
                             
 
@@ -185,8 +186,7 @@ def get_outputter_type(output_func_name):
     Returns:
         (str) : Type of requested output function
     '''
-    curr_func = find_entry_point('output_formats', output_func_name)
-    return getattr(import_module(curr_func.__module__), 'output_type')
+    return get_plugin_type('output_formats', output_func_name)
 
 
 def list_outputters_by_type():
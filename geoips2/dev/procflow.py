@@ -22,10 +22,10 @@
 
 import logging
 import collections
-from importlib import import_module
 LOG = logging.getLogger(__name__)
 
 from geoips2.geoips2_utils import find_entry_point, list_entry_points
+from geoips2.plugin_registry import get_plugin_type
 
 
 ### Driver functions ###
@@ -145,8 +145,7 @@ def get_procflow_type(procflow_func_name):
                         Type defaults to 'standard' if not specified. Driver types currently one of:
                         'standard' : call signature <procflow_func_name>(fnames, command_line_args=None)
     '''
-    procflow_func = find_entry_point('procflows', procflow_func_name)
-    return getattr(import_module(procflow_func.__module__), 'procflow_type')
+    return get_plugin_type('procflows', procflow_func_name)
 
 
 def list_procflows_by_type():
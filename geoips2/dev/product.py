@@ -96,20 +96,20 @@ def is_valid_product(product_name, source_name):
     optional_keys = {
                      'interp_alg_cmap': ['display_name',
                                          'mtif_type',
-                                         'covg_func', 'covg_args'],
+                                         'covg_func', 'covg_args', 'netcdf_encoding'],
                      'interp_alg': ['display_name',
-                                    'covg_func', 'covg_args'],
+                                    'covg_func', 'covg_args', 'netcdf_encoding'],
                      'alg': ['display_name',
-                             'covg_func', 'covg_args'],
+                             'covg_func', 'covg_args', 'netcdf_encoding'],
                      'cmap': ['display_name',
-                              'covg_func', 'covg_args'],
+                              'covg_func', 'covg_args', 'netcdf_encoding'],
                      'sectored_xarray_dict_to_output_format': ['display_name',
-                                                               'covg_func', 'covg_args'],
+                                                               'covg_func', 'covg_args', 'netcdf_encoding'],
                      'unsectored_xarray_dict_to_output_format': ['display_name',
-                                                                 'covg_func', 'covg_args'],
+                                                                 'covg_func', 'covg_args', 'netcdf_encoding'],
                      'alg_cmap': ['display_name',
                                   'mtif_type',
-                                  'covg_func', 'covg_args'],
+                                  'covg_func', 'covg_args', 'netcdf_encoding'],
                      }
 
     product_dict = get_product(product_name, source_name)
@@ -703,3 +703,27 @@ def get_covg_args_from_product(product_name, source_name):
     if 'covg_args' not in products:
         return {}
     return products['covg_args']
+
+
+def get_netcdf_encoding_from_product(product_name, source_name):
+    ''' Interface Under Development, please provide feedback to geoips@nrlmry.navy.mil
+
+    Retrieve netcdf encoding policy (compression, chunking, packing), based on requested product and source
+
+    Args:
+        product_name (str) : Name of requested product (ie, 'IR-BD', '89H', 'color89Nearest', etc)
+        source_name (str) : Name of requested source (ie, 'ahi', 'modis', etc)
+
+    Returns:
+        (dict) : Return encoding policy for xarray_data outputs, None if not specified (use default policy)
+
+    See geoips2.xarray_utils.netcdf_encoding for additional information on encoding policies
+    '''
+    products = get_product(product_name, source_name)
+
+    if not products:
+        raise ValueError('UNSUPPORTED product_name {0} not supported for source {1}'.format(product_name, source_name))
+
+    if 'netcdf_encoding' not in products:
+        return None
+    return products['netcdf_encoding']
@@ -112,6 +112,37 @@ if getenv('PREGENERATED_GEOLOCATION_PATH'):
 else:
     PATHS['PREGENERATED_GEOLOCATION_PATH'] = pathjoin(PATHS['GEOIPS_OUTDIRS'], 'preprocessed', 'geolocation')
 
+# Location for writing out cached image reprojection warp indices
+if getenv('WARP_INDEX_PATH'):
+    PATHS['WARP_INDEX_PATH'] = getenv('WARP_INDEX_PATH').rstrip('/')
+else:
+    PATHS['WARP_INDEX_PATH'] = pathjoin(PATHS['GEOIPS_OUTDIRS'], 'longterm_files', 'geolocation', 'warp_indices')
+
+# Location for writing out cached projected, clipped map boundary geometry
+if getenv('BOUNDARY_GEOMETRY_PATH'):
+    PATHS['BOUNDARY_GEOMETRY_PATH'] = getenv('BOUNDARY_GEOMETRY_PATH').rstrip('/')
+else:
+    PATHS['BOUNDARY_GEOMETRY_PATH'] = pathjoin(PATHS['GEOIPS_OUTDIRS'], 'longterm_files', 'geolocation',
+                                               'boundary_geometry')
+
+# Location for writing out geoips2 plugin registry snapshots
+if getenv('PLUGIN_REGISTRY_PATH'):
+    PATHS['PLUGIN_REGISTRY_PATH'] = getenv('PLUGIN_REGISTRY_PATH').rstrip('/')
+else:
+    PATHS['PLUGIN_REGISTRY_PATH'] = pathjoin(PATHS['GEOIPS_OUTDIRS'], 'longterm_files', 'plugin_registry')
+
+# Spool directory for jobs submitted to resident procflow workers (geoips2.commandline.procflow_worker)
+if getenv('PROCFLOW_SPOOL_PATH'):
+    PATHS['PROCFLOW_SPOOL_PATH'] = getenv('PROCFLOW_SPOOL_PATH').rstrip('/')
+else:
+    PATHS['PROCFLOW_SPOOL_PATH'] = pathjoin(PATHS['GEOIPS_OUTDIRS'], 'procflow_spool')
+
+# Synthetic benchmark inputs and results (geoips2.commandline.run_benchmarks)
+if getenv('BENCHMARK_PATH'):
+    PATHS['BENCHMARK_PATH'] = getenv('BENCHMARK_PATH').rstrip('/')
+else:
+    PATHS['BENCHMARK_PATH'] = pathjoin(PATHS['GEOIPS_OUTDIRS'], 'benchmarks')
+
 # GEOIPS_COPYRIGHT determines what organization name displays in imagery titles, etc.
 PATHS['GEOIPS_COPYRIGHT'] = 'NRL-Monterey'
 if getenv('GEOIPS_COPYRIGHT'):
@@ -125,6 +156,12 @@ PATHS['TC_TEMPLATE'] = pathjoin(PATHS['GEOIPS2'], 'geoips2', 'yaml_configs', 'se
 if getenv('TC_TEMPLATE'):
     PATHS['TC_TEMPLATE'] = getenv('TC_TEMPLATE')
 
+# Write clean PNG imagery directly from the colormapped RGBA array, rather than through a matplotlib figure.
+# Off until the direct output has been verified against matplotlib (tests/scripts/clean_rgba_compare.sh)
+PATHS['GEOIPS_DIRECT_RGBA'] = False
+if getenv('GEOIPS_DIRECT_RGBA'):
+    PATHS['GEOIPS_DIRECT_RGBA'] = True
+
 PATHS['DEFAULT_QUEUE'] = None
 if getenv('DEFAULT_QUEUE'):
     PATHS['DEFAULT_QUEUE'] = getenv('DEFAULT_QUEUE')
@@ -213,6 +250,18 @@ PATHS['TC_DECKS_DB'] = pathjoin(PATHS['GEOIPS_OUTDIRS'], 'longterm_files', 'tc',
 if getenv('TC_DECKS_DB'):
     PATHS['TC_DECKS_DB'] = getenv('TC_DECKS_DB')
 
+# Optional sqlite database for storing the output product index used when removing duplicate products.
+# If not set, the product index is only maintained in memory.
+PATHS['PRODUCT_INDEX_DB'] = None
+if getenv('PRODUCT_INDEX_DB'):
+    PATHS['PRODUCT_INDEX_DB'] = getenv('PRODUCT_INDEX_DB')
+
+# sqlite database for the content addressed procflow result cache and output file manifest (--result_cache)
+if getenv('RESULT_CACHE_DB'):
+    PATHS['RESULT_CACHE_DB'] = getenv('RESULT_CACHE_DB')
+else:
+    PATHS['RESULT_CACHE_DB'] = pathjoin(PATHS['GEOIPS_OUTDIRS'], 'longterm_files', 'result_cache', 'result_cache.db')
+
 if getenv('TC_DECKS_DIR'):
     PATHS['TC_DECKS_DIR'] = getenv('TC_DECKS_DIR').rstrip('/')
 else:
@@ -237,3 +286,43 @@ def make_dirs(path):
             LOG.warning('%s: We thought %s did not exist, but then it did. Not trying to make directory',
                         resp, path)
     return path
+
+
+class atomic_output_fname(object):
+    ''' Context manager returning a temporary filename in the same directory as out_fname.
+
+    On successful exit the temporary file is atomically renamed to out_fname, so concurrent readers never see a
+    partially written file.  On any failure (including failing to create the temporary file) the temporary file
+    is removed and the exception is raised - callers writing optional cache files should catch (IOError, OSError).
+
+    The temporary file is created with mode 0o666, so the process umask applies exactly as for files opened
+    normally (tempfile.mkstemp would leave shared cache files readable only by the owner).
+
+    Usage:
+        with atomic_output_fname(out_fname) as tmp_fname:
+            with open(tmp_fname, 'w') as fobj:
+                fobj.write(contents)
+    '''
+    def __init__(self, out_fname):
+        self.out_fname = out_fname
+        self.tmp_fname = None
+
+    def __enter__(self):
+        import os
+        from uuid import uuid4
+        out_dir = dirname(self.out_fname)
+        if out_dir:
+            make_dirs(out_dir)
+        self.tmp_fname = pathjoin(out_dir, '.{0}.{1}.tmp'.format(pathsplit(self.out_fname)[1], uuid4().hex[:12]))
+        os.close(os.open(self.tmp_fname, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        return self.tmp_fname
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        import os
+        try:
+            if exc_type is None:
+                os.replace(self.tmp_fname, self.out_fname)
+        finally:
+            if exists(self.tmp_fname):
+                os.remove(self.tmp_fname)
+        return False
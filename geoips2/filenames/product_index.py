@@ -0,0 +1,237 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Per-directory index of output products, used for duplicate product removal.
+
+    Each output directory is listed ONCE, every filename is parsed ONCE with the filename format specific
+    parse function, and the resulting (product_datetime, storm, sensor, platform, product, resolution, coverage)
+    entries are stored sorted by time, so finding all duplicates within a time window is a bisect range scan rather
+    than a glob per minute.
+
+    The index is held in memory for the life of the process.  If PATHS['PRODUCT_INDEX_DB'] is set (via the
+    PRODUCT_INDEX_DB environment variable), the parsed entries are also stored in a sqlite database so other processes
+    can reuse them without re-listing the directory.
+
+    Directory modification times are used to determine when a directory must be re-listed.  Since file system
+    timestamps can be coarse (particularly on NFS), any directory modified within RACY_SECONDS of the time it was
+    indexed is always re-listed on the next query.
+'''
+
+import logging
+from bisect import bisect_left
+from os import stat as osstat, scandir
+from os.path import join as pathjoin
+from time import time
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+# Fields identifying a unique product.  Every entry returned by a parse function must contain these keys,
+# plus product_datetime and coverage.
+INDEX_KEY_FIELDS = ('storm', 'sensor', 'platform', 'product', 'resolution', 'extension')
+
+# Directory modification times within RACY_SECONDS of the time of indexing can not be trusted.
+RACY_SECONDS = 2.0
+
+# {dirname: {'mtime': float, 'racy': bool, 'fnames': {fname: entry}, 'products': {key: ([datetimes], [entries])}}}
+_DIRECTORY_INDEXES = {}
+
+
+def _index_key(entry):
+    return tuple(entry[field] for field in INDEX_KEY_FIELDS)
+
+
+def _build_products(fnames):
+    ''' Sort the parsed entries for a single directory by product key and product_datetime '''
+    products = {}
+    for entry in sorted(fnames.values(), key=lambda ent: (ent['product_datetime'], ent['fname'])):
+        dts, entries = products.setdefault(_index_key(entry), ([], []))
+        dts += [entry['product_datetime']]
+        entries += [entry]
+    return products
+
+
+def _open_index_db(dbname):
+    ''' Open the product index sqlite database, creating the tables if they do not exist '''
+    import sqlite3
+    from os.path import dirname as pathdirname
+    from geoips2.filenames.base_paths import make_dirs
+    make_dirs(pathdirname(dbname))
+    conn = sqlite3.connect(dbname, timeout=60, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.execute('''CREATE TABLE IF NOT EXISTS product_dirs
+        (dirname text PRIMARY KEY NOT NULL,
+            mtime real,
+            racy integer)''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS products
+        (fname text PRIMARY KEY NOT NULL,
+            dirname text NOT NULL,
+            product_datetime timestamp,
+            storm text,
+            sensor text,
+            platform text,
+            product text,
+            resolution text,
+            extension text,
+            coverage real)''')
+    conn.execute('''CREATE INDEX IF NOT EXISTS products_by_time ON products
+        (dirname, storm, sensor, platform, product, resolution, extension, product_datetime)''')
+    return conn
+
+
+def _read_index_db(dbname, dirname, mtime):
+    ''' Return {fname: entry} stored in the sqlite index for dirname, or None if it is missing or out of date '''
+    conn = _open_index_db(dbname)
+    try:
+        row = conn.execute('SELECT mtime, racy FROM product_dirs WHERE dirname = ?', (dirname,)).fetchone()
+        if row is None or row[0] != mtime or row[1]:
+            return None
+        fnames = {}
+        for row in conn.execute('''SELECT fname, product_datetime, storm, sensor, platform, product,
+                                          resolution, extension, coverage
+                                   FROM products WHERE dirname = ?''', (dirname,)):
+            entry = dict(zip(('fname', 'product_datetime') + INDEX_KEY_FIELDS + ('coverage',), row))
+            fnames[entry['fname']] = entry
+    finally:
+        conn.close()
+    return fnames
+
+
+def _write_index_db(dbname, dirname, mtime, racy, fnames):
+    ''' Replace the sqlite index entries for dirname with the current {fname: entry} dictionary '''
+    conn = _open_index_db(dbname)
+    try:
+        with conn:
+            conn.execute('DELETE FROM products WHERE dirname = ?', (dirname,))
+            conn.executemany('''INSERT OR REPLACE INTO products
+                                (fname, dirname, product_datetime, storm, sensor, platform, product,
+                                 resolution, extension, coverage) VALUES (?,?,?,?,?,?,?,?,?,?)''',
+                             [(entry['fname'], dirname, entry['product_datetime'])
+                              + _index_key(entry) + (entry['coverage'],)
+                              for entry in fnames.values()])
+            conn.execute('INSERT OR REPLACE INTO product_dirs (dirname, mtime, racy) VALUES (?,?,?)',
+                         (dirname, mtime, int(racy)))
+    finally:
+        conn.close()
+
+
+def _delete_from_index_db(dbname, fname):
+    conn = _open_index_db(dbname)
+    try:
+        with conn:
+            conn.execute('DELETE FROM products WHERE fname = ?', (fname,))
+    finally:
+        conn.close()
+
+
+def get_directory_index(dirname, parse_func, dbname=None):
+    ''' Return the current index for dirname, re-listing the directory only if it has changed.
+
+    Args:
+        dirname (str) : Full path to the directory to index
+        parse_func (function) : Function taking a full path filename, returning a dictionary with keys
+                                product_datetime, coverage, and all INDEX_KEY_FIELDS, or None if the filename
+                                is not of the expected format
+        dbname (str) : DEFAULT PATHS['PRODUCT_INDEX_DB'].  Optional sqlite database in which to store the index.
+
+    Returns:
+        (dict) : {index_key: ([product_datetimes], [entries])}, sorted by product_datetime
+    '''
+    if dbname is None:
+        dbname = gpaths['PRODUCT_INDEX_DB']
+
+    try:
+        mtime = osstat(dirname).st_mtime
+    except FileNotFoundError:
+        return {}
+
+    dir_index = _DIRECTORY_INDEXES.get(dirname)
+    if dir_index is not None and dir_index['mtime'] == mtime and not dir_index['racy']:
+        return dir_index['products']
+
+    fnames = None
+    if dir_index is None and dbname:
+        fnames = _read_index_db(dbname, dirname, mtime)
+        if fnames is not None:
+            LOG.info('Using product index from %s for %s', dbname, dirname)
+
+    if fnames is None:
+        # Only parse the filenames we have not seen before
+        old_fnames = dir_index['fnames'] if dir_index is not None else {}
+        fnames = {}
+        with scandir(dirname) as dir_entries:
+            for dir_entry in dir_entries:
+                fname = pathjoin(dirname, dir_entry.name)
+                if fname in old_fnames:
+                    fnames[fname] = old_fnames[fname]
+                    continue
+                entry = parse_func(fname)
+                if entry is not None:
+                    entry['fname'] = fname
+                    fnames[fname] = entry
+        racy = time() - mtime < RACY_SECONDS
+        if dbname:
+            _write_index_db(dbname, dirname, mtime, racy, fnames)
+    else:
+        racy = False
+
+    dir_index = {'mtime': mtime,
+                 'racy': racy,
+                 'fnames': fnames,
+                 'products': _build_products(fnames)}
+    _DIRECTORY_INDEXES[dirname] = dir_index
+    return dir_index['products']
+
+
+def query_product_index(dirname, parse_func, index_fields, start_datetime, end_datetime, dbname=None):
+    ''' Return all indexed products in dirname matching index_fields, with start_datetime <= time < end_datetime
+
+    Args:
+        dirname (str) : Full path to the directory containing the products
+        parse_func (function) : Filename parse function, see get_directory_index
+        index_fields (dict) : Dictionary containing values for all INDEX_KEY_FIELDS
+        start_datetime (datetime) : Inclusive start of time range
+        end_datetime (datetime) : Exclusive end of time range
+        dbname (str) : DEFAULT PATHS['PRODUCT_INDEX_DB'].  Optional sqlite index database.
+
+    Returns:
+        (list) : List of entry dictionaries, each containing 'fname', 'product_datetime', 'coverage',
+                 and all INDEX_KEY_FIELDS, sorted by product_datetime
+    '''
+    products = get_directory_index(dirname, parse_func, dbname=dbname)
+    if _index_key(index_fields) not in products:
+        return []
+    dts, entries = products[_index_key(index_fields)]
+    return entries[bisect_left(dts, start_datetime):bisect_left(dts, end_datetime)]
+
+
+def remove_from_product_index(fname, dbname=None):
+    ''' Remove a single (deleted) filename from the in memory and sqlite product indexes '''
+    from os.path import dirname as pathdirname
+    if dbname is None:
+        dbname = gpaths['PRODUCT_INDEX_DB']
+    dir_index = _DIRECTORY_INDEXES.get(pathdirname(fname))
+    if dir_index is not None and fname in dir_index['fnames']:
+        entry = dir_index['fnames'].pop(fname)
+        dts, entries = dir_index['products'][_index_key(entry)]
+        ind = entries.index(entry)
+        dts.pop(ind)
+        entries.pop(ind)
+    if dbname:
+        _delete_from_index_db(dbname, fname)
+
+
+def clear_product_index():
+    ''' Clear the in memory product index for all directories '''
+    _DIRECTORY_INDEXES.clear()
@@ -0,0 +1,291 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Content addressed cache of procflow results, and a manifest of what produced each output file.
+
+    Each product a procflow produces for a sector is identified by a cache key - a sha1 hash of:
+
+        * the content hashes of the input data files,
+        * the product name, source name, and full product specification (algorithm, interpolation, colormap, ...),
+        * the area definition (area_id, projection, extent, shape, and dynamic sector times),
+        * the output format and filename format,
+        * the version and module modification time of each plugin used (reader, algorithm, interpolation, colormap,
+          output, filename, procflow), and
+        * any other command line arguments that affect the output (gridlines, boundaries, area_def adjustment).
+
+    When a procflow is run with --result_cache, it looks up each key before reading the data.  If the files
+    recorded for that key all still exist, unchanged, the read / interpolation / algorithm / output chain is skipped
+    and the existing files are returned as that sector's products.  Otherwise the products are produced as usual and
+    recorded under the key.
+
+    Keys and output files are stored in the sqlite database PATHS['RESULT_CACHE_DB'], which also serves as the
+    manifest - get_file_provenance returns the full specification that produced any recorded output file.
+    Input file content hashes are stored by (filename, size, modification time), so each input is hashed only once.
+'''
+
+import os
+import json
+import logging
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+# Increment when the cache key contents change, so old results are never reused
+RESULT_CACHE_VERSION = 2
+
+# Increment when the database tables change - databases with an older schema are cleared and recreated
+RESULT_CACHE_SCHEMA_VERSION = 2
+
+# Read input files in chunks of this many bytes when computing content hashes
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Command line arguments that affect the output products, included in the cache key
+RESULT_CACHE_ARGS = ['reader_name', 'product_name', 'output_format', 'filename_format', 'gridlines_params',
+                     'boundaries_params', 'adjust_area_def', 'output_config']
+
+
+def _open_result_cache_db(dbname=None):
+    ''' Open the result cache sqlite database, creating the tables if they do not exist
+
+    The database is only a cache, so tables written with an older RESULT_CACHE_SCHEMA_VERSION are dropped and
+    recreated rather than migrated.
+    '''
+    import sqlite3
+    from geoips2.filenames.base_paths import make_dirs
+    if dbname is None:
+        dbname = gpaths['RESULT_CACHE_DB']
+    make_dirs(os.path.dirname(dbname))
+    conn = sqlite3.connect(dbname, timeout=60)
+    if conn.execute('PRAGMA user_version').fetchone()[0] != RESULT_CACHE_SCHEMA_VERSION:
+        with conn:
+            for table in ['input_hashes', 'results', 'result_files']:
+                conn.execute('DROP TABLE IF EXISTS {0}'.format(table))
+            conn.execute('PRAGMA user_version = {0}'.format(RESULT_CACHE_SCHEMA_VERSION))
+    conn.execute('''CREATE TABLE IF NOT EXISTS input_hashes
+        (fname text PRIMARY KEY NOT NULL,
+            size integer,
+            mtime_ns integer,
+            sha1 text)''')
+    # num_files is the number of output files recorded for the result, so a partial set is never a hit
+    conn.execute('''CREATE TABLE IF NOT EXISTS results
+        (cache_key text PRIMARY KEY NOT NULL,
+            spec text,
+            created text,
+            num_files integer NOT NULL)''')
+    # The same file (ie, per sector metadata YAML shared by several products) may belong to several results
+    conn.execute('''CREATE TABLE IF NOT EXISTS result_files
+        (cache_key text NOT NULL,
+            fname text NOT NULL,
+            size integer,
+            mtime_ns integer,
+            PRIMARY KEY (cache_key, fname))''')
+    return conn
+
+
+def get_file_content_hash(fname, conn=None):
+    ''' Return the sha1 hash of the contents of fname, reusing the stored hash if the file has not changed
+
+    Args:
+        fname (str) : full path to input file
+        conn (sqlite3.Connection) : DEFAULT None, open result cache database, opened if None
+
+    Returns:
+        (str) : sha1 hex digest of the file contents
+    '''
+    from hashlib import sha1
+    close_conn = conn is None
+    if conn is None:
+        conn = _open_result_cache_db()
+    fname = os.path.abspath(fname)
+    fstat = os.stat(fname)
+    row = conn.execute('SELECT size, mtime_ns, sha1 FROM input_hashes WHERE fname = ?', (fname,)).fetchone()
+    if row is not None and row[0] == fstat.st_size and row[1] == fstat.st_mtime_ns:
+        content_hash = row[2]
+    else:
+        file_hash = sha1()
+        with open(fname, 'rb') as fobj:
+            for chunk in iter(lambda: fobj.read(HASH_CHUNK_BYTES), b''):
+                file_hash.update(chunk)
+        content_hash = file_hash.hexdigest()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO input_hashes VALUES (?, ?, ?, ?)',
+                         (fname, fstat.st_size, fstat.st_mtime_ns, content_hash))
+    if close_conn:
+        conn.close()
+    return content_hash
+
+
+def get_area_def_signature(area_def):
+    ''' Return a JSON serializable description of everything about area_def that affects output products '''
+    proj_dict = getattr(area_def, 'proj_dict', {})
+    signature = {'area_id': area_def.area_id,
+                 'proj_dict': sorted([(str(key), str(val)) for key, val in proj_dict.items()]),
+                 'area_extent': [float(val) for val in area_def.area_extent],
+                 'shape': [int(val) for val in area_def.shape]}
+    for attr in ['sector_type', 'sector_start_datetime', 'sector_end_datetime', 'sector_info']:
+        if hasattr(area_def, attr):
+            signature[attr] = str(getattr(area_def, attr))
+    return signature
+
+
+def get_plugin_signature(namespace, name):
+    ''' Return (distribution version, module modification time) of plugin name in namespace, or None '''
+    if name is None:
+        return None
+    from geoips2.plugin_registry import get_plugin_info
+    entry = get_plugin_info(namespace, name)
+    if entry is None:
+        return None
+    return [entry['version'], entry['mtime']]
+
+
+def get_result_cache_key(fnames, product_name, source_name, area_def, output_format, filename_format,
+                         procflow_name, command_line_args=None, extra_spec=None):
+    ''' Return the cache key and full specification of a single product for a single sector
+
+    Args:
+        fnames (list) : input data files
+        product_name (str) : product name
+        source_name (str) : data source name, for the product specification
+        area_def (AreaDefinition) : requested sector, before any area_def adjustment
+        output_format (str) : output format plugin name
+        filename_format (str) : filename format plugin name (or list of names)
+        procflow_name (str) : procflow producing the product
+        command_line_args (dict) : DEFAULT None, command line arguments, RESULT_CACHE_ARGS are included in the spec
+        extra_spec (dict) : DEFAULT None, additional JSON serializable specification (ie, config output options)
+
+    Returns:
+        (tuple) : (sha1 cache key, specification dictionary)
+    '''
+    from hashlib import sha1
+    from geoips2.dev.product import get_product
+    command_line_args = command_line_args or {}
+    conn = _open_result_cache_db()
+    try:
+        inputs = [[os.path.basename(fname), get_file_content_hash(fname, conn)] for fname in sorted(fnames)]
+    finally:
+        conn.close()
+    filename_formats = filename_format if isinstance(filename_format, list) else [filename_format]
+    product = get_product(product_name, source_name)
+    # Algorithm, interpolation and colormap plugins used by the product
+    product_plugins = product or {}
+    spec = {'version': RESULT_CACHE_VERSION,
+            'inputs': inputs,
+            'product_name': product_name,
+            'source_name': source_name,
+            'product': product,
+            'area_def': get_area_def_signature(area_def),
+            'output_format': output_format,
+            'filename_formats': filename_formats,
+            'procflow': procflow_name,
+            'plugins': {'readers': get_plugin_signature('readers', command_line_args.get('reader_name')),
+                        'algorithms': get_plugin_signature('algorithms', product_plugins.get('alg_func')),
+                        'interpolation': get_plugin_signature('interpolation', product_plugins.get('interp_func')),
+                        'user_colormaps': get_plugin_signature('user_colormaps', product_plugins.get('cmap_func')),
+                        'output_formats': get_plugin_signature('output_formats', output_format),
+                        'filename_formats': [get_plugin_signature('filename_formats', fmt)
+                                             for fmt in filename_formats],
+                        'procflows': get_plugin_signature('procflows', procflow_name)},
+            'args': dict((key, command_line_args.get(key)) for key in RESULT_CACHE_ARGS),
+            'extra': extra_spec}
+    spec_string = json.dumps(spec, sort_keys=True, default=str)
+    return sha1(spec_string.encode('utf-8')).hexdigest(), json.loads(spec_string)
+
+
+def lookup_cached_result(cache_key):
+    ''' Return the output files recorded for cache_key
+
+    Returns:
+        (list) : recorded output files, or None if cache_key is not recorded, no files were recorded, or any
+                 recorded file is missing or has changed
+    '''
+    conn = _open_result_cache_db()
+    try:
+        row = conn.execute('SELECT num_files FROM results WHERE cache_key = ?', (cache_key,)).fetchone()
+        if row is None:
+            return None
+        num_files = row[0]
+        rows = conn.execute('SELECT fname, size, mtime_ns FROM result_files WHERE cache_key = ? ORDER BY fname',
+                            (cache_key,)).fetchall()
+    finally:
+        conn.close()
+    if num_files == 0 or len(rows) != num_files:
+        LOG.info('RESULTCACHEMISS %s %s of %s recorded outputs found', cache_key, len(rows), num_files)
+        return None
+    for fname, size, mtime_ns in rows:
+        if not os.path.exists(fname):
+            LOG.info('RESULTCACHEMISS %s recorded output %s no longer exists', cache_key, fname)
+            return None
+        fstat = os.stat(fname)
+        if fstat.st_size != size or fstat.st_mtime_ns != mtime_ns:
+            LOG.info('RESULTCACHEMISS %s recorded output %s has been modified', cache_key, fname)
+            return None
+    return [row[0] for row in rows]
+
+
+def record_result(cache_key, spec, output_fnames):
+    ''' Record output_fnames as the result of cache_key, replacing any previous result for cache_key
+
+    Call before duplicate removal, so every output produced is recorded.  Output files that do not exist are not
+    recorded.  A result with no files is recorded, but never returned as a hit.
+
+    Returns:
+        (list) : recorded output files
+    '''
+    from datetime import datetime
+    recorded = []
+    for fname in sorted(set(os.path.abspath(fname) for fname in output_fnames)):
+        if os.path.exists(fname):
+            fstat = os.stat(fname)
+            recorded += [(cache_key, fname, fstat.st_size, fstat.st_mtime_ns)]
+    conn = _open_result_cache_db()
+    try:
+        with conn:
+            conn.execute('DELETE FROM result_files WHERE cache_key = ?', (cache_key,))
+            conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                         (cache_key, json.dumps(spec, sort_keys=True), datetime.utcnow().isoformat(),
+                          len(recorded)))
+            conn.executemany('INSERT INTO result_files VALUES (?, ?, ?, ?)', recorded)
+    finally:
+        conn.close()
+    LOG.info('RESULTCACHERECORD %s %s files', cache_key, len(recorded))
+    return [row[1] for row in recorded]
+
+
+def get_file_provenance(fname):
+    ''' Return the manifest entry for output file fname
+
+    If several results recorded fname, the most recent result whose recorded size and modification time match the
+    current file is returned.
+
+    Returns:
+        (dict) : {'cache_key', 'created', 'spec'} for the result that produced fname, or None if not recorded
+    '''
+    fname = os.path.abspath(fname)
+    if not os.path.exists(fname):
+        return None
+    fstat = os.stat(fname)
+    conn = _open_result_cache_db()
+    try:
+        row = conn.execute('''SELECT results.cache_key, results.created, results.spec FROM result_files
+                              JOIN results ON results.cache_key = result_files.cache_key
+                              WHERE result_files.fname = ? AND result_files.size = ? AND result_files.mtime_ns = ?
+                              ORDER BY results.created DESC LIMIT 1''',
+                           (fname, fstat.st_size, fstat.st_mtime_ns)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    return {'cache_key': row[0], 'created': row[1], 'spec': json.loads(row[2])}
@@ -15,7 +15,6 @@
 ''' General high level utilities for geoips2 processing '''
 
 import logging
-from importlib import metadata
 
 LOG = logging.getLogger(__name__)
 
@@ -71,14 +70,10 @@ def find_entry_point(namespace, name, default=None):
                              then no match will result in an exception
 
     '''
-    entry_points = metadata.entry_points()
+    from geoips2.plugin_registry import load_plugin
     ep_namespace = '.'.join([NAMESPACE_PREFIX, namespace])
-    for ep in entry_points[ep_namespace]:
-        if ep.name == name:
-            resolved_ep = ep.load()
-            break
-    else:
-        resolved_ep = None
+    # The plugin registry snapshot avoids scanning every installed distribution's entry points on each lookup
+    resolved_ep = load_plugin(namespace, name)
     if resolved_ep is not None:
         return resolved_ep
     else:
@@ -96,9 +91,8 @@ def list_entry_points(namespace):
     Args:
         namespace (str)    : Entry point namespace (e.g. 'readers')
     '''
-    entry_points = metadata.entry_points()
-    ep_namespace = '.'.join([NAMESPACE_PREFIX, namespace])
-    return [ep.name for ep in entry_points[ep_namespace]]
+    from geoips2.plugin_registry import list_plugins
+    return list_plugins(namespace)
 
 
 def list_product_specs_dict_yamls():
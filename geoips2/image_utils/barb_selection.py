@@ -0,0 +1,111 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Spatially aware selection of wind barbs for plotting.
+
+    Observations are projected onto the output image grid, clipped to the area_def, and binned into square
+    screen cells of barb_spacing pixels.  At most one observation is kept per cell, so the number of barbs
+    drawn scales with the image size rather than the density of the swath.
+'''
+import logging
+
+import numpy
+
+LOG = logging.getLogger(__name__)
+
+# Barb spacing in barb lengths, used when the spacing is not specified explicitly
+DEFAULT_BARB_SPACING_FACTOR = 1.5
+
+
+def get_barb_spacing_pixels(barblength, dpi, spacing_factor=DEFAULT_BARB_SPACING_FACTOR):
+    ''' Return the screen cell size in pixels for barbs of length barblength points at dpi '''
+    return max(1, int(round(spacing_factor * barblength * dpi / 72.0)))
+
+
+def get_image_pixel_coords(area_def, lats, lons):
+    ''' Return fractional (rows, cols) image pixel coordinates of lats/lons within area_def
+
+    Args:
+        area_def (pyresample.AreaDefinition) : output image area definition
+        lats (numpy.ndarray) : 1-D latitudes
+        lons (numpy.ndarray) : 1-D longitudes
+
+    Returns:
+        (tuple) : (rows, cols) float arrays, NaN where the location can not be projected
+    '''
+    from pyproj import Proj
+    proj_x, proj_y = Proj(area_def.proj_dict)(lons, lats)
+    proj_x = numpy.where(numpy.isfinite(proj_x) & (numpy.abs(proj_x) < 1e30), proj_x, numpy.nan)
+    proj_y = numpy.where(numpy.isfinite(proj_y) & (numpy.abs(proj_y) < 1e30), proj_y, numpy.nan)
+    cols = (proj_x - area_def.area_extent[0]) / area_def.pixel_size_x
+    rows = (area_def.area_extent[3] - proj_y) / area_def.pixel_size_y
+    return rows, cols
+
+
+def select_barbs(area_def, lats, lons, barb_spacing, rain_flag=None, prefer_rain_flagged=True,
+                 keep_colocated=False):
+    ''' Select at most one observation per barb_spacing x barb_spacing pixel cell of the area_def image
+
+    Within each cell the observation nearest the cell center is selected.  If rain_flag is specified,
+    rain flagged observations are preferred (or avoided, if prefer_rain_flagged is False) before distance
+    is considered, so rain contamination is not hidden by thinning.
+
+    Args:
+        area_def (pyresample.AreaDefinition) : output image area definition
+        lats (numpy.ndarray) : 1-D latitudes of valid observations
+        lons (numpy.ndarray) : 1-D longitudes of valid observations
+        barb_spacing (int) : screen cell size, in pixels
+        rain_flag (numpy.ndarray) : DEFAULT None, 1-D rain flags, nonzero where rain flagged
+        prefer_rain_flagged (bool) : DEFAULT True, prefer rain flagged observations within each cell
+        keep_colocated (bool) : DEFAULT False, also keep every observation at exactly the same location as a
+                                selected observation (ie, all wind ambiguities at a selected location)
+
+    Returns:
+        (numpy.ndarray) : sorted int64 indices into lats/lons of the selected observations
+    '''
+    lats = numpy.asarray(lats, dtype=numpy.float64)
+    lons = numpy.asarray(lons, dtype=numpy.float64)
+    rows, cols = get_image_pixel_coords(area_def, lats, lons)
+
+    # Clip to the image - NaN comparisons are False, so unprojectable locations are removed
+    inside = (rows >= 0) & (rows < area_def.shape[0]) & (cols >= 0) & (cols < area_def.shape[1])
+    inside_inds = numpy.where(inside)[0]
+    if not inside_inds.size:
+        LOG.info('  No wind barbs within area_def %s', area_def.area_id)
+        return inside_inds.astype(numpy.int64)
+    rows = rows[inside_inds]
+    cols = cols[inside_inds]
+
+    cell_rows = (rows // barb_spacing).astype(numpy.int64)
+    cell_cols = (cols // barb_spacing).astype(numpy.int64)
+    num_cell_cols = int(area_def.shape[1] // barb_spacing) + 1
+    cell_ids = cell_rows * num_cell_cols + cell_cols
+    dist = (rows - (cell_rows + 0.5) * barb_spacing)**2 + (cols - (cell_cols + 0.5) * barb_spacing)**2
+
+    sort_keys = [dist]
+    if rain_flag is not None:
+        rain = numpy.asarray(rain_flag)[inside_inds] != 0
+        sort_keys += [~rain if prefer_rain_flagged else rain]
+    sort_keys += [cell_ids]
+    # lexsort uses the last key as the primary key - the first observation per cell is the best one
+    order = numpy.lexsort(sort_keys)
+    _, first_in_cell = numpy.unique(cell_ids[order], return_index=True)
+    selected = inside_inds[order[first_in_cell]]
+
+    if keep_colocated:
+        locations = lats[inside_inds] + 1j * lons[inside_inds]
+        selected = inside_inds[numpy.isin(locations, lats[selected] + 1j * lons[selected])]
+
+    LOG.info('  Selected %s of %s wind barbs, %s pixel cells', selected.size, lats.size, barb_spacing)
+    return numpy.sort(selected)
@@ -0,0 +1,359 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Pre-projected, pre-clipped Natural Earth boundary geometry for cartopy map objects.
+
+    Cartopy's Natural Earth features reproject the full global geometries into the map projection every time
+    they are drawn.  For a given map projection and extent the result never changes, so the coastlines,
+    countries, states and rivers are read once, transformed to projected coordinates, clipped to the map extent,
+    and stored in memory and under PATHS['BOUNDARY_GEOMETRY_PATH'].  Boundaries are then drawn as a single
+    LineCollection per feature, with no per-draw projection.
+
+    Only geometries within the (padded) lat/lon bounds of the area_def are densified and projected, so the first
+    computation for a small sector is much cheaper than cartopy's full global reprojection.  Dynamic sectors (ie, TC
+    sectors, which move with every fix) are kept in memory only, so they do not accumulate files on disk.
+
+    Natural Earth shapefiles are read through cartopy.io.shapereader, so they must be available in the cartopy
+    data directory (or downloadable) the first time a given resolution is used.
+'''
+import os
+import logging
+
+import numpy
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+# Natural Earth (category, name) for each boundaries_info feature, matching the cartopy.feature definitions
+BOUNDARY_FEATURES = {'coastlines': ('physical', 'coastline'),
+                     'countries': ('cultural', 'admin_0_boundary_lines_land'),
+                     'states': ('cultural', 'admin_1_states_provinces_lakes'),
+                     'rivers': ('physical', 'rivers_lake_centerlines')}
+
+# Natural Earth resolutions, with the maximum map extent in degrees each is used for (cartopy's adaptive scaler)
+RESOLUTION_EXTENTS = [('10m', 15), ('50m', 50), ('110m', None)]
+
+# Maximum lon/lat segment length in degrees for each resolution - longer segments (ie, straight state and country
+# lines) are densified before projecting, so they follow the projected curve rather than a straight chord
+DENSIFY_DEGREES = {'10m': 0.05, '50m': 0.25, '110m': 1.0}
+
+# A segment crossing the projection antimeridian is a wraparound if its projected length exceeds this multiple of
+# its neighbouring segments
+WRAP_JUMP_FACTOR = 20.0
+
+# Increment when the computed geometry changes, so previously cached geometry files are not reused
+BOUNDARY_GEOMETRY_VERSION = 2
+
+# Degrees of padding around the area_def lat/lon bounds - geometries entirely outside the padded bounds are skipped
+LONLAT_BOUNDS_PAD = 2.0
+
+# In memory projected geometry, keyed by cache hash
+BOUNDARY_GEOMETRY_CACHE = {}
+# Maximum number of feature geometries held in BOUNDARY_GEOMETRY_CACHE - cleared when full
+MAX_BOUNDARY_GEOMETRY_CACHE_SIZE = 64
+
+
+def get_boundary_resolution(area_def):
+    ''' Return the Natural Earth resolution ('10m', '50m' or '110m') appropriate for the extent of area_def '''
+    from pyresample import utils
+    minlon, minlat, maxlon, maxlat = area_def.area_extent_ll
+    minlon = utils.wrap_longitudes(minlon)
+    maxlon = utils.wrap_longitudes(maxlon)
+    if minlon > maxlon:
+        maxlon += 360
+    extent = max(maxlon - minlon, maxlat - minlat)
+    for resolution, max_extent in RESOLUTION_EXTENTS:
+        if max_extent is None or extent <= max_extent:
+            return resolution
+    return RESOLUTION_EXTENTS[-1][0]
+
+
+def get_boundary_geometry_hash(proj4_params, extent, resolution, feature_name):
+    ''' Return a sha1 hash uniquely identifying the projected geometry of feature_name '''
+    from hashlib import sha1
+    hash_string = ''
+    for key in sorted(proj4_params.keys()):
+        hash_string += '{0}={1};'.format(key, proj4_params[key])
+    hash_string += str([float(val) for val in extent])
+    hash_string += '{0};{1};{2};{3}'.format(resolution, BOUNDARY_FEATURES[feature_name], feature_name,
+                                            BOUNDARY_GEOMETRY_VERSION)
+    return sha1(hash_string.encode('ascii')).hexdigest()
+
+
+def get_boundary_geometry_filename(area_id, feature_name, resolution, geometry_hash):
+    ''' Return the full path to the cached projected geometry file '''
+    fname = 'BOUNDARIES_{0}_{1}_{2}_{3}.npz'.format(area_id, feature_name, resolution, geometry_hash)
+    return os.path.join(gpaths['BOUNDARY_GEOMETRY_PATH'], fname)
+
+
+def iter_geometry_coords(geom):
+    ''' Yield an (N, 2) lon/lat array for every line or polygon ring in shapely geometry geom '''
+    if hasattr(geom, 'geoms'):
+        for part in geom.geoms:
+            for coords in iter_geometry_coords(part):
+                yield coords
+    elif hasattr(geom, 'exterior'):
+        yield numpy.asarray(geom.exterior.coords)[:, :2]
+        for interior in geom.interiors:
+            yield numpy.asarray(interior.coords)[:, :2]
+    else:
+        yield numpy.asarray(geom.coords)[:, :2]
+
+
+def densify_line(coords, max_step):
+    ''' Return lon/lat coords with points linearly interpolated so no segment is longer than max_step degrees
+
+    Args:
+        coords (numpy.ndarray) : (N, 2) lon/lat vertices
+        max_step (float) : maximum segment length in degrees
+
+    Returns:
+        (numpy.ndarray) : (M, 2) lon/lat vertices, M >= N, including all original vertices
+    '''
+    seg_lengths = numpy.hypot(*numpy.diff(coords, axis=0).T)
+    nsteps = numpy.maximum(numpy.ceil(seg_lengths / max_step), 1).astype(numpy.int64)
+    if (nsteps == 1).all():
+        return coords
+    seg_inds = numpy.repeat(numpy.arange(nsteps.size), nsteps)
+    fractions = (numpy.arange(seg_inds.size) - numpy.repeat(numpy.cumsum(nsteps) - nsteps, nsteps)) / nsteps[seg_inds]
+    points = coords[seg_inds] + fractions[:, None] * (coords[seg_inds + 1] - coords[seg_inds])
+    return numpy.vstack([points, coords[-1:]])
+
+
+def get_wraparound_segments(lons, proj_x, proj_y, lon_0, x_0=0.0):
+    ''' Return a boolean array, True for each segment that wraps around the edge of the projection
+
+    A segment wraps if it crosses the antimeridian of the projection (lon_0 + 180), its projected end points fall on
+    opposite sides of the projection center (a sign change in x), and it jumps across the map - its projected
+    length is more than WRAP_JUMP_FACTOR times that of its neighbouring segments.  Lines crossing the antimeridian
+    continuously (ie, around the pole in polar projections) are kept.
+
+    Args:
+        lons (numpy.ndarray) : longitudes of the densified line
+        proj_x (numpy.ndarray) : projected x coordinates of the line
+        proj_y (numpy.ndarray) : projected y coordinates of the line
+        lon_0 (float) : central longitude of the projection
+        x_0 (float) : DEFAULT 0.0, false easting of the projection
+
+    Returns:
+        (numpy.ndarray) : boolean array with one element per segment
+    '''
+    rel_lons = (lons - lon_0 + 180.0) % 360.0 - 180.0
+    crosses_antimeridian = numpy.abs(numpy.diff(rel_lons)) > 180.0
+    if not crosses_antimeridian.any():
+        return crosses_antimeridian
+    with numpy.errstate(invalid='ignore'):
+        changes_side = numpy.sign(proj_x[:-1] - x_0) != numpy.sign(proj_x[1:] - x_0)
+        seg_lengths = numpy.hypot(numpy.diff(proj_x), numpy.diff(proj_y))
+        # Longest adjacent segment - NaN if there are no (finite) neighbours, in which case the segment is dropped
+        neighbour_lengths = numpy.fmax(numpy.concatenate([[numpy.nan], seg_lengths[:-1]]),
+                                       numpy.concatenate([seg_lengths[1:], [numpy.nan]]))
+        jumps = ~(seg_lengths <= WRAP_JUMP_FACTOR * neighbour_lengths)
+    return crosses_antimeridian & changes_side & jumps
+
+
+def lonlat_bounds_intersect(geom_bounds, lonlat_bounds):
+    ''' Return True if lon/lat bounding box geom_bounds may intersect lonlat_bounds, allowing for longitude wrapping
+
+    Args:
+        geom_bounds (tuple) : (minlon, minlat, maxlon, maxlat) of a geometry, longitudes between -180 and 180
+        lonlat_bounds (tuple) : (minlon, minlat, maxlon, maxlat) of the area, as returned by
+                                geoips2.interface_modules.readers.utils.regular_grid.get_area_def_lonlat_bounds
+                                (maxlon may exceed 180)
+
+    Returns:
+        (bool) : False only if geom_bounds lies entirely outside lonlat_bounds
+    '''
+    gminlon, gminlat, gmaxlon, gmaxlat = geom_bounds
+    minlon, minlat, maxlon, maxlat = lonlat_bounds
+    if gmaxlat < minlat or gminlat > maxlat:
+        return False
+    if maxlon - minlon >= 360.0:
+        return True
+    for shift in [-360.0, 0.0, 360.0]:
+        if gmaxlon + shift >= minlon and gminlon + shift <= maxlon:
+            return True
+    return False
+
+
+def get_padded_lonlat_bounds(area_def, pad=LONLAT_BOUNDS_PAD):
+    ''' Return the lat/lon bounds of area_def, padded by pad degrees, for lonlat_bounds_intersect '''
+    from geoips2.interface_modules.readers.utils.regular_grid import get_area_def_lonlat_bounds
+    minlon, minlat, maxlon, maxlat = get_area_def_lonlat_bounds(area_def)
+    return minlon - pad, max(minlat - pad, -90.0), maxlon + pad, min(maxlat + pad, 90.0)
+
+
+def clip_projected_line(proj_x, proj_y, extent, wraps=None):
+    ''' Split a projected line into the runs of segments that may be visible within extent
+
+    Segments with an unprojectable end point, segments entirely outside extent, and segments wrapping around the
+    edge of the projection are removed.
+
+    Args:
+        proj_x (numpy.ndarray) : projected x coordinates of the line
+        proj_y (numpy.ndarray) : projected y coordinates of the line
+        extent (tuple) : (x0, x1, y0, y1) map extent in projected coordinates
+        wraps (numpy.ndarray) : DEFAULT None, boolean array, True for segments wrapping around the projection
+                                (see get_wraparound_segments)
+
+    Returns:
+        (list) : float32 (N, 2) arrays of visible line pieces
+    '''
+    x0, x1, y0, y1 = min(extent[:2]), max(extent[:2]), min(extent[2:]), max(extent[2:])
+    finite = numpy.isfinite(proj_x) & numpy.isfinite(proj_y) & (numpy.abs(proj_x) < 1e30) & (numpy.abs(proj_y) < 1e30)
+    seg_x0, seg_x1 = proj_x[:-1], proj_x[1:]
+    seg_y0, seg_y1 = proj_y[:-1], proj_y[1:]
+    with numpy.errstate(invalid='ignore'):
+        keep = finite[:-1] & finite[1:]
+        keep &= (numpy.maximum(seg_x0, seg_x1) >= x0) & (numpy.minimum(seg_x0, seg_x1) <= x1)
+        keep &= (numpy.maximum(seg_y0, seg_y1) >= y0) & (numpy.minimum(seg_y0, seg_y1) <= y1)
+    if wraps is not None:
+        keep &= ~wraps
+    if not keep.any():
+        return []
+    # Runs of consecutive kept segments become separate line pieces
+    edges = numpy.diff(numpy.concatenate([[0], keep.astype(numpy.int8), [0]]))
+    starts = numpy.where(edges == 1)[0]
+    ends = numpy.where(edges == -1)[0]
+    return [numpy.column_stack([proj_x[start:end + 1], proj_y[start:end + 1]]).astype(numpy.float32)
+            for start, end in zip(starts, ends)]
+
+
+def compute_boundary_geometry(proj4_params, extent, resolution, feature_name, lonlat_bounds=None):
+    ''' Read the Natural Earth feature_name geometries, project them with proj4_params, and clip to extent
+
+    Lines are densified in lon/lat (DENSIFY_DEGREES) before projecting, so they follow the projected curves.
+
+    Args:
+        proj4_params (dict) : proj4 parameters of the map projection
+        extent (tuple) : (x0, x1, y0, y1) map extent in projected coordinates
+        resolution (str) : Natural Earth resolution, '10m', '50m' or '110m'
+        feature_name (str) : one of 'coastlines', 'countries', 'states', 'rivers'
+        lonlat_bounds (tuple) : DEFAULT None, (minlon, minlat, maxlon, maxlat) - geometries and rings entirely
+                                outside these bounds are skipped before densifying (see get_padded_lonlat_bounds)
+
+    Returns:
+        (list) : float32 (N, 2) arrays of projected line pieces
+    '''
+    from pyproj import Proj
+    from cartopy.io import shapereader
+    category, name = BOUNDARY_FEATURES[feature_name]
+    shp_fname = shapereader.natural_earth(resolution=resolution, category=category, name=name)
+    reader = None
+    if lonlat_bounds is not None and lonlat_bounds[0] >= -180.0 and lonlat_bounds[2] <= 180.0:
+        # Newer cartopy skips records outside bbox without parsing them
+        try:
+            reader = shapereader.Reader(shp_fname, bbox=lonlat_bounds)
+        except TypeError:
+            reader = None
+    if reader is None:
+        reader = shapereader.Reader(shp_fname)
+    proj = Proj(proj4_params)
+    lon_0 = float(proj4_params.get('lon_0', 0.0))
+    x_0 = float(proj4_params.get('x_0', 0.0))
+    lines = []
+    for geom in reader.geometries():
+        if lonlat_bounds is not None and not lonlat_bounds_intersect(geom.bounds, lonlat_bounds):
+            continue
+        for coords in iter_geometry_coords(geom):
+            if coords.shape[0] < 2:
+                continue
+            if lonlat_bounds is not None and not lonlat_bounds_intersect(
+                    (coords[:, 0].min(), coords[:, 1].min(), coords[:, 0].max(), coords[:, 1].max()), lonlat_bounds):
+                continue
+            coords = densify_line(numpy.asarray(coords, dtype=numpy.float64), DENSIFY_DEGREES[resolution])
+            proj_x, proj_y = proj(coords[:, 0], coords[:, 1])
+            proj_x = numpy.asarray(proj_x, dtype=numpy.float64)
+            proj_y = numpy.asarray(proj_y, dtype=numpy.float64)
+            wraps = get_wraparound_segments(coords[:, 0], proj_x, proj_y, lon_0, x_0)
+            lines += clip_projected_line(proj_x, proj_y, extent, wraps=wraps)
+    return lines
+
+
+def read_boundary_geometry(fname):
+    ''' Read projected line pieces written by write_boundary_geometry, returning None if not readable '''
+    try:
+        with numpy.load(fname) as npz:
+            vertices = npz['vertices']
+            offsets = npz['offsets']
+    except (IOError, OSError, ValueError, KeyError) as resp:
+        LOG.warning('Could not read boundary geometry file %s, recomputing: %s', fname, resp)
+        return None
+    if offsets.size < 2:
+        return []
+    return numpy.split(vertices, offsets[1:-1])
+
+
+def write_boundary_geometry(fname, lines):
+    ''' Write line pieces as concatenated vertices and offsets, through a temporary file so concurrent readers
+        never see a partial file.  The geometry file is only a cache - failing to write it is logged and ignored.
+    '''
+    from geoips2.filenames.base_paths import atomic_output_fname
+    offsets = numpy.cumsum([0] + [line.shape[0] for line in lines])
+    vertices = numpy.concatenate(lines) if lines else numpy.zeros((0, 2), dtype=numpy.float32)
+    try:
+        with atomic_output_fname(fname) as tmp_fname:
+            with open(tmp_fname, 'wb') as fobj:
+                numpy.savez(fobj, vertices=vertices, offsets=offsets)
+        LOG.info('Wrote boundary geometry to %s', fname)
+    except (IOError, OSError) as resp:
+        LOG.warning('Could not write boundary geometry file %s: %s', fname, resp)
+
+
+def get_boundary_geometry(mapobj, area_def, feature_name, resolution=None):
+    ''' Return the projected, clipped line pieces of feature_name for cartopy projection mapobj
+
+    Geometry is looked up in memory, then on disk, and only computed if not found in either.  Geometry for dynamic
+    sectors is only cached in memory.
+
+    Args:
+        mapobj (cartopy.crs.Projection) : map projection, boundaries are clipped to mapobj.bounds
+        area_def (AreaDefinition) : pyresample AreaDefinition, for the default resolution and file names
+        feature_name (str) : one of 'coastlines', 'countries', 'states', 'rivers'
+        resolution (str) : DEFAULT None, Natural Earth resolution, from get_boundary_resolution if None
+
+    Returns:
+        (list) : float32 (N, 2) arrays of line pieces in mapobj projected coordinates
+    '''
+    if resolution is None:
+        resolution = get_boundary_resolution(area_def)
+    # Newer pyresample builds the cartopy projection from WKT, leaving proj4_params empty
+    proj4_params = dict(mapobj.proj4_params) or dict(area_def.proj_dict)
+    extent = tuple(float(val) for val in mapobj.bounds)
+    geometry_hash = get_boundary_geometry_hash(proj4_params, extent, resolution, feature_name)
+    if geometry_hash in BOUNDARY_GEOMETRY_CACHE:
+        return BOUNDARY_GEOMETRY_CACHE[geometry_hash]
+
+    from geoips2.sector_utils.utils import is_dynamic_sector
+    # Dynamic sectors rarely repeat exactly, so writing their geometry to disk would only accumulate files
+    fname = None
+    if not is_dynamic_sector(area_def):
+        fname = get_boundary_geometry_filename(area_def.area_id, feature_name, resolution, geometry_hash)
+    lines = None
+    if fname is not None and os.path.exists(fname):
+        LOG.info('Reading cached boundary geometry from %s', fname)
+        lines = read_boundary_geometry(fname)
+
+    if lines is None:
+        LOG.info('Projecting %s %s boundaries for %s', resolution, feature_name, area_def.area_id)
+        lines = compute_boundary_geometry(proj4_params, extent, resolution, feature_name,
+                                          lonlat_bounds=get_padded_lonlat_bounds(area_def))
+        if fname is not None:
+            write_boundary_geometry(fname, lines)
+
+    if len(BOUNDARY_GEOMETRY_CACHE) >= MAX_BOUNDARY_GEOMETRY_CACHE_SIZE:
+        BOUNDARY_GEOMETRY_CACHE.clear()
+    BOUNDARY_GEOMETRY_CACHE[geometry_hash] = lines
+    return lines
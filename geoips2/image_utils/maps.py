@@ -435,15 +435,20 @@ def set_boundaries_info_dict(boundaries_info):
     return use_boundaries_info
 
 
-def draw_boundaries(mapobj, curr_ax, boundaries_info, zorder=None):
+def draw_boundaries(mapobj, curr_ax, boundaries_info, zorder=None, area_def=None):
     ''' Draw boundaries on specified map instance (basemap or cartopy), based on specs found in boundaries_info
 
+    With cartopy and a specified area_def, boundaries are drawn from the cached pre-projected geometry in
+    geoips2.image_utils.boundary_geometry, falling back to cartopy's Natural Earth features if unavailable.
+
     Args:
         mapobj (map object) : Basemap or CRS object for plotting boundaries
         curr_ax (matplotlib.axes._axes.Axes) : matplotlib Axes object for plotting boundaries
         boundaries_info (dict) : Dictionary of parameters for plotting map boundaries.
                                  See geoips2.image_utils.maps.check_boundaries_info_dict
                                       for required dictionary entries and defaults.
+        zorder (int) : DEFAULT None, matplotlib zorder for the boundaries
+        area_def (AreaDefinition) : DEFAULT None, pyresample AreaDefinition, required for cached cartopy geometry
 
     Returns:
         No return values
@@ -460,27 +465,36 @@ def draw_boundaries(mapobj, curr_ax, boundaries_info, zorder=None):
 
     if is_crs(mapobj):
         LOG.info('    Plotting with cartopy')
+        from matplotlib.collections import LineCollection
+        from geoips2.image_utils.boundary_geometry import get_boundary_geometry
         import cartopy.feature as cfeature
-        if boundaries_info['request_coastlines']:
-            curr_ax.add_feature(cfeature.COASTLINE,
-                                edgecolor=boundaries_info['coastlines_color'],
-                                linewidth=boundaries_info['coastlines_linewidth'],
-                                **extra_args)
-        if boundaries_info['request_countries']:
-            curr_ax.add_feature(cfeature.BORDERS,
-                                edgecolor=boundaries_info['countries_color'],
-                                linewidth=boundaries_info['countries_linewidth'],
-                                **extra_args)
-        if boundaries_info['request_states']:
-            curr_ax.add_feature(cfeature.STATES,
-                                edgecolor=boundaries_info['states_color'],
-                                linewidth=boundaries_info['states_linewidth'],
-                                **extra_args)
-        if boundaries_info['request_rivers']:
-            curr_ax.add_feature(cfeature.RIVERS,
-                                edgecolor=boundaries_info['rivers_color'],
-                                linewidth=boundaries_info['rivers_linewidth'],
-                                **extra_args)
+        cartopy_features = {'coastlines': cfeature.COASTLINE,
+                            'countries': cfeature.BORDERS,
+                            'states': cfeature.STATES,
+                            'rivers': cfeature.RIVERS}
+        for feature_name in ['coastlines', 'countries', 'states', 'rivers']:
+            if not boundaries_info['request_{0}'.format(feature_name)]:
+                continue
+            color = boundaries_info['{0}_color'.format(feature_name)]
+            linewidth = boundaries_info['{0}_linewidth'.format(feature_name)]
+            lines = None
+            if area_def is not None:
+                try:
+                    # Pre-projected, pre-clipped geometry in mapobj coordinates - no per-draw projection
+                    lines = get_boundary_geometry(mapobj, area_def, feature_name)
+                except (IOError, OSError, ValueError, AttributeError) as resp:
+                    LOG.warning('    Could not get cached %s geometry, using cartopy feature: %s', feature_name, resp)
+            if lines is None:
+                curr_ax.add_feature(cartopy_features[feature_name],
+                                    edgecolor=color,
+                                    linewidth=linewidth,
+                                    **extra_args)
+                continue
+            curr_ax.add_collection(LineCollection(lines,
+                                                  colors=color,
+                                                  linewidths=linewidth,
+                                                  transform=mapobj,
+                                                  **extra_args))
     else:
         LOG.info('    Plotting with basemap')
         if boundaries_info['request_coastlines']:
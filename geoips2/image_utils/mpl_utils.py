@@ -16,7 +16,6 @@
 
 # Python Standard Libraries
 import logging
-import matplotlib
 
 LOG = logging.getLogger(__name__)
 
@@ -87,7 +86,7 @@ def alpha_from_masked_arrays(arrays):
 
 
 def plot_overlays(mapobj, curr_ax, area_def, boundaries_info, gridlines_info,
-                  boundaries_zorder=None, gridlines_zorder=None):
+                  boundaries_zorder=None, gridlines_zorder=None, use_template=False):
     ''' Plot specified coastlines and gridlines on the matplotlib axes.
 
     Args:
@@ -101,6 +100,10 @@ def plot_overlays(mapobj, curr_ax, area_def, boundaries_info, gridlines_info,
                                 If a field is not included in the dictionary, the default is used for that field.
                                  See geoips2.image_utils.maps.set_gridlines_info_dict
                                      for required fields and defaults
+        use_template (bool) : DEFAULT False, if True and no zorders are specified, composite the cached overlay
+                              template for this area_def and figure geometry on top of all axes, rather than
+                              drawing the overlays directly.  Only use when nothing is plotted after the overlays.
+                              See geoips2.image_utils.overlay_template
     Returns:
         No return values. Overlays are plotted directly on the mapobj and ax instances.
 
@@ -110,8 +113,15 @@ def plot_overlays(mapobj, curr_ax, area_def, boundaries_info, gridlines_info,
     use_boundaries_info = set_boundaries_info_dict(boundaries_info)
     use_gridlines_info = set_gridlines_info_dict(gridlines_info, area_def)
 
+    if use_template and boundaries_zorder is None and gridlines_zorder is None:
+        from geoips2.image_utils.overlay_template import get_overlay_template, composite_overlay_template
+        rgba, bounds = get_overlay_template(curr_ax.figure, curr_ax, mapobj, area_def,
+                                            use_boundaries_info, use_gridlines_info)
+        composite_overlay_template(curr_ax.figure, rgba, bounds)
+        return
+
     from geoips2.image_utils.maps import draw_boundaries
-    draw_boundaries(mapobj, curr_ax, use_boundaries_info, zorder=boundaries_zorder)
+    draw_boundaries(mapobj, curr_ax, use_boundaries_info, zorder=boundaries_zorder, area_def=area_def)
 
     from geoips2.image_utils.maps import draw_gridlines
     draw_gridlines(mapobj, area_def, curr_ax, use_gridlines_info, zorder=gridlines_zorder)
@@ -135,10 +145,14 @@ def save_image(fig, out_fname, is_final=True, image_datetime=None, remove_duplic
     rc_params = matplotlib.rcParams
     from os.path import dirname, exists as pathexists
     from geoips2.filenames.base_paths import make_dirs
+    from geoips2.image_utils.overlay_template import OVERLAY_TEMPLATE_AX_LABEL
     if is_final:
         if not pathexists(dirname(out_fname)):
             make_dirs(dirname(out_fname))
         for ax in fig.axes:
+            if ax.get_label() == OVERLAY_TEMPLATE_AX_LABEL:
+                # The composited overlay template is an image, never annotated
+                continue
             LOG.info('Adding ax to %s', ax)
             ax.set_axis_on()
         # final with titles, labels, etc.  Note bbox_inches='tight' removes white space, pad_inches=0.1 puts back in
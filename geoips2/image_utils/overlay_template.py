@@ -0,0 +1,164 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Reusable boundaries and gridlines overlay templates.
+
+    Every annotated image of a sector has identical map chrome - coastlines, countries, states, rivers, gridlines
+    and gridline labels.  Rather than having cartopy or basemap clip and project the boundary features for every
+    product, the overlay layer is rendered once per (area_def, boundaries_info, gridlines_info, figure size,
+    main axes position, dpi, font size) onto a transparent figure, stored as an RGBA raster, and composited onto
+    each product's figure in an axes covering exactly the non-transparent pixels of the template.
+
+    Since the template axes covers the gridline labels, bbox_inches='tight' crops the final image as it would
+    have with the overlays drawn directly.
+'''
+import logging
+
+LOG = logging.getLogger(__name__)
+
+# In memory overlay templates, keyed by get_overlay_template_key
+OVERLAY_TEMPLATE_CACHE = {}
+# Maximum number of cached overlay templates
+MAX_OVERLAY_TEMPLATE_CACHE_SIZE = 32
+
+# Label of the composited template axes, so save_image leaves its axis off for final imagery
+OVERLAY_TEMPLATE_AX_LABEL = 'geoips2_overlay_template'
+
+
+def get_overlay_template_key(fig, main_ax, mapobj, area_def, boundaries_info, gridlines_info):
+    ''' Return a hashable key identifying the overlay layer drawn on main_ax
+
+    Args:
+        fig (matplotlib.figure.Figure) : product figure
+        main_ax (matplotlib.axes._axes.Axes) : product main axes
+        mapobj (map object) : Basemap or CRS object
+        area_def (AreaDefinition) : pyresample AreaDefinition of the image
+        boundaries_info (dict) : complete boundaries_info, from maps.set_boundaries_info_dict
+        gridlines_info (dict) : complete gridlines_info, from maps.set_gridlines_info_dict
+
+    Returns:
+        (tuple) : key for OVERLAY_TEMPLATE_CACHE
+    '''
+    import matplotlib
+    from geoips2.image_utils.maps import is_crs
+    proj_dict = getattr(area_def, 'proj_dict', {})
+    return (area_def.area_id,
+            repr(sorted(proj_dict.items())),
+            repr([float(val) for val in area_def.area_extent]),
+            tuple(area_def.shape),
+            repr(sorted(boundaries_info.items())),
+            repr(sorted(gridlines_info.items())),
+            tuple(int(round(val)) for val in fig.get_size_inches() * fig.dpi),
+            float(fig.dpi),
+            tuple(float(val) for val in main_ax.get_position().bounds),
+            tuple(float(val) for val in main_ax.get_xlim() + main_ax.get_ylim()),
+            repr(matplotlib.rcParams['font.size']),
+            is_crs(mapobj))
+
+
+def render_overlay_template(fig, main_ax, mapobj, area_def, boundaries_info, gridlines_info):
+    ''' Draw the boundaries and gridlines on a transparent copy of the product figure geometry
+
+    Args:
+        fig (matplotlib.figure.Figure) : product figure, for figure size and dpi
+        main_ax (matplotlib.axes._axes.Axes) : product main axes, for position and map limits
+        mapobj (map object) : Basemap or CRS object
+        area_def (AreaDefinition) : pyresample AreaDefinition of the image
+        boundaries_info (dict) : complete boundaries_info, from maps.set_boundaries_info_dict
+        gridlines_info (dict) : complete gridlines_info, from maps.set_gridlines_info_dict
+
+    Returns:
+        (tuple) : (uint8 RGBA array cropped to the non-transparent pixels,
+                   (col0, row0, col1, row1) pixel bounds of the cropped array within the full figure),
+                  or (None, None) if nothing was drawn
+    '''
+    import numpy
+    import matplotlib.pyplot as plt
+    from geoips2.image_utils.maps import is_crs, draw_boundaries, draw_gridlines
+
+    template_fig = plt.figure(dpi=fig.dpi)
+    template_fig.set_size_inches(fig.get_size_inches())
+    if is_crs(mapobj):
+        template_ax = template_fig.add_axes(main_ax.get_position().bounds, projection=mapobj, frame_on=False)
+    else:
+        template_ax = template_fig.add_axes(main_ax.get_position().bounds, frame_on=False)
+    template_ax.set_axis_off()
+
+    draw_boundaries(mapobj, template_ax, boundaries_info, area_def=area_def)
+    draw_gridlines(mapobj, area_def, template_ax, gridlines_info)
+    # Drawing may reset the limits (ie, basemap set_axes_limits) - match the product axes exactly
+    template_ax.set_xlim(main_ax.get_xlim())
+    template_ax.set_ylim(main_ax.get_ylim())
+
+    template_fig.patch.set_alpha(0)
+    template_ax.patch.set_alpha(0)
+    template_fig.canvas.draw()
+    rgba = numpy.asarray(template_fig.canvas.buffer_rgba()).copy()
+    plt.close(template_fig)
+
+    rows = numpy.where(rgba[:, :, 3].any(axis=1))[0]
+    cols = numpy.where(rgba[:, :, 3].any(axis=0))[0]
+    if not rows.size:
+        return None, None
+    bounds = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+    return rgba[bounds[1]:bounds[3], bounds[0]:bounds[2]], bounds
+
+
+def get_overlay_template(fig, main_ax, mapobj, area_def, boundaries_info, gridlines_info):
+    ''' Return the cached overlay template for the product figure, rendering it only if not already cached
+
+    Args: see render_overlay_template
+
+    Returns:
+        (tuple) : (RGBA array, pixel bounds), see render_overlay_template
+    '''
+    key = get_overlay_template_key(fig, main_ax, mapobj, area_def, boundaries_info, gridlines_info)
+    if key in OVERLAY_TEMPLATE_CACHE:
+        LOG.info('Using cached overlay template for %s', area_def.area_id)
+        return OVERLAY_TEMPLATE_CACHE[key]
+
+    LOG.info('Rendering overlay template for %s', area_def.area_id)
+    template = render_overlay_template(fig, main_ax, mapobj, area_def, boundaries_info, gridlines_info)
+    if len(OVERLAY_TEMPLATE_CACHE) >= MAX_OVERLAY_TEMPLATE_CACHE_SIZE:
+        OVERLAY_TEMPLATE_CACHE.clear()
+    OVERLAY_TEMPLATE_CACHE[key] = template
+    return template
+
+
+def composite_overlay_template(fig, rgba, bounds):
+    ''' Composite the overlay template onto fig, in a new axes on top of all existing axes
+
+    Args:
+        fig (matplotlib.figure.Figure) : product figure
+        rgba (numpy.ndarray) : uint8 RGBA template array, from get_overlay_template
+        bounds (tuple) : (col0, row0, col1, row1) pixel bounds of rgba within the figure
+
+    Returns:
+        (matplotlib.axes._axes.Axes) : the template axes, or None if the template is empty
+    '''
+    if rgba is None:
+        return None
+    fig_width, fig_height = [int(round(val)) for val in fig.get_size_inches() * fig.dpi]
+    col0, row0, col1, row1 = bounds
+    # Figure coordinates start at the bottom left, image rows at the top
+    ax_rect = [float(col0) / fig_width,
+               1.0 - float(row1) / fig_height,
+               float(col1 - col0) / fig_width,
+               float(row1 - row0) / fig_height]
+    template_ax = fig.add_axes(ax_rect, label=OVERLAY_TEMPLATE_AX_LABEL, frame_on=False)
+    template_ax.patch.set_alpha(0)
+    template_ax.imshow(rgba, interpolation='none', aspect='auto')
+    template_ax.set_zorder(max([ax.get_zorder() for ax in fig.axes]) + 1)
+    template_ax.set_axis_off()
+    return template_ax
@@ -0,0 +1,186 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Direct RGBA rasterization of clean imagery, without creating a matplotlib figure.
+
+    A clean image is the data array colormapped at exactly the area_def shape, so rather than plotting with
+    imshow and saving with savefig, the mpl_colors_info norm and colormap (including bad / under / over colors)
+    are applied as a single vectorized lookup table operation, and the resulting RGBA array is encoded directly
+    to PNG.
+
+    The direct path is only used when GEOIPS_DIRECT_RGBA is set.  render_clean_rgba_matplotlib reproduces the
+    original figure based path, for checking the direct output against matplotlib with compare_clean_rgba
+    (tests/scripts/clean_rgba_compare.sh).
+'''
+import os
+import logging
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+# Output formats supported by the direct rasterizer - all others use the matplotlib figure based path
+RGBA_RASTER_EXTENSIONS = ['.png']
+
+
+def can_rasterize_directly(data, out_fnames):
+    ''' Return True if data can be written to all out_fnames with the direct RGBA rasterizer
+
+    Args:
+        data (numpy.ndarray) : 2-D data array, or 3-D RGB / RGBA array
+        out_fnames (list) : list of output filenames
+
+    Returns:
+        (bool) : True if GEOIPS_DIRECT_RGBA is set, data are 2-D or RGB(A), and all out_fnames are PNG files
+    '''
+    if not gpaths['GEOIPS_DIRECT_RGBA']:
+        return False
+    if data.ndim not in [2, 3] or (data.ndim == 3 and data.shape[2] not in [3, 4]):
+        return False
+    return all([os.path.splitext(fname)[1].lower() in RGBA_RASTER_EXTENSIONS for fname in out_fnames])
+
+
+def rgb_to_rgba_bytes(data):
+    ''' Convert a 3-D RGB or RGBA array to uint8 RGBA, following matplotlib's imshow conventions
+
+    Floating point arrays are 0 to 1, integer arrays 0 to 255.  Masked pixels are fully transparent.
+    '''
+    import numpy
+    mask = numpy.ma.getmaskarray(data).any(axis=2)
+    values = numpy.ma.getdata(data)
+    if values.dtype.kind == 'f':
+        values = (numpy.clip(values, 0, 1) * 255).astype(numpy.uint8)
+    else:
+        values = numpy.clip(values, 0, 255).astype(numpy.uint8)
+    rgba = numpy.empty(values.shape[:2] + (4,), dtype=numpy.uint8)
+    rgba[:, :, :3] = values[:, :, :3]
+    rgba[:, :, 3] = values[:, :, 3] if values.shape[2] == 4 else 255
+    rgba[mask, 3] = 0
+    return rgba
+
+
+def colormap_to_rgba_bytes(data, mpl_colors_info):
+    ''' Apply the mpl_colors_info norm and colormap to 2-D data as a uint8 RGBA lookup
+
+    Args:
+        data (numpy.ndarray or numpy.ma.MaskedArray) : 2-D data array.  Masked and non-finite values use the
+                                                       colormap's bad color.
+        mpl_colors_info (dict) : Specifies matplotlib Colors parameters, as used by plot_image
+
+    Returns:
+        (numpy.ndarray) : uint8 array of shape data.shape + (4,)
+    '''
+    import numpy
+    import matplotlib
+    from matplotlib import cm
+    from matplotlib.colors import Normalize
+    cmap = mpl_colors_info.get('cmap')
+    if cmap is None:
+        cmap = cm.get_cmap(matplotlib.rcParams['image.cmap'])
+    norm = mpl_colors_info.get('norm')
+    data = numpy.ma.masked_invalid(data, copy=False)
+    if norm is None:
+        # Matches imshow's autoscaling when no norm is specified
+        norm = Normalize()
+    # Colormap.__call__ with bytes=True indexes the uint8 lookup table directly, including under / over / bad
+    return cmap(norm(data), bytes=True)
+
+
+def data_to_rgba_bytes(data, mpl_colors_info):
+    ''' Return the uint8 RGBA clean image for data, for either 2-D data or 3-D RGB(A) arrays '''
+    if data.ndim == 3:
+        return rgb_to_rgba_bytes(data)
+    return colormap_to_rgba_bytes(data, mpl_colors_info)
+
+
+def save_rgba_image(rgba, out_fname, image_datetime=None, remove_duplicate_minrange=None):
+    ''' Encode the uint8 RGBA array directly to out_fname, logging consistently with mpl_utils.save_image
+
+    Args:
+        rgba (numpy.ndarray) : uint8 array of shape (rows, cols, 4)
+        out_fname (str) : full path to output PNG file
+        image_datetime (datetime) : DEFAULT None, data time for LATENCY logging
+        remove_duplicate_minrange (int) : DEFAULT None, passed to mpl_utils.remove_duplicates
+
+    Returns:
+        (list) : [out_fname]
+    '''
+    from matplotlib.image import imsave
+    from geoips2.filenames.base_paths import make_dirs
+    from geoips2.image_utils.mpl_utils import remove_duplicates
+    make_dirs(os.path.dirname(out_fname))
+    LOG.info('Writing %s', out_fname)
+    imsave(out_fname, rgba)
+    if remove_duplicate_minrange is not None:
+        remove_duplicates(out_fname, remove_duplicate_minrange)
+    LOG.info('IMAGESUCCESS wrote %s', out_fname)
+    if image_datetime is not None:
+        from datetime import datetime
+        LOG.info('LATENCY %s %s', datetime.utcnow() - image_datetime, out_fname)
+    return [out_fname]
+
+
+def render_clean_rgba_matplotlib(area_def, data, mpl_colors_info):
+    ''' Render the clean image for data with the original matplotlib figure based path, returning uint8 RGBA
+
+    Args:
+        area_def (AreaDefinition) : pyresample AreaDefinition of the image
+        data (numpy.ndarray) : data array, as passed to plot_image
+        mpl_colors_info (dict) : Specifies matplotlib Colors parameters, as passed to plot_image
+
+    Returns:
+        (numpy.ndarray) : uint8 array of shape (y_size, x_size, 4)
+    '''
+    import numpy
+    import matplotlib.pyplot as plt
+    from geoips2.image_utils.mpl_utils import create_figure_and_main_ax_and_mapobj, plot_image
+    fig, main_ax, mapobj = create_figure_and_main_ax_and_mapobj(area_def.x_size, area_def.y_size, area_def,
+                                                                noborder=True)
+    plot_image(main_ax, data, mapobj, mpl_colors_info=mpl_colors_info)
+    for ax in fig.axes:
+        ax.set_axis_off()
+    fig.patch.set_alpha(0)
+    main_ax.patch.set_alpha(0)
+    fig.canvas.draw()
+    rgba = numpy.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return rgba
+
+
+def compare_clean_rgba(area_def, data, mpl_colors_info, tolerance=1):
+    ''' Compare the direct RGBA rasterization of data against the matplotlib figure based rendering
+
+    Args:
+        area_def (AreaDefinition) : pyresample AreaDefinition of the image
+        data (numpy.ndarray) : data array, as passed to plot_image
+        mpl_colors_info (dict) : Specifies matplotlib Colors parameters
+        tolerance (int) : DEFAULT 1, maximum allowed difference in any 0-255 channel value
+
+    Returns:
+        (tuple) : (bool, fraction of pixels differing by more than tolerance, maximum channel difference)
+    '''
+    import numpy
+    direct = data_to_rgba_bytes(data, mpl_colors_info).astype(numpy.int16)
+    reference = render_clean_rgba_matplotlib(area_def, data, mpl_colors_info).astype(numpy.int16)
+    if direct.shape != reference.shape:
+        LOG.warning('Direct RGBA shape %s does not match matplotlib shape %s', direct.shape, reference.shape)
+        return False, 1.0, 255
+    diff = numpy.abs(direct - reference)
+    # Fully transparent pixels match regardless of color
+    diff[(direct[:, :, 3] == 0) & (reference[:, :, 3] == 0)] = 0
+    bad_fraction = float(numpy.count_nonzero(diff.max(axis=2) > tolerance)) / diff.shape[0] / diff.shape[1]
+    max_diff = int(diff.max())
+    LOG.info('Direct RGBA vs matplotlib: max difference %s, %s fraction of pixels beyond tolerance %s',
+             max_diff, bad_fraction, tolerance)
+    return bad_fraction == 0, bad_fraction, max_diff
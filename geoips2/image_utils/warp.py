@@ -0,0 +1,180 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Cached nearest neighbor reprojection warps from an AreaDefinition grid to a cartopy map projection.
+
+    Rather than having cartopy re-warp the full data array on every imshow call, the index of the source
+    pixel for every target pixel is computed once per (source area_def, target projection, target shape),
+    stored in memory and under PATHS['WARP_INDEX_PATH'], and applied to each new data array with a single
+    numpy gather.  The warped array is already in the map projection, so it is drawn with a plain imshow.
+'''
+import os
+import logging
+
+import numpy
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+# In memory warp indices, keyed by cache hash
+WARP_INDEX_CACHE = {}
+
+
+def get_target_extent(mapobj):
+    ''' Return the (x0, x1, y0, y1) extent of the full cartopy projection mapobj, in projection coordinates '''
+    return (float(mapobj.x_limits[0]), float(mapobj.x_limits[1]),
+            float(mapobj.y_limits[0]), float(mapobj.y_limits[1]))
+
+
+def get_warp_hash(area_def, target_proj4_params, target_extent, target_shape):
+    ''' Return a sha1 hash uniquely identifying the warp from area_def to the target grid
+
+    Sorted string representations are used so the hash is consistent from one Python run to the next.
+    '''
+    from hashlib import sha1
+    hash_string = ''
+    for key in sorted(area_def.proj_dict.keys()):
+        hash_string += '{0}={1};'.format(key, area_def.proj_dict[key])
+    hash_string += str([float(val) for val in area_def.area_extent])
+    hash_string += str(tuple(area_def.shape))
+    for key in sorted(target_proj4_params.keys()):
+        hash_string += '{0}={1};'.format(key, target_proj4_params[key])
+    hash_string += str([float(val) for val in target_extent])
+    hash_string += str(tuple(target_shape))
+    return sha1(hash_string.encode('ascii')).hexdigest()
+
+
+def get_warp_cache_filename(area_def, warp_hash, target_shape):
+    ''' Return the full path to the cached warp index file for warp_hash '''
+    fname = 'WARPINDS_{0}_{1}x{2}_{3}x{4}_{5}.npy'.format(area_def.area_id,
+                                                          area_def.shape[0], area_def.shape[1],
+                                                          target_shape[0], target_shape[1],
+                                                          warp_hash)
+    return os.path.join(gpaths['WARP_INDEX_PATH'], fname)
+
+
+def compute_warp_indices(area_def, target_proj4_params, target_extent, target_shape):
+    ''' Compute the flattened area_def index of the nearest source pixel for each target pixel
+
+    Args:
+        area_def (pyresample.AreaDefinition) : source data grid
+        target_proj4_params (dict) : proj4 parameters of the target map projection
+        target_extent (tuple) : (x0, x1, y0, y1) of the target grid, in target projection coordinates
+        target_shape (tuple) : (rows, cols) of the target grid
+
+    Returns:
+        (numpy.ndarray) : int64 array of shape target_shape, -1 where the target pixel is off the earth or
+                          outside area_def
+    '''
+    from pyproj import Proj
+    x0, x1, y0, y1 = target_extent
+    rows, cols = target_shape
+    # Target pixel centers, top row first to match imshow origin='upper'
+    target_x = x0 + (numpy.arange(cols) + 0.5) * (x1 - x0) / cols
+    target_y = y1 - (numpy.arange(rows) + 0.5) * (y1 - y0) / rows
+    target_x, target_y = numpy.meshgrid(target_x, target_y)
+
+    lons, lats = Proj(target_proj4_params)(target_x, target_y, inverse=True)
+    valid = numpy.isfinite(lons) & numpy.isfinite(lats) & (numpy.abs(lats) <= 90)
+    lons = numpy.where(valid, lons, 0.0)
+    lats = numpy.where(valid, lats, 0.0)
+
+    source_x, source_y = Proj(area_def.proj_dict)(lons, lats)
+    valid &= numpy.isfinite(source_x) & numpy.isfinite(source_y)
+    source_x = numpy.where(valid, source_x, area_def.area_extent[0])
+    source_y = numpy.where(valid, source_y, area_def.area_extent[3])
+
+    source_cols = numpy.floor((source_x - area_def.area_extent[0]) / area_def.pixel_size_x).astype(numpy.int64)
+    source_rows = numpy.floor((area_def.area_extent[3] - source_y) / area_def.pixel_size_y).astype(numpy.int64)
+    valid &= (source_cols >= 0) & (source_cols < area_def.shape[1])
+    valid &= (source_rows >= 0) & (source_rows < area_def.shape[0])
+
+    inds = source_rows * area_def.shape[1] + source_cols
+    inds[~valid] = -1
+    return inds
+
+
+def get_warp_indices(area_def, mapobj, target_shape):
+    ''' Return cached warp indices from area_def to the full extent of cartopy projection mapobj
+
+    Indices are looked up in memory, then on disk, and only computed if not found in either.
+
+    Args:
+        area_def (pyresample.AreaDefinition) : source data grid
+        mapobj (cartopy.crs.Projection) : target map projection
+        target_shape (tuple) : (rows, cols) of the target grid, generally the image size in pixels
+
+    Returns:
+        (tuple) : (warp indices (see compute_warp_indices), target extent (x0, x1, y0, y1))
+    '''
+    target_extent = get_target_extent(mapobj)
+    target_proj4_params = dict(mapobj.proj4_params)
+    warp_hash = get_warp_hash(area_def, target_proj4_params, target_extent, target_shape)
+    if warp_hash in WARP_INDEX_CACHE:
+        return WARP_INDEX_CACHE[warp_hash], target_extent
+
+    fname = get_warp_cache_filename(area_def, warp_hash, target_shape)
+    inds = None
+    if os.path.exists(fname):
+        LOG.info('Reading cached warp indices from %s', fname)
+        try:
+            inds = numpy.load(fname, mmap_mode='r')
+        except (IOError, ValueError) as resp:
+            LOG.warning('Could not read warp index file %s, recomputing: %s', fname, resp)
+        if inds is not None and inds.shape != tuple(target_shape):
+            LOG.warning('Mismatched warp index file shape %s in %s, recomputing', inds.shape, fname)
+            inds = None
+
+    if inds is None:
+        LOG.info('Computing warp indices for %s to %s %s', area_def.area_id, mapobj.proj4_init, target_shape)
+        inds = compute_warp_indices(area_def, target_proj4_params, target_extent, target_shape)
+        write_warp_indices(fname, inds)
+
+    WARP_INDEX_CACHE[warp_hash] = inds
+    return inds, target_extent
+
+
+def write_warp_indices(fname, inds):
+    ''' Write warp indices to fname, through a temporary file so concurrent readers never see a partial file.
+
+    The warp index file is only a cache - failing to write it is logged, and never fails the product.
+    '''
+    from geoips2.filenames.base_paths import atomic_output_fname
+    try:
+        with atomic_output_fname(fname) as tmp_fname:
+            with open(tmp_fname, 'wb') as fobj:
+                numpy.save(fobj, inds)
+        LOG.info('Wrote warp indices to %s', fname)
+    except (IOError, OSError) as resp:
+        LOG.warning('Could not write warp index file %s: %s', fname, resp)
+
+
+def warp_data(data, inds):
+    ''' Apply warp indices to data with a single gather
+
+    Args:
+        data (numpy.ndarray or numpy.ma.MaskedArray) : 2-D data on the source area_def grid
+        inds (numpy.ndarray) : warp indices from get_warp_indices
+
+    Returns:
+        (numpy.ma.MaskedArray) : data on the target grid, masked where inds is -1 or the source data are masked
+    '''
+    data = numpy.ma.asarray(data)
+    flat_data = data.filled().ravel()
+    flat_mask = numpy.ma.getmaskarray(data).ravel()
+    inds = numpy.asarray(inds)
+    invalid = inds < 0
+    safe_inds = numpy.where(invalid, 0, inds)
+    return numpy.ma.masked_array(flat_data[safe_inds], mask=invalid | flat_mask[safe_inds])
@@ -20,11 +20,9 @@ import logging
 from os.path import join as pathjoin, splitext as pathsplitext
 from os.path import dirname as pathdirname, basename as pathbasename, exists as pathexists
 from datetime import datetime, timedelta
-from glob import glob
 from os import unlink as osunlink
 
 from geoips2.filenames.base_paths import PATHS as gpaths
-from geoips2.data_manipulations.merge import minrange
 
 LOG = logging.getLogger(__name__)
 
@@ -103,72 +101,79 @@ def tc_fname(area_def, xarray_obj, product_name, coverage, output_type='png', ou
     return web_fname
 
 
+def tc_fname_parse(fname):
+    ''' Parse a TC web filename into the fields used by the product index for duplicate removal.
+
+    Args:
+        fname (str) : Full path to TC web filename (png or png.yaml)
+
+    Returns:
+        (dict) : Dictionary of product_datetime, coverage, and geoips2.filenames.product_index.INDEX_KEY_FIELDS,
+                 or None if fname is not a TC web filename
+    '''
+    # 20201010_222325_WP162020_gmi_GPM_89H_40kts_14p16_1p0.png
+    # 20201010_222325_WP162020_gmi_GPM_89H_40kts_14p16_1p0.png.yaml
+    parts = pathbasename(fname).split('_')
+    if len(parts) != 9:
+        return None
+    yyyymmdd, hhmnss, stormname, sensor, platform, product, intensity, coverage, res = parts
+    # Resolution field includes the extension - keep png and png.yaml separate
+    res, _, extension = res.partition('.')
+    if extension not in ('png', 'png.yaml'):
+        return None
+    if 'p' not in coverage or 'p' not in res or 'kts' not in intensity:
+        return None
+    try:
+        fname_dt = datetime.strptime(yyyymmdd+hhmnss, '%Y%m%d%H%M%S')
+        coverage = float(coverage.replace('p', '.'))
+    except ValueError:
+        return None
+    return {'product_datetime': fname_dt,
+            'storm': stormname,
+            'sensor': sensor,
+            'platform': platform,
+            'product': product,
+            'resolution': res,
+            'extension': extension,
+            'coverage': coverage}
+
+
 def tc_fname_remove_duplicates(fname, mins_to_remove=10, remove_files=False):
     # 20201010_222325_WP162020_gmi_GPM_89H_40kts_14p16_1p0.png
     # 20201010_222325_WP162020_gmi_GPM_89H_40kts_14p16_1p0.png.yaml
-    matching_fnames = []
     removed_fnames = []
     saved_fnames = []
     ext1 = pathsplitext(fname)[-1]
     ext2 = pathsplitext(pathsplitext(fname)[0])[-1]
-    ext3 = pathsplitext(pathsplitext(pathsplitext(fname)[0])[0])[-1]
     if (ext1 == '.png') or (ext1 == '.yaml' and ext2 == '.png'):
         LOG.info('MATCHES EXT FORMAT. png or png.yaml. Attempting to remove old_tcweb duplicates')
     else:
         LOG.info('NOT REMOVING DUPLICATES. Not tc_web filename, not png or png.yaml.')
         return [], []
-    dirname = pathdirname(fname) 
-    basename = pathbasename(fname)
-    parts = basename.split('_')
-    if len(parts) != 9:
-        LOG.info('NOT REMOVING DUPLICATES. Not tc_web filename, does not contain 9 fields.')
-        return [], []
-        
-    try:
-        # 20201010_222325_WP162020_gmi_GPM_89H_40kts_14p16_1p0.png
-        yyyymmdd = parts[0]
-        hhmnss = parts[1]
-        stormname = parts[2]
-        sensor = parts[3]
-        platform = parts[4]
-        product = parts[5]
-        intensity = parts[6]
-        coverage = parts[7]
-        res = parts[8]
-        if 'p' not in coverage or 'p' not in res:
-            LOG.info('NOT REMOVING DUPLICATES. Not tc_web filename, coverage or res not "NNpNN.')
-            return [], []
-        if 'kts' not in intensity:
-            LOG.info('NOT REMOVING DUPLICATES. Not tc_web filename, intensity does not contain "kts".')
-            return [], []
-    except IndexError:
-        LOG.info('NOT REMOVING DUPLICATES. Unmatched filename format, incorrect number of _ delimited fields')
-        return [], []
-    try:
-        fname_dt = datetime.strptime(yyyymmdd+hhmnss, '%Y%m%d%H%M%S')
-    except ValueError:
-        LOG.info('NOT REMOVING DUPLICATES. Unmatched filename format, incorrect date time string.')
+
+    fname_fields = tc_fname_parse(fname)
+    if fname_fields is None:
+        LOG.info('NOT REMOVING DUPLICATES. Not tc_web filename, unmatched filename format.')
         return [], []
+
+    # Match the previous glob behavior, which checked one minute at a time over
+    # [fname_dt - mins_to_remove, fname_dt + mins_to_remove)
     timediff = timedelta(minutes=mins_to_remove)
-    for currdt in minrange(fname_dt - timediff, fname_dt + timediff):
-        # 20201010_222325_WP162020_gmi_GPM_89H_40kts_14p16_1p0.png
-        dtstr = currdt.strftime('{0}/%Y%m%d_%H%M*_{1}_{2}_{3}_{4}_*_*_{5}'.format(
-                                dirname, stormname, sensor, platform, product, res))
-        # print(dtstr)
-        matching_fnames += glob(dtstr)
+    start_dt = (fname_fields['product_datetime'] - timediff).replace(second=0, microsecond=0)
+    end_dt = start_dt + timedelta(minutes=int((2*timediff).total_seconds() / 60))
+
+    from geoips2.filenames.product_index import query_product_index, remove_from_product_index
+    matching_entries = query_product_index(pathdirname(fname), tc_fname_parse, fname_fields, start_dt, end_dt)
     max_coverage = 0
-    for matching_fname in matching_fnames:
-        # 20201010_222325_WP162020_gmi_GPM_89H_40kts_14p16_1p0.png
-        parts = pathbasename(matching_fname).split('_')
-        coverage = float(parts[7].replace('p', '.'))
-        max_coverage = max(coverage, max_coverage)
+    for entry in matching_entries:
+        max_coverage = max(entry['coverage'], max_coverage)
 
     gotone = False
     LOG.info('CHECKING DUPLICATE FILES')
-    for matching_fname in list(set(matching_fnames)):
-        # 20201010_222325_WP162020_gmi_GPM_89H_40kts_14p16_1p0.png
-        parts = pathbasename(matching_fname).split('_')
-        coverage = float(parts[7].replace('p', '.'))
+    # Copy the list, removing entries from the index modifies it
+    for entry in list(matching_entries):
+        matching_fname = entry['fname']
+        coverage = entry['coverage']
         if coverage < max_coverage or gotone is True:
             removed_fnames += [matching_fname]
             # Test it out for a bit first
@@ -180,12 +185,13 @@ def tc_fname_remove_duplicates(fname, mins_to_remove=10, remove_files=False):
                 except FileNotFoundError as resp:
                     LOG.warning('FAILDELETE %s: File %s did not exist, someone must have deleted it for us?',
                                 matching_fname, str(resp))
+                remove_from_product_index(matching_fname)
 
             else:
                 LOG.info('TEST DELETING DUPLICATE FILE with less coverage %s < %s %s',
                          coverage, max_coverage, matching_fname)
         else:
-            if len(matching_fnames) == 1:
+            if len(matching_entries) == 1:
                 LOG.info('SAVING DUPLICATE FILE (only one!) with max coverage %s %s', max_coverage, matching_fname)
             else:
                 LOG.info('SAVING DUPLICATE FILE with max coverage %s %s', max_coverage, matching_fname)
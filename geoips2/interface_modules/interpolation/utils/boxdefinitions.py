@@ -181,6 +181,16 @@ class MaskedCornersSwathDefinition(SwathDefinition):
     @property
     def corners(self):
         """Returns the corners of the current area.
+
+        Corners are only calculated once per instance - copies of the cached corners are returned, since
+        planar_point_inside modifies the longitudes of the points passed to it.
+        """
+        if getattr(self, '_cached_corners', None) is None:
+            self._cached_corners = self._calculate_corners()
+        return copy_corners(self._cached_corners)
+
+    def _calculate_corners(self):
+        """Calculate the corners of the current area, allowing for masked data in the corners.
         """
         try:
             # Try to just set normal CoordinateDefinition corners
@@ -192,16 +202,17 @@ class MaskedCornersSwathDefinition(SwathDefinition):
 
         lons, lats = self.get_lonlats()
 
-        #Determine which rows and columns contain good data
-        rows = lons.any(axis=1)
-        cols = lons.any(axis=0)
+        #Determine which rows and columns contain good data, and how many good points each contains
+        valid = ~np.ma.getmaskarray(lons)
+        row_counts = valid.sum(axis=1)
+        col_counts = valid.sum(axis=0)
 
         #Get the minimum and maximum row and column that contain good data
-        good_row_inds = np.where(~rows.mask)[0]
+        good_row_inds = np.flatnonzero(row_counts)
         min_row = good_row_inds.min()
         max_row = good_row_inds.max()
 
-        good_col_inds = np.where(~cols.mask)[0]
+        good_col_inds = np.flatnonzero(col_counts)
         min_col = good_col_inds.min()
         max_col = good_col_inds.max()
 
@@ -215,55 +226,31 @@ class MaskedCornersSwathDefinition(SwathDefinition):
         #from .spherical import Arc
         from pyresample.spherical_geometry import Coordinate, Arc
         #Calculate the eight possible corners and produce arcs for each pair
+        # Sides were failing with Divide by Zero error for NCC data because there was 
+        # a single good point in the outermost row or column.  Step inward (up to 20 rows/columns) until
+        # the row/column contains more than one good point.
         #Corners for top side
-        # Right side was failing with Divide by Zero error for NCC data because there was 
-        # a single good point in the max_col.  Keep incrementing or decrementing until good.min 
-        # doesn't equal good.max 
-        good = np.where(~lons[min_row,:].mask)[0]
-        tries = 0
-        while (tries < 20 and good.min() == good.max()):
-            #print 'good.min() can\'t equal good.max() for top side, incrementing min_row! Would have failed with ZeroDivisionError before!'
-            min_row += 1
-            tries += 1
-            good = np.where(~lons[min_row,:].mask)[0]
-        top_corners = [Coordinate(*self.get_lonlat(min_row, good.min())),
-                       Coordinate(*self.get_lonlat(min_row, good.max()))]
+        min_row = _step_to_multiple_valid(row_counts, min_row, 1)
+        top_corners = [Coordinate(*self.get_lonlat(min_row, _first_valid(valid[min_row, :]))),
+                       Coordinate(*self.get_lonlat(min_row, _last_valid(valid[min_row, :])))]
         top_arc = Arc(top_corners[0], top_corners[1])
 
         #Corners for bottom side
-        good = np.where(~lons[max_row,:].mask)[0]
-        tries = 0
-        while (tries < 20 and good.min() == good.max()):
-            #print 'good.min() can\'t equal good.max() for bottom side, decrementing max_row! Would have failed with ZeroDivisionError before!'
-            max_row -= 1
-            tries += 1
-            good = np.where(~lons[max_row,:].mask)[0]
-        bot_corners = [Coordinate(*self.get_lonlat(max_row, good.min())),
-                       Coordinate(*self.get_lonlat(max_row, good.max()))]
+        max_row = _step_to_multiple_valid(row_counts, max_row, -1)
+        bot_corners = [Coordinate(*self.get_lonlat(max_row, _first_valid(valid[max_row, :]))),
+                       Coordinate(*self.get_lonlat(max_row, _last_valid(valid[max_row, :])))]
         bot_arc = Arc(bot_corners[0], bot_corners[1])
 
         #Corners for left side
-        good = np.where(~lons[:,min_col].mask)[0]
-        tries = 0
-        while (tries < 20 and good.min() == good.max()):
-            #print 'good.min() can\'t equal good.max() for left side, incrementing min_col! Would have failed with ZeroDivisionError before!'
-            min_col += 1
-            tries += 1
-            good = np.where(~lons[:,min_col].mask)[0]
-        left_corners = [Coordinate(*self.get_lonlat(good.min(),min_col)),
-                        Coordinate(*self.get_lonlat(good.max(),min_col))]
+        min_col = _step_to_multiple_valid(col_counts, min_col, 1)
+        left_corners = [Coordinate(*self.get_lonlat(_first_valid(valid[:, min_col]), min_col)),
+                        Coordinate(*self.get_lonlat(_last_valid(valid[:, min_col]), min_col))]
         left_arc = Arc(left_corners[0], left_corners[1])
 
         #Corners for right side
-        good = np.where(~lons[:,max_col].mask)[0]
-        tries = 0
-        while (tries < 20 and good.min() == good.max()):
-            #print 'good.min() can\'t equal good.max() for right side, decrementing max_col! Would have failed with ZeroDivisionError before!'
-            max_col -= 1
-            tries += 1
-            good = np.where(~lons[:,max_col].mask)[0]
-        right_corners = [Coordinate(*self.get_lonlat(good.min(),max_col)),
-                         Coordinate(*self.get_lonlat(good.max(),max_col))]
+        max_col = _step_to_multiple_valid(col_counts, max_col, -1)
+        right_corners = [Coordinate(*self.get_lonlat(_first_valid(valid[:, max_col]), max_col)),
+                         Coordinate(*self.get_lonlat(_last_valid(valid[:, max_col]), max_col))]
         right_arc = Arc(right_corners[0], right_corners[1])
 
         #Calculate the four false corners
@@ -446,13 +433,15 @@ class PlanarPolygonDefinition(CoordinateDefinition):
     @property
     def corners(self):
         #print '    In 2D false corners for: '+str(self.name)
-        try:
-            #print '        Corners already set, returning'
-            return super(CoordinateDefinition, self).corners
-        except ValueError:
-            pass
+        # Only calculate corners once per instance, return copies since planar_point_inside modifies points
+        if getattr(self, '_cached_corners', None) is None:
+            try:
+                #print '        Corners already set, returning'
+                self._cached_corners = super(CoordinateDefinition, self).corners
+            except ValueError:
+                self._cached_corners = get_2d_false_corners(self)
 
-        return get_2d_false_corners(self)
+        return copy_corners(self._cached_corners)
 
 
     def __contains__(self, point):
@@ -471,6 +460,21 @@ class PlanarPolygonDefinition(CoordinateDefinition):
 
         return retval
 
+    def points_inside(self, lons, lats):
+        """Are points inside the 4 corners of the current area? Vectorized version of __contains__,
+            DOES NOT use spherical geometry / great circle arcs.
+
+        :Parameters:
+        lons : numpy array
+            Longitudes of points to test, in degrees
+        lats : numpy array
+            Latitudes of points to test, in degrees
+
+        :Returns:
+        inside : numpy array of bool, same shape as lons
+        """
+        return planar_points_inside(lons, lats, self.corners)
+
     def intersection(self, other):
         """Returns the corners of the intersection polygon of the current area
         with *other*.
@@ -859,17 +863,9 @@ def planar_point_inside(point, corners):
     boundaries.
     """
 #    lons = boxdef.get_lonlats()[0]
-    lons = np.ma.array([corn.lon for corn in corners])
-    lats = np.ma.array([corn.lat for corn in corners])
-    # MLS use wrap_longitudes?
-    lons = np.ma.where(lons<0,lons+2*math.pi,lons)
-            
 #    lats = boxdef.get_lonlats()[1]
 #    corners = boxdef.corners
-    minlon = lons.min()
-    maxlon = lons.max()
-    minlat = lats.min()
-    maxlat = lats.max()
+    minlon, maxlon, minlat, maxlat = planar_corner_bounds(corners)
     # MLS use wrap_longitudes?
     if point.lon < 0:
         point.lon += 2*math.pi
@@ -890,6 +886,80 @@ def planar_point_inside(point, corners):
     return False
 
 
+def planar_corner_bounds(corners):
+    """Return min/max lon/lat (radians, longitudes wrapped to 0 to 2pi) of 4 corners, as used by
+    planar_point_inside.
+    """
+    # MLS use wrap_longitudes?
+    lons = [corn.lon+2*math.pi if corn.lon < 0 else corn.lon for corn in corners]
+    lats = [corn.lat for corn in corners]
+    return min(lons), max(lons), min(lats), max(lats)
+
+
+def planar_points_inside(lons, lats, corners_list):
+    """Vectorized planar_point_inside - are many points inside the 4 corners of one or many areas?
+    This DOES NOT USE great circle arcs as area boundaries, and does not modify the passed corners.
+
+    :Parameters:
+    lons : numpy array
+        Longitudes of points to test, in degrees
+    lats : numpy array
+        Latitudes of points to test, in degrees
+    corners_list : list
+        Either a single list of 4 corner Coordinates, or a list of lists of 4 corner Coordinates
+
+    :Returns:
+    inside : numpy array of bool
+        Same shape as lons if a single set of corners was passed,
+        otherwise shape (len(corners_list),) + lons.shape
+    """
+    single_area = hasattr(corners_list[0], 'lon')
+    if single_area:
+        corners_list = [corners_list]
+    bounds = np.array([planar_corner_bounds(corners) for corners in corners_list])
+    minlon, maxlon, minlat, maxlat = [bound.reshape((-1,) + (1,)*np.ndim(lons)) for bound in bounds.T]
+
+    point_lons = np.radians(np.ma.filled(np.ma.asarray(lons, dtype=float), np.nan))
+    point_lats = np.radians(np.ma.filled(np.ma.asarray(lats, dtype=float), np.nan))
+    # MLS use wrap_longitudes?
+    point_lons = np.where(point_lons < 0, point_lons+2*math.pi, point_lons)
+
+    with np.errstate(invalid='ignore'):
+        inside = (minlon < point_lons) & (point_lons < maxlon) & (minlat < point_lats) & (point_lats < maxlat)
+    if single_area:
+        return inside[0]
+    return inside
+
+
+def copy_corners(corners):
+    """Return copies of corner Coordinates, so callers can not modify cached corners"""
+    from copy import copy
+    return [copy(corner) for corner in corners]
+
+
+def _first_valid(valid):
+    """Index of first True value in 1d boolean array"""
+    return int(np.argmax(valid))
+
+
+def _last_valid(valid):
+    """Index of last True value in 1d boolean array"""
+    return int(valid.size - 1 - np.argmax(valid[::-1]))
+
+
+def _step_to_multiple_valid(counts, start, step, max_tries=20):
+    """Starting at index start, step through counts (number of valid points in each row or column) at most
+    max_tries times, and return the first index containing more than one valid point.
+    If none found, return the last index stepped to that contains any valid points.
+    """
+    inds = start + step * np.arange(max_tries + 1)
+    inds = inds[(inds >= 0) & (inds < counts.size)]
+    multiple = np.flatnonzero(counts[inds] > 1)
+    if multiple.size:
+        return int(inds[multiple[0]])
+    return int(inds[counts[inds] > 0][-1])
+
+
 def _get_slice(segments, shape):
     """Generator for segmenting a 1D or 2D array"""
 
@@ -66,12 +66,23 @@ def full_disk_image(area_def,
     fig, main_ax, mapobj = create_figure_and_main_ax_and_mapobj(x_size, y_size, area_def, existing_mapobj=mapobj)
 
     # Plot the actual data on a map
-
-    main_ax.imshow(plot_data,
-                   transform=area_def.to_cartopy_crs(),
-                   # extent=area_def.area_extent_ll,
-                   cmap=mpl_colors_info['cmap'],
-                   norm=mpl_colors_info['norm'])
+    if hasattr(area_def, 'proj_dict'):
+        # Warp the data into the map projection with a cached index, so cartopy does not re-warp on every image
+        from geoips2.image_utils.warp import get_warp_indices, warp_data
+        warp_inds, target_extent = get_warp_indices(area_def, mapobj, (y_size, x_size))
+        main_ax.imshow(warp_data(plot_data, warp_inds),
+                       transform=mapobj,
+                       extent=target_extent,
+                       origin='upper',
+                       interpolation='nearest',
+                       cmap=mpl_colors_info['cmap'],
+                       norm=mpl_colors_info['norm'])
+    else:
+        main_ax.imshow(plot_data,
+                       transform=area_def.to_cartopy_crs(),
+                       # extent=area_def.area_extent_ll,
+                       cmap=mpl_colors_info['cmap'],
+                       norm=mpl_colors_info['norm'])
 
     # Set the title for final image
     title_string = get_title_string_from_objects(area_def, xarray_obj, product_name_title,
@@ -86,7 +97,8 @@ def full_disk_image(area_def,
         create_colorbar(fig, mpl_colors_info)
 
     # Plot gridlines and boundaries overlays
-    plot_overlays(mapobj, main_ax, area_def, boundaries_info=boundaries_info, gridlines_info=gridlines_info)
+    plot_overlays(mapobj, main_ax, area_def, boundaries_info=boundaries_info, gridlines_info=gridlines_info,
+                  use_template=True)
 
     if output_fnames is not None:
         for annotated_fname in output_fnames:
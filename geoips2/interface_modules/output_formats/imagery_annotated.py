@@ -53,7 +53,14 @@ def imagery_annotated(area_def,
                                                          cmap_name=None,
                                                          cbar_label=None)
     mapobj = None
-    if clean_fname:
+    from geoips2.image_utils.rgba_raster import can_rasterize_directly, data_to_rgba_bytes, save_rgba_image
+    if clean_fname and can_rasterize_directly(plot_data, [clean_fname]):
+        # Clean imagery is the colormapped data at exactly the area_def shape - no figure required
+        LOG.info('Saving the clean image %s', clean_fname)
+        success_outputs += save_rgba_image(data_to_rgba_bytes(plot_data, mpl_colors_info), clean_fname,
+                                           image_datetime=xarray_obj.start_datetime,
+                                           remove_duplicate_minrange=remove_duplicate_minrange)
+    elif clean_fname:
         # Create matplotlib figure and main axis, where the main image will be plotted
         fig, main_ax, mapobj = create_figure_and_main_ax_and_mapobj(area_def.x_size,
                                                                     area_def.y_size,
@@ -116,7 +123,8 @@ def imagery_annotated(area_def,
         create_colorbar(fig, mpl_colors_info)
 
     # Plot gridlines and boundaries overlays
-    plot_overlays(mapobj, main_ax, area_def, boundaries_info=boundaries_info, gridlines_info=gridlines_info)
+    plot_overlays(mapobj, main_ax, area_def, boundaries_info=boundaries_info, gridlines_info=gridlines_info,
+                  use_template=True)
 
     if output_fnames is not None:
         for annotated_fname in output_fnames:
@@ -40,6 +40,16 @@ def imagery_clean(area_def,
         mpl_colors_info = set_matplotlib_colors_standard(data_range=[plot_data.min(), plot_data.max()],
                                                          cmap_name=None,
                                                          cbar_label=None)
+    from geoips2.image_utils.rgba_raster import can_rasterize_directly, data_to_rgba_bytes, save_rgba_image
+    if can_rasterize_directly(plot_data, output_fnames):
+        # Clean imagery is the colormapped data at exactly the area_def shape - no figure required
+        rgba = data_to_rgba_bytes(plot_data, mpl_colors_info)
+        for clean_fname in output_fnames:
+            LOG.info('Saving the clean image %s', clean_fname)
+            success_outputs += save_rgba_image(rgba, clean_fname, image_datetime=xarray_obj.start_datetime,
+                                               remove_duplicate_minrange=remove_duplicate_minrange)
+        return success_outputs
+
     mapobj = None
 
     for clean_fname in output_fnames:
@@ -88,16 +88,13 @@ def imagery_windbarbs(area_def,
     # ASCAT 25 km data.
     # This would also avoid having the product names hard coded in the output module code.
     if product_name == 'windbarbs':
-        # Thinning the data points to better display the windbards
-        thinning=1                                                    # skip data points
         barblength=5.
         linewidth=1.5
         sizes_dict = dict(height=0.7,
                           spacing=0.3)
         rain_size = 10
+        keep_colocated = False
     elif product_name == 'wind-ambiguities':
-        # Thinning the data points to better display the windbards
-        thinning=1                                                   # skip data points
         barblength=5    # Length of individual barbs
         linewidth=2     # Width of individual barbs
         rain_size = 10  # Marker size for rain_flag
@@ -105,6 +102,8 @@ def imagery_windbarbs(area_def,
                           spacing=0,
                           width=0,  # flag width, relative to barblength
                           emptybarb=0.5)
+        # Plot all ambiguities at each selected location
+        keep_colocated = True
 
     lat=xarray_obj['latitude'].to_masked_array()
     lon2=xarray_obj['longitude'].to_masked_array()
@@ -116,33 +115,27 @@ def imagery_windbarbs(area_def,
     # Must be 0-360 for barbs
     lon = numpy.ma.where(lon2 < 0, lon2 + 360, lon2)
 
-    if len(lat.shape) == 2:
-        lat2  =lat[::thinning,::thinning]
-        lon2  =lon[::thinning,::thinning]
-        u2    =u[::thinning,::thinning]
-        v2    =v[::thinning,::thinning]
-        speed2=speed[::thinning,::thinning]
-        rain_flag2=rain_flag[::thinning, ::thinning]
-    elif len(lat.shape) == 1:
-        lat2  =lat[::thinning]
-        lon2  =lon[::thinning]
-        u2    =u[::thinning]
-        v2    =v[::thinning]
-        speed2=speed[::thinning]
-        rain_flag2=rain_flag[::thinning]
-    if lat2.min() > 0:
-        flip_barb = False
-    elif lat2.max() < 0:
-        flip_barb = True
-    else:
-        flip_barb = numpy.ma.where(lat2 > 0, False, True).data
-    good_inds = numpy.ma.where(speed2)
-    lon2 = lon2[good_inds]
-    lat2 = lat2[good_inds]
-    u2 = u2[good_inds]
-    v2 = v2[good_inds]
-    speed2 = speed2[good_inds]
-    rain_flag2 = rain_flag2[good_inds]
+    # Select at most one observation (location, for ambiguities) per barb-sized screen cell within the sector,
+    # so the number of barbs scales with the image size rather than the swath density
+    import matplotlib
+    from geoips2.image_utils.barb_selection import select_barbs, get_barb_spacing_pixels
+    good_inds = numpy.where((speed.ravel() != 0).filled(False)
+                            & ~numpy.ma.getmaskarray(lat).ravel()
+                            & ~numpy.ma.getmaskarray(lon).ravel())[0]
+    barb_spacing = get_barb_spacing_pixels(barblength, matplotlib.rcParams['figure.dpi'])
+    good_inds = good_inds[select_barbs(area_def,
+                                       lat.ravel().data[good_inds],
+                                       lon.ravel().data[good_inds],
+                                       barb_spacing,
+                                       rain_flag=rain_flag.ravel().filled(0)[good_inds],
+                                       keep_colocated=keep_colocated)]
+    lat2 = lat.ravel()[good_inds]
+    lon2 = lon.ravel()[good_inds]
+    u2 = u.ravel()[good_inds]
+    v2 = v.ravel()[good_inds]
+    speed2 = speed.ravel()[good_inds]
+    rain_flag2 = rain_flag.ravel()[good_inds]
+    flip_barb = (lat2 <= 0).filled(False)
     rain_inds = numpy.ma.where(rain_flag2)
 
 
@@ -258,7 +251,8 @@ def imagery_windbarbs(area_def,
         create_colorbar(fig, mpl_colors_info)
 
     # Plot gridlines and boundaries overlays
-    plot_overlays(mapobj, main_ax, area_def, boundaries_info=boundaries_info, gridlines_info=gridlines_info)
+    plot_overlays(mapobj, main_ax, area_def, boundaries_info=boundaries_info, gridlines_info=gridlines_info,
+                  use_template=True)
 
     if output_fnames is not None:
         for annotated_fname in output_fnames:
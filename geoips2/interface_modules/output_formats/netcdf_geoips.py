@@ -22,7 +22,8 @@ output_type = 'xarray_data'
 
 def netcdf_geoips(xarray_obj,
                   product_names,
-                  output_fnames):
+                  output_fnames,
+                  encoding_policy=None):
 
     import xarray
     prod_xarray = xarray.Dataset()
@@ -32,7 +33,5 @@ def netcdf_geoips(xarray_obj,
     for product_name in product_names:
         prod_xarray[product_name] = xarray_obj[product_name]
 
-    from geoips2.interface_modules.output_formats.netcdf_xarray import write_xarray_netcdf
-    for ncdf_fname in output_fnames:
-        write_xarray_netcdf(prod_xarray, ncdf_fname)
-    return output_fnames
+    from geoips2.interface_modules.output_formats.netcdf_xarray import write_xarray_netcdfs
+    return write_xarray_netcdfs(prod_xarray, output_fnames, encoding_policy=encoding_policy)
@@ -15,6 +15,8 @@
 import os
 import logging
 
+from geoips2.filenames.base_paths import atomic_output_fname
+
 LOG = logging.getLogger(__name__)
 
 output_type = 'xarray_data'
@@ -22,95 +24,115 @@ output_type = 'xarray_data'
 
 def netcdf_xarray(xarray_obj,
                   product_names,
-                  output_fnames):
+                  output_fnames,
+                  encoding_policy=None):
+
+    return write_xarray_netcdfs(xarray_obj, output_fnames, encoding_policy=encoding_policy)
+
+
+def write_xarray_netcdfs(xarray_obj, ncdf_fnames, clobber=False, encoding_policy=None):
+    ''' Write xarray_obj to every file in ncdf_fnames, encoding and compressing the data only once.
+
+    The first file is written with write_xarray_netcdf, and the remaining files are atomic copies of it.
+
+    Args:
+        xarray_obj (xarray.Dataset) : Dataset to write, not modified
+        ncdf_fnames (list) : full paths of all requested output files
+        clobber (bool) : DEFAULT False, overwrite existing files
+        encoding_policy (dict) : DEFAULT None, see geoips2.xarray_utils.netcdf_encoding
+
+    Returns:
+        (list) : ncdf_fnames
+    '''
+    import shutil
+    written_fname = None
+    for ncdf_fname in ncdf_fnames:
+        if not clobber and os.path.exists(ncdf_fname):
+            LOG.warning('SKIPPING not outputing file %s, exists', ncdf_fname)
+            continue
+        if written_fname is None:
+            write_xarray_netcdf(xarray_obj, ncdf_fname, clobber=clobber, encoding_policy=encoding_policy)
+            written_fname = ncdf_fname
+        else:
+            LOG.info('Copying %s to %s', written_fname, ncdf_fname)
+            with atomic_output_fname(ncdf_fname) as tmp_fname:
+                shutil.copyfile(written_fname, tmp_fname)
+    return ncdf_fnames
+
 
-    for ncdf_fname in output_fnames:
-        write_xarray_netcdf(xarray_obj, ncdf_fname)
-    return output_fnames
+def write_xarray_netcdf(xarray_obj, ncdf_fname, clobber=False, encoding_policy=None):
+    ''' Write out xarray_obj to netcdf file named ncdf_fname
 
+    Attributes that netcdf can not store natively (datetimes, bools, None, dicts, area definitions) are encoded
+    with geoips2.xarray_utils.attr_encoding, and restored exactly by the geoips2_netcdf reader.
 
-def write_xarray_netcdf(xarray_obj, ncdf_fname, clobber=False):
-    ''' Write out xarray_obj to netcdf file named ncdf_fname '''
+    xarray_obj is not modified - attributes are encoded on a shallow copy - so multiple products may be written
+    from the same xarray_obj concurrently.  The file is written to a temporary file and renamed into place.
 
-    def check_attr(xobj, attr):
-        if isinstance(xobj.attrs[attr], datetime):
-            xobj.attrs[attr] = xobj.attrs[attr].strftime('%c')
-        if xobj.attrs[attr] is None:
-            xobj.attrs[attr] = str(xobj.attrs[attr])
-        if isinstance(xobj.attrs[attr], bool):
-            xobj.attrs[attr] = str(xobj.attrs[attr])
-        # DO NOT attempt to store dicts - they are not supported
-        if isinstance(xobj.attrs[attr], dict):
-            LOG.warning('SKIPPING attr %s %s, dictionaries not supported for netcdf output',
-                        attr, xobj.attrs[attr])
-            xobj.attrs.pop(attr)
+    Args:
+        xarray_obj (xarray.Dataset) : Dataset to write
+        ncdf_fname (str) : full path to output netcdf file
+        clobber (bool) : DEFAULT False, overwrite ncdf_fname if it exists
+        encoding_policy (dict) : DEFAULT None, compression/chunking/packing policy,
+                                 see geoips2.xarray_utils.netcdf_encoding
 
-    from geoips2.filenames.base_paths import make_dirs
-    from os.path import dirname
-    make_dirs(dirname(ncdf_fname))
+    Returns:
+        (list) : [ncdf_fname]
+    '''
 
+    from geoips2.xarray_utils.attr_encoding import encode_attrs
+    from geoips2.xarray_utils.netcdf_encoding import get_netcdf_encoding
 
-    orig_attrs = xarray_obj.attrs.copy()
-    orig_var_attrs = {}
+    if clobber is not True and os.path.exists(ncdf_fname):
+        LOG.warning('SKIPPING not outputing file %s, exists', ncdf_fname)
+        return [ncdf_fname]
 
-    from datetime import datetime
-    for attr in xarray_obj.attrs.copy().keys():
-        check_attr(xarray_obj, attr)
-    for varname in xarray_obj.variables.keys():
-        orig_var_attrs[varname] = xarray_obj[varname].attrs.copy()
-        for attr in xarray_obj[varname].attrs.keys():
-            check_attr(xarray_obj[varname], attr)
+    # Shallow copy - shares the data arrays, but has independent attrs
+    out_xarray = xarray_obj.copy(deep=False)
 
     roi_str = 'none'
-    if 'interpolation_radius_of_influence' in xarray_obj.attrs.keys():
-        roi_str = xarray_obj.interpolation_radius_of_influence
+    if 'interpolation_radius_of_influence' in out_xarray.attrs.keys():
+        roi_str = out_xarray.interpolation_radius_of_influence
 
     sdt_str = 'none'
-    if 'start_datetime' in xarray_obj.attrs.keys():
-        sdt_str = xarray_obj.attrs['start_datetime']
+    if 'start_datetime' in out_xarray.attrs.keys():
+        sdt_str = out_xarray.attrs['start_datetime']
 
     edt_str = 'none'
-    if 'end_datetime' in xarray_obj.attrs.keys():
-        edt_str = xarray_obj.attrs['end_datetime']
+    if 'end_datetime' in out_xarray.attrs.keys():
+        edt_str = out_xarray.attrs['end_datetime']
 
     dp_str = 'none'
-    if 'data_provider' in xarray_obj.attrs.keys():
-        dp_str = xarray_obj.attrs['data_provider']
+    if 'data_provider' in out_xarray.attrs.keys():
+        dp_str = out_xarray.attrs['data_provider']
 
     area_def_str = 'none'
     # GEOIPS 1 COMPATIBILITY
-    if 'area_def' in xarray_obj.attrs.keys():
-        # Must pop off the actual area_defintion - does not write to xarray properly
-        area_def = xarray_obj.attrs.pop('area_def')
-        area_def_str = repr(area_def)
-        xarray_obj.attrs['area_def_str'] = area_def_str
-    # If actual area_definition object, write it out to xarray as str
-    elif 'area_definition' in xarray_obj.attrs.keys():
+    if 'area_def' in out_xarray.attrs.keys():
+        area_def_str = repr(out_xarray.attrs['area_def'])
+        out_xarray.attrs['area_def_str'] = area_def_str
+    # The area_definition itself is encoded losslessly by encode_attrs - area_definition_str is still written
+    # for readability and for older readers.
+    elif 'area_definition' in out_xarray.attrs.keys():
         # If area_definition_str was explicitly defined on the area_definition object, use that
-        if hasattr(xarray_obj.area_definition, 'area_definition_str'):
-            # Must pop off the actual area_defintion - does not write to xarray properly
-            area_def_str = xarray_obj.area_definition.area_definition_str
-            area_def = xarray_obj.attrs.pop('area_definition')
-            xarray_obj.attrs['area_definition_str'] = area_def_str
+        if hasattr(out_xarray.area_definition, 'area_definition_str'):
+            area_def_str = out_xarray.area_definition.area_definition_str
         else:
-            # Must pop off the actual area_defintion - does not write to xarray properly
-            area_def = xarray_obj.attrs.pop('area_definition')
-            area_def_str = repr(area_def)
-            xarray_obj.attrs['area_definition_str'] = area_def_str
+            area_def_str = repr(out_xarray.area_definition)
+        out_xarray.attrs['area_definition_str'] = area_def_str
+
+    out_xarray.attrs = encode_attrs(out_xarray.attrs)
+    for varname in out_xarray.variables.keys():
+        out_xarray.variables[varname].attrs = encode_attrs(out_xarray.variables[varname].attrs)
 
     LOG.info('Writing xarray obj to file %s, source %s, platform %s, start_dt %s, end_dt %s, %s %s, %s %s, %s %s',
-             ncdf_fname, xarray_obj.source_name, xarray_obj.platform_name, sdt_str, edt_str,
+             ncdf_fname, out_xarray.source_name, out_xarray.platform_name, sdt_str, edt_str,
              'provider', dp_str,
              'roi', roi_str,
              'area_def', area_def_str)
 
-    from os.path import exists
-    if clobber is True or not exists(ncdf_fname):
-        xarray_obj.to_netcdf(ncdf_fname)
-    else:
-        LOG.warning('SKIPPING not outputing file %s, exists', ncdf_fname)
-    xarray_obj.attrs = orig_attrs
-    for varname in xarray_obj.variables.keys():
-        xarray_obj[varname].attrs = orig_var_attrs[varname]
+    encoding = get_netcdf_encoding(out_xarray, encoding_policy)
+    with atomic_output_fname(ncdf_fname) as tmp_fname:
+        out_xarray.to_netcdf(tmp_fname, encoding=encoding)
 
     return [ncdf_fname]
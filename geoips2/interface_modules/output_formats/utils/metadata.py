@@ -18,9 +18,68 @@ import logging
 LOG = logging.getLogger(__name__)
 
 
+# Sector metadata blocks, keyed by get_sector_metadata_key, shared across all products for the same area_def
+SECTOR_METADATA_CACHE = {}
+# Maximum number of cached sector metadata blocks
+MAX_SECTOR_METADATA_CACHE_SIZE = 64
+
+
+def get_sector_metadata_key(area_def):
+    ''' Return a hashable key identifying the sector metadata block for area_def, without computing area_extent_ll
+    '''
+    sector_info = getattr(area_def, 'sector_info', {})
+    return (area_def.area_id,
+            getattr(area_def, 'sector_type', None),
+            area_def.proj4_string,
+            tuple(area_def.area_extent),
+            tuple(area_def.shape),
+            repr(sorted(sector_info.items(), key=lambda item: str(item[0]))))
+
+
+def get_sector_metadata_block(area_def):
+    ''' Return the sector information and bounding box metadata for area_def, computed once per area_def
+
+    The returned dictionary is shared - copy it before adding product specific fields.
+
+    Args:
+        area_def (AreaDefinition) : Pyresample AreaDefinition of sector information
+
+    Returns:
+        (dict) : sector_info, sector_type, and bounding_box metadata
+    '''
+    key = get_sector_metadata_key(area_def)
+    if key in SECTOR_METADATA_CACHE:
+        return SECTOR_METADATA_CACHE[key]
+
+    sector_info = area_def.sector_info.copy()
+
+    if hasattr(area_def, 'sector_type') and 'sector_type' not in sector_info:
+        sector_info['sector_type'] = area_def.sector_type
+
+    area_extent_ll = area_def.area_extent_ll
+    sector_info['bounding_box'] = {}
+    sector_info['bounding_box']['minlat'] = area_extent_ll[1]
+    sector_info['bounding_box']['maxlat'] = area_extent_ll[3]
+    sector_info['bounding_box']['minlon'] = area_extent_ll[0]
+    sector_info['bounding_box']['maxlon'] = area_extent_ll[2]
+    sector_info['bounding_box']['pixel_width_m'] = area_def.pixel_size_x
+    sector_info['bounding_box']['pixel_height_m'] = area_def.pixel_size_y
+    sector_info['bounding_box']['image_width'] = area_def.x_size
+    sector_info['bounding_box']['image_height'] = area_def.y_size
+    sector_info['bounding_box']['proj4_string'] = area_def.proj4_string
+
+    if len(SECTOR_METADATA_CACHE) >= MAX_SECTOR_METADATA_CACHE_SIZE:
+        SECTOR_METADATA_CACHE.clear()
+    SECTOR_METADATA_CACHE[key] = sector_info
+    return sector_info
+
+
 def produce_all_sector_metadata(final_products, area_def, xarray_obj, metadata_dir='metadata'):
     ''' Produce metadata for all products listed in "final_products" - all products should cover area_def region
 
+    The sector metadata block is computed once for area_def and shared by every product's YAML file.
+    Files are written atomically, and left untouched if their contents have not changed.
+
     Args:
         final_products (list) : list of strings, containing paths to all products that need metadata files generated.
         area_def (AreaDefinition) : pyresample AreaDefinition that was used to produce all products in final_products
@@ -34,21 +93,23 @@ def produce_all_sector_metadata(final_products, area_def, xarray_obj, metadata_d
     yaml_products = []
     from geoips2.sector_utils.utils import is_sector_type
     if is_sector_type(area_def, 'tc'):
+        from geoips2.sector_utils.tc_tracks import produce_sector_metadata
+        sector_block = get_sector_metadata_block(area_def)
         for final_product in final_products:
             if 'yaml' in final_product:
                 continue
-            from geoips2.sector_utils.tc_tracks import produce_sector_metadata
             curr_metadata_dir = metadata_dir
             if '_dev' not in metadata_dir and '_dev' in final_product:
                 curr_metadata_dir = metadata_dir+'_dev'
             yaml_products += produce_sector_metadata(area_def,
                                                      xarray_obj,
                                                      final_product,
-                                                     metadata_dir=curr_metadata_dir)
+                                                     metadata_dir=curr_metadata_dir,
+                                                     sector_block=sector_block)
     return yaml_products
 
 
-def output_metadata_yaml(metadata_fname, area_def, xarray_obj, productname=None):
+def output_metadata_yaml(metadata_fname, area_def, xarray_obj, productname=None, sector_block=None):
     ''' Write out yaml file "metadata_fname" of sector info found in "area_def"
 
     Args:
@@ -56,25 +117,15 @@ def output_metadata_yaml(metadata_fname, area_def, xarray_obj, productname=None)
         area_def (AreaDefinition) : Pyresample AreaDefinition of sector information
         xarray_obj (xarray.Dataset) : xarray Dataset object that was used to produce product
         productname (str) : Full path to full product filename that this YAML file refers to
+        sector_block (dict) : DEFAULT None, sector metadata from get_sector_metadata_block.
+                              If None, retrieve it for area_def.
     Returns:
-        (str) : Path to metadata filename if successfully produced.
+        (list) : Path to metadata filename if successfully produced, or already up to date.
     '''
     from geoips2.dev.utils import replace_geoips_paths
-    sector_info = area_def.sector_info.copy()
-
-    if hasattr(area_def, 'sector_type') and 'sector_type' not in sector_info:
-        sector_info['sector_type'] = area_def.sector_type
-
-    sector_info['bounding_box'] = {}
-    sector_info['bounding_box']['minlat'] = area_def.area_extent_ll[1]
-    sector_info['bounding_box']['maxlat'] = area_def.area_extent_ll[3]
-    sector_info['bounding_box']['minlon'] = area_def.area_extent_ll[0]
-    sector_info['bounding_box']['maxlon'] = area_def.area_extent_ll[2]
-    sector_info['bounding_box']['pixel_width_m'] = area_def.pixel_size_x
-    sector_info['bounding_box']['pixel_height_m'] = area_def.pixel_size_y
-    sector_info['bounding_box']['image_width'] = area_def.x_size
-    sector_info['bounding_box']['image_height'] = area_def.y_size
-    sector_info['bounding_box']['proj4_string'] = area_def.proj4_string
+    if sector_block is None:
+        sector_block = get_sector_metadata_block(area_def)
+    sector_info = dict(sector_block)
 
     if productname:
         sector_info['product_filename'] = replace_geoips_paths(productname)
@@ -82,8 +133,8 @@ def output_metadata_yaml(metadata_fname, area_def, xarray_obj, productname=None)
     if 'original_source_filenames' in xarray_obj.attrs.keys():
         sector_info['original_source_filenames'] = xarray_obj.original_source_filenames
 
-    from geoips2.sector_utils.yaml_utils import write_yamldict
-    returns = write_yamldict(sector_info, metadata_fname, force=True)
+    from geoips2.sector_utils.yaml_utils import write_yamldict_if_changed
+    returns = write_yamldict_if_changed(sector_info, metadata_fname)
     if returns:
         LOG.info('METADATASUCCESS Writing %s', metadata_fname)
     return returns
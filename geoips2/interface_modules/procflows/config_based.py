@@ -55,6 +55,37 @@ def get_sectored_read(config_dict, area_defs, area_def_id, sector_type, reader,
     return xobjs
 
 
+def get_cached_sector_results(fnames, source_name, area_def, sector_type, config_dict, command_line_args):
+    ''' Look up the result cache for every product requested for sector_type
+
+    Args:
+        fnames (list) : input data files
+        source_name (str) : data source name
+        area_def (AreaDefinition) : requested sector, before any area_def adjustment
+        sector_type (str) : sector type from the YAML config available_sectors
+        config_dict (dict) : YAML output config dictionary
+        command_line_args (dict) : dictionary of command line arguments
+
+    Returns:
+        (dict) : {(output_type, product_name): (cache_key, cache_spec, cached products or None if not cached)}
+    '''
+    from geoips2.filenames.result_cache import get_result_cache_key, lookup_cached_result
+    cached_results = {}
+    for output_type, output_dict in config_dict['outputs'].items():
+        if output_dict['requested_sector_type'] != sector_type:
+            continue
+        for product_name in output_dict['product_names']:
+            cache_key, cache_spec = get_result_cache_key(fnames, product_name, source_name, area_def,
+                                                         output_dict['output_format'],
+                                                         output_dict['filename_formats'],
+                                                         'config_based', command_line_args,
+                                                         extra_spec={'output_type': output_type,
+                                                                     'output_dict': output_dict,
+                                                                     'sector_type': sector_type})
+            cached_results[(output_type, product_name)] = (cache_key, cache_spec, lookup_cached_result(cache_key))
+    return cached_results
+
+
 def get_area_def_list_from_dict(area_defs):
     ''' Get a list of actual area_defs from the full dictionary returned from get_area_defs_from_available_sectors'''
     list_area_defs = []
@@ -345,6 +376,11 @@ def config_based(fnames, command_line_args=None):
     saved_products = []
     num_jobs = 0
 
+    from geoips2.profiler import start_profiler, stop_profiler
+    profiler = start_profiler('config_based', output_config=command_line_args['output_config'])
+    from geoips2.memory_budget import get_memory_budget, estimate_read_nbytes, RELEASE_FRACTION
+    memory_budget = get_memory_budget(command_line_args)
+
     from geoips2.commandline.args import check_command_line_args
 
     # These args should always be checked
@@ -353,7 +389,7 @@ def config_based(fnames, command_line_args=None):
     check_command_line_args(check_args, command_line_args)
     config_dict = get_config_dict(command_line_args['output_config'])
 
-    from geoips2.stable.reader import get_reader
+    from geoips2.stable.reader import get_reader, reader_honors_area_def
     from glob import glob
     from geoips2.dev.product import get_required_variables
 
@@ -382,16 +418,18 @@ def config_based(fnames, command_line_args=None):
         bg_variables = get_required_variables(bg_product_name, bg_xobjs['METADATA'].source_name)
 
     reader = get_reader(config_dict['reader_name'])
-    xobjs = reader(fnames, metadata_only=True)
+    with profiler.span('read_metadata'):
+        xobjs = reader(fnames, metadata_only=True)
     source_name = xobjs['METADATA'].source_name
 
     variables = get_variables_from_available_outputs_dict(config_dict['outputs'], source_name)
     # command_line_args take priority over config args - if someone passes something in
     # explicitly, it will be used rather than config "default"
-    area_defs = get_area_defs_from_available_sectors(config_dict['available_sectors'],
-                                                     command_line_args,
-                                                     xobjs,
-                                                     variables)
+    with profiler.span('get_area_defs'):
+        area_defs = get_area_defs_from_available_sectors(config_dict['available_sectors'],
+                                                         command_line_args,
+                                                         xobjs,
+                                                         variables)
 
     # If this config does not perform a sectored read, just read all the data now
     # Otherwise data will be read within the area_def loop
@@ -399,8 +437,24 @@ def config_based(fnames, command_line_args=None):
     if 'sectored_read' in config_dict and config_dict['sectored_read']:
         sectored_read = True
 
+    # Unsectored outputs require the full read
+    requires_full_read = any([sector_dict.get('unsectored')
+                              for sector_dict in config_dict['available_sectors'].values()])
+    if not sectored_read and not requires_full_read and not memory_budget.fits(estimate_read_nbytes(fnames)):
+        # Readers ignoring area_def would just repeat the full read for every sector
+        if reader_honors_area_def(config_dict['reader_name']):
+            LOG.info('MEMORY full read of %s not expected to fit within budget %s MB, reading each sector separately',
+                     fnames, memory_budget.budget_mb)
+            sectored_read = True
+        else:
+            LOG.warning('MEMORY full read of %s not expected to fit within budget %s MB, but reader %s does not '
+                        'honor area_def, reading all data once', fnames, memory_budget.budget_mb,
+                        config_dict['reader_name'])
+
     if not sectored_read:
-        xobjs = reader(fnames, metadata_only=False, chans=variables)
+        with profiler.span('read'):
+            xobjs = reader(fnames, metadata_only=False, chans=variables)
+            memory_budget.account('read', xobjs)
 
     # Check if we have any required unsectored outputs, if so produce here, then continue
     final_products = process_unsectored_data_outputs(final_products,
@@ -429,9 +483,35 @@ def config_based(fnames, command_line_args=None):
         # so we only want to reproject once for each sector_type
         for sector_type in area_defs[area_def_id]:
 
+            # Sector spans skipped with continue are ended as 'incomplete' when the next sector span starts
+            sector_span = profiler.start_span('sector', parent=profiler.root, area_id=area_def_id,
+                                              sector_type=sector_type)
+            cached_results = {}
+            if command_line_args.get('result_cache'):
+                cached_results = get_cached_sector_results(fnames, source_name,
+                                                           area_defs[area_def_id][sector_type]['area_def'],
+                                                           sector_type, config_dict, command_line_args)
+                # Skip the read entirely if every product for this sector_type is already available
+                if cached_results and all([result[2] is not None for result in cached_results.values()]):
+                    for (output_type, product_name), result in cached_results.items():
+                        cpath, cmodule = set_comparison_path(config_dict['outputs'][output_type], product_name,
+                                                             output_type)
+                        final_products = initialize_final_products(final_products, cpath, cmodule)
+                        final_products[cpath]['compare_outputs_module'] = cmodule
+                        final_products[cpath]['files'] += result[2]
+                    LOG.info('RESULTCACHEHIT all products for %s %s, SKIPPING', area_def_id, sector_type)
+                    profiler.end_span(sector_span, status='cached')
+                    continue
             # If we read separately for each sector (geostationary), then must set xobjs within area_def loop
             if sectored_read:
-                xobjs = get_sectored_read(config_dict, area_defs, area_def_id, sector_type, reader, fnames, variables)
+                # Release the previous sector's data before reading the next, so only one sector is held at a time
+                xobjs = pad_sect_xarrays = None
+                pad_alg_xarrays = {}
+                alg_xarrays = {}
+                with profiler.span('read'):
+                    xobjs = get_sectored_read(config_dict, area_defs, area_def_id, sector_type, reader, fnames,
+                                              variables)
+                    memory_budget.account('read', xobjs)
                 if not xobjs:
                     continue
             area_def = area_defs[area_def_id][sector_type]['area_def']
@@ -459,8 +539,10 @@ def config_based(fnames, command_line_args=None):
             process_datetimes[area_def.area_id] = {}
             process_datetimes[area_def.area_id]['start'] = datetime.utcnow()
             # Make sure we grab some around the required data.
-            pad_sect_xarrays = sector_xarrays(xobjs, pad_area_def, varlist=curr_variables,
-                                              hours_before_sector_time=6, hours_after_sector_time=6, drop=True)
+            with profiler.span('sector_data'):
+                pad_sect_xarrays = sector_xarrays(xobjs, pad_area_def, varlist=curr_variables,
+                                                  hours_before_sector_time=6, hours_after_sector_time=6, drop=True)
+                memory_budget.account('sector_data', pad_sect_xarrays)
 
             # If we didn't get any data, continue to the next sector_type
             if len(pad_sect_xarrays) == 0:
@@ -482,6 +564,7 @@ def config_based(fnames, command_line_args=None):
                 # If we haven't created the bg_alg_xarray for the current sector_type yet, process it and add to the
                 # dictionary
                 if sector_type not in bg_alg_xarrays:
+                    bg_span = profiler.start_span('background', product_name=bg_product_name)
                     bg_xobjs = bg_reader(bg_files, metadata_only=False,
                                          chans=bg_variables, area_def=pad_area_def)
                     bg_pad_sect_xarrays = sector_xarrays(bg_xobjs,
@@ -492,6 +575,7 @@ def config_based(fnames, command_line_args=None):
                                                          drop=True)
                     from geoips2.interface_modules.procflows.overlay import get_bg_xarray
                     bg_alg_xarrays[sector_type] = get_bg_xarray(bg_pad_sect_xarrays, area_def, bg_product_name)
+                    profiler.end_span(bg_span)
 
             # Must adjust the area definition AFTER sectoring xarray (to get valid start/end time
             adjust_area_def = None
@@ -528,6 +612,13 @@ def config_based(fnames, command_line_args=None):
                     final_products = initialize_final_products(final_products, cpath, cmodule)
                     final_products[cpath]['compare_outputs_module'] = cmodule
 
+                    cache_key, cache_spec, cached_products = cached_results.get((output_type, product_name),
+                                                                                (None, None, None))
+                    if cached_products is not None:
+                        LOG.info('RESULTCACHEHIT %s, SKIPPING %s %s', cache_key, output_type, product_name)
+                        final_products[cpath]['files'] += cached_products
+                        continue
+
                     output_format = output_dict['output_format']
                     filename_formats = output_dict['filename_formats']
 
@@ -552,10 +643,16 @@ def config_based(fnames, command_line_args=None):
                                                           drop=True)
                             alg_xarrays[product_name] = get_alg_xarray(sect_xarrays, area_def, product_name)
                         alg_xarray = alg_xarrays[product_name]
+                    memory_budget.account('algorithm', alg_xarray)
+                    if memory_budget.is_over_budget(RELEASE_FRACTION):
+                        # Recompute for later output types, rather than holding every product's algorithm output
+                        pad_alg_xarrays.pop(product_name, None)
+                        alg_xarrays.pop(product_name, None)
 
                     from geoips2.dev.product import get_covg_from_product
                     covg_func = get_covg_from_product(product_name, alg_xarray.source_name)
-                    covg = covg_func(alg_xarray, product_name, area_def)
+                    with profiler.span('coverage', product_name=product_name):
+                        covg = covg_func(alg_xarray, product_name, area_def)
 
                     minimum_coverage = 10
                     if hasattr(alg_xarray, 'minimum_coverage'):
@@ -588,17 +685,24 @@ def config_based(fnames, command_line_args=None):
                     for filename_format in filename_formats:
                         output_fnames += [get_filename(alg_xarray, area_def, filename_format, product_name)]
 
-                    curr_products = plot_data(alg_xarray,
-                                              area_def,
-                                              output_format,
-                                              product_name,
-                                              output_fnames,
-                                              **kwargs)
+                    with profiler.span('output', product_name=product_name, output_format=output_format):
+                        curr_products = plot_data(alg_xarray,
+                                                  area_def,
+                                                  output_format,
+                                                  product_name,
+                                                  output_fnames,
+                                                  **kwargs)
 
-                    curr_metadata = produce_all_sector_metadata(curr_products, area_def, alg_xarray)
+                    with profiler.span('metadata', product_name=product_name):
+                        curr_metadata = produce_all_sector_metadata(curr_products, area_def, alg_xarray)
                     final_products[cpath]['files'] += curr_metadata
                     final_products[cpath]['files'] += curr_products
 
+                    if cache_key is not None:
+                        # Record before duplicate removal, so the result includes every output produced
+                        from geoips2.filenames.result_cache import record_result
+                        record_result(cache_key, cache_spec, curr_products + curr_metadata)
+
                     for filename_format in filename_formats:
                         if 'remove_duplicates' in output_dict and output_dict['remove_duplicates'] is not None:
                             curr_removed_products, curr_saved_products = remove_duplicates(curr_products+curr_metadata,
@@ -610,6 +714,8 @@ def config_based(fnames, command_line_args=None):
                     process_datetimes[area_def.area_id]['end'] = datetime.utcnow()
                     num_jobs += 1
 
+            profiler.end_span(sector_span)
+
     process_datetimes['overall_end'] = datetime.utcnow()
     from geoips2.dev.utils import output_process_times
     output_process_times(process_datetimes, num_jobs)
@@ -620,7 +726,8 @@ def config_based(fnames, command_line_args=None):
         if cpath != 'no_comparison':
             curr_compare_outputs = find_entry_point('output_comparisons',
                                                     final_products[cpath]['compare_outputs_module'])
-            curr_retval = curr_compare_outputs(cpath, final_products[cpath]['files'])
+            with profiler.span('compare', parent=profiler.root):
+                curr_retval = curr_compare_outputs(cpath, final_products[cpath]['files'])
             retval += curr_retval
             if curr_retval != 0:
                 failed_compares[cpath] = curr_retval
@@ -638,5 +745,6 @@ def config_based(fnames, command_line_args=None):
             LOG.info('    CONFIGSUCCESS %s', filename)
         LOG.info('\n')
 
+    stop_profiler(command_line_args.get('profile_report'))
     return retval
 
@@ -31,9 +31,16 @@ def plot_data(alg_xarray, area_def, output_format, product_name, output_fnames,
     output_func = get_outputter(output_format)
     output_func_type = get_outputter_type(output_format)
     if output_func_type == 'xarray_data':
+        from geoips2.dev.product import get_netcdf_encoding_from_product
+        # Only pass encoding_policy if specified, so xarray_data outputters without the kwarg are still supported
+        output_kwargs = {}
+        encoding_policy = get_netcdf_encoding_from_product(product_name, alg_xarray.source_name)
+        if encoding_policy is not None:
+            output_kwargs['encoding_policy'] = encoding_policy
         final_products = output_func(xarray_obj=alg_xarray,
                                      product_names=[product_name, 'latitude', 'longitude'],
-                                     output_fnames=output_fnames)
+                                     output_fnames=output_fnames,
+                                     **output_kwargs)
     else:
         from geoips2.dev.cmap import get_cmap
         from geoips2.dev.product import get_cmap_name, get_cmap_args
@@ -154,6 +161,10 @@ def overlay(fnames, command_line_args=None):
     removed_products = []
     saved_products = []
 
+    from geoips2.profiler import start_profiler, stop_profiler
+    profiler = start_profiler('overlay', product_name=command_line_args['product_name'],
+                              output_format=command_line_args['output_format'])
+
     from geoips2.commandline.args import check_command_line_args
 
     check_command_line_args(['sector_list', 'sectorfiles',  # Static sectors
@@ -207,19 +218,23 @@ def overlay(fnames, command_line_args=None):
     from geoips2.interface_modules.procflows.single_source import pad_area_definition
     pad_area_def = pad_area_definition(area_def)
 
+    sector_span = profiler.start_span('sector', parent=profiler.root, area_id=area_def.area_id)
     # Read in primary (foreground) data files
-    xobjs = reader(fnames, metadata_only=False, chans=variables, area_def=pad_area_def)
+    with profiler.span('read'):
+        xobjs = reader(fnames, metadata_only=False, chans=variables, area_def=pad_area_def)
     # Read in background data files.
-    bg_xobjs = bg_reader(bg_fnames, metadata_only=False, chans=bg_variables, area_def=pad_area_def)
+    with profiler.span('read_background'):
+        bg_xobjs = bg_reader(bg_fnames, metadata_only=False, chans=bg_variables, area_def=pad_area_def)
 
     process_datetimes[area_def.area_id] = {}
     process_datetimes[area_def.area_id]['start'] = datetime.utcnow()
     # Sector to pad_area_def to give us some wiggle room for recentering
-    sect_xarrays = sector_xarrays(xobjs, pad_area_def, varlist=variables, drop=True)
+    with profiler.span('sector_data'):
+        sect_xarrays = sector_xarrays(xobjs, pad_area_def, varlist=variables, drop=True)
 
-    # Always sector to pad_area_def for bg xarrays initially - start datetime is based off primary data.
-    # bg_xarrays will be interpolated to area_def at the last step.
-    bg_sect_xarrays = sector_xarrays(bg_xobjs, pad_area_def, varlist=bg_variables+[bg_product_name])
+        # Always sector to pad_area_def for bg xarrays initially - start datetime is based off primary data.
+        # bg_xarrays will be interpolated to area_def at the last step.
+        bg_sect_xarrays = sector_xarrays(bg_xobjs, pad_area_def, varlist=bg_variables+[bg_product_name])
 
     if adjust_area_def:
         from geoips2.geoips2_utils import find_entry_point
@@ -244,13 +259,15 @@ def overlay(fnames, command_line_args=None):
         
         sect_xarrays = sector_xarrays(sect_xarrays, area_def, varlist=variables, drop=True)
         alg_xarray = get_alg_xarray(sect_xarrays, area_def, product_name)
-        bg_xarray = get_bg_xarray(bg_sect_xarrays, area_def, bg_product_name)
+        with profiler.span('background', product_name=bg_product_name):
+            bg_xarray = get_bg_xarray(bg_sect_xarrays, area_def, bg_product_name)
 
         from geoips2.interface_modules.procflows.single_source import combine_filename_extra_fields
         alg_xarray = combine_filename_extra_fields(bg_xarray, alg_xarray)
 
         output_fnames = []
         output_fnames += [get_filename(alg_xarray, area_def, filename_format, product_name)]
+        output_span = profiler.start_span('output', output_format=output_format)
         if gridlines_info is not None:
             gridlines_info = set_lonlat_spacing(gridlines_info, area_def)
             curr_products = plot_data(alg_xarray,
@@ -270,8 +287,10 @@ def overlay(fnames, command_line_args=None):
                                       output_fnames,
                                       bg_xarray,
                                       bg_product_name)
+        profiler.end_span(output_span)
 
-        curr_metadata = produce_all_sector_metadata(curr_products, area_def, alg_xarray)
+        with profiler.span('metadata'):
+            curr_metadata = produce_all_sector_metadata(curr_products, area_def, alg_xarray)
 
         final_products += curr_metadata
         final_products += curr_products
@@ -288,6 +307,7 @@ def overlay(fnames, command_line_args=None):
         LOG.info('SKIPPING No coverage or required variables for %s %s', xobjs['METADATA'].source_name, area_def.name)
         #raise ImportError('Failed to find required fields in product algorithm: {0}.{1}'.format(
         #                                                        sect_xarrays[0].source_name,product_name))
+    profiler.end_span(sector_span)
 
     process_datetimes['overall_end'] = datetime.utcnow()
     from geoips2.dev.utils import output_process_times
@@ -297,7 +317,8 @@ def overlay(fnames, command_line_args=None):
     if compare_paths:
         from geoips2.geoips2_utils import find_entry_point
         compare_outputs = find_entry_point('output_comparisons', compare_outputs_module)
-        retval = compare_outputs(compare_paths[0].replace('<product>', product_name), final_products)
+        with profiler.span('compare', parent=profiler.root):
+            retval = compare_outputs(compare_paths[0].replace('<product>', product_name), final_products)
 
     from os.path import basename
     LOG.info('The following products were produced from procflow %s', basename(__file__))
@@ -305,5 +326,6 @@ def overlay(fnames, command_line_args=None):
         LOG.info('    SINGLESOURCESUCCESS %s', output_product)
     LOG.info('Return Value: %s', bin(retval))
 
+    stop_profiler(command_line_args.get('profile_report'))
     return retval
 
@@ -17,9 +17,8 @@
 import logging
 from datetime import timedelta
 
-import xarray
-
 from geoips2.dev.product import get_required_variables, get_product_type
+from geoips2.profiler import get_profiler
 
 PMW_NUM_PIXELS_X = 1400
 PMW_NUM_PIXELS_Y = 1400
@@ -164,9 +163,16 @@ def plot_data(alg_xarray, area_def, output_format, product_name, output_fnames,
 
     if get_outputter_type(output_format) == 'xarray_data':
         output_func = get_outputter(output_format)
+        from geoips2.dev.product import get_netcdf_encoding_from_product
+        # Only pass encoding_policy if specified, so xarray_data outputters without the kwarg are still supported
+        output_kwargs = {}
+        encoding_policy = get_netcdf_encoding_from_product(product_name, alg_xarray.source_name)
+        if encoding_policy is not None:
+            output_kwargs['encoding_policy'] = encoding_policy
         final_products = output_func(xarray_obj=alg_xarray,
                                      product_names=[product_name, 'latitude', 'longitude'],
-                                     output_fnames=output_fnames)
+                                     output_fnames=output_fnames,
+                                     **output_kwargs)
     else:
         from geoips2.dev.cmap import get_cmap
         from geoips2.dev.product import get_cmap_name, get_cmap_args
@@ -265,6 +271,7 @@ def get_area_defs_from_command_line_args(command_line_args, xobjs, variables, fi
 
 def get_alg_xarray(sect_xarrays, area_def, product_name):
 
+    import xarray
     from geoips2.dev.interp import get_interp
     from geoips2.dev.product import get_interp_name, get_interp_args
     from geoips2.dev.product import get_alg_name, get_alg_args
@@ -305,7 +312,8 @@ def get_alg_xarray(sect_xarrays, area_def, product_name):
             # Otherwise, apply the requested interpolation routine.
             else:
                 interp_args['varlist'] = [varname]
-                interp_xarray = interp_func(area_def, sect_xarray, interp_xarray, **interp_args)
+                with get_profiler().span('interp', variable=varname):
+                    interp_xarray = interp_func(area_def, sect_xarray, interp_xarray, **interp_args)
 
             LOG.info('Min/max interp %s %s / %s', varname, interp_xarray[varname].min(), interp_xarray[varname].max())
 
@@ -318,11 +326,12 @@ def get_alg_xarray(sect_xarrays, area_def, product_name):
     # algorithm types would by necessity have different procflows in general, rather than having a one size
     # fits all procflow...).
 
-    if alg_func_type == 'xarray_to_numpy':
-        interp_xarray[product_name] = xarray.DataArray(alg_func(interp_xarray, **alg_args))
-    else:
-        interp_xarray[product_name] = xarray.DataArray(alg_func([interp_xarray[varname].to_masked_array()
-                                                             for varname in variables], **alg_args))  
+    with get_profiler().span('algorithm', product_name=product_name):
+        if alg_func_type == 'xarray_to_numpy':
+            interp_xarray[product_name] = xarray.DataArray(alg_func(interp_xarray, **alg_args))
+        else:
+            interp_xarray[product_name] = xarray.DataArray(alg_func([interp_xarray[varname].to_masked_array()
+                                                                     for varname in variables], **alg_args))
 
     # Add appropriate attributes to alg_xarray
     if 'adjustment_id' in area_def.sector_info:
@@ -366,6 +375,12 @@ def single_source(fnames, command_line_args=None):
     removed_products = []
     saved_products = []
 
+    from geoips2.profiler import start_profiler, stop_profiler
+    profiler = start_profiler('single_source', product_name=command_line_args['product_name'],
+                              output_format=command_line_args['output_format'])
+    from geoips2.memory_budget import get_memory_budget
+    memory_budget = get_memory_budget(command_line_args)
+
     from geoips2.commandline.args import check_command_line_args
 
     # These args should always be checked
@@ -398,11 +413,13 @@ def single_source(fnames, command_line_args=None):
     reader = get_reader(reader_name)
 
     num_jobs = 0
-    xobjs = reader(fnames, metadata_only=True)
+    with profiler.span('read_metadata'):
+        xobjs = reader(fnames, metadata_only=True)
     from geoips2.xarray_utils.data import sector_xarrays
 
     variables = get_required_variables(product_name, xobjs['METADATA'].source_name)  #get input variables
-    area_defs = get_area_defs_from_command_line_args(command_line_args, xobjs, variables, filter_time=True)
+    with profiler.span('get_area_defs'):
+        area_defs = get_area_defs_from_command_line_args(command_line_args, xobjs, variables, filter_time=True)
 
     if get_product_type(product_name, xobjs['METADATA'].source_name) == 'unsectored_xarray_dict_to_output_format':
         xdict = reader(fnames, metadata_only=False)
@@ -416,9 +433,27 @@ def single_source(fnames, command_line_args=None):
     for area_def in area_defs:
 
         LOG.info('\n\n\n\nNEXT area definition: %s', area_def)
+        # Sector spans skipped with continue are ended as 'incomplete' when the next sector span starts
+        sector_span = profiler.start_span('sector', parent=profiler.root, area_id=area_def.area_id)
+        if command_line_args.get('result_cache'):
+            from geoips2.filenames.result_cache import get_result_cache_key, lookup_cached_result
+            cache_key, cache_spec = get_result_cache_key(fnames, product_name, xobjs['METADATA'].source_name,
+                                                         area_def, output_format, filename_format, 'single_source',
+                                                         command_line_args)
+            cached_products = lookup_cached_result(cache_key)
+            if cached_products is not None:
+                LOG.info('RESULTCACHEHIT %s, SKIPPING %s', cache_key, area_def.name)
+                final_products += cached_products
+                profiler.end_span(sector_span, status='cached')
+                continue
         pad_area_def = pad_area_definition(area_def, xobjs['METADATA'].source_name)
+        # Release the previous sector's data before reading the next, so only one sector is held at a time
+        xobjs = {'METADATA': xobjs['METADATA']}
+        pad_sect_xarrays = sect_xarrays = alg_xarray = None
         try:
-            xobjs = reader(fnames, metadata_only=False, chans=variables, area_def=pad_area_def)
+            with profiler.span('read'):
+                xobjs = reader(fnames, metadata_only=False, chans=variables, area_def=pad_area_def)
+                memory_budget.account('read', xobjs)
         # geostationary satellites fail with IndexError when the area_def does not intersect the
         # data.  Just skip those.  We need a better method for handling this generally, but for
         # now skip IndexErrors.
@@ -434,8 +469,10 @@ def single_source(fnames, command_line_args=None):
                 variables +=['SatAzimuth', 'SunAzimuth']
             else:
                 raise ValueError('SatAzimuth and/or SunAzimuth not in ABI data')
-        pad_sect_xarrays = sector_xarrays(xobjs, pad_area_def, varlist=variables,
-                                          hours_before_sector_time=6, hours_after_sector_time=6, drop=True)
+        with profiler.span('sector_data'):
+            pad_sect_xarrays = sector_xarrays(xobjs, pad_area_def, varlist=variables,
+                                              hours_before_sector_time=6, hours_after_sector_time=6, drop=True)
+            memory_budget.account('sector_data', pad_sect_xarrays)
 
         if len(pad_sect_xarrays.keys()) == 0:
             LOG.info('SKIPPING no sectored xarrays returned for %s', area_def.name)
@@ -490,10 +527,12 @@ def single_source(fnames, command_line_args=None):
                 sect_xarrays = sector_xarrays(pad_sect_xarrays, area_def, varlist=variables,
                                               hours_before_sector_time=6, hours_after_sector_time=6, drop=True)
                 alg_xarray = get_alg_xarray(sect_xarrays, area_def, product_name)
+            memory_budget.account('algorithm', alg_xarray)
 
             from geoips2.dev.product import get_covg_from_product
             covg_func = get_covg_from_product(product_name, alg_xarray.source_name)
-            covg = covg_func(alg_xarray, product_name, area_def)
+            with profiler.span('coverage'):
+                covg = covg_func(alg_xarray, product_name, area_def)
 
             for attrname in new_attrs:
                 LOG.info('ADDING attribute %s %s to alg_xarray', attrname, new_attrs[attrname])
@@ -512,6 +551,7 @@ def single_source(fnames, command_line_args=None):
                 continue
  
             output_fnames += [get_filename(alg_xarray, area_def, filename_format, product_name)]
+            output_span = profiler.start_span('output', output_format=output_format)
             if gridlines_info is not None:
                 gridlines_info = set_lonlat_spacing(gridlines_info, area_def)
                 curr_products = plot_data(alg_xarray,
@@ -527,19 +567,28 @@ def single_source(fnames, command_line_args=None):
                                       output_format,
                                       product_name,
                                       output_fnames)
+            profiler.end_span(output_span)
 
-            curr_metadata = produce_all_sector_metadata(curr_products, area_def, alg_xarray)
+            with profiler.span('metadata'):
+                curr_metadata = produce_all_sector_metadata(curr_products, area_def, alg_xarray)
             final_products += curr_metadata
 
             final_products += curr_products
 
-            curr_removed_products, curr_saved_products = remove_duplicates(curr_products+curr_metadata,
-                                                                           filename_format,
-                                                                           remove_files=True)
+            if command_line_args.get('result_cache'):
+                # Record before duplicate removal, so the result includes every output produced
+                from geoips2.filenames.result_cache import record_result
+                record_result(cache_key, cache_spec, curr_products + curr_metadata)
+
+            with profiler.span('remove_duplicates'):
+                curr_removed_products, curr_saved_products = remove_duplicates(curr_products+curr_metadata,
+                                                                               filename_format,
+                                                                               remove_files=True)
             removed_products += curr_removed_products
             saved_products += curr_saved_products
 
             process_datetimes[area_def.area_id]['end'] = datetime.utcnow()
+            profiler.end_span(sector_span)
             num_jobs += 1
         else:
             LOG.info('SKIPPING No coverage or required variables "%s" for %s %s',
@@ -560,8 +609,12 @@ def single_source(fnames, command_line_args=None):
     if compare_paths:
         from geoips2.geoips2_utils import find_entry_point
         compare_outputs = find_entry_point('output_comparisons', compare_outputs_module)
-        retval = compare_outputs(compare_paths[0].replace('<product>', product_name).replace('<procflow>', 'single_source'),
-                                 final_products)
+        with profiler.span('compare', parent=profiler.root):
+            retval = compare_outputs(compare_paths[0].replace('<product>', product_name).replace('<procflow>',
+                                                                                                'single_source'),
+                                     final_products)
+
+    stop_profiler(command_line_args.get('profile_report'))
 
     return retval
 
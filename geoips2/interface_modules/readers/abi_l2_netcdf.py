@@ -24,6 +24,8 @@ import xarray as xr
 log = logging.getLogger(__name__)
 
 reader_type = 'standard'
+# Only the data covering area_def are returned when area_def is specified
+honors_area_def = True
 
 
 def get_metadata(fname):
@@ -46,6 +46,8 @@ except ImportError:
 from geoips2.filenames.base_paths import PATHS as gpaths
 
 reader_type = 'standard'
+# Only the data covering area_def are returned when area_def is specified
+honors_area_def = True
 
 log = logging.getLogger(__name__)
 
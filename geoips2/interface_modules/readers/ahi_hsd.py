@@ -86,6 +86,8 @@ ALL_GVARS = {'LOW': ['latitude', 'longitude', 'SunZenith', 'SunAzimuth', 'SatZen
              'HIGH': ['latitude', 'longitude', 'SunZenith', 'SunAzimuth', 'SatZenith', 'SatAzimuth']}
 
 reader_type = 'standard'
+# Only the data covering area_def are returned when area_def is specified
+honors_area_def = True
 
 
 class AutoGenError(Exception):
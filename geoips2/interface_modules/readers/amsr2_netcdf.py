@@ -198,9 +198,8 @@ def read_amsr_mbt(full_xarray, varname, timestamp=None):
     else:
         LOG.info('Using existing scan_times, for dims %s', sub_xarray[varnames[varname]].dims)
         sub_xarray['timestamp'] = timestamp
-    from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp, get_max_from_xarray_timestamp
-    sub_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(sub_xarray, 'timestamp')
-    sub_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(sub_xarray, 'timestamp')
+    from geoips2.xarray_utils.timestamp import get_timestamp_range
+    sub_xarray.attrs['start_datetime'], sub_xarray.attrs['end_datetime'] = get_timestamp_range(sub_xarray, 'timestamp')
     return sub_xarray
 
 
@@ -301,8 +300,9 @@ def amsr2_netcdf(fnames, metadata_only=False, chans=None, area_def=None, self_re
 
     for dsname, curr_xarray in xarrays.items():
         LOG.info('Setting standard metadata')
-        from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp, get_max_from_xarray_timestamp
-        curr_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(curr_xarray, 'timestamp')
-        curr_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(curr_xarray, 'timestamp')
+        from geoips2.xarray_utils.timestamp import get_timestamp_range
+        start_datetime, end_datetime = get_timestamp_range(curr_xarray, 'timestamp')
+        curr_xarray.attrs['start_datetime'] = start_datetime
+        curr_xarray.attrs['end_datetime'] = end_datetime
     xarrays['METADATA'] = list(xarrays.values())[0][[]]
     return xarrays
@@ -52,9 +52,6 @@
 # Python Standard Libraries
 import logging
 LOG = logging.getLogger(__name__)
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 from numpy import datetime64
 
 # library for hdf files
@@ -142,9 +142,6 @@ Since AMSU-A sensor is no longer available, we select only the AMSU-B/MHS channe
 
 # Python Standard Libraries
 import logging
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 from numpy import datetime64
 
 # library for hdf files
@@ -127,14 +127,11 @@ def read_byu_data(wind_xarray):
         wind_xarray['sigma0_mean'] = (wind_xarray['sig_fore'] + wind_xarray['sig_aft'] + wind_xarray['sig_mid'] )/3
 
     from datetime import datetime
-    from numpy import datetime64
+    from geoips2.interface_modules.readers.utils.wind_decoding import broadcast_timestamp
     startdt = datetime.strptime(wind_xarray.SZF_start_time[:-1], '%Y%m%d%H%M%S')
     enddt = datetime.strptime(wind_xarray.SZF_stop_time[:-1], '%Y%m%d%H%M%S')
     middt = startdt + (enddt - startdt) / 2
-    timearray = numpy.ma.array(numpy.zeros(shape=wind_xarray.latitude.shape).astype(int) + datetime64(middt))
-    wind_xarray['timestamp'] = xarray.DataArray(timearray,
-                                                name='timestamp',
-                                                coords=wind_xarray['latitude'].coords)
+    wind_xarray['timestamp'] = broadcast_timestamp(middt, wind_xarray['latitude'])
     wind_xarray = wind_xarray.set_coords(['timestamp'])
 
     return {dsname: wind_xarray}
@@ -169,7 +166,7 @@ def ascat_uhr_netcdf(fnames, metadata_only=False, chans=None, area_def=None, sel
             Variables and Attributes: (See geoips2/docs :doc:`xarray_standards`)
     '''
 
-    from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp, get_max_from_xarray_timestamp
+    from geoips2.interface_modules.readers.utils.wind_decoding import set_wind_standard_metadata
     import xarray
     # Only SAR reads multiple files
     fname = fnames[0]
@@ -189,23 +186,7 @@ def ascat_uhr_netcdf(fnames, metadata_only=False, chans=None, area_def=None, sel
     if hasattr(wind_xarray, 'institution') and 'Brigham Young University' in wind_xarray.institution:
         wind_xarrays = read_byu_data(wind_xarray)
 
-    for wind_xarray in wind_xarrays.values():
-
-        LOG.info('Setting standard metadata')
-        wind_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(wind_xarray, 'timestamp')
-        wind_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(wind_xarray, 'timestamp')
-
-        if 'wind_speed_kts' in wind_xarray.variables:
-            # These text files store wind speeds natively in kts
-            wind_xarray['wind_speed_kts'].attrs['units'] = 'kts'
-
-        LOG.info('Read data %s start_dt %s source %s platform %s data_provider %s roi %s native resolution',
-                 wind_xarray.attrs['start_datetime'],
-                 wind_xarray.attrs['source_name'],
-                 wind_xarray.attrs['platform_name'],
-                 wind_xarray.attrs['data_provider'],
-                 wind_xarray.attrs['interpolation_radius_of_influence'],
-                 wind_xarray.attrs['sample_distance_km'])
+    wind_xarray = set_wind_standard_metadata(wind_xarrays)
 
     wind_xarrays['METADATA'] = wind_xarray[[]]
     if wind_xarrays['METADATA'].start_datetime == wind_xarrays['METADATA'].end_datetime:
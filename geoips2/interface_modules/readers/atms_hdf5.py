@@ -76,126 +76,153 @@ GATMO_j01_d20210809_t0959306_e1000023_b19296_fnmoc_ops.h5:     for geolocations
 
 from os.path import basename
 
-import h5py
-import numpy as np
-
 import logging
 LOG = logging.getLogger(__name__)
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 
 reader_type = 'standard'
 
-#from IPython import embed as shell
+TB_GROUP = 'ATMS-SDR_All'
+GEO_GROUP = 'ATMS-SDR-GEO_All'
 
-# list of variables selected from input files
-atms_vars=['BrightnessTemperature','BrightnessTemperatureFactors','BeamTime','Latitude', 'Longitude',
-           'SatelliteAzimuthAngle','SatelliteZenithAngle', 'SolarAzimuthAngle', 'SolarZenithAngle',
-           'StartTime']
+# (output variable name, BrightnessTemperature channel index) for selected TB channels
+# H183 uses index 18 to match the 183+-4.5 GHz channel used by FNMOC
+tb_channels = [('V23', 0), ('V31', 1), ('H50', 2), ('V89', 15), ('H165', 16), ('H183', 18)]
 
-# unify common names for sat/sun-zenith and azimuth angles
-xvarnames={'SolarZenithAngle': 'SunZenith',
-           'SolarAzimuthAngle': 'SunAzimuth',
-           'SatelliteZenithAngle': 'SatZenith',
-           'SatelliteAzimuthAngle': 'SatAzimuth'}
+# (output variable name, geolocation dataset name) - unify common names for sat/sun-zenith and azimuth angles
+geo_vars = [('latitude', 'Latitude'),
+            ('longitude', 'Longitude'),
+            ('SunZenith', 'SolarZenithAngle'),
+            ('SunAzimuth', 'SolarAzimuthAngle'),
+            ('SatZenith', 'SatelliteZenithAngle'),
+            ('SatAzimuth', 'SatelliteAzimuthAngle')]
 
-import xarray as xr
-final_xarray = xr.Dataset()              #define a xarray to hold all selected variables
+# IDPS Epoch Time is microseconds since 00:00:00.000000 Jan 1 1958
+IET_EPOCH = '1958-01-01T00:00:00'
 
 
-def read_atms_file(fname, xarray_atms):
-    fileobj = h5py.File(fname, mode='r')
-    import pandas as pd
-    import xarray as xr
+def iet_to_datetime64(iet_time):
+    ''' Convert an array of IDPS Epoch Times to datetime64[ns], truncated to whole seconds.
+
+    Leap seconds are ignored, matching the previous Unix time based conversion - IET includes leap seconds,
+    so the returned times are offset from UTC by the leap seconds since 1958.
+
+    Args:
+        iet_time (numpy.ndarray) : signed 64-bit integer microseconds since 00:00:00 Jan 1 1958
+
+    Returns:
+        (numpy.ndarray) : datetime64[ns] array of the same shape as iet_time
+    '''
     import numpy
-    import datetime
- 
-    #check for available variables from nput file
-    if 'ATMS-SDR_All' in fileobj['All_Data'].keys():                 #for TB-data
-        data_select=fileobj['All_Data']['ATMS-SDR_All']
-        
-        tb      = data_select['BrightnessTemperature'][()] 
-        tb_time = data_select['BeamTime'][()] 
-        tb_factor = data_select['BrightnessTemperatureFactors'][()]
-
-        # convert tb to actual values
-        tbs=tb*tb_factor[0] + tb_factor[1]
- 
-        # TBs for selected channels 
-        V23 =tbs[:,:,0]
-        V31 =tbs[:,:,1]
-        H50 =tbs[:,:,2]
-        V89 =tbs[:,:,15]
-        H165=tbs[:,:,16]    
-        H183=tbs[:,:,18]                  #to match the 183+-4.5 GHz channel used by FNMOC    
-
-        #  get UTC time in datetime64 format required by geoips2 for each pixel
-        nscan=tb_time.shape[0]        # 12
-        npix =tb_time.shape[1]        # 96 pixels per scan
-        time_scan=np.zeros((nscan,npix)).astype('int')   # 0 initilization of an integer array     
-
-        for i in range(nscan):
-            for j in range(npix):
-                pix_date=datetime.datetime.utcfromtimestamp(tb_time[i,j]/1e6).replace(tzinfo=datetime.timezone.utc)
-
-                yy   = pix_date.year
-                mo   = pix_date.month
-                dd   = pix_date.day
-                hh   = pix_date.hour
-                mm   = pix_date.minute
-                ss   = pix_date.second
-
-                # setup time in datetime64 format required by geoips2 
-                yy=yy-12   #adjust difference of Unix epoch (1970) and JPSS IDPS epoch (19598)=378,691,200 seconds  
-                time_scan[i,j]='%04d%02d%02d%02d%02d%02d' % (yy,mo,dd,hh,mm,ss)
-
-        #make list of numpy arrays
-        var_names=[V23,V31,H50,V89,H165,H183,time_scan]
-        list_vars = ['V23','V31','H50','V89','H165','H183','time_scan']
-
-    if 'ATMS-SDR-GEO_All' in fileobj['All_Data'].keys():             #for geo-data
-        data_select=fileobj['All_Data']['ATMS-SDR-GEO_All']
-
-        lat       =data_select['Latitude'][()]
-        lon       =data_select['Longitude'][()]
-        SunZenith =data_select['SolarZenithAngle'][()]
-        SunAzimuth=data_select['SolarAzimuthAngle'][()]
-        SatZenith =data_select['SatelliteZenithAngle'][()]
-        SatAzimuth=data_select['SatelliteAzimuthAngle'][()]        
-
-        #make list of numpy arrays
-        var_names=[lat,lon,SunZenith,SunAzimuth,SatZenith,SatAzimuth]
-        list_vars = ['latitude','longitude','SunZenith','SunAzimuth','SatZenith','SatAzimuth']
-
-    #close the h5 object
-    fileobj.close()
-
-    #          ------  setup xarray variables   ------
-
-    #namelist_atms  = ['latitude', 'longitude', 'V23', 'V31', 'H50','V89','H165','H183','timestamp'
-    #                   'SunZenith', 'SunAzimuth', 'SatZenith','SatAzimuth']
-
-    if list_vars[0] not in xarray_atms.variables.keys():
-        # new variables, add these vars to the ATMS xarray
-        for i in range(len(list_vars)):
-            if list_vars[i] == 'time_scan':
-                final_xarray['timestamp']=xr.DataArray(pd.DataFrame(var_names[i]).apply(pd.to_datetime,format='%Y%m%d%H%M%S'))
-            else:
-                final_xarray[list_vars[i]] =xr.DataArray(var_names[i])
-    else:
-        # accumulation of mutliple files
-        for i in range(len(list_vars)):
-            if list_vars[i] == 'time_scan':
-                new_timestamp = xr.DataArray(pd.DataFrame(var_names[i]).apply(pd.to_datetime, format='%Y%m%d%H%M%S'))
-                merged_array=numpy.vstack([xarray_atms['timestamp'].to_masked_array(), new_timestamp.to_masked_array()])
-                final_xarray['timestamp'] = xr.DataArray(merged_array,dims=['dim_'+str(merged_array.shape[0]), 'dim_1'])
-            else:
-                merged_array=numpy.vstack([xarray_atms[list_vars[i]].to_masked_array(), var_names[i]])
-                final_xarray[list_vars[i]] = xr.DataArray(merged_array,dims=['dim_'+str(merged_array.shape[0]), 'dim_1'])
+    timestamps = numpy.datetime64(IET_EPOCH, 'us') + iet_time.astype('int64').astype('timedelta64[us]')
+    return timestamps.astype('datetime64[s]').astype('datetime64[ns]')
 
-    
-    return final_xarray
+
+def get_atms_file_info(fname):
+    ''' First pass over a single ATMS file - determine the file type, shape, and dtypes without reading data.
+
+    Args:
+        fname (str) : Full path to SATMS (TB) or GATMO (geolocation) h5 file
+
+    Returns:
+        (dict) : Dictionary with keys fname, group, nscan, npix, dtypes ({varname: dtype}), and platform_name.
+                 None if the file contains neither TB nor geolocation data.
+    '''
+    import h5py
+    import numpy
+    with h5py.File(fname, mode='r') as fileobj:
+        if TB_GROUP in fileobj['All_Data'].keys():
+            group = TB_GROUP
+            data_select = fileobj['All_Data'][TB_GROUP]
+            shape = data_select['BeamTime'].shape
+            tb_dtype = numpy.result_type(data_select['BrightnessTemperature'].dtype,
+                                         data_select['BrightnessTemperatureFactors'].dtype)
+            dtypes = dict((varname, tb_dtype) for varname, chan_ind in tb_channels)
+            dtypes['timestamp'] = numpy.dtype('datetime64[ns]')
+        elif GEO_GROUP in fileobj['All_Data'].keys():
+            group = GEO_GROUP
+            data_select = fileobj['All_Data'][GEO_GROUP]
+            shape = data_select['Latitude'].shape
+            dtypes = dict((varname, data_select[dsname].dtype) for varname, dsname in geo_vars)
+        else:
+            LOG.warning('No ATMS TB or geolocation data in %s, skipping', fname)
+            return None
+        platform_name = fileobj.attrs['Platform_Short_Name'][0, 0].decode("utf-8")
+
+    return {'fname': fname,
+            'group': group,
+            'nscan': shape[0],
+            'npix': shape[1],
+            'dtypes': dtypes,
+            'platform_name': platform_name}
+
+
+def read_atms_file(fname, arrays, scan_start, scan_end):
+    ''' Second pass over a single ATMS file - fill rows scan_start:scan_end of the preallocated arrays.
+
+    Only the variables contained in arrays are read, so metadata only reads pull just BeamTime from the TB files.
+
+    Args:
+        fname (str) : Full path to SATMS (TB) or GATMO (geolocation) h5 file
+        arrays (dict) : {varname: numpy.ndarray} preallocated output arrays for this file's group
+        scan_start (int) : first output row for this file
+        scan_end (int) : end output row (exclusive) for this file
+
+    Returns:
+        None, arrays are filled in place
+    '''
+    import h5py
+    import numpy
+    with h5py.File(fname, mode='r') as fileobj:
+        if TB_GROUP in fileobj['All_Data'].keys():
+            data_select = fileobj['All_Data'][TB_GROUP]
+            if 'timestamp' in arrays:
+                arrays['timestamp'][scan_start:scan_end] = iet_to_datetime64(data_select['BeamTime'][()])
+            selected = [(varname, chan_ind) for varname, chan_ind in tb_channels if varname in arrays]
+            if selected:
+                tb_factor = data_select['BrightnessTemperatureFactors'][()]
+                tb = data_select['BrightnessTemperature'][()]
+                for varname, chan_ind in selected:
+                    # convert tb to actual values
+                    arrays[varname][scan_start:scan_end] = tb[:, :, chan_ind] * tb_factor[0] + tb_factor[1]
+        elif GEO_GROUP in fileobj['All_Data'].keys():
+            data_select = fileobj['All_Data'][GEO_GROUP]
+            for varname, dsname in geo_vars:
+                if varname in arrays:
+                    data_select[dsname].read_direct(arrays[varname], dest_sel=numpy.s_[scan_start:scan_end])
+
+
+def assemble_atms_arrays(file_infos, varnames=None):
+    ''' Preallocate and fill the output arrays for all files, concatenated along the scan dimension.
+
+    TB and geolocation files are each stacked in the order they appear in file_infos.
+
+    Args:
+        file_infos (list) : list of dictionaries returned from get_atms_file_info
+        varnames (list) : DEFAULT None (all variables).  Only assemble the variables listed.
+
+    Returns:
+        (dict) : {varname: numpy.ndarray} of shape (total scans, npix)
+    '''
+    import numpy
+    arrays = {}
+    for group in (TB_GROUP, GEO_GROUP):
+        group_infos = [info for info in file_infos if info['group'] == group]
+        if not group_infos:
+            continue
+        nscan = sum([info['nscan'] for info in group_infos])
+        npix = group_infos[0]['npix']
+        group_arrays = dict((varname, numpy.empty((nscan, npix), dtype=dtype))
+                            for varname, dtype in group_infos[0]['dtypes'].items()
+                            if varnames is None or varname == 'timestamp' or varname in varnames)
+        scan_start = 0
+        for info in group_infos:
+            if info['npix'] != npix:
+                raise ValueError('Inconsistent number of ATMS pixels per scan in {0}: {1} != {2}'.format(
+                                 info['fname'], info['npix'], npix))
+            read_atms_file(info['fname'], group_arrays, scan_start, scan_start + info['nscan'])
+            scan_start += info['nscan']
+        arrays.update(group_arrays)
+    return arrays
 
 
 def atms_hdf5(fnames, metadata_only=False, chans=None, area_def=None, self_register=False):
@@ -205,13 +232,15 @@ def atms_hdf5(fnames, metadata_only=False, chans=None, area_def=None, self_regis
     All GeoIPS 2.0 readers read data into xarray Datasets - a separate
     dataset for each shape/resolution of data - and contain standard metadata information.
 
+    Files are read in two passes - the first pass only inspects each file to count scans, the second pass fills
+    preallocated arrays for all granules at once.  No state is held between calls.
+
     Args:
         fnames (list): List of strings, full paths to files
         metadata_only (Optional[bool]):
             * DEFAULT False
             * return before actually reading data if True
-            * note:  since atms reader is designed to read all data information from the first time,
-                     the second time to read the atms datafiles is not needed.  Thus, reading the data for the second time is skipped
+            * only BeamTime is read from the TB files, to determine start and end datetimes
         chans (Optional[list of str]):
             * NOT YET IMPLEMENTED
                 * DEFAULT None (include all channels)
@@ -228,40 +257,43 @@ def atms_hdf5(fnames, metadata_only=False, chans=None, area_def=None, self_regis
     Returns:
         list of xarray.Datasets: list of xarray.Dataset objects with required
             Variables and Attributes: (See geoips2/docs :doc:`xarray_standards`)
-            
+
     '''
 
-    import os
-    from datetime import datetime
-    import numpy as np
     import xarray as xr
-    from IPython import embed as shell
 
     LOG.info('Reading files %s', fnames)
 
-    if metadata_only == True:                      # read-in datafiles first time if 'metadata_only= True'
-        xarray_atms = xr.Dataset()
-        xarray_atms.attrs['original_source_filenames'] = []
-        for fname in fnames:
-            xarray_atms = read_atms_file(fname, xarray_atms)
-            xarray_atms.attrs['original_source_filenames'] += [basename(fname)]     #name of last file from input files
-
-        # setup attributors
-        fileobj = h5py.File(fname, mode='r')
-        from geoips2.xarray_utils.timestamp import get_datetime_from_datetime64
-        from geoips2.xarray_utils.timestamp import get_max_from_xarray_timestamp, get_min_from_xarray_timestamp
-        xarray_atms.attrs['start_datetime'] = get_min_from_xarray_timestamp(xarray_atms, 'timestamp')
-        xarray_atms.attrs['end_datetime'] = get_max_from_xarray_timestamp(xarray_atms, 'timestamp')
-        xarray_atms.attrs['source_name'] = 'atms'
-        xarray_atms.attrs['platform_name'] = fileobj.attrs['Platform_Short_Name'][0,0].decode("utf-8")  #could be changed if needed
-        xarray_atms.attrs['data_provider'] = 'NOAA'      
-
-        # MTIFs need to be "prettier" for PMW products, so 2km resolution for final image
-        xarray_atms.attrs['sample_distance_km'] = 2
-        xarray_atms.attrs['interpolation_radius_of_influence'] = 30000     #could be tuned if needed
-        fileobj.close()
-    else:                   # if 'metadata_only= False', it is for the second time to read-in datafiles    
-        xarray_atms=final_xarray                 #avoid read the data the second time
+    # First pass - count scans per file, no data read
+    file_infos = [info for info in [get_atms_file_info(fname) for fname in fnames] if info is not None]
+
+    # Second pass - fill preallocated arrays
+    varnames = None
+    if metadata_only:
+        varnames = []
+    arrays = assemble_atms_arrays(file_infos, varnames=varnames)
+
+    xarray_atms = xr.Dataset()
+    for varname, data in arrays.items():
+        xarray_atms[varname] = xr.DataArray(data, dims=['dim_0', 'dim_1'])
+
+    # setup attributors
+    from geoips2.xarray_utils.timestamp import get_timestamp_range
+    xarray_atms.attrs['original_source_filenames'] = [basename(fname) for fname in fnames]
+    start_datetime, end_datetime = get_timestamp_range(xarray_atms, 'timestamp')
+    xarray_atms.attrs['start_datetime'] = start_datetime
+    xarray_atms.attrs['end_datetime'] = end_datetime
+    xarray_atms.attrs['source_name'] = 'atms'
+    xarray_atms.attrs['platform_name'] = file_infos[-1]['platform_name']  # could be changed if needed
+    xarray_atms.attrs['data_provider'] = 'NOAA'
+
+    # MTIFs need to be "prettier" for PMW products, so 2km resolution for final image
+    xarray_atms.attrs['sample_distance_km'] = 2
+    xarray_atms.attrs['interpolation_radius_of_influence'] = 30000     # could be tuned if needed
+
+    if metadata_only:
+        LOG.info('metadata_only, returning without reading TB or geolocation data')
+        return {'METADATA': xarray_atms[[]]}
 
     return {'METADATA': xarray_atms[[]],
             'ATMS': xarray_atms}
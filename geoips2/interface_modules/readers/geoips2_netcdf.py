@@ -21,6 +21,8 @@ import logging
 LOG = logging.getLogger(__name__)
 
 reader_type = 'standard'
+# Only the data covering area_def are returned when area_def is specified
+honors_area_def = True
 
 
 def geoips2_netcdf(fnames, metadata_only=False, chans=None, area_def=None, self_register=False):
@@ -35,13 +37,12 @@ def geoips2_netcdf(fnames, metadata_only=False, chans=None, area_def=None, self_
             * DEFAULT False
             * return before actually reading data if True
         chans (Optional[list of str]):
-            * NOT YET IMPLEMENTED
-                * DEFAULT None (include all channels)
-                * List of desired channels (skip unneeded variables as needed)
+            * DEFAULT None (include all channels)
+            * List of desired channels (skip unneeded variables as needed)
         area_def (Optional[pyresample.AreaDefinition]):
-            * NOT YET IMPLEMENTED
-                * DEFAULT None (read all data)
-                * Specify region to read
+            * DEFAULT None (read all data)
+            * Specify region to read - only the row/column window of 2-D latitude/longitude data
+              covering area_def is read
         self_register (Optional[str]):
             * NOT YET IMPLEMENTED
                 * DEFAULT False (read multiple resolutions of data)
@@ -59,27 +60,83 @@ def geoips2_netcdf(fnames, metadata_only=False, chans=None, area_def=None, self_
     from os.path import basename
     xarray_objs = {}
     for fname in fnames:
-        xarray_objs[basename(fname)] = read_xarray_netcdf(fname)
+        if metadata_only:
+            # Variables are opened lazily, so this only reads the file header
+            xarray_objs['METADATA'] = read_xarray_netcdf(fname)[[]]
+            return xarray_objs
+        xarray_objs[basename(fname)] = read_xarray_netcdf(fname, chans=chans, area_def=area_def)
 
     xarray_objs['METADATA'] = list(xarray_objs.values())[0][[]]
 
     return xarray_objs
 
 
-def read_xarray_netcdf(ncdf_fname):
+def get_area_def_window(xarray_obj, area_def):
+    ''' Return the row/column slices of 2-D latitude/longitude data in xarray_obj covering area_def
+
+    Args:
+        xarray_obj (xarray.Dataset) : Dataset containing 2-D latitude and longitude variables
+        area_def (pyresample.AreaDefinition) : region of interest
+
+    Returns:
+        (dict) : {dim: slice} for use with xarray_obj.isel, empty if latitude/longitude are not 2-D,
+                 None if no data fall within area_def
+    '''
+    import numpy
+    from geoips2.interface_modules.readers.utils.text_columns import bbox_predicate
+    if 'latitude' not in xarray_obj.variables or 'longitude' not in xarray_obj.variables \
+       or xarray_obj['latitude'].ndim != 2:
+        return {}
+    lat_dims = xarray_obj['latitude'].dims
+    mask = bbox_predicate(area_def)({'latitude': xarray_obj['latitude'].values,
+                                     'longitude': xarray_obj['longitude'].values})
+    rows = numpy.where(mask.any(axis=1))[0]
+    cols = numpy.where(mask.any(axis=0))[0]
+    if not rows.size:
+        return None
+    return {lat_dims[0]: slice(int(rows[0]), int(rows[-1]) + 1),
+            lat_dims[1]: slice(int(cols[0]), int(cols[-1]) + 1)}
+
+
+def read_xarray_netcdf(ncdf_fname, chans=None, area_def=None, chunks=None):
+    ''' Open a geoips2 formatted netcdf file, decoding attributes written by write_xarray_netcdf
+
+    Variables are opened lazily - data are only read from disk for the variables and window that are
+    actually accessed.
+
+    Args:
+        ncdf_fname (str) : full path to netcdf file
+        chans (list) : DEFAULT None, list of variables to include.  latitude, longitude, and timestamp are always
+                       included.  If None, include all variables.
+        area_def (pyresample.AreaDefinition) : DEFAULT None, if specified only include the row/column window of
+                                               2-D latitude/longitude data covering area_def
+        chunks (dict) : DEFAULT None, if specified, dask chunk sizes passed to xarray.open_dataset (requires dask)
+
+    Returns:
+        (xarray.Dataset) : Dataset with original attribute types restored
+    '''
     import xarray
-    from datetime import datetime
-    try:
-        xarray_obj = xarray.open_dataset(ncdf_fname)
-    except IOError:
-        raise IOError
-    for attr in xarray_obj.attrs.keys():
-        if 'datetime' in attr:
-            xarray_obj.attrs[attr] = datetime.strptime(xarray_obj.attrs[attr], '%c')
-        if attr == 'None':
-            xarray_obj.attrs[attr] = None
-        if attr == 'True':
-            xarray_obj.attrs[attr] = True
-        if attr == 'False':
-            xarray_obj.attrs[attr] = False
+    from geoips2.xarray_utils.attr_encoding import decode_attrs
+    open_kwargs = {}
+    if chunks is not None:
+        open_kwargs['chunks'] = chunks
+    xarray_obj = xarray.open_dataset(ncdf_fname, **open_kwargs)
+
+    xarray_obj.attrs = decode_attrs(xarray_obj.attrs)
+    for varname in xarray_obj.variables.keys():
+        xarray_obj.variables[varname].attrs = decode_attrs(xarray_obj.variables[varname].attrs)
+
+    if chans is not None:
+        keep_vars = set(chans) | set(['latitude', 'longitude', 'timestamp'])
+        xarray_obj = xarray_obj.drop_vars([varname for varname in xarray_obj.data_vars
+                                           if varname not in keep_vars])
+
+    if area_def is not None:
+        window = get_area_def_window(xarray_obj, area_def)
+        if window is None:
+            LOG.info('No data in %s within area_def %s', ncdf_fname, area_def.area_id)
+            window = dict((dim, slice(0, 0)) for dim in xarray_obj['latitude'].dims)
+        if window:
+            LOG.info('Reading window %s from %s', window, ncdf_fname)
+            xarray_obj = xarray_obj.isel(window)
     return xarray_obj
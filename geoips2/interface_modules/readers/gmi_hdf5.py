@@ -42,9 +42,6 @@ import numpy as np
 
 import logging
 LOG = logging.getLogger(__name__)
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 
 reader_type = 'standard'
 
@@ -191,10 +188,9 @@ def gmi_hdf5(fnames, metadata_only=False, chans=None, area_def=None, self_regist
 
     # setup attributors
     from geoips2.xarray_utils.timestamp import get_datetime_from_datetime64
-    from geoips2.xarray_utils.timestamp import get_max_from_xarray_timestamp, get_min_from_xarray_timestamp
+    from geoips2.xarray_utils.timestamp import get_timestamp_range
     xarray_gmi.attrs['original_source_filenames'] = original_source_filenames
-    xarray_gmi.attrs['start_datetime'] = get_min_from_xarray_timestamp(xarray_gmi, 'timestamp')
-    xarray_gmi.attrs['end_datetime'] = get_max_from_xarray_timestamp(xarray_gmi, 'timestamp')
+    xarray_gmi.attrs['start_datetime'], xarray_gmi.attrs['end_datetime'] = get_timestamp_range(xarray_gmi, 'timestamp')
     xarray_gmi.attrs['source_name'] = 'gmi'
     xarray_gmi.attrs['platform_name'] = 'GPM'
     xarray_gmi.attrs['data_provider'] = 'NASA'
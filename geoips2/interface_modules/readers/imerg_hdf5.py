@@ -40,13 +40,28 @@ from os.path import basename
 # Installed Libraries
 import h5py
 import numpy as np
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 
 LOG = logging.getLogger(__name__)
 
 reader_type = 'standard'
+# Only the data covering area_def are returned when area_def is specified
+honors_area_def = True
+
+
+def set_imerg_attrs(xarray_imerg, start_dt, end_dt, fname):
+    ''' Set the standard IMERG metadata attributes on xarray_imerg '''
+    # xarray_imerg.attrs['start_datetime'] = datetime.strptime(start_time,'%Y%m%d%H%M%S')
+    xarray_imerg.attrs['start_datetime'] = start_dt
+    # xarray_imerg.attrs['end_datetime']   = datetime.strptime(end_time,'%Y%m%d%H%M%S')
+    xarray_imerg.attrs['end_datetime'] = end_dt
+    xarray_imerg.attrs['source_name']    = 'imerg'
+    xarray_imerg.attrs['platform_name']  = 'GPM'
+    xarray_imerg.attrs['data_provider']  = 'NASA'
+    xarray_imerg.attrs['original_source_filenames'] = [basename(fname)]
+
+    # MTIFs need to be "prettier" for PMW products, so 2km resolution for final image
+    xarray_imerg.attrs['sample_distance_km'] = 2
+    xarray_imerg.attrs['interpolation_radius_of_influence'] = 15000
 
 
 def imerg_hdf5(fnames, metadata_only=False, chans=None, area_def=None, self_register=False):
@@ -65,9 +80,9 @@ def imerg_hdf5(fnames, metadata_only=False, chans=None, area_def=None, self_regi
                 * DEFAULT None (include all channels)
                 * List of desired channels (skip unneeded variables as needed)
         area_def (Optional[pyresample.AreaDefinition]):
-            * NOT YET IMPLEMENTED
-                * DEFAULT None (read all data)
-                * Specify region to read
+            * DEFAULT None (read all data)
+            * Specify region to read - only the grid rows and columns covering area_def are read, and
+              the windowed data are returned (lat, lon), north to south and west to east
         self_register (Optional[str]):
             * NOT YET IMPLEMENTED
                 * DEFAULT False (read multiple resolutions of data)
@@ -111,37 +126,45 @@ def imerg_hdf5(fnames, metadata_only=False, chans=None, area_def=None, self_regi
     # start_time = date_yrmody + date_hhmmse_start
     # end_time   = date_yrmody + date_hhmmse_end
 
-    # get imerg variables    
-    if hasattr(fileobj['Grid']['lat'], 'value'):
-        # Older versions of h5py - 2.10.0
-        lat=fileobj['Grid']['lat'].value                          #(1800)
-        lon=fileobj['Grid']['lon'].value                          #(3600)
-        
-        rain  =fileobj['Grid']['precipitationCal'].value                        #(1,3600,1800)
-        rrProb=fileobj['Grid']['probabilityLiquidPrecipitation'].value          #(1,3600,1800)
-        rrErr =fileobj['Grid']['randomError'].value                             #(1,3600,1800)
-        IRrr  =fileobj['Grid']['IRprecipitation'].value                         #(1,3600,1800)
-    else:
-        # Newer versions of h5py - 3.2.1
-        lat=fileobj['Grid']['lat'][:]                          #(1800)
-        lon=fileobj['Grid']['lon'][:]                          #(3600)
-        
-        rain  =fileobj['Grid']['precipitationCal'][:]                        #(1,3600,1800)
-        rrProb=fileobj['Grid']['probabilityLiquidPrecipitation'][:]          #(1,3600,1800)
-        rrErr =fileobj['Grid']['randomError'][:]                             #(1,3600,1800)
-        IRrr  =fileobj['Grid']['IRprecipitation'][:]                         #(1,3600,1800)
-
-    lat_2d,lon_2d=np.meshgrid(lat,lon)                        #(3600,1800)
-
-    # take out the fake additional array of 3d_array (actually 2D array), i.e., delete the "1" array of above variables
-    rain  =np.squeeze(rain)
-    rrProb=np.squeeze(rrProb) 
-    rrErr =np.squeeze(rrErr) 
-    IRrr  =np.squeeze(IRrr) 
+    # get imerg 1-D coordinates - variables are (1, lon, lat), (1,3600,1800)
+    lat = fileobj['Grid']['lat'][...]                          #(1800)
+    lon = fileobj['Grid']['lon'][...]                          #(3600)
 
     start_dt = datetime.utcfromtimestamp(fileobj['Grid']['time'][...][0])
     end_dt = start_dt + timedelta(minutes=int(fileobj['Grid']['HQobservationTime'][...].max()))
 
+    if metadata_only:
+        fileobj.close()
+        xarray_imerg = xr.Dataset()
+        set_imerg_attrs(xarray_imerg, start_dt, end_dt, fname)
+        LOG.info('metadata_only, returning without reading data')
+        return {'METADATA': xarray_imerg}
+
+    lat_inds = None
+    if area_def is not None:
+        from geoips2.interface_modules.readers.utils.regular_grid import get_regular_grid_window
+        lat_inds, lon_inds = get_regular_grid_window(lat, lon, area_def)
+        if lat_inds is None:
+            LOG.warning('area_def does not overlap the IMERG grid, reading full grid')
+
+    if lat_inds is None:
+        # Full grid, in the file's original (lon, lat) order
+        rain  =np.squeeze(fileobj['Grid']['precipitationCal'][...])                  #(3600,1800)
+        rrProb=np.squeeze(fileobj['Grid']['probabilityLiquidPrecipitation'][...])    #(3600,1800)
+        rrErr =np.squeeze(fileobj['Grid']['randomError'][...])                       #(3600,1800)
+        IRrr  =np.squeeze(fileobj['Grid']['IRprecipitation'][...])                   #(3600,1800)
+        lat_2d,lon_2d=np.meshgrid(lat,lon)                                           #(3600,1800)
+    else:
+        # Only read the rows and columns needed for area_def, returned (lat, lon) north to south and west to east
+        from geoips2.interface_modules.readers.utils.regular_grid import read_regular_grid_variable
+        # take out the fake additional array of 3d_array (actually 2D array), i.e., delete the "1" array
+        rain  =read_regular_grid_variable(fileobj['Grid']['precipitationCal'], lat_inds, lon_inds, 2, 1)[0]
+        rrProb=read_regular_grid_variable(fileobj['Grid']['probabilityLiquidPrecipitation'],
+                                          lat_inds, lon_inds, 2, 1)[0]
+        rrErr =read_regular_grid_variable(fileobj['Grid']['randomError'], lat_inds, lon_inds, 2, 1)[0]
+        IRrr  =read_regular_grid_variable(fileobj['Grid']['IRprecipitation'], lat_inds, lon_inds, 2, 1)[0]
+        lon_2d,lat_2d=np.meshgrid(lon[lon_inds],lat[lat_inds])                       #(nlat,nlon)
+
     #close the h5 object
     fileobj.close()
 
@@ -159,19 +182,7 @@ def imerg_hdf5(fnames, metadata_only=False, chans=None, area_def=None, self_regi
     xarray_imerg['rrErr']    =xr.DataArray(rrErr)
     xarray_imerg['IRrr']     =xr.DataArray(IRrr)
 
-    # setup attributors
-    # xarray_imerg.attrs['start_datetime'] = datetime.strptime(start_time,'%Y%m%d%H%M%S')
-    xarray_imerg.attrs['start_datetime'] = start_dt
-    # xarray_imerg.attrs['end_datetime']   = datetime.strptime(end_time,'%Y%m%d%H%M%S')
-    xarray_imerg.attrs['end_datetime'] = end_dt
-    xarray_imerg.attrs['source_name']    = 'imerg'
-    xarray_imerg.attrs['platform_name']  = 'GPM'
-    xarray_imerg.attrs['data_provider']  = 'NASA'
-    xarray_imerg.attrs['original_source_filenames'] = [basename(fname)]
-
-    # MTIFs need to be "prettier" for PMW products, so 2km resolution for final image
-    xarray_imerg.attrs['sample_distance_km'] = 2
-    xarray_imerg.attrs['interpolation_radius_of_influence'] = 15000
+    set_imerg_attrs(xarray_imerg, start_dt, end_dt, fname)
 
     return {'IMERG': xarray_imerg,
             'METADATA': xarray_imerg[[]]}
@@ -20,6 +20,8 @@ from datetime import datetime
 LOG = logging.getLogger(__name__)
 
 reader_type = 'standard'
+# Only the data covering area_def are returned when area_def is specified
+honors_area_def = True
 
 
 def mimic_netcdf(fnames, metadata_only=False, chans=None, area_def=None, self_register=False):
@@ -55,9 +57,9 @@ def mimic_netcdf(fnames, metadata_only=False, chans=None, area_def=None, self_re
                 * DEFAULT None (include all channels)
                 * List of desired channels (skip unneeded variables as needed)
         area_def (Optional[pyresample.AreaDefinition]):
-            * NOT YET IMPLEMENTED
-                * DEFAULT None (read all data)
-                * Specify region to read
+            * DEFAULT None (read all data)
+            * Specify region to read - only the grid rows and columns covering area_def are read, and
+              the windowed data are returned north to south and west to east
         self_register (Optional[str]):
             * NOT YET IMPLEMENTED
                 * DEFAULT False (read multiple resolutions of data)
@@ -90,10 +92,21 @@ def mimic_netcdf(fnames, metadata_only=False, chans=None, area_def=None, self_re
 
     LOG.info('Obtaining lat/lon from xarray')
     # Meshgrid requires Latitude and Longitude at once, so don't put in loop
-    lat = xobj.variables['latArr'][...]
-    lon = xobj.variables['lonArr'][...]
-
-    LOG.info('Calculating full lat/lon grid')
+    lat = xobj.variables['latArr'][...].data
+    lon = xobj.variables['lonArr'][...].data
+    if area_def is not None:
+        # Only read the rows and columns needed for area_def, north to south and west to east
+        from geoips2.interface_modules.readers.utils.regular_grid import get_regular_grid_window
+        lat_inds, lon_inds = get_regular_grid_window(lat, lon, area_def)
+        if lat_inds is None:
+            LOG.warning('area_def does not overlap the MIMIC grid, reading full grid')
+        else:
+            LOG.info('Reading lat/lon window')
+            xobj = xobj.isel(lat=lat_inds, lon=lon_inds)
+            lat = lat[lat_inds]
+            lon = lon[lon_inds]
+
+    LOG.info('Calculating lat/lon grid')
     import numpy
     lon_final, lat_final = numpy.meshgrid(lon,lat)
 
@@ -67,20 +67,14 @@ def read_sar_data(wind_xarray):
     wind_xarray = wind_xarray.rename({'latitude': 'latitude', 'longitude': 'longitude'})
 
     # Set timestamp appropriately
-    # Get the full array of timestamps.  pandas is much better with time series.
-    wind_pandas = wind_xarray.to_dataframe()
-
-    # This worked with xarray version 0.16.1
-    # wind_xarray['timestamp'] = wind_pandas['acquisition_time'][:, 5, :].to_xarray().transpose()
-
-    # Make sure it grabs the right ones, no matter which order x, y, and xfit are in.
-    # Later versions (0.18.0) of xarray can have different orders -
-    # ensure we use labels, not explicit locations
-    timestamp_array = wind_pandas['acquisition_time'].to_xarray()[dict(x=slice(None),
-                                                                       y=slice(None),
-                                                                       xfit=5)].transpose('y', 'x')
-    # Remove the xfit coordinate - no longer needed
-    wind_xarray['timestamp'] = timestamp_array.reset_coords('xfit', drop=True)
+    # acquisition_time is decoded natively by xarray - use the xfit=5 fit point, broadcast to the full (y, x)
+    # wind array.  Use labels, not explicit locations, since xarray versions can order dimensions differently.
+    from geoips2.interface_modules.readers.utils.wind_decoding import broadcast_timestamp
+    acquisition_time = wind_xarray['acquisition_time']
+    if 'xfit' in acquisition_time.dims:
+        acquisition_time = acquisition_time.isel(xfit=5)
+    wind_xarray['timestamp'] = broadcast_timestamp(acquisition_time,
+                                                   wind_xarray['wind_speed_kts'].transpose('y', 'x'))
 
     wind_xarray = wind_xarray.set_coords(['timestamp'])
     wind_xarray['sigma'] = xarray.where(wind_xarray.sigma == 0, numpy.nan, wind_xarray.sigma)
@@ -118,7 +112,7 @@ def sar_winds_netcdf(fnames, metadata_only=False, chans=None, area_def=None, sel
             Variables and Attributes: (See geoips2/docs :doc:`xarray_standards`)
     '''
 
-    from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp, get_max_from_xarray_timestamp
+    from geoips2.interface_modules.readers.utils.wind_decoding import set_wind_standard_metadata, concatenate_rows
     import xarray
     # Only SAR reads multiple files
     fname = fnames[0]
@@ -135,61 +129,40 @@ def sar_winds_netcdf(fnames, metadata_only=False, chans=None, area_def=None, sel
     if hasattr(wind_xarray, 'source') and 'SAR' in wind_xarray.source\
        and hasattr(wind_xarray, 'title') and 'SAR' in wind_xarray.title:
         wind_xarrays = []
+        source_fnames = []
         columns = None
         for fname in fnames:
             LOG.info('    Reading file %s', fname)
-            wind_xarray = xarray.open_dataset(str(fname))
+            # The first file is already open - only open each file once
+            if fname != fnames[0]:
+                wind_xarray = xarray.open_dataset(str(fname))
             LOG.info('        rows: %s, columns: %s', wind_xarray.rows, wind_xarray.columns)
             if columns is None:
                 columns = wind_xarray.columns
             if columns == wind_xarray.columns:
                 wind_xarrays += read_sar_data(wind_xarray)
+                source_fnames += [basename(fname)]
             else:
                 LOG.info('            COLUMNS DOES NOT MATCH, NOT APPENDING')
         if len(fnames) == 1:
             wind_xarrays = {'WINDSPEED': wind_xarrays[0]}
         else:
+            # Concatenate all files along rows into preallocated arrays
             final_xarray = xarray.Dataset()
-            import numpy
-            lat_array = xarray.DataArray(numpy.vstack([curr_xarray.latitude.to_masked_array()
-                                                       for curr_xarray in wind_xarrays]))
-            lon_array = xarray.DataArray(numpy.vstack([curr_xarray.longitude.to_masked_array()
-                                                       for curr_xarray in wind_xarrays]))
-            timestamp_array = xarray.DataArray(numpy.vstack([curr_xarray.timestamp.to_masked_array()
-                                                             for curr_xarray in wind_xarrays]))
-            wspd_array = xarray.DataArray(numpy.vstack([curr_xarray.wind_speed_kts.to_masked_array()
-                                                       for curr_xarray in wind_xarrays]))
-            sigma_array = xarray.DataArray(numpy.vstack([curr_xarray.sigma.to_masked_array()
-                                                       for curr_xarray in wind_xarrays]))
-            final_xarray['latitude'] = lat_array
-            final_xarray['longitude'] = lon_array
-            final_xarray['timestamp'] = timestamp_array
-            final_xarray['wind_speed_kts'] = wspd_array
-            final_xarray['sigma'] = sigma_array
-            final_xarray.attrs = wind_xarrays[0].attrs
+            for varname in ['latitude', 'longitude', 'timestamp', 'wind_speed_kts', 'sigma']:
+                final_xarray[varname] = xarray.DataArray(concatenate_rows([curr_xarray[varname]
+                                                                           for curr_xarray in wind_xarrays]))
+            final_xarray.attrs = dict(wind_xarrays[0].attrs)
 
             wind_xarrays = {'WINDSPEED': final_xarray}
+        # Every file concatenated into the final dataset, not only the first
+        wind_xarrays['WINDSPEED'].attrs['original_source_filenames'] = source_fnames
 
     for wind_xarray in wind_xarrays.values():
-
         if not hasattr(wind_xarray, 'minimum_coverage'):
             wind_xarray.attrs['minimum_coverage'] = 20
 
-        LOG.info('Setting standard metadata')
-        wind_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(wind_xarray, 'timestamp')
-        wind_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(wind_xarray, 'timestamp')
-
-        if 'wind_speed_kts' in wind_xarray.variables:
-            # These text files store wind speeds natively in kts
-            wind_xarray['wind_speed_kts'].attrs['units'] = 'kts'
-
-        LOG.info('Read data %s start_dt %s source %s platform %s data_provider %s roi %s native resolution',
-                 wind_xarray.attrs['start_datetime'],
-                 wind_xarray.attrs['source_name'],
-                 wind_xarray.attrs['platform_name'],
-                 wind_xarray.attrs['data_provider'],
-                 wind_xarray.attrs['interpolation_radius_of_influence'],
-                 wind_xarray.attrs['sample_distance_km'])
+    wind_xarray = set_wind_standard_metadata(wind_xarrays)
 
     wind_xarrays['METADATA'] = wind_xarray[[]]
     if wind_xarrays['METADATA'].start_datetime == wind_xarrays['METADATA'].end_datetime:
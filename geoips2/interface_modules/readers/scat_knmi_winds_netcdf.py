@@ -103,7 +103,7 @@ def scat_knmi_winds_netcdf(fnames, metadata_only=False, chans=None, area_def=Non
             Variables and Attributes: (See geoips2/docs :doc:`xarray_standards`)
     '''
 
-    from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp, get_max_from_xarray_timestamp
+    from geoips2.interface_modules.readers.utils.wind_decoding import set_wind_standard_metadata
     import xarray
     # Only SAR reads multiple files
     fname = fnames[0]
@@ -126,23 +126,7 @@ def scat_knmi_winds_netcdf(fnames, metadata_only=False, chans=None, area_def=Non
     if hasattr(wind_xarray, 'title_short_name') and 'OSCAT' in wind_xarray.title_short_name:
         wind_xarrays = read_knmi_data(wind_xarray)
 
-    for wind_xarray in wind_xarrays.values():
-
-        LOG.info('Setting standard metadata')
-        wind_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(wind_xarray, 'timestamp')
-        wind_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(wind_xarray, 'timestamp')
-
-        if 'wind_speed_kts' in wind_xarray.variables:
-            # These text files store wind speeds natively in kts
-            wind_xarray['wind_speed_kts'].attrs['units'] = 'kts'
-
-        LOG.info('Read data %s start_dt %s source %s platform %s data_provider %s roi %s native resolution',
-                 wind_xarray.attrs['start_datetime'],
-                 wind_xarray.attrs['source_name'],
-                 wind_xarray.attrs['platform_name'],
-                 wind_xarray.attrs['data_provider'],
-                 wind_xarray.attrs['interpolation_radius_of_influence'],
-                 wind_xarray.attrs['sample_distance_km'])
+    wind_xarray = set_wind_standard_metadata(wind_xarrays)
 
     wind_xarrays['METADATA'] = wind_xarray[[]]
 
@@ -107,6 +107,8 @@ IR_CALIB = {'msg1': {'B04': {'wn': 2567.330, 'a': 0.9956, 'b': 3.410}, # IR3.9 W
 geolocation_variable_names = ['latitude', 'longitude', 'SunZenith', 'SatZenith', 'SunAzimuth', 'SatAzimuth']
 
 reader_type = 'standard'
+# Only the data covering area_def are returned when area_def is specified
+honors_area_def = True
 
 
 def calculate_chebyshev_polynomial(coefs, start_dt, end_dt, dt):
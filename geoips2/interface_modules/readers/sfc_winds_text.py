@@ -19,6 +19,8 @@ LOG = logging.getLogger(__name__)
 MS_TO_KTS = 1.94384
 
 reader_type = 'standard'
+# Only the data covering area_def are returned when area_def is specified
+honors_area_def = True
 
 
 def sfc_winds_text(fnames, metadata_only=False, chans=None, area_def=None, self_register=False):
@@ -37,9 +39,9 @@ def sfc_winds_text(fnames, metadata_only=False, chans=None, area_def=None, self_
                 * DEFAULT None (include all channels)
                 * List of desired channels (skip unneeded variables as needed)
         area_def (Optional[pyresample.AreaDefinition]):
-            * NOT YET IMPLEMENTED
-                * DEFAULT None (read all data)
-                * Specify region to read
+            * DEFAULT None (read all data)
+            * Specify region to read - points outside the padded lat/lon extent of area_def are dropped
+              before the xarray Dataset is built.  start_datetime and end_datetime reflect the full file.
         self_register (Optional[str]):
             * NOT YET IMPLEMENTED
                 * DEFAULT False (read multiple resolutions of data)
@@ -52,58 +54,82 @@ def sfc_winds_text(fnames, metadata_only=False, chans=None, area_def=None, self_
     fname = fnames[0]
     import numpy
     import pandas
+    import xarray
+    from geoips2.interface_modules.readers.utils.text_columns import read_text_columns, filter_columns
+    from geoips2.interface_modules.readers.utils.text_columns import bbox_predicate
     LOG.info('Reading file %s', fname)
-    data = numpy.loadtxt(fname, dtype=str, skiprows=0)
 
-    if data[0][0] == 'SAR':
+    with open(fname, 'r') as fobj:
+        data_type = fobj.readline().split()[0]
+
+    if data_type == 'SAR':
         source_name = 'sar-spd'
         platform_name = 'sentinel-1'
         interpolation_roi = 3000
         data_provider = 'star'
-    elif data[0][0] == 'SMAP':
+    elif data_type == 'SMAP':
         source_name = 'smap-spd'
         platform_name = 'smap'
         interpolation_roi = 15000
         data_provider = 'rss'
-    elif data[0][0] == 'SMOS':
+    elif data_type == 'SMOS':
         source_name = 'smos-spd'
         platform_name = 'smos'
         interpolation_roi = 25000
         data_provider = 'esa'
-    elif data[0][0] == 'AMSR':
+    elif data_type == 'AMSR':
         source_name = 'amsr2'
         platform_name = 'gcom-w1'
         interpolation_roi = 10000
         data_provider = 'star'
 
-    LOG.info('Making full dataframe')
-    # make a data frame
-    columns = ['dataType', 'latitude', 'longitude', 'wind_speed_kts', 'timestamp']
-    wind_xarray = pandas.DataFrame(data=data, columns=columns)
-
-    LOG.info('Converting lat to numeric')
-    # make appropriate data types
-    wind_xarray['longitude'] = pandas.to_numeric(wind_xarray['longitude'], errors='coerce')
-    LOG.info('Converting lon to numeric')
-    wind_xarray['latitude'] = pandas.to_numeric(wind_xarray['latitude'], errors='coerce')
-    LOG.info('Converting windspeed to numeric')
-    wind_xarray['wind_speed_kts'] = pandas.to_numeric(wind_xarray['wind_speed_kts'], errors='coerce')
-    LOG.info('Converting to timestamp to datetime')
-
-    # This is ORDERS OF MAGNITUDE slower than giving the format directly. Seconds vs minutes
-    # wind_xarray['timestamp'] = pandas.to_datetime(wind_xarray['timestamp'],
-    #                                                infer_datetime_format=True, errors='coerce')
-    wind_xarray['timestamp'] = pandas.to_datetime(wind_xarray['timestamp'], format='%Y%m%d%H%M', errors='coerce')
-
-    wind_xarray = wind_xarray.to_xarray()
-
-    wind_xarray.attrs['source_name'] = source_name
-    wind_xarray.attrs['platform_name'] = platform_name
-    wind_xarray.attrs['start_datetime'] = wind_xarray.to_dataframe()['timestamp'].min().to_pydatetime()
-    wind_xarray.attrs['end_datetime'] = wind_xarray.to_dataframe()['timestamp'].max().to_pydatetime()
-    wind_xarray.attrs['data_provider'] = data_provider
-    # 20000 leaves gaps
-    wind_xarray.attrs['interpolation_radius_of_influence'] = interpolation_roi
+    # (name, dtype, datetime_format) for each column in the file
+    # Giving the timestamp format directly is ORDERS OF MAGNITUDE faster than inferring it. Seconds vs minutes
+    columns = [('dataType', 'U16', None),
+               ('latitude', numpy.float64, None),
+               ('longitude', numpy.float64, None),
+               ('wind_speed_kts', numpy.float64, None),
+               ('timestamp', None, '%Y%m%d%H%M')]
+
+    if metadata_only:
+        LOG.info('Parsing timestamp column only')
+        data = read_text_columns(fname, columns[4:], usecols=[4])
+    else:
+        LOG.info('Parsing typed columns')
+        data = read_text_columns(fname, columns, index_name='index')
+
+    # Use the full file for start and end times, before any spatial filtering
+    timestamps = data['timestamp'][~numpy.isnat(data['timestamp'])]
+    if timestamps.size:
+        start_datetime = pandas.Timestamp(timestamps.min()).to_pydatetime()
+        end_datetime = pandas.Timestamp(timestamps.max()).to_pydatetime()
+    else:
+        LOG.warning('No valid timestamps in %s', fname)
+        # Same as the pandas min / max of an all NaT timestamp column
+        start_datetime = end_datetime = pandas.NaT
+    attrs = {'source_name': source_name,
+             'platform_name': platform_name,
+             'start_datetime': start_datetime,
+             'end_datetime': end_datetime,
+             'data_provider': data_provider,
+             # 20000 leaves gaps
+             'interpolation_radius_of_influence': interpolation_roi}
+
+    if metadata_only:
+        LOG.info('metadata_only, returning without building wind dataset')
+        return {'METADATA': xarray.Dataset(attrs=attrs)}
+
+    if area_def is not None:
+        LOG.info('Filtering to area_def %s', area_def.name)
+        data = filter_columns(data, bbox_predicate(area_def))
+
+    LOG.info('Making wind dataset')
+    # Same layout as pandas.DataFrame.to_xarray, with original row numbers as the index coordinate
+    wind_xarray = xarray.Dataset(coords={'index': data['index']})
+    wind_xarray['dataType'] = xarray.DataArray(data['dataType'].astype(object), dims=('index',))
+    for varname in ['latitude', 'longitude', 'wind_speed_kts', 'timestamp']:
+        wind_xarray[varname] = xarray.DataArray(data[varname], dims=('index',))
+    wind_xarray.attrs = attrs
 
     # These text files store wind speeds natively in kts
     wind_xarray['wind_speed_kts'].attrs['units'] = 'kts'
@@ -23,13 +23,13 @@ DEG_TO_KM = 111.321
 reader_type = 'standard'
 
 
-def read_smos_data(wind_xarray, fname):
+def read_smos_data(wind_xarray, fname, measurement_time):
     ''' Reformat SMOS xarray object appropriately
             variables: latitude, longitude, timestamp, wind_speed_kts
-            attributes: source_name, platform_name, data_provider, interpolation_radius_of_influence'''
+            attributes: source_name, platform_name, data_provider, interpolation_radius_of_influence
+            measurement_time is the undecoded measurement_time DataArray'''
     import xarray
     import numpy
-    from datetime import datetime, timedelta
     LOG.info('Reading SMOS data')
 
     # Attributes aren't set in the data files - use the file names to determine the version
@@ -58,28 +58,19 @@ def read_smos_data(wind_xarray, fname):
                                                 name='longitude',
                                                 coords=wind_xarray['wind_speed_kts'].coords)
     wind_xarray = wind_xarray.set_coords(['latitude', 'longitude'])
-    # timearray = numpy.zeros(wind_xarray.wind_speed_kts.shape).astype(int) + wind_xarray.time.values[0]
-
-    timearray = numpy.ma.masked_array(data=numpy.zeros(wind_xarray.wind_speed_kts.shape).astype(int)
-                                      + wind_xarray.time.values[0],
-                                      mask=True)
-    from numpy import datetime64, timedelta64
-    from netCDF4 import Dataset
-    ncobj = Dataset(fname)
-    basedt = datetime64(datetime.strptime('19900101', '%Y%m%d'))
-    nctimearray = numpy.flipud(ncobj.variables['measurement_time'][...][0, :, :])
-    timeinds = numpy.ma.where(nctimearray)
-    # Check if there are any unmasked timeinds, if so update timearray
-    if numpy.size(timeinds) > 0:
-        timedata = nctimearray[timeinds].data.tolist()
-        timevals = numpy.ma.masked_array([basedt + timedelta64(timedelta(days=xx)) for xx in timedata])
-        timearray[timeinds] = timevals
-    # Otherwise set timearray as unmasked values
-    else:
-        timearray = timearray.data
-    wind_xarray['timestamp'] = xarray.DataArray(data=timearray,
-                                                name='timestamp',
-                                                coords=wind_xarray['wind_speed_kts'].coords)
+
+    from geoips2.interface_modules.readers.utils.wind_decoding import broadcast_timestamp, cf_offsets_to_datetime64
+    timestamp = broadcast_timestamp(wind_xarray.time.values[0], wind_xarray['wind_speed_kts'])
+    # measurement_time is read undecoded, days since 1990-01-01.  0 indicates no measurement.
+    nctimearray = numpy.flipud(measurement_time.to_masked_array()[0, :, :])
+    valid = ~numpy.ma.getmaskarray(nctimearray) & (nctimearray.filled(0) != 0)
+    # Check if there are any valid times, if so use them, otherwise use the time variable everywhere
+    if valid.any():
+        timestamp.values[...] = cf_offsets_to_datetime64(nctimearray,
+                                                         measurement_time.attrs.get('units',
+                                                                                    'days since 1990-01-01'),
+                                                         valid=valid)
+    wind_xarray['timestamp'] = timestamp
     return {'WINDSPEED': wind_xarray}
 
 
@@ -112,12 +103,15 @@ def smos_winds_netcdf(fnames, metadata_only=False, chans=None, area_def=None, se
             Variables and Attributes: (See geoips2/docs :doc:`xarray_standards`)
     '''
 
-    from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp, get_max_from_xarray_timestamp
+    from geoips2.interface_modules.readers.utils.wind_decoding import set_wind_standard_metadata
     import numpy
     import xarray
     # Only SAR reads multiple files
     fname = fnames[0]
-    wind_xarray = xarray.open_dataset(str(fname))
+    # Open once without decoding times, so the raw measurement_time offsets are available, then decode the rest.
+    raw_xarray = xarray.open_dataset(str(fname), decode_times=False)
+    measurement_time = raw_xarray['measurement_time']
+    wind_xarray = xarray.decode_cf(raw_xarray)
     # Set attributes appropriately
     wind_xarray.attrs['original_source_filenames'] = [basename(fname)]
     wind_xarray.attrs['minimum_coverage'] = 20
@@ -140,27 +134,10 @@ def smos_winds_netcdf(fnames, metadata_only=False, chans=None, area_def=None, se
 
     LOG.info('Read data from %s', fname)
 
-    # SMOS timestamp is not read in correctly natively with xarray - must pass fname so we can get time
-    # information directly from netCDF4.Dataset open
-    wind_xarrays = read_smos_data(wind_xarray, fname)
-
-    for wind_xarray in wind_xarrays.values():
-
-        LOG.info('Setting standard metadata')
-        wind_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(wind_xarray, 'timestamp')
-        wind_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(wind_xarray, 'timestamp')
-
-        if 'wind_speed_kts' in wind_xarray.variables:
-            # These text files store wind speeds natively in kts
-            wind_xarray['wind_speed_kts'].attrs['units'] = 'kts'
+    # SMOS measurement_time is not decoded correctly natively with xarray - decode the raw offsets directly
+    wind_xarrays = read_smos_data(wind_xarray, fname, measurement_time)
 
-        LOG.info('Read data %s start_dt %s source %s platform %s data_provider %s roi %s native resolution',
-                 wind_xarray.attrs['start_datetime'],
-                 wind_xarray.attrs['source_name'],
-                 wind_xarray.attrs['platform_name'],
-                 wind_xarray.attrs['data_provider'],
-                 wind_xarray.attrs['interpolation_radius_of_influence'],
-                 wind_xarray.attrs['sample_distance_km'])
+    wind_xarray = set_wind_standard_metadata(wind_xarrays)
 
     wind_xarrays['METADATA'] = wind_xarray[[]]
     if wind_xarrays['METADATA'].start_datetime == wind_xarrays['METADATA'].end_datetime:
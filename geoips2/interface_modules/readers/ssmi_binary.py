@@ -68,9 +68,6 @@
 import logging
 from os.path import basename
 LOG = logging.getLogger(__name__)
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 from numpy import datetime64
 
 reader_type = 'standard'
@@ -32,9 +32,6 @@ import logging
 from os.path import basename
 #import os
 from datetime import datetime, timedelta
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 
 LOG = logging.getLogger(__name__)
 
@@ -0,0 +1,151 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Utilities for reading sector windows from regular lat/lon grids (IMERG, MIMIC, etc).
+
+    Windows are computed from the 1-D latitude and longitude coordinate arrays, so only the rows and columns
+    needed for the requested area_def are read.  The window covers the lat/lon bounds of the full area_def
+    boundary, so sectors crossing the dateline or containing a pole are handled.  Windowed data are always
+    returned with latitude decreasing along rows (north to south) and longitude increasing along columns
+    (west to east).
+'''
+import logging
+
+import numpy
+
+LOG = logging.getLogger(__name__)
+
+
+def get_area_def_lonlat_bounds(area_def):
+    ''' Return the lat/lon bounds of the full boundary of area_def.
+
+    Every pixel along the four edges of area_def is used, rather than only the corners, so edges that bow
+    poleward, sectors crossing the dateline, and sectors containing a pole are all bounded correctly.
+
+    Args:
+        area_def (pyresample.AreaDefinition) : region of interest
+
+    Returns:
+        (tuple) : (minlon, minlat, maxlon, maxlat), minlon between -180 and 180, and maxlon - minlon the
+                  longitude width of the sector (maxlon may exceed 180 when crossing the dateline).
+                  (-180, -90, 180, 90) if the boundary has no valid locations (ie, geostationary full disk)
+    '''
+    num_lines, num_samples = area_def.shape
+    edges = [area_def.get_lonlats(data_slice=(0, slice(None))),
+             area_def.get_lonlats(data_slice=(slice(None), num_samples - 1)),
+             area_def.get_lonlats(data_slice=(num_lines - 1, slice(None))),
+             area_def.get_lonlats(data_slice=(slice(None), 0))]
+    # Some pyresample versions return 2-D (1, N) / (N, 1) arrays for edge slices
+    edges = [(numpy.ravel(lons), numpy.ravel(lats)) for lons, lats in edges]
+    # Walk the boundary in order: top left to right, right top to bottom, bottom right to left, left bottom to top
+    lons = numpy.concatenate([edges[0][0], edges[1][0], edges[2][0][::-1], edges[3][0][::-1]]).astype(numpy.float64)
+    lats = numpy.concatenate([edges[0][1], edges[1][1], edges[2][1][::-1], edges[3][1][::-1]]).astype(numpy.float64)
+    good = numpy.isfinite(lons) & numpy.isfinite(lats) & (numpy.abs(lats) <= 90.0)
+    lons = lons[good]
+    lats = lats[good]
+    if not lons.size:
+        return -180.0, -90.0, 180.0, 90.0
+    minlat = float(lats.min())
+    maxlat = float(lats.max())
+
+    # A boundary that winds all the way around in longitude encloses a pole
+    steps = (numpy.diff(numpy.append(lons, lons[0])) + 180.0) % 360.0 - 180.0
+    if abs(steps.sum()) > 180.0:
+        if lats.mean() > 0:
+            maxlat = 90.0
+        else:
+            minlat = -90.0
+        return -180.0, minlat, 180.0, maxlat
+
+    # The sector covers everything except the largest longitude gap between boundary points
+    sorted_lons = numpy.sort(lons % 360.0)
+    gaps = numpy.append(numpy.diff(sorted_lons), sorted_lons[0] + 360.0 - sorted_lons[-1])
+    largest_gap = int(numpy.argmax(gaps))
+    minlon = float(sorted_lons[(largest_gap + 1) % sorted_lons.size])
+    minlon = ((minlon + 180.0) % 360.0) - 180.0
+    return minlon, minlat, minlon + 360.0 - float(gaps[largest_gap]), maxlat
+
+
+def get_regular_grid_window(lats, lons, area_def=None, lon_pad=3.0, lat_pad=3.0):
+    ''' Return the indices of a regular lat/lon grid needed to cover area_def.
+
+    Args:
+        lats (numpy.ndarray) : 1-D array of grid latitudes, ascending or descending
+        lons (numpy.ndarray) : 1-D array of grid longitudes, ascending
+        area_def (pyresample.AreaDefinition) : DEFAULT None, return the full grid
+        lon_pad (float) : DEFAULT 3.0, degrees of longitude to include outside area_def on each side
+        lat_pad (float) : DEFAULT 3.0, degrees of latitude to include outside area_def on each side
+
+    Returns:
+        (tuple) : (lat_inds, lon_inds) numpy integer arrays.  lat_inds are ordered north to south, lon_inds are
+                  ordered west to east, wrapping past the end of the longitude array when the sector crosses the
+                  grid seam (ie, the dateline for -180 to 180 grids).  (None, None) if area_def does not overlap
+                  the grid.
+    '''
+    lats = numpy.asarray(lats)
+    lons = numpy.asarray(lons)
+
+    lat_inds = numpy.arange(lats.size)
+    lon_inds = numpy.arange(lons.size)
+    if area_def is not None:
+        minlon, minlat, maxlon, maxlat = get_area_def_lonlat_bounds(area_def)
+        lat_inds = numpy.where((lats >= minlat - lat_pad) & (lats <= maxlat + lat_pad))[0]
+
+        # Longitude offsets east of the western edge of the sector, 0 to 360
+        lon_width = maxlon - minlon + 2 * lon_pad
+        if lon_width < 360.0:
+            lon_offsets = (lons - (minlon - lon_pad)) % 360.0
+            lon_inds = numpy.where(lon_offsets <= lon_width)[0]
+            lon_inds = lon_inds[numpy.argsort(lon_offsets[lon_inds], kind='stable')]
+
+    if not lat_inds.size or not lon_inds.size:
+        LOG.info('  No regular grid points within area_def %s', area_def)
+        return None, None
+
+    lat_inds = lat_inds[numpy.argsort(-lats[lat_inds], kind='stable')]
+    return lat_inds, lon_inds
+
+
+def get_index_runs(inds):
+    ''' Split an array of indices into a list of slices of consecutive increasing indices '''
+    breaks = numpy.where(numpy.diff(inds) != 1)[0] + 1
+    return [slice(int(run[0]), int(run[-1]) + 1) for run in numpy.split(inds, breaks)]
+
+
+def read_regular_grid_variable(var, lat_inds, lon_inds, lat_axis, lon_axis):
+    ''' Read the lat_inds/lon_inds window from a gridded variable using only contiguous slices.
+
+    Args:
+        var (array-like) : h5py.Dataset, netCDF4.Variable, numpy.ndarray, or any object supporting basic slicing
+        lat_inds (numpy.ndarray) : latitude indices, as returned from get_regular_grid_window
+        lon_inds (numpy.ndarray) : longitude indices, as returned from get_regular_grid_window
+        lat_axis (int) : latitude dimension of var
+        lon_axis (int) : longitude dimension of var
+
+    Returns:
+        (numpy.ndarray) : windowed data, with latitude and longitude moved to the last two dimensions
+                          (..., lat, lon), ordered north to south and west to east
+    '''
+    lat_slice = slice(int(lat_inds.min()), int(lat_inds.max()) + 1)
+    pieces = []
+    # Wrapped longitudes are read as two pieces, either side of the grid seam
+    for lon_slice in get_index_runs(lon_inds):
+        index = [slice(None)] * len(var.shape)
+        index[lat_axis] = lat_slice
+        index[lon_axis] = lon_slice
+        pieces += [numpy.asarray(var[tuple(index)])]
+    data = numpy.concatenate(pieces, axis=lon_axis)
+    data = numpy.take(data, lat_inds - lat_slice.start, axis=lat_axis)
+    return numpy.moveaxis(data, (lat_axis, lon_axis), (-2, -1))
+
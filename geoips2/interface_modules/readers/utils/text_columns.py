@@ -0,0 +1,239 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Typed columnar parser for delimited text data files (text winds, WFABBA fires, etc).
+
+    Each file is parsed in a single pass by numpy's compiled text parser directly into a structured array of
+    numeric / fixed width string fields, rather than reading every field as a Python string and converting
+    column by column.  Compact numeric datetime fields (ie, 202108091230) are read as integers and decoded to
+    datetime64 with vectorized arithmetic.
+
+    If the fast parse fails on malformed values, the file is re-parsed line by line, and unparseable values are
+    coerced to NaN / NaT (matching pandas.to_numeric / to_datetime with errors='coerce').
+
+    Optional row predicates (see bbox_predicate and time_predicate) are applied to the typed columns before any
+    xarray or pandas objects are constructed.
+'''
+import logging
+from itertools import islice
+
+LOG = logging.getLogger(__name__)
+
+# Field widths for the datetime format codes supported by compact_datetime_to_datetime64
+DATETIME_FIELD_WIDTHS = {'%Y': 4, '%m': 2, '%d': 2, '%j': 3, '%H': 2, '%M': 2, '%S': 2}
+
+
+def get_parse_dtype(columns):
+    ''' Return the numpy structured dtype used to parse the requested columns
+
+    Args:
+        columns (list) : list of (name, dtype, datetime_format) tuples.  If datetime_format is not None, the
+                         column is parsed as int64 and decoded to datetime64[ns] using datetime_format.
+
+    Returns:
+        (numpy.dtype) : structured dtype with one field per column
+    '''
+    import numpy
+    return numpy.dtype([(name, numpy.int64 if datetime_format else dtype)
+                        for name, dtype, datetime_format in columns])
+
+
+def compact_datetime_to_datetime64(values, datetime_format):
+    ''' Decode integers of concatenated datetime fields (ie, 202108091230 for %Y%m%d%H%M) to datetime64[ns]
+
+    Args:
+        values (numpy.ndarray) : int64 array of encoded datetimes.  Negative values are treated as missing.
+        datetime_format (str) : concatenation of %Y, %m, %d, %j, %H, %M, and %S format codes
+
+    Returns:
+        (numpy.ndarray) : datetime64[ns] array, NaT where values are missing or not valid datetimes
+    '''
+    import numpy
+    codes = [datetime_format[ind:ind + 2] for ind in range(0, len(datetime_format), 2)]
+    if ''.join(codes) != datetime_format or not set(codes).issubset(DATETIME_FIELD_WIDTHS):
+        raise ValueError('Unsupported compact datetime format {0}'.format(datetime_format))
+
+    values = numpy.asarray(values, dtype=numpy.int64)
+    fields = {}
+    remainder = values.copy()
+    for code in reversed(codes):
+        scale = 10 ** DATETIME_FIELD_WIDTHS[code]
+        fields[code] = remainder % scale
+        remainder = remainder // scale
+
+    ones = numpy.ones(values.shape, dtype=numpy.int64)
+    zeros = numpy.zeros(values.shape, dtype=numpy.int64)
+    year = fields.get('%Y', ones * 1970)
+    month = fields.get('%m', ones)
+    day = fields.get('%d', ones)
+    hour = fields.get('%H', zeros)
+    minute = fields.get('%M', zeros)
+    second = fields.get('%S', zeros)
+
+    valid = (values >= 0) & (remainder == 0) & (hour < 24) & (minute < 60) & (second < 60)
+    years = (year - 1970).astype('timedelta64[Y]') + numpy.datetime64('1970', 'Y')
+    if '%j' in fields:
+        valid &= (fields['%j'] >= 1) & (fields['%j'] <= 366)
+        dates = years.astype('datetime64[D]') + (fields['%j'] - 1).astype('timedelta64[D]')
+        valid &= dates.astype('datetime64[Y]') == years
+    else:
+        valid &= (month >= 1) & (month <= 12)
+        months = years.astype('datetime64[M]') + (month - 1).astype('timedelta64[M]')
+        dates = months + (day - 1).astype('timedelta64[D]')
+        valid &= (day >= 1) & (dates.astype('datetime64[M]') == months)
+
+    seconds = (hour * 3600 + minute * 60 + second).astype('timedelta64[s]')
+    timestamps = (dates.astype('datetime64[s]') + seconds).astype('datetime64[ns]')
+    timestamps[~valid] = numpy.datetime64('NaT')
+    return timestamps
+
+
+def _coerce_value(value, dtype):
+    ''' Convert a single text field to dtype, returning a missing value if it can not be parsed '''
+    value = value.strip()
+    if dtype.kind in 'US':
+        return value
+    try:
+        if dtype.kind == 'f':
+            return float(value)
+        return int(value)
+    except ValueError:
+        if dtype.kind == 'f':
+            return float('nan')
+        return -1
+
+
+def _read_text_columns_coerce(fname, parse_dtype, delimiter, skiprows, usecols):
+    ''' Slow line by line parse, coercing values that can not be parsed to missing values '''
+    import numpy
+    field_dtypes = [parse_dtype[ind] for ind in range(len(parse_dtype))]
+    rows = []
+    with open(fname, 'r') as fobj:
+        for line in islice(fobj, skiprows, None):
+            fields = line.split(delimiter)
+            if not line.strip():
+                continue
+            if usecols is not None:
+                fields = [fields[col] if col < len(fields) else '' for col in usecols]
+            fields += [''] * (len(field_dtypes) - len(fields))
+            rows += [tuple(_coerce_value(field, dtype) for field, dtype in zip(fields, field_dtypes))]
+    return numpy.array(rows, dtype=parse_dtype)
+
+
+def filter_columns(columns, predicate):
+    ''' Apply one or more row predicates to a dictionary of equal length columns
+
+    Args:
+        columns (dict) : {name: numpy.ndarray} columns, all of the same length
+        predicate (function or list of functions) : each function takes the columns dictionary and returns
+                                                    a boolean array, True for rows to keep
+
+    Returns:
+        (dict) : {name: numpy.ndarray} columns containing only the rows selected by all predicates
+    '''
+    import numpy
+    predicates = predicate if isinstance(predicate, (list, tuple)) else [predicate]
+    mask = None
+    for curr_predicate in predicates:
+        curr_mask = numpy.asarray(curr_predicate(columns), dtype=bool)
+        mask = curr_mask if mask is None else mask & curr_mask
+    if mask is None:
+        return columns
+    LOG.info('  Keeping %s of %s rows after applying predicates', numpy.count_nonzero(mask), mask.size)
+    return dict((name, column[mask]) for name, column in columns.items())
+
+
+def read_text_columns(fname, columns, delimiter=None, skiprows=0, usecols=None, predicate=None,
+                      index_name=None):
+    ''' Parse a delimited text file in a single pass into typed numpy columns.
+
+    Args:
+        fname (str) : Full path to text file
+        columns (list) : list of (name, dtype, datetime_format) tuples, in file order.  If datetime_format is
+                         not None, the field is decoded to datetime64[ns] using compact_datetime_to_datetime64.
+        delimiter (str) : DEFAULT None (any whitespace), field delimiter
+        skiprows (int) : DEFAULT 0, number of header lines to skip
+        usecols (list) : DEFAULT None (all columns), field indices of the requested columns within each line
+        predicate (function or list of functions) : DEFAULT None, row predicates, see filter_columns
+        index_name (str) : DEFAULT None, if specified include the original int64 row numbers under index_name
+
+    Returns:
+        (dict) : {name: numpy.ndarray} for each requested column, plus index_name if requested
+    '''
+    import numpy
+    parse_dtype = get_parse_dtype(columns)
+    try:
+        data = numpy.loadtxt(fname, dtype=parse_dtype, delimiter=delimiter, skiprows=skiprows,
+                             usecols=usecols, comments=None, ndmin=1)
+    except ValueError as resp:
+        LOG.warning('Fast parse failed for %s (%s), coercing unparseable values to missing', fname, resp)
+        data = _read_text_columns_coerce(fname, parse_dtype, delimiter, skiprows, usecols)
+
+    parsed = {}
+    for name, dtype, datetime_format in columns:
+        if datetime_format:
+            parsed[name] = compact_datetime_to_datetime64(data[name], datetime_format)
+        else:
+            parsed[name] = numpy.ascontiguousarray(data[name])
+    if index_name is not None:
+        parsed[index_name] = numpy.arange(data.size, dtype=numpy.int64)
+
+    if predicate is not None:
+        parsed = filter_columns(parsed, predicate)
+    return parsed
+
+
+def bbox_predicate(area_def, lon_name='longitude', lat_name='latitude', lon_pad=3.0, lat_pad=3.0):
+    ''' Return a row predicate selecting points within the lat/lon extent of area_def, handling the dateline
+
+    Args:
+        area_def (pyresample.AreaDefinition) : region of interest
+        lon_name (str) : DEFAULT 'longitude', name of the longitude column
+        lat_name (str) : DEFAULT 'latitude', name of the latitude column
+        lon_pad (float) : DEFAULT 3.0, degrees of longitude to include outside area_def on each side
+        lat_pad (float) : DEFAULT 3.0, degrees of latitude to include outside area_def on each side
+
+    Returns:
+        (function) : predicate for use with read_text_columns / filter_columns
+    '''
+    minlon, minlat, maxlon, maxlat = area_def.area_extent_ll
+    lon_width = (maxlon - minlon) % 360.0 + 2 * lon_pad
+
+    def predicate(columns):
+        # NaN comparisons are False, so missing locations are removed
+        mask = (columns[lat_name] >= minlat - lat_pad) & (columns[lat_name] <= maxlat + lat_pad)
+        if lon_width < 360.0:
+            mask &= (columns[lon_name] - (minlon - lon_pad)) % 360.0 <= lon_width
+        return mask
+    return predicate
+
+
+def time_predicate(start_datetime, end_datetime, time_name='timestamp'):
+    ''' Return a row predicate selecting times between start_datetime and end_datetime, inclusive
+
+    Args:
+        start_datetime (datetime.datetime) : earliest time to include
+        end_datetime (datetime.datetime) : latest time to include
+        time_name (str) : DEFAULT 'timestamp', name of the datetime64 column
+
+    Returns:
+        (function) : predicate for use with read_text_columns / filter_columns
+    '''
+    import numpy
+    start_dt64 = numpy.datetime64(start_datetime, 'ns')
+    end_dt64 = numpy.datetime64(end_datetime, 'ns')
+
+    def predicate(columns):
+        return (columns[time_name] >= start_dt64) & (columns[time_name] <= end_dt64)
+    return predicate
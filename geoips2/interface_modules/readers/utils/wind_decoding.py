@@ -0,0 +1,173 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Shared time and geolocation decoding for the netCDF surface wind readers (SMOS, SAR, KNMI, ASCAT UHR).
+
+    Epoch offsets are converted to datetime64 with a single numpy operation over the full array, scalar
+    observation times are broadcast without building intermediate integer arrays, and multiple files are
+    concatenated into preallocated arrays.
+'''
+import logging
+
+LOG = logging.getLogger(__name__)
+
+# Microseconds per CF time unit
+CF_TIME_UNITS_US = {'days': 86400000000,
+                    'day': 86400000000,
+                    'd': 86400000000,
+                    'hours': 3600000000,
+                    'hour': 3600000000,
+                    'hr': 3600000000,
+                    'h': 3600000000,
+                    'minutes': 60000000,
+                    'minute': 60000000,
+                    'min': 60000000,
+                    'seconds': 1000000,
+                    'second': 1000000,
+                    'secs': 1000000,
+                    'sec': 1000000,
+                    's': 1000000,
+                    'milliseconds': 1000,
+                    'millisecond': 1000,
+                    'ms': 1000,
+                    'microseconds': 1,
+                    'microsecond': 1,
+                    'us': 1}
+
+
+def parse_cf_time_units(units):
+    ''' Parse a CF time units string, ie 'days since 1990-01-01 00:00:00'
+
+    Args:
+        units (str) : CF "<unit> since <reference time>" string
+
+    Returns:
+        (tuple) : (microseconds per unit (int), reference time (numpy.datetime64[us]))
+    '''
+    import numpy
+    from datetime import datetime, timedelta
+    unit, since, reference = units.strip().partition(' since ')
+    if not since or unit.strip().lower() not in CF_TIME_UNITS_US:
+        raise ValueError('Unsupported CF time units "{0}"'.format(units))
+
+    date_str, _, time_str = reference.strip().replace('T', ' ').partition(' ')
+    time_str = time_str.replace('UTC', '').replace('Z', '').split('+')[0].strip()
+    epoch = datetime.strptime(date_str, '%Y-%m-%d')
+    if time_str:
+        time_fields = [float(field) for field in time_str.split(':')]
+        epoch += timedelta(seconds=sum(field * scale for field, scale in zip(time_fields, [3600, 60, 1])))
+    return CF_TIME_UNITS_US[unit.strip().lower()], numpy.datetime64(epoch, 'us')
+
+
+def cf_offsets_to_datetime64(offsets, units, valid=None):
+    ''' Convert an array of CF epoch offsets to datetime64[ns] with a single numpy operation
+
+    Args:
+        offsets (numpy.ndarray) : integer or floating point offsets, may be a masked array
+        units (str) : CF time units string, ie 'days since 1990-01-01'
+        valid (numpy.ndarray) : DEFAULT None, boolean array, False where offsets should be treated as missing.
+                                Masked and non-finite offsets are always treated as missing.
+
+    Returns:
+        (numpy.ndarray) : datetime64[ns] array of the same shape as offsets, NaT where missing
+    '''
+    import numpy
+    us_per_unit, epoch = parse_cf_time_units(units)
+
+    offsets = numpy.ma.asarray(offsets)
+    values = offsets.filled(0).astype(numpy.float64)
+    missing = numpy.ma.getmaskarray(offsets) | ~numpy.isfinite(values)
+    if valid is not None:
+        missing |= ~numpy.asarray(valid, dtype=bool)
+    values[missing] = 0
+
+    # Round to whole microseconds, consistent with datetime.timedelta
+    timestamps = (epoch + numpy.round(values * us_per_unit).astype(numpy.int64).astype('timedelta64[us]'))
+    timestamps = timestamps.astype('datetime64[ns]')
+    timestamps[missing] = numpy.datetime64('NaT')
+    return timestamps
+
+
+def broadcast_timestamp(timestamp, like):
+    ''' Return timestamp broadcast to the dimensions and coordinates of the DataArray like
+
+    Args:
+        timestamp (datetime, numpy.datetime64, or xarray.DataArray) : single observation time, or DataArray of
+                                                                      times on a subset of like's dimensions
+        like (xarray.DataArray) : DataArray with the desired shape, dimensions, and coordinates
+
+    Returns:
+        (xarray.DataArray) : datetime64[ns] timestamps with like's dimensions and coordinates
+    '''
+    import numpy
+    import xarray
+    if isinstance(timestamp, xarray.DataArray):
+        timestamp = timestamp.reset_coords(drop=True)
+        return xarray.broadcast(timestamp, like)[0].transpose(*like.dims)
+    return xarray.DataArray(numpy.full(like.shape, numpy.datetime64(timestamp, 'ns')),
+                            name='timestamp',
+                            coords=like.coords,
+                            dims=like.dims)
+
+
+def concatenate_rows(arrays):
+    ''' Concatenate 2-D arrays along the first dimension into a single preallocated array
+
+    Args:
+        arrays (list) : list of numpy.ndarray or xarray.DataArray, all with the same number of columns
+
+    Returns:
+        (numpy.ndarray) : array of shape (total rows, columns)
+    '''
+    import numpy
+    arrays = [numpy.asarray(arr) for arr in arrays]
+    total_rows = sum([arr.shape[0] for arr in arrays])
+    output = numpy.empty((total_rows,) + arrays[0].shape[1:], dtype=numpy.result_type(*arrays))
+    start_row = 0
+    for arr in arrays:
+        output[start_row:start_row + arr.shape[0]] = arr
+        start_row += arr.shape[0]
+    return output
+
+
+def set_wind_standard_metadata(wind_xarrays):
+    ''' Set start_datetime, end_datetime, and wind speed units on each wind xarray Dataset
+
+    Args:
+        wind_xarrays (dict) : dictionary of xarray Datasets, each containing a 'timestamp' variable
+
+    Returns:
+        (xarray.Dataset) : the last Dataset in wind_xarrays, used for the METADATA entry
+    '''
+    from geoips2.xarray_utils.timestamp import get_timestamp_range
+    wind_xarray = None
+    for wind_xarray in wind_xarrays.values():
+
+        LOG.info('Setting standard metadata')
+        start_datetime, end_datetime = get_timestamp_range(wind_xarray, 'timestamp')
+        wind_xarray.attrs['start_datetime'] = start_datetime
+        wind_xarray.attrs['end_datetime'] = end_datetime
+
+        if 'wind_speed_kts' in wind_xarray.variables:
+            # These text files store wind speeds natively in kts
+            wind_xarray['wind_speed_kts'].attrs['units'] = 'kts'
+
+        LOG.info('Read data %s start_dt %s source %s platform %s data_provider %s roi %s native resolution',
+                 wind_xarray.attrs['start_datetime'],
+                 wind_xarray.attrs['source_name'],
+                 wind_xarray.attrs['platform_name'],
+                 wind_xarray.attrs['data_provider'],
+                 wind_xarray.attrs['interpolation_radius_of_influence'],
+                 wind_xarray.attrs['sample_distance_km'])
+    return wind_xarray
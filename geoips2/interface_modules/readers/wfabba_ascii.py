@@ -85,30 +85,65 @@ def read_wfabba_header(wfabba_file):
     return header_meta
 
 
-def read_wfabba_text(wfabba_file):
-    xobj = xarray.Dataset()
-    header_meta = read_wfabba_header(wfabba_file)
-    text = np.genfromtxt(wfabba_file,
-                         delimiter=',',
-                         skip_header=header_meta['header length'],
-                         comments=None, dtype=str)
+def read_wfabba_columns(wfabba_file, header_meta=None):
+    ''' Parse the fire detections from a single WFABBA file into typed numpy columns.
+
+    Args:
+        wfabba_file (str) : Full path to WFABBA ascii file
+        header_meta (dict) : DEFAULT None, header metadata from read_wfabba_header.  Read from wfabba_file if None.
+                             header_meta['units'] is set to the units of each column.
+
+    Returns:
+        (dict) : {column name: numpy.ndarray} including 'firetime', empty if there are no detected fires
+    '''
+    from itertools import islice
+    from geoips2.interface_modules.readers.utils.text_columns import read_text_columns
+    if header_meta is None:
+        header_meta = read_wfabba_header(wfabba_file)
     header_meta['units'] = {}
-    if int(header_meta['Number of detected fires']) > 0:
-        col_names = text[0, :]
-        col_units = text[1, :]
-        for col_num, (col_name, col_unit) in enumerate(zip(col_names, col_units)):
-            col_name = col_name.replace('### ', '').replace(' ', '').lower()
-            col_unit = col_unit.replace('### ', '').replace(' ', '')
-            data = text[2:, col_num].astype(float)
-            xobj[col_name] = xarray.DataArray(data)
-            header_meta['units'][col_name] = col_unit
-        xobj['firetime'] = xarray.DataArray([header_meta['datetime']]*int(header_meta['Number of detected fires']))
+    if int(header_meta['Number of detected fires']) <= 0:
+        return {}
+
+    # The last two header lines contain the column names and units
+    with open(wfabba_file, 'r') as fobj:
+        col_lines = list(islice(fobj, header_meta['header length'], header_meta['header length'] + 2))
+    col_names = [col_name.replace('### ', '').replace(' ', '').lower()
+                 for col_name in col_lines[0].rstrip('\n').split(',')]
+    col_units = [col_unit.replace('### ', '').replace(' ', '')
+                 for col_unit in col_lines[1].rstrip('\n').split(',')]
+    header_meta['units'] = dict(zip(col_names, col_units))
+
+    columns = read_text_columns(wfabba_file,
+                                [(col_name, np.float64, None) for col_name in col_names],
+                                delimiter=',',
+                                skiprows=header_meta['header length'] + 2)
+    columns['firetime'] = np.full(columns[col_names[0]].shape,
+                                  np.datetime64(header_meta['datetime'], 'ns'))
+    return columns
+
+
+def wfabba_columns_to_xarray(columns):
+    ''' Create an xarray Dataset from a dictionary of WFABBA columns, one variable per column '''
+    xobj = xarray.Dataset()
+    for col_name, data in columns.items():
+        xobj[col_name] = xarray.DataArray(data)
+    return xobj
+
+
+def set_wfabba_file_attrs(xobj, header_meta):
+    ''' Set the standard metadata attributes from a single WFABBA file header '''
     xobj.attrs['start_datetime'] = header_meta['datetime']
     xobj.attrs['end_datetime'] = header_meta['datetime']
     xobj.attrs['filename_datetimes'] = [header_meta['datetime']]
     xobj.attrs['platform_name'] = header_meta['Satellite']
     xobj.attrs['source_name'] = header_meta['Instrument']
     xobj.attrs['data_provider'] = header_meta['Data source']
+
+
+def read_wfabba_text(wfabba_file):
+    header_meta = read_wfabba_header(wfabba_file)
+    xobj = wfabba_columns_to_xarray(read_wfabba_columns(wfabba_file, header_meta))
+    set_wfabba_file_attrs(xobj, header_meta)
     return xobj
 
 
@@ -139,7 +174,6 @@ def wfabba_ascii(fnames, metadata_only=False, chans=None, area_def=None, self_re
         list of xarray.Datasets: list of xarray.Dataset objects with required
             Variables and Attributes: (See geoips2/docs :doc:`xarray_standards`)
     '''
-    xarray_objs = []
     metadata = read_wfabba_header(fnames[0])
     end_metadata = read_wfabba_header(fnames[-1])
     geoips2_attrs = {'area_definition': area_def,
@@ -158,23 +192,33 @@ def wfabba_ascii(fnames, metadata_only=False, chans=None, area_def=None, self_re
     if metadata_only:
         return {'METADATA': meta_dataset}
 
-    for i, fname in enumerate(fnames):
+    # Parse all files into typed columns, and build a single Dataset from the concatenated columns
+    header_metas = []
+    file_columns = []
+    for fname in fnames:
         LOG.info('Reading %s' % fname)
-        wfabba_xobj = read_wfabba_text(fname)
-        wfabba_xobj.attrs['original_source_filenames'] = [basename(fname)]
-        wfabba_xobj.attrs['sample_distance_km'] = 2
-        wfabba_xobj.attrs = dict(wfabba_xobj.attrs, **geoips2_attrs)
-        xarray_objs.append(wfabba_xobj)
-
-    if len(xarray_objs) > 1:
-        start_times = [x.attrs['start_datetime'] for x in xarray_objs]
-        end_times = [x.attrs['end_datetime'] for x in xarray_objs]
-        xarray_dset = xarray.concat(xarray_objs, dim='dim_0')
-        xarray_dset.attrs['start_datetime'] = min(start_times)
-        xarray_dset.attrs['end_datetime'] = max(end_times)
-        xarray_dset = xarray_dset.assign_coords({'time': start_times})
+        header_meta = read_wfabba_header(fname)
+        header_metas += [header_meta]
+        file_columns += [read_wfabba_columns(fname, header_meta)]
+
+    nonempty_columns = [columns for columns in file_columns if columns]
+    if len(fnames) > 1 and nonempty_columns:
+        col_names = list(nonempty_columns[0].keys())
+        xarray_dset = wfabba_columns_to_xarray(
+            dict((col_name, np.concatenate([columns[col_name] for columns in nonempty_columns]))
+                 for col_name in col_names))
     else:
-        xarray_dset = xarray_objs[0]
-    return {'wfabba': xarray_dset, 'METADATA': meta_dataset}
+        xarray_dset = wfabba_columns_to_xarray(file_columns[0])
 
+    # Attributes come from the first file, as with xarray.concat
+    set_wfabba_file_attrs(xarray_dset, header_metas[0])
+    xarray_dset.attrs['original_source_filenames'] = [basename(fnames[0])]
+    xarray_dset.attrs['sample_distance_km'] = 2
+    xarray_dset.attrs = dict(xarray_dset.attrs, **geoips2_attrs)
 
+    if len(fnames) > 1:
+        start_times = [header_meta['datetime'] for header_meta in header_metas]
+        xarray_dset.attrs['start_datetime'] = min(start_times)
+        xarray_dset.attrs['end_datetime'] = max(start_times)
+        xarray_dset = xarray_dset.assign_coords({'time': start_times})
+    return {'wfabba': xarray_dset, 'METADATA': meta_dataset}
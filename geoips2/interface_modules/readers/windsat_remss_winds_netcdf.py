@@ -51,7 +51,7 @@ def windsat_remss_winds_netcdf(fnames, metadata_only=False, chans=None, area_def
             Variables and Attributes: (See geoips2/docs :doc:`xarray_standards`)
     '''
 
-    from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp, get_max_from_xarray_timestamp
+    from geoips2.xarray_utils.timestamp import get_timestamp_range
     import xarray
     # Only SAR reads multiple files
     fname = fnames[0]
@@ -75,8 +75,9 @@ def windsat_remss_winds_netcdf(fnames, metadata_only=False, chans=None, area_def
     for wind_xarray in wind_xarrays.values():
 
         LOG.info('Setting standard metadata')
-        wind_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(wind_xarray, 'timestamp')
-        wind_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(wind_xarray, 'timestamp')
+        start_datetime, end_datetime = get_timestamp_range(wind_xarray, 'timestamp')
+        wind_xarray.attrs['start_datetime'] = start_datetime
+        wind_xarray.attrs['end_datetime'] = end_datetime
 
         if 'wind_speed_kts' in wind_xarray.variables:
             # These text files store wind speeds natively in kts
@@ -0,0 +1,169 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Procflow memory accounting and memory budget enforcement.
+
+    Procflows account for the data they hold at each stage (reader output, sectored and interpolated datasets)
+    along with the current process RSS, logged as MEMORY lines and recorded on the active profiler span.
+
+    When a memory budget is set (--memory_budget_mb, or the GEOIPS_MEMORY_BUDGET_MB environment variable),
+    procflows additionally:
+
+        * release the module level caches (warp indices, overlay templates, boundary geometry, timestamp ranges,
+          sector metadata, product directory indexes, TC templates and area definitions) whenever RSS exceeds
+          RELEASE_FRACTION of the budget,
+        * do not keep algorithm outputs cached between output types within a sector once the budget is exceeded, and
+        * fall back from a single full read to windowed reads for each sector (config_based) when the full read is
+          not expected to fit within the budget, for readers declaring honors_area_def
+          (see geoips2.stable.reader.reader_honors_area_def).
+
+    With no budget set, only the accounting is performed.
+'''
+import os
+import sys
+import logging
+
+LOG = logging.getLogger(__name__)
+
+BYTES_PER_MB = 1024.0 * 1024.0
+
+# Release caches once RSS exceeds this fraction of the budget, before the budget is actually reached
+RELEASE_FRACTION = 0.8
+
+# Estimated in memory size of fully read data, relative to the size of the input files on disk (packed integers
+# and compressed variables are unpacked to floats, and latitude / longitude / timestamp arrays are added)
+FILE_EXPANSION_FACTOR = 4.0
+
+# (module, attribute) of module level caches safe to clear at any time - only cleared if already imported
+RELEASABLE_CACHES = [('geoips2.image_utils.warp', 'WARP_INDEX_CACHE'),
+                     ('geoips2.image_utils.overlay_template', 'OVERLAY_TEMPLATE_CACHE'),
+                     ('geoips2.image_utils.boundary_geometry', 'BOUNDARY_GEOMETRY_CACHE'),
+                     ('geoips2.xarray_utils.timestamp', 'TIMESTAMP_RANGE_CACHE'),
+                     ('geoips2.interface_modules.output_formats.utils.metadata', 'SECTOR_METADATA_CACHE'),
+                     ('geoips2.filenames.product_index', '_DIRECTORY_INDEXES'),
+                     ('geoips2.sector_utils.tc_tracks', '_TEMPLATE_CACHE'),
+                     ('geoips2.sector_utils.tc_tracks', '_TEMPLATE_AREA_DEF_CACHE')]
+
+
+def get_current_rss_mb():
+    ''' Return the current resident set size of this process in MB, or the peak RSS where not available '''
+    try:
+        with open('/proc/self/statm') as fobj:
+            return int(fobj.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / BYTES_PER_MB
+    except (IOError, OSError, ValueError, IndexError):
+        import resource
+        # ru_maxrss is KB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def get_nbytes(obj):
+    ''' Return the total size in bytes of the arrays in obj
+
+    Args:
+        obj : xarray Dataset or DataArray, numpy array, or a dict / list of any of these (ie, reader output)
+
+    Returns:
+        (int) : total bytes - lazily loaded variables are counted at their full size
+    '''
+    if obj is None:
+        return 0
+    if isinstance(obj, dict):
+        return sum(get_nbytes(val) for val in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(get_nbytes(val) for val in obj)
+    if hasattr(obj, 'variables') and hasattr(obj, 'data_vars'):
+        return sum(int(var.nbytes) for var in obj.variables.values())
+    return int(getattr(obj, 'nbytes', 0))
+
+
+def release_caches():
+    ''' Clear all imported RELEASABLE_CACHES and run garbage collection
+
+    Returns:
+        (float) : MB of RSS released
+    '''
+    import gc
+    rss_before = get_current_rss_mb()
+    for module_name, cache_name in RELEASABLE_CACHES:
+        if module_name in sys.modules:
+            getattr(sys.modules[module_name], cache_name).clear()
+    gc.collect()
+    released = rss_before - get_current_rss_mb()
+    LOG.info('MEMORY released caches, RSS %.1f MB -> %.1f MB', rss_before, rss_before - released)
+    return released
+
+
+class MemoryBudget(object):
+    ''' Memory accounting for a procflow run, enforcing budget_mb if specified '''
+
+    def __init__(self, budget_mb=None):
+        self.budget_mb = budget_mb
+        self.stages = []
+
+    @property
+    def enabled(self):
+        ''' True if a memory budget is being enforced '''
+        return self.budget_mb is not None
+
+    def is_over_budget(self, fraction=1.0):
+        ''' Return True if the current RSS exceeds fraction of the budget (always False with no budget) '''
+        return self.enabled and get_current_rss_mb() > fraction * self.budget_mb
+
+    def fits(self, nbytes):
+        ''' Return True if nbytes more can be allocated without exceeding the budget (always True with no budget) '''
+        return not self.enabled or get_current_rss_mb() + nbytes / BYTES_PER_MB <= self.budget_mb
+
+    def account(self, stage, obj=None):
+        ''' Record and log the size of the data held after stage, releasing caches if nearing the budget
+
+        Args:
+            stage (str) : procflow stage name, ie 'read', 'sector_data', 'algorithm'
+            obj : DEFAULT None, data held after stage (see get_nbytes)
+
+        Returns:
+            (dict) : {'stage', 'held_mb', 'rss_mb'}
+        '''
+        from geoips2.profiler import get_profiler
+        usage = {'stage': stage, 'held_mb': get_nbytes(obj) / BYTES_PER_MB, 'rss_mb': get_current_rss_mb()}
+        self.stages += [usage]
+        LOG.info('MEMORY %-20s held %9.1f MB, RSS %9.1f MB, budget %s MB',
+                 stage, usage['held_mb'], usage['rss_mb'], self.budget_mb)
+        span = get_profiler().current_span
+        if span is not None:
+            span.attrs['held_mb'] = '{0:.1f}'.format(usage['held_mb'])
+        if self.is_over_budget(RELEASE_FRACTION):
+            release_caches()
+            if self.is_over_budget():
+                LOG.warning('MEMORY RSS %.1f MB exceeds budget %s MB after %s', get_current_rss_mb(),
+                            self.budget_mb, stage)
+        return usage
+
+
+def get_memory_budget(command_line_args=None):
+    ''' Return the MemoryBudget for a procflow run
+
+    The budget is taken from command_line_args['memory_budget_mb'] if specified, otherwise from the
+    GEOIPS_MEMORY_BUDGET_MB environment variable.  If neither is set, no budget is enforced.
+    '''
+    budget_mb = None
+    if command_line_args is not None and command_line_args.get('memory_budget_mb') is not None:
+        budget_mb = float(command_line_args['memory_budget_mb'])
+    elif os.getenv('GEOIPS_MEMORY_BUDGET_MB'):
+        budget_mb = float(os.getenv('GEOIPS_MEMORY_BUDGET_MB'))
+    return MemoryBudget(budget_mb)
+
+
+def estimate_read_nbytes(fnames):
+    ''' Estimate the in memory size of fully reading fnames, from their size on disk '''
+    return int(FILE_EXPANSION_FACTOR * sum(os.path.getsize(fname) for fname in fnames if os.path.exists(fname)))
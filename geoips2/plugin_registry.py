@@ -0,0 +1,288 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Versioned snapshot of all geoips2 entry point plugins, for listing and type lookups without imports.
+
+    For every plugin in every geoips2.* entry point namespace, the registry records the module and attribute,
+    the module level type attribute (ie, output_type, reader_type), and the function call signature.  Type
+    attributes and signatures are read by parsing the plugin module source, so building the registry does not
+    import the plugins or their dependencies.  Plugins whose type can not be determined statically are imported
+    once while building the registry.
+
+    The registry is written to PATHS['PLUGIN_REGISTRY_PATH'], named by a fingerprint of the installed
+    distributions' geoips2 entry points, and rebuilt automatically when the entry points change or any plugin
+    module has been modified since the registry was written.
+'''
+import os
+import sys
+import json
+import logging
+from importlib import import_module
+
+from geoips2.filenames.base_paths import PATHS as gpaths
+
+LOG = logging.getLogger(__name__)
+
+NAMESPACE_PREFIX = 'geoips2'
+
+# Increment when the registry contents change, so old snapshots are never used
+REGISTRY_VERSION = 1
+
+# Module level attribute specifying the plugin type, for each entry point namespace
+TYPE_ATTRIBUTES = {'readers': 'reader_type',
+                   'algorithms': 'alg_func_type',
+                   'user_colormaps': 'cmap_type',
+                   'filename_formats': 'filename_type',
+                   'interpolation': 'interp_type',
+                   'output_formats': 'output_type',
+                   'procflows': 'procflow_type'}
+
+# The registry loaded in the current process
+REGISTRY = {}
+
+
+def get_installed_entry_points():
+    ''' Return (distribution, version, namespace, name, value) for every geoips2 entry point installed
+
+    The first distribution on the path providing a given namespace and name wins, as with
+    importlib.metadata entry point loading.
+    '''
+    from importlib import metadata
+    entry_points = []
+    found = set()
+    for dist in metadata.distributions():
+        for entry_point in dist.entry_points:
+            if not entry_point.group.startswith(NAMESPACE_PREFIX + '.'):
+                continue
+            namespace = entry_point.group[len(NAMESPACE_PREFIX) + 1:]
+            if (namespace, entry_point.name) in found:
+                continue
+            found.add((namespace, entry_point.name))
+            entry_points += [(dist.metadata['Name'], dist.version, namespace, entry_point.name, entry_point.value)]
+    return entry_points
+
+
+def get_entry_points_fingerprint(entry_points):
+    ''' Return a sha1 hash of the installed entry points, registry version, and python version '''
+    from hashlib import sha1
+    hash_string = 'v{0};{1};'.format(REGISTRY_VERSION, sys.version.split()[0])
+    hash_string += repr(sorted(entry_points))
+    return sha1(hash_string.encode('utf-8')).hexdigest()
+
+
+def get_registry_filename(fingerprint):
+    ''' Return the full path to the registry snapshot for fingerprint '''
+    return os.path.join(gpaths['PLUGIN_REGISTRY_PATH'],
+                        'plugin_registry_v{0}_{1}.json'.format(REGISTRY_VERSION, fingerprint))
+
+
+def get_module_filename(module_name):
+    ''' Return the source filename of module_name without importing it (parent packages are imported) '''
+    from importlib.util import find_spec
+    try:
+        spec = find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not spec.origin.endswith('.py'):
+        return None
+    return spec.origin
+
+
+def parse_plugin_source(fname, attr_name, type_attr):
+    ''' Statically read the type attribute and call signature of function attr_name from module source fname
+
+    Args:
+        fname (str) : full path to plugin module source
+        attr_name (str) : name of the plugin function within the module
+        type_attr (str) : module level type attribute name (ie, 'output_type'), or None
+
+    Returns:
+        (tuple) : (type string or None if not a literal assignment,
+                   signature dict {'args': [...], 'kwargs': [...]} or None if attr_name is not a function)
+    '''
+    import ast
+    with open(fname, 'rb') as fobj:
+        tree = ast.parse(fobj.read(), filename=fname)
+    plugin_type = None
+    signature = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and type_attr is not None:
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == type_attr \
+                   and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                    plugin_type = node.value.value
+        elif isinstance(node, ast.FunctionDef) and node.name == attr_name:
+            arg_names = [arg.arg for arg in node.args.posonlyargs + node.args.args]
+            num_kwargs = len(node.args.defaults)
+            signature = {'args': arg_names[:len(arg_names) - num_kwargs],
+                         'kwargs': arg_names[len(arg_names) - num_kwargs:] +
+                         [arg.arg for arg in node.args.kwonlyargs]}
+    return plugin_type, signature
+
+
+def get_plugin_entry(distribution, version, namespace, name, value):
+    ''' Return the registry entry for a single entry point, importing the plugin only if its type can not be
+        determined from the source
+    '''
+    module_name, _, attr_name = value.partition(':')
+    attr_name = attr_name.strip()
+    module_name = module_name.strip()
+    type_attr = TYPE_ATTRIBUTES.get(namespace)
+    entry = {'module': module_name, 'attr': attr_name, 'distribution': distribution, 'version': version,
+             'type_attr': type_attr, 'type': None, 'signature': None, 'fname': None, 'mtime': None}
+    fname = get_module_filename(module_name)
+    if fname is not None:
+        entry['fname'] = fname
+        entry['mtime'] = os.stat(fname).st_mtime
+        try:
+            entry['type'], entry['signature'] = parse_plugin_source(fname, attr_name, type_attr)
+        except (SyntaxError, ValueError, IOError) as resp:
+            LOG.warning('Could not parse plugin source %s: %s', fname, resp)
+    if type_attr is not None and (entry['type'] is None or entry['signature'] is None):
+        # Not a literal module level assignment, or the function is defined in another module - import once, now,
+        # rather than on every lookup, and read the type from the module defining the function
+        try:
+            plugin = import_module(module_name)
+            for attr in attr_name.split('.'):
+                plugin = getattr(plugin, attr)
+            entry['type'] = getattr(import_module(plugin.__module__), type_attr)
+        except Exception as resp:  # Any plugin import failure is reported when the plugin is actually used
+            LOG.warning('Could not determine %s for plugin %s.%s: %s', type_attr, namespace, name, resp)
+    return entry
+
+
+def build_registry(entry_points, fingerprint):
+    ''' Build the registry dictionary for entry_points
+
+    Returns:
+        (dict) : {'version', 'fingerprint', 'plugins': {namespace: {name: entry}}}
+    '''
+    LOG.info('Building geoips2 plugin registry for %s entry points', len(entry_points))
+    plugins = {}
+    for distribution, version, namespace, name, value in entry_points:
+        plugins.setdefault(namespace, {})[name] = get_plugin_entry(distribution, version, namespace, name, value)
+    return {'version': REGISTRY_VERSION, 'fingerprint': fingerprint, 'plugins': plugins}
+
+
+def is_registry_current(registry):
+    ''' Return True if no plugin module has been modified since registry was built '''
+    for namespace_plugins in registry['plugins'].values():
+        for entry in namespace_plugins.values():
+            if entry['fname'] is None:
+                continue
+            try:
+                if os.stat(entry['fname']).st_mtime != entry['mtime']:
+                    LOG.info('Plugin module %s modified, rebuilding plugin registry', entry['fname'])
+                    return False
+            except OSError:
+                return False
+    return True
+
+
+def read_registry(fname):
+    ''' Read the registry snapshot fname, returning None if it does not exist, is unreadable, or is out of date '''
+    if not os.path.exists(fname):
+        return None
+    try:
+        with open(fname) as fobj:
+            registry = json.load(fobj)
+    except (IOError, ValueError) as resp:
+        LOG.warning('Could not read plugin registry %s: %s', fname, resp)
+        return None
+    if registry.get('version') != REGISTRY_VERSION or not is_registry_current(registry):
+        return None
+    return registry
+
+
+def write_registry(fname, registry):
+    ''' Write registry to fname, through a temporary file so concurrent readers never see a partial file.
+
+    The snapshot is only an optimization - if it can not be written, the in memory registry is still used.
+
+    Returns:
+        (bool) : True if the snapshot was written
+    '''
+    from geoips2.filenames.base_paths import atomic_output_fname
+    try:
+        with atomic_output_fname(fname) as tmp_fname:
+            with open(tmp_fname, 'w') as fobj:
+                json.dump(registry, fobj, indent=1, sort_keys=True)
+    except (IOError, OSError) as resp:
+        LOG.warning('Could not write plugin registry %s, using in memory registry: %s', fname, resp)
+        return False
+    LOG.info('Wrote plugin registry %s', fname)
+    return True
+
+
+def get_registry(rebuild=False):
+    ''' Return the plugin registry for the installed distributions, loading or building it once per process
+
+    Args:
+        rebuild (bool) : DEFAULT False, if True rebuild the registry even if a current snapshot exists
+
+    Returns:
+        (dict) : plugin registry, see build_registry
+    '''
+    if REGISTRY and not rebuild:
+        return REGISTRY
+    entry_points = get_installed_entry_points()
+    fingerprint = get_entry_points_fingerprint(entry_points)
+    fname = get_registry_filename(fingerprint)
+    registry = None if rebuild else read_registry(fname)
+    if registry is None:
+        registry = build_registry(entry_points, fingerprint)
+        write_registry(fname, registry)
+    REGISTRY.clear()
+    REGISTRY.update(registry)
+    return REGISTRY
+
+
+def list_plugins(namespace):
+    ''' Return the names of all plugins in entry point namespace (ie, 'readers'), without importing them '''
+    return list(get_registry()['plugins'].get(namespace, {}).keys())
+
+
+def get_plugin_info(namespace, name):
+    ''' Return the registry entry for plugin name in namespace, or None if it is not installed '''
+    return get_registry()['plugins'].get(namespace, {}).get(name)
+
+
+def get_plugin_type(namespace, name):
+    ''' Return the module level type attribute of plugin name in namespace, without importing the plugin
+
+    If the registry could not determine the type, the plugin module is imported, so any exceptions match a direct
+    getattr on the plugin module.
+
+    Raises:
+        (Exception) : plugin name is not installed in namespace
+    '''
+    entry = get_plugin_info(namespace, name)
+    if entry is None:
+        raise Exception('Failed to find object matching {0} in namespace {1}.{2}'.format(name,
+                                                                                        NAMESPACE_PREFIX,
+                                                                                        namespace))
+    if entry['type'] is not None:
+        return entry['type']
+    return getattr(import_module(entry['module']), TYPE_ATTRIBUTES[namespace])
+
+
+def load_plugin(namespace, name):
+    ''' Import and return plugin name in namespace, or None if it is not installed '''
+    entry = get_plugin_info(namespace, name)
+    if entry is None:
+        return None
+    plugin = import_module(entry['module'])
+    for attr_name in entry['attr'].split('.'):
+        plugin = getattr(plugin, attr_name)
+    return plugin
@@ -0,0 +1,351 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Hierarchical stage profiler for geoips2 procflows.
+
+    A procflow starts a profiler for the run, then records nested spans for each stage
+    (read -> sector -> interp -> algorithm -> output -> compare).  Each span records wall time, CPU time,
+    the process peak RSS at the end of the span, the change in current RSS over the span, and bytes read / written
+    during the span (from /proc/self/io, where available).
+
+        profiler = start_profiler('single_source', product_name=product_name)
+        with get_profiler().span('read', area_id=area_def.area_id):
+            xobjs = reader(...)
+        sector_span = profiler.start_span('sector', parent=profiler.root, area_id=area_def.area_id)
+        ...
+        profiler.end_span(sector_span)
+        stop_profiler(command_line_args.get('profile_report'))
+
+    Spans are identified by their path (ie 'single_source/sector[tc2020sh16gabekile]/interp'), so reports from
+    different runs can be compared with diff_profile_reports.  Reports are written as JSON, or as CSV if the
+    report filename ends in .csv.  Helper functions deep within a procflow use get_profiler(), which returns a
+    no-op profiler when no procflow profiler is active.
+'''
+import os
+import time
+import logging
+from contextlib import contextmanager
+
+LOG = logging.getLogger(__name__)
+
+# Span attribute used to label the span path, so repeated stages (ie, one sector span per area_def) are distinct
+PATH_LABEL_ATTRS = ['area_id', 'sector_type', 'product_name', 'output_format', 'variable']
+
+# Columns written to CSV profile reports
+REPORT_COLUMNS = ['path', 'name', 'depth', 'status', 'wall_seconds', 'cpu_seconds', 'peak_rss_mb',
+                  'rss_mb', 'rss_delta_mb', 'bytes_read', 'bytes_written']
+
+# The profiler for the currently running procflow, see get_profiler
+ACTIVE_PROFILER = []
+
+
+def get_resource_usage():
+    ''' Return the current wall time, CPU time, peak and current RSS (MB), and cumulative bytes read and written
+
+    Bytes read / written are None where /proc/self/io is not available.
+    '''
+    import resource
+    from geoips2.memory_budget import get_current_rss_mb
+    usage = {'wall': time.perf_counter(),
+             'cpu': time.process_time(),
+             # ru_maxrss is KB on Linux
+             'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+             'rss_mb': get_current_rss_mb(),
+             'bytes_read': None,
+             'bytes_written': None}
+    try:
+        with open('/proc/self/io') as fobj:
+            for line in fobj:
+                field, _, value = line.partition(':')
+                if field == 'rchar':
+                    usage['bytes_read'] = int(value)
+                elif field == 'wchar':
+                    usage['bytes_written'] = int(value)
+    except (IOError, OSError, ValueError):
+        pass
+    return usage
+
+
+class ProfileSpan(object):
+    ''' A single timed stage within a profiled run '''
+
+    def __init__(self, name, parent=None, **attrs):
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.children = []
+        self.status = 'running'
+        self.start_usage = get_resource_usage()
+        self.end_usage = None
+        label = ','.join([str(attrs[key]) for key in PATH_LABEL_ATTRS if attrs.get(key) is not None])
+        self.label = '{0}[{1}]'.format(name, label) if label else name
+        if parent is not None:
+            parent.children.append(self)
+
+    @property
+    def path(self):
+        ''' Slash separated labels of this span and all its parents '''
+        if self.parent is None:
+            return self.label
+        return '{0}/{1}'.format(self.parent.path, self.label)
+
+    @property
+    def depth(self):
+        ''' Number of parents of this span '''
+        return 0 if self.parent is None else self.parent.depth + 1
+
+    def end(self, status='done'):
+        ''' Record the end resource usage of this span '''
+        if self.end_usage is None:
+            self.end_usage = get_resource_usage()
+            self.status = status
+
+    def to_dict(self):
+        ''' Return the span measurements as a flat dictionary '''
+        end_usage = self.end_usage or get_resource_usage()
+        span_dict = {'path': self.path,
+                     'name': self.name,
+                     'depth': self.depth,
+                     'status': self.status,
+                     'attrs': dict((key, str(val)) for key, val in self.attrs.items()),
+                     'wall_seconds': end_usage['wall'] - self.start_usage['wall'],
+                     'cpu_seconds': end_usage['cpu'] - self.start_usage['cpu'],
+                     'peak_rss_mb': end_usage['peak_rss_mb'],
+                     'rss_mb': end_usage['rss_mb'],
+                     'rss_delta_mb': end_usage['rss_mb'] - self.start_usage['rss_mb'],
+                     'bytes_read': None,
+                     'bytes_written': None}
+        for field in ['bytes_read', 'bytes_written']:
+            if end_usage[field] is not None and self.start_usage[field] is not None:
+                span_dict[field] = end_usage[field] - self.start_usage[field]
+        return span_dict
+
+    def iter_spans(self):
+        ''' Yield this span and all descendants, depth first '''
+        yield self
+        for child in self.children:
+            for span in child.iter_spans():
+                yield span
+
+
+class StageProfiler(object):
+    ''' Nested stage profiler for a single procflow run '''
+
+    def __init__(self, name, **attrs):
+        from datetime import datetime
+        self.start_datetime = datetime.utcnow()
+        self.root = ProfileSpan(name, **attrs)
+        self.stack = [self.root]
+
+    @property
+    def current_span(self):
+        ''' Innermost open span '''
+        return self.stack[-1]
+
+    def start_span(self, name, parent=None, **attrs):
+        ''' Start a new span, nested within parent
+
+        Args:
+            name (str) : stage name, ie 'read', 'sector', 'interp', 'algorithm', 'output', 'compare'
+            parent (ProfileSpan) : DEFAULT None, parent span - any spans still open within parent are ended with
+                                   status 'incomplete' (ie, a loop iteration that was skipped with continue).
+                                   If None, nest within the innermost open span.
+            attrs : additional span attributes, ie area_id, product_name
+
+        Returns:
+            (ProfileSpan) : the new span, to pass to end_span
+        '''
+        if parent is not None:
+            while self.stack[-1] is not parent and len(self.stack) > 1:
+                self.stack.pop().end(status='incomplete')
+        span = ProfileSpan(name, parent=self.stack[-1], **attrs)
+        self.stack.append(span)
+        return span
+
+    def end_span(self, span, status='done'):
+        ''' End span, and any spans still open within it '''
+        if span not in self.stack:
+            span.end(status=status)
+            return
+        while self.stack[-1] is not span:
+            self.stack.pop().end(status='incomplete')
+        self.stack.pop().end(status=status)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        ''' Context manager recording a span nested within the innermost open span, status 'failed' on exception '''
+        curr_span = self.start_span(name, **attrs)
+        try:
+            yield curr_span
+        except BaseException:
+            self.end_span(curr_span, status='failed')
+            raise
+        self.end_span(curr_span)
+
+    def finish(self, status='done'):
+        ''' End all open spans, including the root span '''
+        self.end_span(self.root, status=status)
+
+    def get_report(self):
+        ''' Return the machine readable report for this run
+
+        Returns:
+            (dict) : {'run': run information, 'spans': list of flat span dictionaries, depth first}
+        '''
+        import socket
+        return {'run': {'name': self.root.name,
+                        'start_datetime': self.start_datetime.isoformat(),
+                        'host': socket.gethostname(),
+                        'pid': os.getpid(),
+                        'attrs': dict((key, str(val)) for key, val in self.root.attrs.items())},
+                'spans': [span.to_dict() for span in self.root.iter_spans()]}
+
+    def log_summary(self):
+        ''' Log the wall time, CPU time, and peak RSS of every span, indented by depth '''
+        for span_dict in self.get_report()['spans']:
+            LOG.info('PROFILE %-60s %-10s wall %9.3fs cpu %9.3fs peak_rss %9.1fMB rss_delta %+9.1fMB',
+                     '  ' * span_dict['depth'] + span_dict['path'].split('/')[-1], span_dict['status'],
+                     span_dict['wall_seconds'], span_dict['cpu_seconds'], span_dict['peak_rss_mb'],
+                     span_dict['rss_delta_mb'])
+
+    def write_report(self, out_fname):
+        ''' Write the report to out_fname, CSV if out_fname ends in .csv, otherwise JSON
+
+        Returns:
+            (list) : [out_fname]
+        '''
+        from geoips2.filenames.base_paths import make_dirs
+        report = self.get_report()
+        if os.path.dirname(out_fname):
+            make_dirs(os.path.dirname(out_fname))
+        if out_fname.endswith('.csv'):
+            import csv
+            with open(out_fname, 'w', newline='') as fobj:
+                writer = csv.DictWriter(fobj, fieldnames=REPORT_COLUMNS, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(report['spans'])
+        else:
+            import json
+            with open(out_fname, 'w') as fobj:
+                json.dump(report, fobj, indent=2)
+        LOG.info('PROFILESUCCESS wrote %s', out_fname)
+        return [out_fname]
+
+
+class NullProfiler(object):
+    ''' Profiler interface that records nothing, used when no procflow profiler is active '''
+    root = None
+    current_span = None
+
+    def start_span(self, name, parent=None, **attrs):
+        return None
+
+    def end_span(self, span, status='done'):
+        return None
+
+    @contextmanager
+    def span(self, name, **attrs):
+        yield None
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def get_profiler():
+    ''' Return the active procflow profiler, or a no-op profiler if none is active '''
+    if ACTIVE_PROFILER:
+        return ACTIVE_PROFILER[-1]
+    return NULL_PROFILER
+
+
+def start_profiler(name, **attrs):
+    ''' Start and activate a profiler for procflow run name
+
+    Returns:
+        (StageProfiler) : the active profiler
+    '''
+    profiler = StageProfiler(name, **attrs)
+    # Procflows do not nest - discard any profiler left active by a run that raised an exception
+    del ACTIVE_PROFILER[:]
+    ACTIVE_PROFILER.append(profiler)
+    return profiler
+
+
+def stop_profiler(report_fname=None, status='done'):
+    ''' Finish and deactivate the active profiler, log its summary, and write its report if requested
+
+    Args:
+        report_fname (str) : DEFAULT None, JSON or CSV report filename
+        status (str) : DEFAULT 'done', final status of the run
+
+    Returns:
+        (list) : [report_fname] if a report was written, otherwise []
+    '''
+    if not ACTIVE_PROFILER:
+        return []
+    profiler = ACTIVE_PROFILER.pop()
+    profiler.finish(status=status)
+    profiler.log_summary()
+    if report_fname:
+        return profiler.write_report(report_fname)
+    return []
+
+
+def read_profile_report(fname):
+    ''' Read a JSON or CSV profile report, returning a list of span dictionaries '''
+    if fname.endswith('.csv'):
+        import csv
+        with open(fname, newline='') as fobj:
+            spans = list(csv.DictReader(fobj))
+        for span_dict in spans:
+            for field in ['wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'rss_mb', 'rss_delta_mb']:
+                if span_dict.get(field):
+                    span_dict[field] = float(span_dict[field])
+        return spans
+    import json
+    with open(fname) as fobj:
+        return json.load(fobj)['spans']
+
+
+def diff_profile_reports(old_fname, new_fname, field='wall_seconds', threshold=1.2):
+    ''' Compare two profile reports, returning the spans where field increased by more than threshold
+
+    Spans are matched by path.  Repeated paths within a report are summed.
+
+    Args:
+        old_fname (str) : baseline JSON or CSV profile report
+        new_fname (str) : new JSON or CSV profile report
+        field (str) : DEFAULT 'wall_seconds', measurement to compare
+        threshold (float) : DEFAULT 1.2, minimum new / old ratio to report
+
+    Returns:
+        (list) : (path, old value, new value, ratio) for each regressed span, largest ratio first
+    '''
+    totals = []
+    for fname in [old_fname, new_fname]:
+        curr_totals = {}
+        for span_dict in read_profile_report(fname):
+            curr_totals[span_dict['path']] = curr_totals.get(span_dict['path'], 0.0) + float(span_dict[field])
+        totals += [curr_totals]
+    old_totals, new_totals = totals
+    regressions = []
+    for path, new_value in new_totals.items():
+        old_value = old_totals.get(path)
+        if not old_value:
+            continue
+        ratio = new_value / old_value
+        if ratio > threshold:
+            regressions += [(path, old_value, new_value, ratio)]
+            LOG.info('PROFILEREGRESSION %s %s %.3f -> %.3f (%.2fx)', path, field, old_value, new_value, ratio)
+    return sorted(regressions, key=lambda regression: regression[3], reverse=True)
@@ -71,21 +71,31 @@ def floor_minute(datetime_obj):
     return datetime_obj - timedelta(seconds=second, microseconds=micro)
 
 
-def calculate_overpass(tle, observer_lat, observer_lon, date):
-    '''Calculate next overpass information for a satellite at an observer location and time
+def create_observer(observer_lat, observer_lon, date):
+    '''Create ephem observer at a given location and time
     Args:
-        tle (ephem.EarthSatellite) : tle for satellite
         observer_lat (float) : observer latitude
         observer_lon (float) : observer longitude
-        date (datetime) : start time for next overpass
+        date (datetime) : observer date
     Returns:
-        (dict) : next overpass information
+        (ephem.Observer) : observer at sea level
     '''
-    sector = ephem.Observer()                                      
+    sector = ephem.Observer()
     sector.lon = str(observer_lon)
     sector.lat = str(observer_lat)
     sector.date = date.strftime('%Y/%m/%d %H:%M:%S')
     sector.elevation = 0.0
+    return sector
+
+
+def calculate_sun_moon(sector, date):
+    '''Calculate sunrise, sunset, and moon phase for an observer
+    Args:
+        sector (ephem.Observer) : observer location and time
+        date (datetime) : time used for the observer
+    Returns:
+        (dict) : check datetime, sunrise, sunset, and moon phase portions of the overpass information
+    '''
     moon = ephem.Moon()
     sun = ephem.Sun()
     moon.compute(sector)
@@ -94,10 +104,26 @@ def calculate_overpass(tle, observer_lat, observer_lon, date):
     sunset = sun.set_time.datetime()
     if sunset <= sunrise:
         sunset += timedelta(days=1)
-    opass_info = {'check datetime': date,
-                  'sunrise': sunrise,
-                  'sunset': sunset,
-                  'moon phase': moon.phase}
+    return {'check datetime': date,
+            'sunrise': sunrise,
+            'sunset': sunset,
+            'moon phase': moon.phase}
+
+
+def calculate_overpass(tle, observer_lat, observer_lon, date):
+    '''Calculate next overpass information for a satellite at an observer location and time
+    Args:
+        tle (ephem.EarthSatellite) : tle for satellite
+        observer_lat (float) : observer latitude
+        observer_lon (float) : observer longitude
+        date (datetime) : start time for next overpass
+    Returns:
+        (dict) : next overpass information
+    '''
+    sector = create_observer(observer_lat, observer_lon, date)
+    opass_info = calculate_sun_moon(sector, date)
+    sunrise = opass_info['sunrise']
+    sunset = opass_info['sunset']
     try:
         opass = sector.next_pass(tle)
         is_geostationary = False
@@ -138,18 +164,14 @@ def calculate_overpass(tle, observer_lat, observer_lon, date):
     return opass_info
 
 
-def predict_satellite_overpass(tlefile, satellite_tle, area_def, start_datetime, check_midpoints=False):
-    '''Estimate next satellite overpass information with ephem
+def get_observer_points(area_def, check_midpoints=False):
+    '''Get observer points used for overpass prediction of an area definition
     Args:
-        tlefile (str) : file path of TLE
-        satellite_tle (dict) : dictionary holding satellite tle line1 and line2 data
         area_def (pyresample) : area definition
-        start_datetime (datetime) : start time to find the next available overpass
-        check_midpoints (bool) : check mid points of area definition for additional overpassses
+        check_midpoints (bool) : include mid points of area definition for additional overpassses
     Returns:
-        (dict) : dictionary holding next overpass information
+        (list) : list of (lat, lon) tuples, sector center first
     '''
-    tle = ephem.readtle(tlefile, satellite_tle['line1'], satellite_tle['line2'])
     ll_lon, ll_lat, ur_lon, ur_lat = area_def.area_extent_ll
     center_lon = (ll_lon + ur_lon)/2.
     center_lat = (ll_lat + ur_lat)/2.
@@ -163,36 +185,59 @@ def predict_satellite_overpass(tlefile, satellite_tle, area_def, start_datetime,
         observers.append((mid_lat_lower, center_lon))
         observers.append((center_lat, mid_lon_upper))
         observers.append((center_lat, mid_lon_lower))
-    overpasses = {}
-    rise_times = []
-    valid_overpasses = 0
-    for i, observer in enumerate(observers):
-        observer_lat, observer_lon = observer
-        opass_info = calculate_overpass(tle,
-                                        observer_lat,
-                                        observer_lon,
-                                        start_datetime)
-        if isinstance(opass_info, type(None)):
-            # Either something went wrong in the predictor, or found a
-            # geostationary satellite that does not overpass the sector, ever!
-            overpasses = None
+    return observers
+
+
+def combine_observer_overpasses(observer_overpasses):
+    '''Combine overpasses found for each observer point of a sector into the final sector overpass dictionary.
+    Overpasses found for additional observer points are only included if they do not intersect with the
+    sector's center observer pass.  Observer points with no overpass are skipped.
+    Args:
+        observer_overpasses (list) : list of overpass info dicts (or None), sector center first
+    Returns:
+        (dict) : dictionary holding next overpass information, None if the sector center did not have an overpass
+    '''
+    if not observer_overpasses or observer_overpasses[0] is None:
+        # Either something went wrong in the predictor, or found a
+        # geostationary satellite that does not overpass the sector, ever!
+        return None
+    center_rise = observer_overpasses[0]['rise time']
+    center_set = observer_overpasses[0]['set time']
+    overpasses = {'pass 1': observer_overpasses[0]}
+    valid_overpasses = 1
+    for opass_info in observer_overpasses[1:]:
+        if opass_info is None:
             continue
-        if i < 1:
-            # Keep track of center rise set times
-            center_rise = opass_info['rise time']
-            center_set = opass_info['set time']
-            valid_overpasses += 1
-            overpasses['pass {0}'.format(valid_overpasses)] = opass_info
         # Only add if overpass does not intersect
         # with the sector's center observer point
         max_t = opass_info['max altitude time']
         if (max_t < center_rise) or (max_t > center_set):
-            rise_times.append(opass_info['rise time'])
             valid_overpasses += 1
             overpasses['pass {0}'.format(valid_overpasses)] = opass_info
     return overpasses
 
 
+def predict_satellite_overpass(tlefile, satellite_tle, area_def, start_datetime, check_midpoints=False):
+    '''Estimate next satellite overpass information with ephem
+    Args:
+        tlefile (str) : file path of TLE
+        satellite_tle (dict) : dictionary holding satellite tle line1 and line2 data
+        area_def (pyresample) : area definition
+        start_datetime (datetime) : start time to find the next available overpass
+        check_midpoints (bool) : check mid points of area definition for additional overpassses
+    Returns:
+        (dict) : dictionary holding next overpass information
+    '''
+    tle = ephem.readtle(tlefile, satellite_tle['line1'], satellite_tle['line2'])
+    observer_overpasses = []
+    for observer_lat, observer_lon in get_observer_points(area_def, check_midpoints=check_midpoints):
+        observer_overpasses.append(calculate_overpass(tle,
+                                                      observer_lat,
+                                                      observer_lon,
+                                                      start_datetime))
+    return combine_observer_overpasses(observer_overpasses)
+
+
 def predict_overpass_area_def(tlefile, area_definition, satellite_list, start_datetime, check_midpoints=False):
     ''' Predict satellite overpass for an area_definition
     Args:
@@ -243,3 +288,198 @@ def predict_overpass_yaml(tlefile, sectorfile, sector_list, satellite_list, star
         sector_overpasses[yaml_sector] = overpasses
     return sector_overpasses
 
+
+
+def propagate_satellite_track(satellite, satellite_tle, start_datetime, end_datetime, time_step_seconds=60):
+    '''Propagate satellite position once over a time window with vectorized SGP4 (pyorbital)
+    Args:
+        satellite (str) : satellite name
+        satellite_tle (dict) : dictionary holding satellite tle line1 and line2 data
+        start_datetime (datetime) : start of time window, floored to the minute
+        end_datetime (datetime) : end of time window
+        time_step_seconds (int) : time between samples
+    Returns:
+        (dict) : 'times' (datetime64 array), 'position' (ECI x, y, z km arrays), 'sublon' and 'sublat' arrays
+    '''
+    import numpy
+    from pyorbital.orbital import Orbital
+    orbit = Orbital(satellite, line1=satellite_tle['line1'], line2=satellite_tle['line2'])
+    start_dt64 = numpy.datetime64(floor_minute(start_datetime), 'us')
+    num_samples = int((end_datetime - floor_minute(start_datetime)).total_seconds() // time_step_seconds) + 1
+    times = start_dt64 + numpy.arange(num_samples) * numpy.timedelta64(int(time_step_seconds), 's')
+    position, _ = orbit.get_position(times, normalize=False)
+    sublon, sublat, _ = orbit.get_lonlatalt(times)
+    return {'times': times,
+            'position': position,
+            'sublon': sublon,
+            'sublat': sublat}
+
+
+def calculate_track_elevations(track, observer_lat, observer_lon):
+    '''Calculate elevation angle of a propagated satellite track seen from a sea level observer
+    Args:
+        track (dict) : propagated track, as returned by propagate_satellite_track
+        observer_lat (float) : observer latitude
+        observer_lon (float) : observer longitude
+    Returns:
+        (numpy.ndarray) : elevation in degrees for every sample in the track
+    '''
+    import numpy
+    from pyorbital import astronomy
+    times = track['times']
+    pos_x, pos_y, pos_z = track['position']
+    (opos_x, opos_y, opos_z), _ = astronomy.observer_position(times, observer_lon, observer_lat, 0.0)
+    lat = numpy.deg2rad(observer_lat)
+    theta = (astronomy.gmst(times) + numpy.deg2rad(observer_lon)) % (2 * numpy.pi)
+    rx = pos_x - opos_x
+    ry = pos_y - opos_y
+    rz = pos_z - opos_z
+    top_z = numpy.cos(lat) * numpy.cos(theta) * rx + numpy.cos(lat) * numpy.sin(theta) * ry + numpy.sin(lat) * rz
+    return numpy.rad2deg(numpy.arcsin(top_z / numpy.sqrt(rx * rx + ry * ry + rz * rz)))
+
+
+def calculate_track_overpass(track, observer_lat, observer_lon, date, sun_moon_info):
+    '''Calculate next overpass information for a propagated satellite track at an observer location.
+    Returns the same information as calculate_overpass, with times accurate to the track time step.
+    Args:
+        track (dict) : propagated track, as returned by propagate_satellite_track
+        observer_lat (float) : observer latitude
+        observer_lon (float) : observer longitude
+        date (datetime) : start time for next overpass
+        sun_moon_info (dict) : sunrise, sunset, and moon phase information, as returned by calculate_sun_moon
+    Returns:
+        (dict) : next overpass information
+    '''
+    import numpy
+    opass_info = dict(sun_moon_info)
+    sunrise = opass_info['sunrise']
+    sunset = opass_info['sunset']
+    elevations = calculate_track_elevations(track, observer_lat, observer_lon)
+    in_window = track['times'] >= numpy.datetime64(date, 'us')
+    above = (elevations > 0) & in_window
+    if not above.any():
+        # Never rises during the time window
+        return None
+
+    def sample_datetime(index):
+        return track['times'][index].astype('datetime64[us]').item()
+
+    if above[in_window].all():
+        # Always above the horizon - geostationary
+        max_ind = numpy.flatnonzero(above)[0]
+        opass_info['rise time'] = date
+        opass_info['max altitude time'] = date
+        opass_info['max altitude'] = date
+        opass_info['set time'] = date
+        opass_info['is geostationary'] = True
+        opass_info['above horizon'] = True
+        opass_info['is daytime'] = (date >= sunrise) & (date < sunset)
+    else:
+        edges = numpy.diff(above.astype(numpy.int8))
+        rise_inds = numpy.flatnonzero(edges == 1) + 1
+        set_inds = numpy.flatnonzero(edges == -1)
+        if rise_inds.size > 0:
+            # Next full pass.  The crossing occurs between the last sample below and the first sample above
+            # the horizon, the floored crossing time is the last sample below the horizon.
+            rise_ind = rise_inds[0]
+            set_inds = set_inds[set_inds >= rise_ind]
+        else:
+            # Only a pass already in progress at the start of the window
+            rise_ind = numpy.flatnonzero(above)[0]
+        set_ind = set_inds[0] if set_inds.size > 0 else above.size - 1
+        max_ind = rise_ind + numpy.argmax(elevations[rise_ind:set_ind+1])
+        max_alt_time = floor_minute(sample_datetime(max_ind))
+        opass_info['rise time'] = floor_minute(sample_datetime(max(rise_ind - 1, 0)))
+        opass_info['max altitude time'] = max_alt_time
+        opass_info['max altitude'] = ephem.degrees(numpy.deg2rad(elevations[max_ind]))
+        opass_info['set time'] = floor_minute(sample_datetime(set_ind))
+        opass_info['is daytime'] = (max_alt_time >= sunrise) & (max_alt_time < sunset)
+        opass_info['is geostationary'] = False
+    opass_info['sublon'] = float(track['sublon'][max_ind])
+    opass_info['sublat'] = float(track['sublat'][max_ind])
+    sublon, sublat, obslon, obslat = numpy.deg2rad([opass_info['sublon'], opass_info['sublat'],
+                                                    observer_lon, observer_lat])
+    earth_radius_km = 6730.
+    cpa_km = 2 * earth_radius_km * numpy.arcsin(numpy.sqrt(numpy.sin((sublat - obslat) / 2.)**2
+                                                           + numpy.cos(sublat) * numpy.cos(obslat)
+                                                           * numpy.sin((sublon - obslon) / 2.)**2))
+    opass_info['closest pass approach (km)'] = float(cpa_km)
+    return opass_info
+
+
+def predict_overpasses_batch(tlefile, area_defs, satellite_list, start_datetime, check_midpoints=False,
+                             end_datetime=None, time_step_seconds=60):
+    '''Predict satellite overpasses for many sectors and satellites at once.
+    The TLE file is read once, each satellite track is propagated once over the time window with vectorized SGP4,
+    and the sun and moon information is computed once per observer point, then every sector observer point is
+    checked against the propagated tracks.
+    Args:
+        tlefile (str) : file path of TLE
+        area_defs (dict) : dictionary of sector names to pyresample area definitions
+        satellite_list (list) : list of satellites to predict the overpass times
+        start_datetime (datetime) : start time to find the next available overpass
+        check_midpoints (bool) : check mid points of area definition for additional overpassses
+        end_datetime (datetime) : DEFAULT start_datetime + 1 day, end of window to search for overpasses
+        time_step_seconds (int) : DEFAULT 60, time between propagated track samples
+    Returns:
+        (dict) : dictionary holding next satellite overpass estimates for sectors
+                 (sorted by sector -> satellite -> overpass info), identical in format to predict_overpass_yaml
+    '''
+    if not isinstance(satellite_list, list):
+        raise TypeError('satellite_list must be type list')
+    if end_datetime is None:
+        end_datetime = start_datetime + timedelta(days=1)
+    satellite_tle_dict = read_satellite_tle(tlefile, satellite_list)
+    tracks = {}
+    for satellite, sat_tle in satellite_tle_dict.items():
+        tracks[satellite] = propagate_satellite_track(satellite, sat_tle, start_datetime, end_datetime,
+                                                      time_step_seconds=time_step_seconds)
+
+    sun_moon_infos = {}
+    sector_overpasses = {}
+    for sector_name, area_def in area_defs.items():
+        observers = get_observer_points(area_def, check_midpoints=check_midpoints)
+        for observer in observers:
+            if observer not in sun_moon_infos:
+                sun_moon_infos[observer] = calculate_sun_moon(create_observer(observer[0], observer[1],
+                                                                              start_datetime),
+                                                              start_datetime)
+        area_def_overpasses = {}
+        for satellite, track in tracks.items():
+            next_overpass = combine_observer_overpasses([calculate_track_overpass(track,
+                                                                                  observer_lat,
+                                                                                  observer_lon,
+                                                                                  start_datetime,
+                                                                                  sun_moon_infos[(observer_lat,
+                                                                                                  observer_lon)])
+                                                         for observer_lat, observer_lon in observers])
+            if next_overpass:
+                area_def_overpasses[satellite] = next_overpass
+        sector_overpasses[sector_name] = area_def_overpasses
+    return sector_overpasses
+
+
+def predict_overpass_yaml_batch(tlefile, sectorfile, sector_list, satellite_list, start_datetime,
+                                check_midpoints=False, end_datetime=None, time_step_seconds=60):
+    '''Predict satellite overpass for sectors from a given yaml sector file, using predict_overpasses_batch
+    Args:
+        tlefile (str) : file path of TLE
+        sectorfile  (str) : file path of sectorfile
+        sector_list (list) : list of sectors held within the sectorfile
+        satellite_list (list) : list of satellites to predict the overpass times
+        start_datetime (datetime) : start time to find the next available overpass
+        check_midpoints (bool) : check mid points of area definition for additional overpassses
+        end_datetime (datetime) : DEFAULT start_datetime + 1 day, end of window to search for overpasses
+        time_step_seconds (int) : DEFAULT 60, time between propagated track samples
+    Returns:
+        (dict) : dictionary holding next satellite overpass estimates for sectors
+                 (sorted by sector -> satellite -> overpass info)
+    '''
+    from geoips2.sector_utils.utils import create_areadefinition_from_yaml
+    area_defs = {}
+    for yaml_sector in sector_list:
+        area_defs[yaml_sector] = create_areadefinition_from_yaml(sectorfile, yaml_sector)
+    return predict_overpasses_batch(tlefile, area_defs, satellite_list, start_datetime,
+                                    check_midpoints=check_midpoints,
+                                    end_datetime=end_datetime,
+                                    time_step_seconds=time_step_seconds)
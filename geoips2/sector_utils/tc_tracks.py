@@ -23,6 +23,15 @@ from geoips2.filenames.base_paths import PATHS as gpaths
 
 LOG = logging.getLogger(__name__)
 
+# Parsed TC template YAMLs, {(template_yaml, mtime): template_dict}
+_TEMPLATE_CACHE = {}
+# Resolved area_def_generator entry points, {area_def_generator_func: function}
+_AREA_DEF_GENERATORS = {}
+# Generated template area definitions, {(template_yaml, mtime, generator name, generator args): area_def}
+_TEMPLATE_AREA_DEF_CACHE = {}
+# Clear the area definition cache once it reaches this size, to avoid unbounded growth in long running processes
+MAX_TEMPLATE_AREA_DEF_CACHE_SIZE = 1000
+
 # If we ever revert back to numbered storm from named storm, we may need to include this list in "get_final_storm_name"
 # rather than just INVEST
 # UNNAMED_STORM_NAMES = ['invest', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
@@ -58,13 +67,15 @@ def tc_fname_metadata(area_def, xarray_obj, product_filename,
     return pathjoin(metadata_yaml_dirname, metadata_yaml_basename)
 
 
-def produce_sector_metadata(area_def, xarray_obj, product_filename, metadata_dir='metadata'):
+def produce_sector_metadata(area_def, xarray_obj, product_filename, metadata_dir='metadata', sector_block=None):
     ''' Produce metadata yaml file of sector information associated with the final_product
     Args:
         area_def (AreaDefinition) : Pyresample AreaDefintion object
         final_product (str) : Product that is associated with the passed area_def
         metadata_dir (str) : DEFAULT 'metadata' Subdirectory name for metadata (using non-default allows for
                                                 non-operational outputs)
+        sector_block (dict) : DEFAULT None, precomputed sector metadata shared across products
+                              (see output_formats.utils.metadata.get_sector_metadata_block)
 
     Returns:
         (str) : Metadata yaml filename, if one was produced.
@@ -78,7 +89,8 @@ def produce_sector_metadata(area_def, xarray_obj, product_filename, metadata_dir
     from geoips2.dev.utils import replace_geoips_paths
     product_partial_path = replace_geoips_paths(product_filename)
     # product_partial_path = pathjoin(*final_product.split('/')[-5:-1]+[basename(final_product)])
-    return output_metadata_yaml(metadata_yaml_filename, area_def, xarray_obj, product_partial_path)
+    return output_metadata_yaml(metadata_yaml_filename, area_def, xarray_obj, product_partial_path,
+                                sector_block=sector_block)
 
 
 def create_tc_sector_info_dict(clat, clon, synoptic_time, storm_year, storm_basin, storm_num, aid_type=None,
@@ -153,6 +165,68 @@ def get_tc_long_description(area_id, fields):
     return long_description
 
 
+def get_tc_template(template_yaml):
+    ''' Return the parsed TC template YAML, only re-reading the file if it has been modified.
+
+    Args:
+        template_yaml (str) : Path to template YAML file
+
+    Returns:
+        (tuple) : (template mtime, area_def_generator_func name, copy of area_def_generator_args dictionary)
+    '''
+    mtime = os.stat(template_yaml).st_mtime
+    if (template_yaml, mtime) not in _TEMPLATE_CACHE:
+        import yaml
+        with open(template_yaml, 'r') as fobj:
+            _TEMPLATE_CACHE[(template_yaml, mtime)] = yaml.safe_load(fobj)
+    template_dict = _TEMPLATE_CACHE[(template_yaml, mtime)]
+    return mtime, template_dict['area_def_generator_func'], dict(template_dict['area_def_generator_args'])
+
+
+def get_area_def_generator(template_func_name):
+    ''' Return the area_def_generator function, only resolving each entry point once per process '''
+    if template_func_name not in _AREA_DEF_GENERATORS:
+        from geoips2.geoips2_utils import find_entry_point
+        _AREA_DEF_GENERATORS[template_func_name] = find_entry_point('area_def_generators', template_func_name)
+    return _AREA_DEF_GENERATORS[template_func_name]
+
+
+def generate_template_area_def(template_yaml, template_mtime, template_func_name, template_args):
+    ''' Generate the area definition for the current template arguments, reusing previously generated
+        area definitions with identical geometry (same template, clat, clon, resolution, and shape).
+
+    Args:
+        template_yaml (str) : Path to template YAML file
+        template_mtime (float) : Modification time of template_yaml, so modified templates are regenerated
+        template_func_name (str) : area_def_generators entry point name
+        template_args (dict) : Complete arguments to the area_def_generator, including area_id,
+                               long_description, clat, and clon
+
+    Returns:
+        (AreaDefinition) : New pyresample AreaDefinition object, with template_args area_id and long_description
+    '''
+    area_id = template_args['area_id']
+    long_description = template_args['long_description']
+    geometry_args = tuple(sorted((key, repr(val)) for key, val in template_args.items()
+                                 if key not in ['area_id', 'long_description']))
+    cache_key = (template_yaml, template_mtime, template_func_name, geometry_args)
+    if cache_key in _TEMPLATE_AREA_DEF_CACHE:
+        # Same projection and extent, possibly from a different storm - copy with this storm's identifiers
+        cached_area_def = _TEMPLATE_AREA_DEF_CACHE[cache_key]
+        return cached_area_def.copy(area_id=area_id,
+                                    description=long_description,
+                                    proj_id=cached_area_def.proj_id.replace(cached_area_def.area_id, area_id))
+
+    template_func = get_area_def_generator(template_func_name)
+    area_def = template_func(**template_args)
+    if hasattr(area_def, 'copy'):
+        if len(_TEMPLATE_AREA_DEF_CACHE) >= MAX_TEMPLATE_AREA_DEF_CACHE_SIZE:
+            _TEMPLATE_AREA_DEF_CACHE.clear()
+        # Store a copy, since the caller sets sector specific attributes on the returned area_def
+        _TEMPLATE_AREA_DEF_CACHE[cache_key] = area_def.copy()
+    return area_def
+
+
 def set_tc_area_def(fields, tcyear=None,
                     finalstormname=None, source_sector_file=None,
                     clat=None, clon=None,
@@ -176,13 +250,9 @@ def set_tc_area_def(fields, tcyear=None,
 
     '''
 
-    import yaml
     if template_yaml is None:
         template_yaml = gpaths['TC_TEMPLATE']
-    with open(template_yaml, 'r') as fobj:
-        template_dict = yaml.safe_load(fobj)
-    template_func_name = template_dict['area_def_generator_func']
-    template_args = template_dict['area_def_generator_args']
+    template_mtime, template_func_name, template_args = get_tc_template(template_yaml)
 
     if not finalstormname and 'final_storm_name' in fields:
         finalstormname = fields['final_storm_name']
@@ -200,15 +270,13 @@ def set_tc_area_def(fields, tcyear=None,
     area_id = get_tc_area_id(fields, finalstormname, tcyear)
     long_description = get_tc_long_description(area_id, fields)
 
-    from geoips2.geoips2_utils import find_entry_point
-    # These are things like 'clat_clon_resolution_shape'
-    template_func = find_entry_point('area_def_generators', template_func_name)
     # Probably generalize this at some point. For now I know those are the ones that are <template>
     template_args['area_id'] = area_id
     template_args['long_description'] = long_description
     template_args['clat'] = clat
     template_args['clon'] = clon
-    area_def = template_func(**template_args)
+    # template_func_name are things like 'clat_clon_resolution_shape'
+    area_def = generate_template_area_def(template_yaml, template_mtime, template_func_name, template_args)
 
     if 'interpolated_time' in fields:
         area_def.sector_start_datetime = fields['interpolated_time']
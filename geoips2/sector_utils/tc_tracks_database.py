@@ -19,6 +19,9 @@ LOG = logging.getLogger(__name__)
 TC_DECKS_DB = gpaths['TC_DECKS_DB']
 TC_DECKS_DIR = gpaths['TC_DECKS_DIR']
 
+# Parser used for trackfiles that do not yet have storm locations stored with a recorded parser
+DEFAULT_TRACKFILE_PARSER = 'bdeck_parser'
+
 
 def open_tc_db(dbname=TC_DECKS_DB):
     '''Open the TC Decks Database, create it if it doesn't exist'''
@@ -53,15 +56,54 @@ def open_tc_db(dbname=TC_DECKS_DB):
         # storm_start_datetime timestamp,
     except sqlite3.OperationalError:
         pass
+    # Parsed storm locations from each trackfile, so area definitions can be generated without re-parsing
+    # every deck file.  file_mtime is the modification time of the trackfile when it was parsed.
+    try:
+        conn_cursor.execute('''CREATE TABLE tc_trackfixes
+            (id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                filename text,
+                file_mtime real,
+                synoptic_time timestamp,
+                clat real,
+                clon real,
+                vmax real,
+                storm_name text,
+                final_storm_name text,
+                tc_year integer,
+                fields text,
+                trackfile_parser text)''')
+    except sqlite3.OperationalError:
+        pass
+    # Databases created before the parser was recorded with each storm location
+    conn_cursor.execute('PRAGMA table_info(tc_trackfixes)')
+    if 'trackfile_parser' not in [column[1] for column in conn_cursor.fetchall()]:
+        conn_cursor.execute('ALTER TABLE tc_trackfixes ADD COLUMN trackfile_parser text')
+    conn_cursor.execute('''CREATE INDEX IF NOT EXISTS tc_trackfixes_synoptic_time
+                           ON tc_trackfixes (synoptic_time)''')
+    conn_cursor.execute('''CREATE INDEX IF NOT EXISTS tc_trackfixes_filename
+                           ON tc_trackfixes (filename)''')
     return conn_cursor, conn
 
 
-def check_db(filenames=None, process=False):
+def db_timestamp_to_datetime(timestamp_str):
+    '''Convert timestamp string stored in the TC Decks Database to datetime object'''
+    from datetime import datetime
+    if '.' in timestamp_str:
+        return datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S.%f')
+    return datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
+
+
+def check_db(filenames=None, process=False, trackfile_parser=None):
     '''filenames is a list of filenames and directories.
-        if a list element is a string directory name, it expands to list of files in dir'''
+        if a list element is a string directory name, it expands to list of files in dir
+
+        Only files that are new, or have been modified since they were last ingested, are opened and parsed.
+        trackfile_parser is the parser used to store the individual storm locations from each updated trackfile'''
 
     from os.path import join as pathjoin
     from os.path import dirname as pathdirname
+    from datetime import datetime
+    from os import stat as osstat
     from glob import glob
 
     if filenames is None:
@@ -70,9 +112,16 @@ def check_db(filenames=None, process=False):
     updated_files = []
     cc,conn = open_tc_db()
 
-    # We might want to rearrange this so we don't open up every file... Check timestamps first.
+    # Check timestamps for all files in the database at once, so we only open the new and updated files.
+    cc.execute("SELECT filename, last_updated FROM tc_trackfiles")
+    database_timestamps = dict(cc.fetchall())
     for filename in filenames:
-        updated_files += update_fields(filename, cc, conn, process=process)
+        if filename in database_timestamps \
+           and datetime.fromtimestamp(osstat(filename).st_mtime) \
+           < db_timestamp_to_datetime(database_timestamps[filename]):
+            LOG.debug('%s already in %s and up to date, not doing anything.', filename, TC_DECKS_DB)
+            continue
+        updated_files += update_fields(filename, cc, conn, process=process, trackfile_parser=trackfile_parser)
 
     cc.execute("SELECT * FROM tc_trackfiles")
     # data = cc.fetchall()
@@ -81,7 +130,7 @@ def check_db(filenames=None, process=False):
     return updated_files
 
 
-def update_fields(tc_trackfilename, cc, conn, process=False):
+def update_fields(tc_trackfilename, cc, conn, process=False, trackfile_parser=None):
     # Must be of form similar to 
     # Gal912016.dat
 
@@ -109,7 +158,7 @@ def update_fields(tc_trackfilename, cc, conn, process=False):
     # Reads timestamp out as string - convert to datetime object.
     # Check if timestamp on file is newer than timestamp in database - if not, just return and don't do anything.
     if data: 
-        database_timestamp = datetime.strptime(cc.execute("SELECT last_updated from tc_trackfiles WHERE filename = ?", (tc_trackfilename,)).fetchone()[0],'%Y-%m-%d %H:%M:%S.%f')
+        database_timestamp = db_timestamp_to_datetime(cc.execute("SELECT last_updated from tc_trackfiles WHERE filename = ?", (tc_trackfilename,)).fetchone()[0])
         if file_timestamp < database_timestamp:
             LOG.info('')
             LOG.info(tc_trackfilename+' already in '+TC_DECKS_DB+' and up to date, not doing anything.')
@@ -173,6 +222,7 @@ def update_fields(tc_trackfilename, cc, conn, process=False):
                         end_datetime,
                         str(vmax),
                         tc_trackfilename,))
+        update_track_fixes(tc_trackfilename, cc, trackfile_parser=trackfile_parser)
         conn.commit()
         return updated_files
 
@@ -217,6 +267,7 @@ def update_fields(tc_trackfilename, cc, conn, process=False):
         LOG.info('')
         LOG.info('    Adding '+tc_trackfilename+' to '+TC_DECKS_DB) 
         updated_files += [tc_trackfilename]
+        update_track_fixes(tc_trackfilename, cc, trackfile_parser=trackfile_parser)
         conn.commit()
 
         # This ONLY runs if it is a brand new storm file and we requested 
@@ -226,6 +277,98 @@ def update_fields(tc_trackfilename, cc, conn, process=False):
     return updated_files
 
 
+def fields_to_json(fields):
+    '''Serialize storm location fields dictionary for storage in the TC Decks Database'''
+    import json
+    from datetime import datetime
+    return json.dumps(fields, default=lambda val: val.isoformat() if isinstance(val, datetime) else str(val))
+
+
+def json_to_fields(fields_json):
+    '''Deserialize storm location fields dictionary stored in the TC Decks Database'''
+    import json
+    from datetime import datetime
+    fields = json.loads(fields_json)
+    for fieldname in ['synoptic_time', 'interpolated_time']:
+        if fields.get(fieldname):
+            fields[fieldname] = datetime.fromisoformat(fields[fieldname])
+    return fields
+
+
+def get_trackfile_parser(tc_trackfilename, cc, trackfile_parser=None):
+    '''Return the trackfile parser to use for tc_trackfilename
+
+    Args:
+        tc_trackfilename (str) : Full path to trackfile
+        cc (sqlite3.Cursor) : Open TC Decks Database cursor
+        trackfile_parser (str) : DEFAULT None, explicitly requested parser, returned unchanged if not None
+
+    Returns:
+        (str) : trackfile_parser if specified, otherwise the parser recorded when the storm locations in
+                tc_trackfilename were last stored, otherwise DEFAULT_TRACKFILE_PARSER
+    '''
+    if trackfile_parser is not None:
+        return trackfile_parser
+    recorded = cc.execute('''SELECT trackfile_parser from tc_trackfixes WHERE
+                             filename = ?
+                             AND trackfile_parser IS NOT NULL LIMIT 1''', (tc_trackfilename,)).fetchone()
+    if recorded is not None:
+        return recorded[0]
+    return DEFAULT_TRACKFILE_PARSER
+
+
+def update_track_fixes(tc_trackfilename, cc, trackfile_parser=None):
+    '''Parse all storm locations from tc_trackfilename, and replace the stored locations in the TC Decks Database
+
+    Args:
+        tc_trackfilename (str) : Full path to trackfile
+        cc (sqlite3.Cursor) : Open TC Decks Database cursor.  Caller is responsible for committing.
+        trackfile_parser (str) : DEFAULT None, parser to use from interface_modules/trackfile_parsers.
+                                 None uses the parser recorded for tc_trackfilename, or DEFAULT_TRACKFILE_PARSER
+
+    Returns:
+        (bool) : True if the storm locations were successfully stored
+    '''
+    from os import stat as osstat
+    from geoips2.geoips2_utils import find_entry_point
+    trackfile_parser = get_trackfile_parser(tc_trackfilename, cc, trackfile_parser=trackfile_parser)
+    file_mtime = osstat(tc_trackfilename).st_mtime
+    try:
+        parser = find_entry_point('trackfile_parsers', trackfile_parser)
+        all_fields, final_storm_name, tc_year = parser(tc_trackfilename)
+    except Exception as resp:  # pylint: disable=broad-except
+        LOG.warning('FAILED parsing storm locations from %s with %s, not storing: %s',
+                    tc_trackfilename, trackfile_parser, str(resp))
+        return False
+
+    cc.execute("DELETE FROM tc_trackfixes WHERE filename = ?", (tc_trackfilename,))
+    cc.executemany('''insert into tc_trackfixes(
+                        filename,
+                        file_mtime,
+                        synoptic_time,
+                        clat,
+                        clon,
+                        vmax,
+                        storm_name,
+                        final_storm_name,
+                        tc_year,
+                        fields,
+                        trackfile_parser) values(?,?,?,?,?,?,?,?,?,?,?)''',
+                   [(tc_trackfilename,
+                     file_mtime,
+                     fields['synoptic_time'],
+                     fields['clat'],
+                     fields['clon'],
+                     fields['vmax'] if fields['vmax'] != '' else None,
+                     fields['storm_name'],
+                     final_storm_name,
+                     tc_year,
+                     fields_to_json(fields),
+                     trackfile_parser) for fields in all_fields])
+    LOG.info('    Stored %s storm locations from %s', len(all_fields), tc_trackfilename)
+    return True
+
+
 def reprocess_storm(tc_trackfilename):
 
     # from IPython import embed as shell; shell()
@@ -274,22 +417,29 @@ def reprocess_storm(tc_trackfilename):
     #shell()
 
 
-def get_all_storms_from_db(start_datetime, end_datetime, template_yaml=None):
+def get_all_storms_from_db(start_datetime, end_datetime, template_yaml=None, trackfile_parser=None):
     '''Get all entries from all storms within a specific range of time from the TC database
         Parameters:
             start_datetime (datetime) : Start time of desired range
             end_datetime (datetime) : End time of desired range
+            template_yaml (str) : DEFAULT None, TC template YAML to use for the area definitions
+            trackfile_parser (str) : DEFAULT None, parser used for trackfiles without up to date storm locations.
+                                     None uses the parser recorded for each trackfile, or DEFAULT_TRACKFILE_PARSER
 
         Returns:
             list of Sectors: List of GeoIPS 1.0 Sector objects, each storm location that falls within the desired
                              time range.
 
+        Storm locations are read from the tc_trackfixes table.  Trackfiles that have been modified since
+        they were last parsed (or were never parsed) are parsed and stored before reading the locations.
+
         Usage:
             >>> startdt = datetime.strptime('20200216', '%Y%m%d')
             >>> enddt = datetime.strptime('20200217', '%Y%m%d')
             >>> get_storm_from_db(startdt, enddt)
     '''
     from os.path import exists as path_exists
+    from os import stat as osstat
     connection_cursor, connection = open_tc_db()
     LOG.info('connection: %s', connection)
     connection_cursor.execute('''SELECT filename from tc_trackfiles WHERE
@@ -298,7 +448,7 @@ def get_all_storms_from_db(start_datetime, end_datetime, template_yaml=None):
                                                               end_datetime))
     deck_filenames = connection_cursor.fetchall()
     return_area_defs = []
-    from geoips2.sector_utils.tc_tracks import trackfile_to_area_defs
+    from geoips2.sector_utils.tc_tracks import trackfile_to_area_defs, set_tc_area_def
     for deck_filename in deck_filenames:
         if deck_filename is not None:
             # Is a tuple
@@ -307,9 +457,29 @@ def get_all_storms_from_db(start_datetime, end_datetime, template_yaml=None):
         if not path_exists(deck_filename):
             LOG.info('Deck file does not exist! %s', deck_filename)
             continue
-        area_defs = trackfile_to_area_defs(deck_filename, template_yaml=template_yaml)
-        for area_def in area_defs:
-            if area_def.sector_start_datetime > start_datetime and area_def.sector_start_datetime < end_datetime:
-                return_area_defs+= [area_def]
+        fixes_mtime, = connection_cursor.execute("SELECT MIN(file_mtime) from tc_trackfixes WHERE filename = ?",
+                                                 (deck_filename,)).fetchone()
+        if fixes_mtime is None or fixes_mtime != osstat(deck_filename).st_mtime:
+            deck_parser = get_trackfile_parser(deck_filename, connection_cursor, trackfile_parser=trackfile_parser)
+            if not update_track_fixes(deck_filename, connection_cursor, trackfile_parser=deck_parser):
+                # Could not store the storm locations - fall back on parsing the full trackfile
+                area_defs = trackfile_to_area_defs(deck_filename, trackfile_parser=deck_parser,
+                                                   template_yaml=template_yaml)
+                for area_def in area_defs:
+                    if area_def.sector_start_datetime > start_datetime \
+                       and area_def.sector_start_datetime < end_datetime:
+                        return_area_defs += [area_def]
+                continue
+            connection.commit()
+        connection_cursor.execute('''SELECT tc_year, final_storm_name, fields from tc_trackfixes WHERE
+                                     filename = ?
+                                     AND synoptic_time > ?
+                                     AND synoptic_time < ?
+                                     ORDER BY id''', (deck_filename, start_datetime, end_datetime))
+        for tc_year, final_storm_name, fields_json in connection_cursor.fetchall():
+            fields = json_to_fields(fields_json)
+            return_area_defs += [set_tc_area_def(fields, tc_year, finalstormname=final_storm_name,
+                                                 source_sector_file=deck_filename, template_yaml=template_yaml)]
+    connection.close()
     # return None if no storm matched
     return return_area_defs
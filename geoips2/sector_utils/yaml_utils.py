@@ -68,6 +68,36 @@ def write_yamldict(yamldict, out_fname, force=False):
         return []
 
 
+def write_yamldict_if_changed(yamldict, out_fname):
+    ''' Atomically write yamldict to out_fname, skipping the write if out_fname already has identical contents
+
+    Args:
+        yamldict (dict) : Dictionary to write out to YAML file
+        out_fname (str) : Output filename to write YAML dict to
+
+    Returns:
+        (list) : [out_fname] if out_fname is up to date (written or unchanged), [] if it could not be written
+    '''
+    import os
+    import yaml
+    from geoips2.filenames.base_paths import atomic_output_fname
+    yaml_str = yaml.safe_dump(yamldict, default_flow_style=False)
+    if os.path.exists(out_fname):
+        with open(out_fname, 'r') as fobj:
+            if fobj.read() == yaml_str:
+                LOG.info('SKIPPING %s unchanged', out_fname)
+                return [out_fname]
+    try:
+        with atomic_output_fname(out_fname) as tmp_fname:
+            with open(tmp_fname, 'w') as fobj:
+                fobj.write(yaml_str)
+    except (IOError, OSError) as resp:
+        LOG.warning('FAILED Writing out yaml file %s: %s', out_fname, resp)
+        return []
+    LOG.info('SUCCESS Writing out yaml file %s', out_fname)
+    return [out_fname]
+
+
 def add_dynamic_datetime_to_yamldict(yaml_dict, sectorname, sector_start_datetime, sector_end_datetime):
     yaml_dict[sectorname]['sector_start_datetime'] = sector_start_datetime
     yaml_dict[sectorname]['sector_end_datetime'] = sector_end_datetime
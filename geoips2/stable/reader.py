@@ -26,10 +26,10 @@
 '''
 
 import collections
-from importlib import import_module
 import logging
 
 from geoips2.geoips2_utils import find_entry_point, list_entry_points
+from geoips2.plugin_registry import get_plugin_type
 
 LOG = logging.getLogger(__name__)
 
@@ -124,8 +124,24 @@ def get_reader_type(reader_name):
         (str) : Reader type currently found in <geoips2_package>.readers.<reader_name>.reader_type
                 Type defaults to 'standard' if not specified.
     '''
-    reader_func = find_entry_point('readers', reader_name)
-    return getattr(import_module(reader_func.__module__), 'reader_type')
+    return get_plugin_type('readers', reader_name)
+
+
+def reader_honors_area_def(reader_name):
+    ''' Check whether the requested reader only returns the data covering area_def, when area_def is specified
+
+    Readers declare this with a module level honors_area_def = True.  Readers without it may ignore area_def
+    and return the full data regardless.
+
+    Args:
+        reader_name (str) : Desired reader function (ie, 'amsr2_ncdf', 'ahi_hsd', etc)
+
+    Returns:
+        (bool) : True if <geoips2_package>.readers.<reader_name>.honors_area_def is True
+    '''
+    import sys
+    reader_func = get_reader(reader_name)
+    return bool(getattr(sys.modules[reader_func.__module__], 'honors_area_def', False))
 
 
 def list_readers_by_type():
@@ -0,0 +1,208 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Lossless, typed encoding of xarray attributes for geoips2 netcdf output.
+
+    netCDF attributes can only hold strings and numbers, so any other attribute values are encoded:
+
+        * datetime / numpy.datetime64 : ISO-8601 string
+        * bool : int 0 / 1
+        * None : empty string
+        * dict, list, tuple : JSON string, with datetimes encoded as {"__datetime__": "<ISO-8601>"}
+        * pyresample AreaDefinition : JSON string containing the pyresample YAML area definition,
+          plus the geoips2 sector attributes (sector_info, sector_type, sector_start_datetime, etc)
+
+    The type of every encoded attribute is stored in the ATTR_TYPES_NAME attribute as a JSON dictionary, so
+    decode_attrs can restore the original values exactly.  Files written before typed encoding was introduced
+    are decoded with the original rules ('%c' formatted datetimes, 'None' / 'True' / 'False' strings).
+'''
+import json
+import logging
+from datetime import datetime
+
+LOG = logging.getLogger(__name__)
+
+# Attribute holding the JSON dictionary of {attr_name: attr_type} for all encoded attributes
+ATTR_TYPES_NAME = 'geoips2_attr_types'
+
+# geoips2 specific attributes stored on pyresample AreaDefinition objects
+AREA_DEF_EXTRA_ATTRS = ['sector_info', 'sector_type', 'sector_start_datetime', 'sector_end_datetime',
+                        'description', 'name', 'area_definition_str']
+
+
+def to_json_compatible(value):
+    ''' Recursively convert value to JSON compatible types, encoding datetimes as {"__datetime__": isoformat} '''
+    import numpy
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, numpy.datetime64):
+        return {'__datetime__': str(value.astype('datetime64[us]'))}
+    if isinstance(value, dict):
+        return dict((str(key), to_json_compatible(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return [to_json_compatible(val) for val in value]
+    if isinstance(value, numpy.ndarray):
+        return to_json_compatible(value.tolist())
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError('Can not JSON encode {0} of type {1}'.format(value, type(value)))
+
+
+def _json_object_hook(obj):
+    if list(obj.keys()) == ['__datetime__']:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def from_json(json_str):
+    ''' Decode a JSON string created from to_json_compatible, restoring datetimes '''
+    return json.loads(json_str, object_hook=_json_object_hook)
+
+
+def encode_area_definition(area_def):
+    ''' Encode a pyresample AreaDefinition, with geoips2 sector attributes, as a JSON string '''
+    extra_attrs = dict((attr, getattr(area_def, attr)) for attr in AREA_DEF_EXTRA_ATTRS if hasattr(area_def, attr))
+    return json.dumps(to_json_compatible({'area_id': area_def.area_id,
+                                          'yaml': area_def.create_areas_def(),
+                                          'attrs': extra_attrs}))
+
+
+def decode_area_definition(json_str):
+    ''' Decode a JSON string created from encode_area_definition into a pyresample AreaDefinition '''
+    from pyresample.area_config import load_area_from_string
+    area_info = from_json(json_str)
+    area_def = load_area_from_string(area_info['yaml'], area_info['area_id'])
+    for attr, value in area_info['attrs'].items():
+        try:
+            setattr(area_def, attr, value)
+        except AttributeError:
+            # Some pyresample versions define name as a read only property
+            LOG.debug('Could not set %s on area_definition', attr)
+    return area_def
+
+
+def encode_attr(value):
+    ''' Encode a single attribute value for netcdf output
+
+    Args:
+        value : attribute value
+
+    Returns:
+        (tuple) : (attr_type, encoded_value).  attr_type is None if value is natively supported by netcdf.
+                  encoded_value is None if value can not be encoded.
+    '''
+    import numpy
+    if isinstance(value, (bool, numpy.bool_)):
+        return 'bool', int(value)
+    if value is None:
+        return 'none', ''
+    if isinstance(value, datetime):
+        return 'datetime', value.isoformat()
+    if isinstance(value, numpy.datetime64):
+        return 'datetime', str(value.astype('datetime64[us]'))
+    if isinstance(value, (str, int, float, numpy.number)):
+        return None, value
+    if isinstance(value, numpy.ndarray) and value.dtype.kind in 'iuf':
+        return None, value
+    if hasattr(value, 'create_areas_def'):
+        try:
+            return 'area_definition', encode_area_definition(value)
+        except (TypeError, ValueError, AttributeError) as resp:
+            LOG.warning('Could not encode area_definition %s, storing repr: %s', value.area_id, resp)
+            return None, repr(value)
+    try:
+        return 'json', json.dumps(to_json_compatible(value))
+    except TypeError as resp:
+        LOG.warning('Unsupported attribute type for netcdf output: %s', resp)
+        return None, None
+
+
+def decode_attr(attr_type, value):
+    ''' Decode a single attribute value encoded with encode_attr '''
+    if attr_type == 'bool':
+        return bool(value)
+    if attr_type == 'none':
+        return None
+    if attr_type == 'datetime':
+        return datetime.fromisoformat(str(value))
+    if attr_type == 'json':
+        return from_json(value)
+    if attr_type == 'area_definition':
+        return decode_area_definition(value)
+    return value
+
+
+def encode_attrs(attrs):
+    ''' Return a new dictionary of netcdf compatible attributes, including the ATTR_TYPES_NAME attribute
+
+    Args:
+        attrs (dict) : xarray Dataset or DataArray attributes
+
+    Returns:
+        (dict) : encoded attributes, skipping any values that can not be encoded
+    '''
+    encoded_attrs = {}
+    attr_types = {}
+    for attr, value in attrs.items():
+        if attr == ATTR_TYPES_NAME:
+            continue
+        attr_type, encoded_value = encode_attr(value)
+        if encoded_value is None:
+            LOG.warning('SKIPPING attr %s %s, not supported for netcdf output', attr, value)
+            continue
+        encoded_attrs[attr] = encoded_value
+        if attr_type is not None:
+            attr_types[attr] = attr_type
+    if attr_types:
+        encoded_attrs[ATTR_TYPES_NAME] = json.dumps(attr_types, sort_keys=True)
+    return encoded_attrs
+
+
+def decode_attrs(attrs):
+    ''' Return a new dictionary of decoded attributes, from attributes written with encode_attrs
+
+    Args:
+        attrs (dict) : attributes read from a netcdf file
+
+    Returns:
+        (dict) : decoded attributes
+    '''
+    if ATTR_TYPES_NAME not in attrs:
+        return decode_legacy_attrs(attrs)
+    attr_types = json.loads(attrs[ATTR_TYPES_NAME])
+    return dict((attr, decode_attr(attr_types.get(attr), value))
+                for attr, value in attrs.items() if attr != ATTR_TYPES_NAME)
+
+
+def decode_legacy_attrs(attrs):
+    ''' Decode attributes written before typed attribute encoding - '%c' datetimes, and None/True/False strings '''
+    decoded_attrs = dict(attrs)
+    for attr, value in attrs.items():
+        # Only string values were encoded - array attributes (ie, valid_range, flag_values) pass through unchanged
+        if not isinstance(value, str):
+            continue
+        if 'datetime' in attr:
+            try:
+                decoded_attrs[attr] = datetime.strptime(value, '%c')
+            except ValueError:
+                LOG.debug('Could not decode %s %s as a datetime', attr, value)
+        elif value == 'None':
+            decoded_attrs[attr] = None
+        elif value == 'True':
+            decoded_attrs[attr] = True
+        elif value == 'False':
+            decoded_attrs[attr] = False
+    return decoded_attrs
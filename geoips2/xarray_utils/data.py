@@ -102,9 +102,16 @@ def sector_xarray_temporal(full_xarray, mindt, maxdt, varnames, verbose=False, d
         LOG.info('  timestamp variable not included in list - not temporally sectoring, returning all data')
         return full_xarray
 
-    for varname in varnames:
-        good_speeds = numpy.ma.count(full_xarray[varname].to_masked_array())
-        if verbose:
+    # Use the cached time range to skip datasets entirely outside the requested times
+    from geoips2.xarray_utils.timestamp import get_timestamp_range
+    data_mindt, data_maxdt = get_timestamp_range(full_xarray, 'timestamp')
+    if data_mindt is None or data_maxdt <= mindt or data_mindt >= maxdt:
+        LOG.warning('  NO TIME DATA between %s and %s for any vars, skipping', mindt, maxdt)
+        return None
+
+    if verbose:
+        for varname in varnames:
+            good_speeds = numpy.ma.count(full_xarray[varname].to_masked_array())
             LOG.info('  STARTED TIME WITH %s points for %s', good_speeds, varname)
     mindt64 = numpy.datetime64(mindt)
     maxdt64 = numpy.datetime64(maxdt)
@@ -294,10 +301,11 @@ def sector_xarray_dataset(full_xarray, area_def, varnames, lon_pad=3, lat_pad=0,
                                               verbose=verbose, drop=drop)
         if sector_xarray is not None\
            and 'timestamp' in varnames and hasattr(area_def, 'sector_start_datetime') and area_def.sector_start_datetime:
-            from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp, get_max_from_xarray_timestamp
+            from geoips2.xarray_utils.timestamp import get_timestamp_range
             sector_xarray.attrs['area_definition'] = area_def
-            sector_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(sector_xarray, 'timestamp')
-            sector_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(sector_xarray, 'timestamp')
+            start_datetime, end_datetime = get_timestamp_range(sector_xarray, 'timestamp')
+            sector_xarray.attrs['start_datetime'] = start_datetime
+            sector_xarray.attrs['end_datetime'] = end_datetime
         elif sector_xarray is not None:
             sector_xarray.attrs['area_definition'] = area_def
             sector_xarray.attrs['start_datetime'] = full_xarray.start_datetime
@@ -435,10 +443,10 @@ def sector_xarrays(xobjs, area_def, varlist, verbose=False,
 
         sect_xarray.attrs['area_definition'] = area_def        # add name of this sector to sector attribute
         if hasattr(sect_xarray, 'timestamp'):
-            from geoips2.xarray_utils.timestamp import get_min_from_xarray_timestamp
-            from geoips2.xarray_utils.timestamp import get_max_from_xarray_timestamp
-            sect_xarray.attrs['start_datetime'] = get_min_from_xarray_timestamp(sect_xarray, 'timestamp')
-            sect_xarray.attrs['end_datetime'] = get_max_from_xarray_timestamp(sect_xarray, 'timestamp')
+            from geoips2.xarray_utils.timestamp import get_timestamp_range
+            start_datetime, end_datetime = get_timestamp_range(sect_xarray, 'timestamp')
+            sect_xarray.attrs['start_datetime'] = start_datetime
+            sect_xarray.attrs['end_datetime'] = end_datetime
             # Note:  need to test whether above two lines can reselect min and max time_info for this sector
 
         LOG.debug('Sectored data start/end datetime: %s %s, %s points from var %s, all vars %s',
@@ -0,0 +1,181 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # #
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # #
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # #
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+''' Encoding policies for geoips2 netcdf output (compression, chunking, dtype downcast, scale/offset packing).
+
+    Compression, chunking, downcasting and packing are all opt-in.  Without a policy every variable is written
+    losslessly: uncompressed, contiguous, and with its in-memory dtype.
+
+    An encoding policy is a dictionary, specified per product with the optional "netcdf_encoding" product field:
+
+        netcdf_encoding:
+            default:                # Applied to every numeric variable
+                zlib: True
+                complevel: 4
+                shuffle: True
+                float_dtype: float32    # Downcast all float64 variables (optional)
+                chunks: {dim_0: 512, dim_1: 512}   # Chunk size per dimension name (optional, compressed
+                                                   # variables default to blocks of rows)
+            variables:              # Per-variable overrides of "default", plus packing
+                Infrared:
+                    dtype: int16        # Pack to int16
+                    scale_factor: 0.01  # If omitted for an integer dtype, computed from the data range
+                    add_offset: 0.0
+
+    Any policy fields not specified fall back to DEFAULT_ENCODING_POLICY.  The returned encoding is always
+    built from scratch, so stale encoding inherited from the input files (ie, chunk sizes larger than a
+    sectored variable) is never reused.
+'''
+import logging
+
+LOG = logging.getLogger(__name__)
+
+# Lossless and uncompressed - products opt in to compression, chunking, and packing with netcdf_encoding
+DEFAULT_ENCODING_POLICY = {'default': {},
+                           'variables': {}}
+
+# Policy fields passed directly through to the xarray netcdf encoding
+PASSTHROUGH_FIELDS = ['zlib', 'complevel', 'shuffle', 'dtype', 'scale_factor', 'add_offset', '_FillValue',
+                      'units', 'calendar', 'contiguous']
+
+# Maximum number of elements per chunk when chunks are not specified in the policy
+DEFAULT_MAX_CHUNK_ELEMENTS = 1024 * 1024
+
+
+def merge_encoding_policy(policy=None):
+    ''' Merge policy over DEFAULT_ENCODING_POLICY
+
+    Args:
+        policy (dict) : DEFAULT None, encoding policy with optional 'default' and 'variables' sections
+
+    Returns:
+        (dict) : complete encoding policy
+    '''
+    merged = {'default': dict(DEFAULT_ENCODING_POLICY['default']),
+              'variables': dict(DEFAULT_ENCODING_POLICY['variables'])}
+    if policy:
+        merged['default'].update(policy.get('default', {}))
+        merged['variables'].update(policy.get('variables', {}))
+    return merged
+
+
+def get_chunksizes(shape, dims, chunks=None, max_chunk_elements=DEFAULT_MAX_CHUNK_ELEMENTS):
+    ''' Return netcdf chunk sizes for a variable, never larger than the variable itself
+
+    Args:
+        shape (tuple) : variable shape
+        dims (tuple) : variable dimension names
+        chunks (dict or list) : DEFAULT None, chunk size per dimension name, or per axis.
+                                If None, split the leading dimension so each chunk holds at most
+                                max_chunk_elements.
+        max_chunk_elements (int) : DEFAULT 1048576, used when chunks is None
+
+    Returns:
+        (tuple) : chunk size per dimension, or None for scalar or empty variables
+    '''
+    if not shape or 0 in shape:
+        return None
+    if chunks is None:
+        row_elements = 1
+        for size in shape[1:]:
+            row_elements *= size
+        rows = max(1, min(shape[0], max_chunk_elements // max(row_elements, 1)))
+        return (rows,) + tuple(shape[1:])
+    if isinstance(chunks, dict):
+        chunks = [chunks.get(dim, size) for dim, size in zip(dims, shape)]
+    return tuple(max(1, min(int(chunk), size)) for chunk, size in zip(chunks, shape))
+
+
+def get_packing_encoding(data_array, dtype):
+    ''' Compute scale_factor / add_offset packing float data_array into integer dtype, reserving the
+        minimum integer value for _FillValue
+
+    Args:
+        data_array (xarray.DataArray) : floating point data to pack
+        dtype (str) : integer dtype, ie 'int16'
+
+    Returns:
+        (dict) : scale_factor, add_offset, and _FillValue encoding
+    '''
+    import numpy
+    dtype = numpy.dtype(dtype)
+    info = numpy.iinfo(dtype)
+    fill_value = info.min
+    valid_min = info.min + 1
+    data_min = float(data_array.min(skipna=True))
+    data_max = float(data_array.max(skipna=True))
+    if not numpy.isfinite(data_min) or not numpy.isfinite(data_max):
+        data_min, data_max = 0.0, 0.0
+    # Map [data_min, data_max] onto [valid_min, info.max]
+    scale_factor = (data_max - data_min) / (float(info.max) - valid_min)
+    if scale_factor == 0:
+        scale_factor = 1.0
+    add_offset = data_min - valid_min * scale_factor
+    return {'scale_factor': scale_factor, 'add_offset': add_offset, '_FillValue': fill_value}
+
+
+def get_variable_encoding(data_array, var_policy):
+    ''' Return the xarray netcdf encoding for a single variable
+
+    Args:
+        data_array (xarray.DataArray) : variable to encode
+        var_policy (dict) : merged default and per-variable policy fields
+
+    Returns:
+        (dict) : xarray encoding for data_array
+    '''
+    import numpy
+    encoding = {}
+    kind = data_array.dtype.kind
+    if kind not in 'iufbM':
+        # Strings and objects are left to xarray's defaults
+        return encoding
+
+    for field in PASSTHROUGH_FIELDS:
+        if field in var_policy:
+            encoding[field] = var_policy[field]
+
+    if kind == 'f' and 'dtype' not in encoding and var_policy.get('float_dtype'):
+        if data_array.dtype.itemsize > numpy.dtype(var_policy['float_dtype']).itemsize:
+            encoding['dtype'] = var_policy['float_dtype']
+
+    if kind == 'f' and 'dtype' in encoding and numpy.dtype(encoding['dtype']).kind in 'iu' \
+       and 'scale_factor' not in encoding:
+        encoding.update(get_packing_encoding(data_array, encoding['dtype']))
+
+    # Compressed variables must be chunked - otherwise only chunk if requested, and leave the variable contiguous
+    if not encoding.get('contiguous') and (encoding.get('zlib') or var_policy.get('chunks') is not None):
+        chunksizes = get_chunksizes(data_array.shape, data_array.dims, var_policy.get('chunks'))
+        if chunksizes is not None:
+            encoding['chunksizes'] = chunksizes
+    return encoding
+
+
+def get_netcdf_encoding(xarray_obj, policy=None):
+    ''' Return the xarray to_netcdf encoding dictionary for every variable in xarray_obj
+
+    Args:
+        xarray_obj (xarray.Dataset) : Dataset to be written
+        policy (dict) : DEFAULT None, encoding policy, see module documentation
+
+    Returns:
+        (dict) : {varname: encoding} for use with xarray.Dataset.to_netcdf
+    '''
+    policy = merge_encoding_policy(policy)
+    encoding = {}
+    for varname in xarray_obj.variables.keys():
+        var_policy = dict(policy['default'])
+        var_policy.update(policy['variables'].get(varname, {}))
+        encoding[varname] = get_variable_encoding(xarray_obj[varname], var_policy)
+    return encoding
@@ -44,6 +44,108 @@ def get_datetime_from_datetime64(dt64):
     return datetime.utcfromtimestamp(dt64.astype(int)*scale)
 
 
+# Cached (start, end) datetimes of timestamp variables, keyed by id(Variable).  Each entry holds a weak reference
+# to the variable's underlying data array, so the entry is invalidated when the variable or its data are replaced.
+TIMESTAMP_RANGE_CACHE = {}
+
+
+def datetime64_to_datetime(dt64):
+    ''' Convert a numpy.datetime64 scalar to a datetime.datetime, exact to the microsecond, None if NaT '''
+    import numpy
+    if numpy.isnat(dt64):
+        return None
+    return dt64.astype('datetime64[us]').astype(object)
+
+
+def _get_timestamp_variable(xarray_obj, varname):
+    ''' Return the xarray Variable varname from a Dataset, or the Variable of a DataArray '''
+    if hasattr(xarray_obj, 'data_vars'):
+        return xarray_obj.variables[varname]
+    if xarray_obj.name == varname or varname not in xarray_obj.coords:
+        return xarray_obj.variable
+    return xarray_obj.coords[varname].variable
+
+
+def _get_cached_timestamp_range(variable):
+    cached = TIMESTAMP_RANGE_CACHE.get(id(variable))
+    if cached is not None and cached[0]() is variable._data and cached[1] == variable.shape:
+        return cached[2]
+    return None
+
+
+def _set_cached_timestamp_range(variable, timestamp_range):
+    import weakref
+    try:
+        data_ref = weakref.ref(variable._data)
+    except TypeError:
+        # Underlying array type does not support weak references - do not cache
+        return
+    var_id = id(variable)
+    TIMESTAMP_RANGE_CACHE[var_id] = (data_ref, variable.shape, timestamp_range)
+    # Remove the entry when the underlying data are garbage collected
+    weakref.finalize(variable._data, TIMESTAMP_RANGE_CACHE.pop, var_id, None)
+
+
+def clear_timestamp_range_cache():
+    ''' Clear all cached timestamp ranges - required only if timestamp values are modified in place '''
+    TIMESTAMP_RANGE_CACHE.clear()
+
+
+def compute_datetime64_range(values):
+    ''' Return the (min, max) of a datetime64 array, ignoring NaT, without masked arrays or copies
+
+    Args:
+        values (numpy.ndarray) : datetime64 array
+
+    Returns:
+        (tuple) : (min, max) numpy.datetime64 scalars, NaT if all values are NaT
+    '''
+    import numpy
+    values = numpy.ascontiguousarray(values)
+    int_values = values.view(numpy.int64).ravel()
+    nat = numpy.iinfo(numpy.int64).min
+    if not int_values.size:
+        return numpy.datetime64('NaT'), numpy.datetime64('NaT')
+    # NaT is the minimum int64, so it never affects the max
+    maxval = int_values.max()
+    if maxval == nat:
+        return numpy.datetime64('NaT'), numpy.datetime64('NaT')
+    minval = numpy.min(int_values, initial=maxval, where=int_values != nat)
+    return numpy.int64(minval).view(values.dtype), numpy.int64(maxval).view(values.dtype)
+
+
+def get_timestamp_range(xarray_obj, varname='timestamp'):
+    ''' Get the minimum and maximum times as datetime objects from xarray object, ignoring NaT
+
+    The range is computed once per timestamp variable and cached until the variable or its data are replaced,
+    so repeated calls from readers, sectoring, and filename generation do not rescan the timestamps.
+
+        Parameters:
+            xarray_obj (xarray.Dataset or xarray.DataArray): xarray object from which to extract the time range
+            varname (str) : DEFAULT 'timestamp', timestamp variable name from which to extract the time range
+
+        Returns:
+            tuple of Python datetime.datetime objects (minimum time, maximum time)
+    '''
+    variable = _get_timestamp_variable(xarray_obj, varname)
+    timestamp_range = _get_cached_timestamp_range(variable)
+    if timestamp_range is not None:
+        return timestamp_range
+
+    values = variable.values
+    if values.dtype.kind == 'M':
+        minval, maxval = compute_datetime64_range(values)
+        timestamp_range = (datetime64_to_datetime(minval), datetime64_to_datetime(maxval))
+    else:
+        # Non-datetime64 timestamps (ie, object arrays of datetimes) - skip None / zero values
+        import numpy
+        good_values = numpy.ravel(values)[numpy.ma.where(numpy.ravel(values))]
+        timestamp_range = (good_values.min(), good_values.max())
+
+    _set_cached_timestamp_range(variable, timestamp_range)
+    return timestamp_range
+
+
 def get_min_from_xarray_timestamp(xarray_obj, varname):
     ''' Get the minimum time as a datetime object from xarray object
 
@@ -54,14 +156,7 @@ def get_min_from_xarray_timestamp(xarray_obj, varname):
         Returns:
             Python datetime.datetime object representing minimum time of the Dataset or DataArray
     '''
-
-    minval = xarray_obj[varname].min().to_dict()['data']
-    # Hack to get around bug in most recent version of numpy
-    if minval is None:
-        import numpy
-        goodinds = numpy.ma.where(xarray_obj[varname].to_masked_array())
-        minval = get_datetime_from_datetime64(xarray_obj[varname].to_masked_array()[goodinds].min())
-    return minval  
+    return get_timestamp_range(xarray_obj, varname)[0]
 
 
 def get_max_from_xarray_timestamp(xarray_obj, varname):
@@ -74,10 +169,4 @@ def get_max_from_xarray_timestamp(xarray_obj, varname):
         Returns:
             Python datetime.datetime object representing maximum time of the Dataset or DataArray
     '''
-    maxval = xarray_obj[varname].max().to_dict()['data']
-    # Hack to get around bug in most recent version of numpy
-    if maxval is None:
-        import numpy
-        goodinds = numpy.ma.where(xarray_obj[varname].to_masked_array())
-        maxval = get_datetime_from_datetime64(xarray_obj[varname].to_masked_array()[goodinds].max())
-    return maxval
+    return get_timestamp_range(xarray_obj, varname)[1]
@@ -54,6 +54,9 @@ setuptools.setup(
     entry_points={
         'console_scripts': [
             'run_procflow=geoips2.commandline.run_procflow:main',
+            'procflow_worker=geoips2.commandline.procflow_worker:main',
+            'run_benchmarks=geoips2.commandline.run_benchmarks:main',
+            'check_import_budget=geoips2.commandline.check_import_budget:main',
             'convert_trackfile_to_yaml=geoips2.commandline.convert_trackfile_to_yaml:main',
             'update_tc_tracks_database=geoips2.commandline.update_tc_tracks_database:main',
             'xml_to_yaml_sector=geoips2.commandline.xml_to_yaml_sector:main',
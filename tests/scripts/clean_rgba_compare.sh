@@ -0,0 +1,48 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # # 
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # # 
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # # 
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+#!/bin/bash
+
+# Compare the direct RGBA clean image (GEOIPS_DIRECT_RGBA) against the matplotlib figure based clean image, for
+# Infrared-like data on the goes16 test sector.  The data span beyond the colormap range on both ends and
+# include missing values, so the under, over, and bad colors are all checked.
+python - $GEOIPS2/tests/sectors/goes16.yaml <<'PYEOF'
+import sys
+import numpy
+from geoips2.sector_utils.utils import get_sectors_from_yamls
+from geoips2.dev.product import get_cmap_from_product
+from geoips2.image_utils.rgba_raster import compare_clean_rgba
+
+area_def = get_sectors_from_yamls([sys.argv[1]], ['goes16'])[0]
+mpl_colors_info = get_cmap_from_product('Infrared', 'abi')
+
+# Infrared data_range is -90 to 30 C - ramp from -110 to 50 C, plus noise, with a block of missing values
+rows, cols = area_def.shape
+data = numpy.linspace(-110.0, 50.0, cols)[numpy.newaxis, :] + numpy.zeros((rows, 1))
+data += numpy.random.RandomState(42).normal(0.0, 2.0, size=data.shape)
+data[rows // 4:rows // 2, cols // 4:cols // 2] = numpy.nan
+data = numpy.ma.masked_invalid(data)
+
+matches, bad_fraction, max_diff = compare_clean_rgba(area_def, data, mpl_colors_info, tolerance=1)
+print('Direct RGBA vs matplotlib: max channel difference {0}, fraction of pixels beyond tolerance {1}'.format(
+      max_diff, bad_fraction))
+if matches:
+    print('GOODCOMPARE direct RGBA clean image matches matplotlib within 1')
+    sys.exit(0)
+print('BADCOMPARE direct RGBA clean image differs from matplotlib')
+sys.exit(1)
+PYEOF
+retval=$?
+
+exit $retval
@@ -0,0 +1,60 @@
+# # # DISTRIBUTION STATEMENT A. Approved for public release: distribution unlimited.
+# # # 
+# # # Author:
+# # # Naval Research Laboratory, Marine Meteorology Division
+# # # 
+# # # This program is free software: you can redistribute it and/or modify it under
+# # # the terms of the NRLMMD License included with this program.  If you did not
+# # # receive the license, see http://www.nrlmry.navy.mil/geoips for more
+# # # information.
+# # # 
+# # # This program is distributed WITHOUT ANY WARRANTY; without even the implied
+# # # warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# # # included license for more details.
+
+#!/bin/bash
+
+# Store the storm locations from the first half of a deck file in a scratch TC Decks Database, then append the
+# rest of the deck file and update again.  The second update must add the appended storm locations, using the
+# parser recorded on the first update.
+python - $GEOIPS2/tests/sectors/bal202020.dat <<'PYEOF'
+import os
+import sys
+import shutil
+import tempfile
+from geoips2.sector_utils.tc_tracks_database import open_tc_db, update_track_fixes
+
+deck_lines = open(sys.argv[1]).readlines()
+num_first = len(deck_lines) // 2
+tmpdir = tempfile.mkdtemp()
+try:
+    deck_fname = os.path.join(tmpdir, 'bal202020.dat')
+    cc, conn = open_tc_db(dbname=os.path.join(tmpdir, 'tc_decks.db'))
+
+    with open(deck_fname, 'w') as fobj:
+        fobj.writelines(deck_lines[:num_first])
+    update_track_fixes(deck_fname, cc, trackfile_parser='bdeck_parser')
+    conn.commit()
+    num_rows_first = cc.execute('SELECT COUNT(*) from tc_trackfixes').fetchone()[0]
+
+    with open(deck_fname, 'a') as fobj:
+        fobj.writelines(deck_lines[num_first:])
+    update_track_fixes(deck_fname, cc)
+    conn.commit()
+    num_rows_second, parsers = cc.execute('''SELECT COUNT(*), GROUP_CONCAT(DISTINCT trackfile_parser)
+                                             from tc_trackfixes''').fetchone()
+    conn.close()
+finally:
+    shutil.rmtree(tmpdir)
+
+print('tc_trackfixes rows: {0} after first update, {1} after appended update, parsers {2}'.format(
+      num_rows_first, num_rows_second, parsers))
+if num_rows_first > 0 and num_rows_second > num_rows_first and parsers == 'bdeck_parser':
+    print('GOODCOMPARE tc_trackfixes rows added on appended update')
+    sys.exit(0)
+print('BADCOMPARE tc_trackfixes rows not added on appended update')
+sys.exit(1)
+PYEOF
+retval=$?
+
+exit $retval
@@ -30,6 +30,8 @@ echo ""
 for call in \
             "$GEOIPS2/tests/scripts/abi.sh" \
             "$GEOIPS2/tests/scripts/abi_config.sh" \
+            "$GEOIPS2/tests/scripts/tc_tracks_database.sh" \
+            "$GEOIPS2/tests/scripts/clean_rgba_compare.sh" \
             "test_interfaces"
 do
     . $GEOIPS2/tests/utils/test_all_run.sh